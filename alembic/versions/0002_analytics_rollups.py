@@ -0,0 +1,44 @@
+"""analytics daily rollups
+
+Revision ID: 0002_analytics_rollups
+Revises: 0001_initial
+Create Date: 2026-10-18 00:00:00
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002_analytics_rollups'
+down_revision = '0001_initial'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'analytics_daily_rollups',
+        sa.Column('id', sa.Integer(), primary_key=True, nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('discipline', sa.String(), nullable=False, server_default=''),
+        sa.Column('document_type', sa.String(), nullable=False, server_default=''),
+        sa.Column('report_count', sa.Integer(), nullable=False, server_default=sa.text('0')),
+        sa.Column('score_sum', sa.Float(), nullable=False, server_default=sa.text('0')),
+        sa.Column('score_min', sa.Float(), nullable=True),
+        sa.Column('score_max', sa.Float(), nullable=True),
+        sa.Column('finding_count', sa.Integer(), nullable=False, server_default=sa.text('0')),
+        sa.Column('high_risk_finding_count', sa.Integer(), nullable=False, server_default=sa.text('0')),
+        sa.Column('processing_ms_sum', sa.Float(), nullable=False, server_default=sa.text('0')),
+        sa.Column('processing_ms_count', sa.Integer(), nullable=False, server_default=sa.text('0')),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.UniqueConstraint('day', 'discipline', 'document_type', name='uq_analytics_daily_rollup'),
+    )
+    op.create_index('ix_analytics_daily_rollups_id', 'analytics_daily_rollups', ['id'])
+    op.create_index('ix_analytics_daily_rollups_day', 'analytics_daily_rollups', ['day'])
+
+
+def downgrade() -> None:
+    op.drop_table('analytics_daily_rollups')
@@ -0,0 +1,40 @@
+"""analytics score histogram
+
+Revision ID: 0003_score_histogram
+Revises: 0002_analytics_rollups
+Create Date: 2026-10-18 00:00:00
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003_score_histogram'
+down_revision = '0002_analytics_rollups'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'analytics_score_histogram',
+        sa.Column('id', sa.Integer(), primary_key=True, nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('discipline', sa.String(), nullable=False, server_default=''),
+        sa.Column('bin', sa.Integer(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False, server_default=sa.text('0')),
+        sa.Column('score_sum', sa.Float(), nullable=False, server_default=sa.text('0')),
+        sa.Column('score_sq_sum', sa.Float(), nullable=False, server_default=sa.text('0')),
+        sa.Column('score_min', sa.Float(), nullable=True),
+        sa.Column('score_max', sa.Float(), nullable=True),
+        sa.UniqueConstraint('day', 'discipline', 'bin', name='uq_analytics_score_histogram'),
+    )
+    op.create_index('ix_analytics_score_histogram_id', 'analytics_score_histogram', ['id'])
+    op.create_index('ix_analytics_score_histogram_day', 'analytics_score_histogram', ['day'])
+
+
+def downgrade() -> None:
+    op.drop_table('analytics_score_histogram')
@@ -0,0 +1,30 @@
+"""report row version
+
+Revision ID: 0004_report_version
+Revises: 0003_score_histogram
+Create Date: 2026-10-18 00:00:00
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004_report_version'
+down_revision = '0003_score_histogram'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('reports') as batch:
+        batch.add_column(
+            sa.Column('version', sa.Integer(), nullable=False, server_default=sa.text('1'))
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('reports') as batch:
+        batch.drop_column('version')
@@ -0,0 +1,38 @@
+"""composite indexes for hot analytics and listing queries
+
+Revision ID: 0005_hot_query_indexes
+Revises: 0004_report_version
+Create Date: 2026-10-19 00:00:00
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005_hot_query_indexes'
+down_revision = '0004_report_version'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = (
+    ('ix_reports_discipline_date_score', 'reports', ['discipline', 'analysis_date', 'compliance_score']),
+    ('ix_reports_type_score', 'reports', ['document_type', 'compliance_score']),
+    ('ix_reports_type_date', 'reports', ['document_type', 'analysis_date']),
+    ('ix_findings_report_risk', 'findings', ['report_id', 'risk']),
+    ('ix_findings_rule_confidence', 'findings', ['rule_id', 'confidence_score']),
+    ('ix_habit_snapshots_user_date', 'habit_progress_snapshots', ['user_id', 'snapshot_date']),
+)
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
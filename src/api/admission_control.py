@@ -0,0 +1,233 @@
+"""Admission control for in-process document analyses.
+
+Each analysis runs the full NER/retrieval/LLM pipeline, so starting every upload
+immediately lets a burst of requests exhaust memory and queue up behind a single
+model. The controller caps concurrently running analyses, keeps a bounded FIFO
+of admitted-but-waiting analyses and rejects requests beyond that with a
+``Retry-After`` estimate derived from recently observed analysis durations.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENT = 2
+DEFAULT_MAX_QUEUE = 16
+DEFAULT_MAX_WAIT_SECONDS = 600.0
+DEFAULT_ANALYSIS_SECONDS = 60.0
+LATENCY_WINDOW = 20
+
+
+def _performance_settings() -> dict[str, Any]:
+    try:
+        from src.config import get_settings
+
+        return dict(get_settings().performance or {})
+    except Exception:
+        return {}
+
+
+class AdmissionRejected(Exception):
+    """Raised when an analysis cannot be admitted right now."""
+
+    def __init__(self, status_code: int, retry_after: int, detail: str) -> None:
+        super().__init__(detail)
+        self.status_code = status_code
+        self.retry_after = retry_after
+        self.detail = detail
+
+
+@dataclass
+class AdmissionTicket:
+    task_id: str
+    queue_position: int
+    estimated_start_seconds: float
+
+
+class AnalysisAdmissionController:
+    """Bounds running analyses and the queue of analyses waiting to start."""
+
+    def __init__(
+        self,
+        max_concurrent: int | None = None,
+        max_queue: int | None = None,
+        max_wait_seconds: float | None = None,
+    ) -> None:
+        perf = _performance_settings()
+        self.max_concurrent = max(
+            1, int(max_concurrent or perf.get("analysis_max_concurrent", DEFAULT_MAX_CONCURRENT))
+        )
+        self.max_queue = max(
+            0,
+            int(
+                max_queue
+                if max_queue is not None
+                else perf.get("analysis_max_queue", DEFAULT_MAX_QUEUE)
+            ),
+        )
+        self.max_wait_seconds = float(
+            max_wait_seconds or perf.get("analysis_max_wait_seconds", DEFAULT_MAX_WAIT_SECONDS)
+        )
+        self._running: dict[str, float] = {}
+        self._reserved: set[str] = set()
+        self._waiting: OrderedDict[str, asyncio.Future[None] | None] = OrderedDict()
+        self._durations: deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+    @property
+    def average_analysis_seconds(self) -> float:
+        """Mean duration of recent analyses, or a conservative default."""
+        if not self._durations:
+            return DEFAULT_ANALYSIS_SECONDS
+        return sum(self._durations) / len(self._durations)
+
+    def estimate_start_seconds(self, position: int) -> float:
+        """Estimate how long the analysis at queue ``position`` (1-based) waits.
+
+        Running analyses are assumed to be half done on average; every further
+        wave of ``max_concurrent`` queued analyses adds one mean duration.
+        """
+        if position <= 0:
+            return 0.0
+        average = self.average_analysis_seconds
+        waves = math.ceil(position / self.max_concurrent)
+        return round((waves - 0.5) * average, 1)
+
+    def admit(self, task_id: str) -> AdmissionTicket:
+        """Reserve a running slot or a queue place for ``task_id``.
+
+        Raises:
+            AdmissionRejected: 429 when the wait queue is full, 503 when the
+                estimated wait exceeds ``max_wait_seconds``.
+        """
+        if len(self._running) + len(self._reserved) < self.max_concurrent and not self._waiting:
+            self._reserved.add(task_id)
+            return AdmissionTicket(task_id, 0, 0.0)
+
+        position = len(self._waiting) + 1
+        estimate = self.estimate_start_seconds(position)
+        if len(self._waiting) >= self.max_queue:
+            retry_after = max(1, math.ceil(self.average_analysis_seconds / self.max_concurrent))
+            logger.warning(
+                "Rejecting analysis %s: %d running, %d queued", task_id, self.active_count, len(self._waiting)
+            )
+            raise AdmissionRejected(
+                429, retry_after, "Analysis queue is full. Please retry later."
+            )
+        if estimate > self.max_wait_seconds:
+            raise AdmissionRejected(
+                503,
+                max(1, math.ceil(estimate - self.max_wait_seconds)),
+                "Analysis capacity is saturated. Please retry later.",
+            )
+
+        self._waiting[task_id] = None
+        return AdmissionTicket(task_id, position, estimate)
+
+    async def acquire(self, task_id: str) -> None:
+        """Wait for a running slot for ``task_id``.
+
+        Analyses that were not admitted beforehand join the back of the queue
+        without a capacity check.
+        """
+        if task_id in self._reserved:
+            self._reserved.discard(task_id)
+            self._running[task_id] = time.monotonic()
+            return
+        if task_id not in self._waiting and len(self._running) + len(self._reserved) < self.max_concurrent and not self._waiting:
+            self._running[task_id] = time.monotonic()
+            return
+
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiting[task_id] = future
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            self._waiting.pop(task_id, None)
+            if future.done() and not future.cancelled():
+                self.release(task_id)
+            raise
+
+    def release(self, task_id: str, duration_seconds: float | None = None) -> None:
+        """Free the slot held by ``task_id`` and start the next queued analysis."""
+        started = self._running.pop(task_id, None)
+        self._reserved.discard(task_id)
+        if self._waiting.pop(task_id, None) is not None:
+            logger.debug("Analysis %s left the queue before starting", task_id)
+        if duration_seconds is None and started is not None:
+            duration_seconds = time.monotonic() - started
+        if duration_seconds is not None and duration_seconds > 0:
+            self._durations.append(duration_seconds)
+        self._dispatch()
+
+    def discard_unstarted(self, task_id: str) -> bool:
+        """Drop a reservation or queue place that never became a running slot.
+
+        Returns:
+            True when ``task_id`` held such a place.
+        """
+        held = task_id in self._reserved or (
+            task_id in self._waiting and self._waiting[task_id] is None
+        )
+        if held:
+            self._reserved.discard(task_id)
+            self._waiting.pop(task_id, None)
+            logger.debug("Analysis %s never started; freeing its admission", task_id)
+            self._dispatch()
+        return held
+
+    def _dispatch(self) -> None:
+        """Hand free slots to queued analyses whose runner is already waiting."""
+        while self._waiting and len(self._running) + len(self._reserved) < self.max_concurrent:
+            task_id, future = next(iter(self._waiting.items()))
+            if future is None:
+                # The head has not reached acquire() yet; keep its place for it
+                self._waiting.pop(task_id)
+                self._reserved.add(task_id)
+                continue
+            self._waiting.pop(task_id)
+            self._running[task_id] = time.monotonic()
+            if not future.done():
+                future.set_result(None)
+
+    @property
+    def active_count(self) -> int:
+        return len(self._running) + len(self._reserved)
+
+    def queue_position(self, task_id: str) -> int | None:
+        """1-based position of ``task_id`` in the wait queue, or None."""
+        for index, queued_id in enumerate(self._waiting, start=1):
+            if queued_id == task_id:
+                return index
+        return None
+
+    def status_for(self, task_id: str) -> dict[str, Any] | None:
+        """Queue details for a waiting analysis, for the status endpoint."""
+        position = self.queue_position(task_id)
+        if position is None:
+            return None
+        return {
+            "queue_position": position,
+            "estimated_start_seconds": self.estimate_start_seconds(position),
+        }
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "running": len(self._running),
+            "reserved": len(self._reserved),
+            "queued": len(self._waiting),
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "average_analysis_seconds": round(self.average_analysis_seconds, 2),
+        }
+
+
+analysis_admission = AnalysisAdmissionController()
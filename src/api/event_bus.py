@@ -0,0 +1,170 @@
+"""In-process publish/subscribe bus for analysis progress events.
+
+Analyses publish progress to a per-task channel; WebSocket and Server-Sent-Events
+clients subscribe to it instead of polling ``/analysis/status``. The bus keeps
+the last event of every channel so that a client joining mid-analysis (or after
+it finished) immediately receives the current state.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from datetime import datetime
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_EVENT_TYPES = frozenset({"complete", "error", "cancelled"})
+DEFAULT_SUBSCRIBER_BUFFER = 64
+DEFAULT_RETAINED_CHANNELS = 1000
+
+
+def analysis_channel(task_id: str) -> str:
+    """Channel name used for the progress events of one analysis."""
+    return f"analysis_{task_id}"
+
+
+def progress_event(
+    task_id: str,
+    current: int,
+    message: str | None,
+    event_type: str = "progress",
+    total: int = 100,
+    **extra: Any,
+) -> dict[str, Any]:
+    """Build a progress event in the format sent to WebSocket clients."""
+    event = {
+        "type": event_type,
+        "task_id": task_id,
+        "current": current,
+        "total": total,
+        "message": message or "",
+        "timestamp": datetime.utcnow().isoformat(),
+    }
+    event.update(extra)
+    return event
+
+
+class Subscription:
+    """A subscriber's view of one channel; iterate it to receive events."""
+
+    def __init__(self, bus: ProgressEventBus, channel: str, buffer: int) -> None:
+        self.bus = bus
+        self.channel = channel
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize=buffer)
+        self.dropped = 0
+
+    def _deliver(self, event: dict[str, Any]) -> None:
+        # Slow consumers only need the latest progress, so drop the oldest event
+        if self.queue.full():
+            try:
+                self.queue.get_nowait()
+                self.dropped += 1
+            except asyncio.QueueEmpty:
+                pass
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout: float | None = None) -> dict[str, Any] | None:
+        """Return the next event, or None if ``timeout`` elapses first."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def __aiter__(self) -> AsyncIterator[dict[str, Any]]:
+        """Yield events until a terminal event has been delivered."""
+        while True:
+            event = await self.queue.get()
+            yield event
+            if event.get("type") in TERMINAL_EVENT_TYPES:
+                return
+
+    def close(self) -> None:
+        self.bus.unsubscribe(self)
+
+    def __enter__(self) -> Subscription:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class ProgressEventBus:
+    """Per-channel fan-out with last-value replay."""
+
+    def __init__(
+        self,
+        subscriber_buffer: int = DEFAULT_SUBSCRIBER_BUFFER,
+        retained_channels: int = DEFAULT_RETAINED_CHANNELS,
+    ) -> None:
+        self.subscriber_buffer = subscriber_buffer
+        self.retained_channels = retained_channels
+        self._subscribers: dict[str, list[Subscription]] = {}
+        self._last: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.published = 0
+
+    def publish(self, channel: str, event: dict[str, Any]) -> int:
+        """Record ``event`` as the channel's latest value and fan it out.
+
+        Safe to call from synchronous code and from worker threads.
+
+        Returns:
+            The number of subscribers the event was delivered to.
+        """
+        with self._lock:
+            self._last[channel] = event
+            self._last.move_to_end(channel)
+            while len(self._last) > self.retained_channels:
+                self._last.popitem(last=False)
+            subscribers = list(self._subscribers.get(channel, ()))
+            self.published += 1
+
+        try:
+            current_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            current_loop = None
+        for subscription in subscribers:
+            if subscription.loop is current_loop:
+                subscription._deliver(event)
+            elif not subscription.loop.is_closed():
+                subscription.loop.call_soon_threadsafe(subscription._deliver, event)
+        return len(subscribers)
+
+    def subscribe(self, channel: str, replay: bool = True) -> Subscription:
+        """Subscribe to ``channel``; with ``replay`` the last event is queued first."""
+        subscription = Subscription(self, channel, self.subscriber_buffer)
+        with self._lock:
+            self._subscribers.setdefault(channel, []).append(subscription)
+            last = self._last.get(channel) if replay else None
+        if last is not None:
+            subscription._deliver(last)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.channel)
+            if not subscribers:
+                return
+            if subscription in subscribers:
+                subscribers.remove(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.channel]
+
+    def last_event(self, channel: str) -> dict[str, Any] | None:
+        with self._lock:
+            return self._last.get(channel)
+
+    def subscriber_count(self, channel: str | None = None) -> int:
+        with self._lock:
+            if channel is not None:
+                return len(self._subscribers.get(channel, ()))
+            return sum(len(subs) for subs in self._subscribers.values())
+
+
+progress_events = ProgressEventBus()
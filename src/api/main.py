@@ -69,24 +69,23 @@ from src.api.global_exception_handler import (
     global_exception_handler,
     http_exception_handler,
 )
-from src.api.middleware.csrf_protection import CSRFProtectionMiddleware
-from src.api.middleware.enhanced_rate_limiting import EnhancedRateLimitMiddleware
-from src.api.middleware.performance_monitoring import PerformanceMonitoringMiddleware
-from src.api.middleware.request_tracking import RequestIdMiddleware, get_request_tracker
-from src.api.middleware.security_middleware import SecurityMiddleware, AuthenticationMiddleware, DataProtectionMiddleware
+from src.api.middleware.request_pipeline import RequestPipelineMiddleware
+from src.api.middleware.request_tracking import get_request_tracker
 from src.config import get_settings
 from src.core.cleanup_services import start_cleanup_services, stop_cleanup_services
+from src.core.database_maintenance_service import DatabaseMaintenanceService
 from src.core.document_cleanup_service import start_cleanup_service as start_doc_cleanup
 from src.core.document_cleanup_service import stop_cleanup_service as stop_doc_cleanup
 from src.core.enhanced_logging import initialize_logging
 from src.core.enhanced_worker_manager import enhanced_worker_manager
 from src.core.file_cleanup_service import start_cleanup_service, stop_cleanup_service
+from src.core.hybrid_retriever import warm_retriever_models
 from src.core.persistent_task_registry import persistent_task_registry
 from src.core.service_manager import create_default_services, service_manager
 from src.core.vector_store import get_vector_store
 from src.database import crud, get_async_db, init_db, models
 from src.database.database import AsyncSessionLocal
-from src.logging_config import CorrelationIdMiddleware, configure_logging
+from src.logging_config import configure_logging
 
 settings = get_settings()
 
@@ -113,7 +112,6 @@ try:
         register_background_task,
     )
     from src.api.middleware.input_validation import InputValidationMiddleware
-    from src.api.middleware.request_logging import RequestLoggingMiddleware
     from src.core.performance_metrics_collector import (
         metrics_collector,
         update_system_metrics_task,
@@ -207,9 +205,9 @@ class InMemoryTaskPurgeService:
 # --- Maintenance Jobs --- #
 
 
-def run_maintenance_jobs():
-    """Instantiates and runs all scheduled maintenance services."""
-    # Placeholder for future maintenance tasks
+def run_maintenance_jobs(loop: asyncio.AbstractEventLoop):
+    """Instantiates and runs all scheduled maintenance services on ``loop``."""
+    DatabaseMaintenanceService().refresh_analytics_rollups(loop)
 
 
 scheduler = BackgroundScheduler(daemon=True)
@@ -273,20 +271,15 @@ async def auto_warm_ai_models():
 
     try:
         # Import AI services
+        from src.api.dependencies import app_state, get_retriever
         from src.core.analysis_service import AnalysisService
-        from src.core.hybrid_retriever import HybridRetriever
 
-        # Initialize retriever
-        retriever = HybridRetriever()
-        await retriever.initialize()
-
-        # Initialize analysis service
-        analysis_service = AnalysisService(retriever=retriever)
-
-        # Store in app state for dependency injection
-        from src.api.dependencies import app_state
-
-        app_state["analysis_service"] = analysis_service
+        # Reuse the services built at startup; models are shared through the
+        # model registry, so nothing is loaded twice
+        analysis_service = app_state.get("analysis_service")
+        if analysis_service is None:
+            analysis_service = AnalysisService(retriever=await get_retriever())
+            app_state["analysis_service"] = analysis_service
 
         # Skip auto-warming if using mocks
         if analysis_service.use_mocks:
@@ -339,6 +332,12 @@ async def lifespan(app: FastAPI):
         ws_handler.setFormatter(formatter)
         logging.getLogger().addHandler(ws_handler)
 
+    # Start loading the retriever's models through the model registry so they
+    # load while the database initializes; the startup retriever shares them
+    # and /health/models reports them as loading until they are ready
+    if not getattr(settings, "use_ai_mocks", False):
+        warm_retriever_models()
+
     # Initialize core services synchronously (MUST complete before server starts)
     # Database must be ready for all DB-dependent operations
     await init_db()
@@ -355,8 +354,14 @@ async def lifespan(app: FastAPI):
         metrics_task = asyncio.create_task(update_system_metrics_task())
         register_background_task(metrics_task)
 
-    run_maintenance_jobs()
-    scheduler.add_job(run_maintenance_jobs, "interval", days=1)
+    # Backfill the analytics rollups in the background; the scheduler thread
+    # refreshes recent days once a day by submitting the job to this loop
+    asyncio.create_task(
+        DatabaseMaintenanceService().refresh_analytics_rollups_async(full=True)
+    )
+    scheduler.add_job(
+        run_maintenance_jobs, "interval", days=1, args=[asyncio.get_running_loop()]
+    )
     scheduler.start()
     logger.info("Scheduler started for daily maintenance tasks.")
 
@@ -486,78 +491,17 @@ app.add_middleware(
     allow_headers=["Authorization", "Content-Type", "Accept", "X-Requested-With"],
 )
 
-# Add enhanced middleware stack (if available)
-if ENHANCED_FEATURES_AVAILABLE:
-    # Disabled: InputValidationMiddleware is too aggressive and rejects valid data
-    # app.add_middleware(InputValidationMiddleware)
-    app.add_middleware(RequestLoggingMiddleware)
-else:
-    logger.warning("Enhanced middleware not available, using basic setup")
-
-# Add comprehensive security middleware stack
-from src.api.middleware.security_middleware import setup_security_middleware
-setup_security_middleware(app)
-
 # Initialize enhanced logging
 initialize_logging()
 
-# Add performance monitoring middleware
-app.add_middleware(PerformanceMonitoringMiddleware)
-
-# Add enhanced rate limiting middleware
-app.add_middleware(EnhancedRateLimitMiddleware)
-
-# Add CSRF protection middleware (use correct add_middleware signature)
+# Request id, correlation id, CSRF, rate limiting, performance monitoring,
+# authentication, threat screening, request logging and security headers run as
+# stages of a single pure-ASGI middleware, outside CORS.
 app.add_middleware(
-    CSRFProtectionMiddleware,
+    RequestPipelineMiddleware,
     secret_key=settings.auth.secret_key.get_secret_value(),
 )
 
-app.add_middleware(CorrelationIdMiddleware)
-app.add_middleware(RequestIdMiddleware)
-
-
-# Security headers middleware
-@app.middleware("http")
-async def add_security_headers(request, call_next):
-    response = await call_next(request)
-
-    # Essential security headers
-    response.headers["X-Content-Type-Options"] = "nosniff"
-    response.headers["X-Frame-Options"] = "DENY"
-    response.headers["X-XSS-Protection"] = "1; mode=block"
-    response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-    response.headers["Permissions-Policy"] = (
-        "geolocation=(), microphone=(), camera=(), payment=(), usb=()"
-    )
-
-    # Content Security Policy
-    csp_policy = (
-        "default-src 'self'; "
-        "script-src 'self' 'unsafe-inline' 'unsafe-eval'; "  # Allow inline scripts for Electron
-        "style-src 'self' 'unsafe-inline'; "
-        "img-src 'self' data: blob:; "
-        "font-src 'self' data:; "
-        "connect-src 'self' ws: wss:; "
-        "frame-ancestors 'none'; "
-        "base-uri 'self'; "
-        "form-action 'self'"
-    )
-    response.headers["Content-Security-Policy"] = csp_policy
-
-    # Strict Transport Security (HTTPS only)
-    if request.url.scheme == "https":
-        response.headers["Strict-Transport-Security"] = (
-            "max-age=31536000; includeSubDomains; preload"
-        )
-
-    # Additional security headers
-    response.headers["Cross-Origin-Embedder-Policy"] = "require-corp"
-    response.headers["Cross-Origin-Opener-Policy"] = "same-origin"
-    response.headers["Cross-Origin-Resource-Policy"] = "same-origin"
-
-    return response
-
 
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)  # type: ignore[arg-type]
@@ -17,6 +17,181 @@ from starlette.middleware.base import BaseHTTPMiddleware
 logger = logging.getLogger(__name__)
 
 
+CSRF_COOKIE_NAME = "csrf_token"
+CSRF_HEADER_NAME = "X-CSRF-Token"
+CSRF_COOKIE_MAX_AGE = 3600  # 1 hour
+
+# Endpoints that don't need CSRF protection
+CSRF_SKIP_PATHS = [
+    "/health",
+    "/metrics",
+    "/docs",
+    "/openapi.json",
+    "/redoc",
+    "/auth/login",  # Login endpoint
+    "/auth/token",  # OAuth2 token endpoint
+    "/api/auth/token",  # OAuth2 token endpoint (with /api prefix)
+    "/auth/register",  # Registration endpoint
+    "/api/auth/register",  # Registration endpoint (with /api prefix)
+]
+
+
+def _key_bytes(secret_key) -> bytes:
+    return secret_key.encode() if isinstance(secret_key, str) else secret_key
+
+
+def should_skip_csrf(request: Request) -> bool:
+    """Determine if CSRF protection should be skipped for this request."""
+    # Skip for safe methods
+    if request.method in ["GET", "HEAD", "OPTIONS"]:
+        return True
+
+    # Skip CSRF when using Authorization Bearer token (stateless API auth)
+    # CSRF primarily protects cookie-based auth; Bearer tokens are not subject to CSRF
+    auth_header = request.headers.get("authorization") or request.headers.get("Authorization")
+    if auth_header and auth_header.lower().startswith("bearer "):
+        return True
+
+    # Skip during automated tests for all endpoints: httpx TestClient uses hosts
+    # like "test" / "testserver". We don't want CSRF to mask other validation errors in tests.
+    try:
+        host = (request.headers.get("host") or "").lower()
+        if host.startswith("test") or host.startswith("testserver"):
+            return True
+    except Exception:
+        # Be conservative if header access fails
+        pass
+
+    if any(request.url.path.startswith(path) for path in CSRF_SKIP_PATHS):
+        return True
+
+    # Skip for WebSocket connections
+    if request.url.path.startswith("/ws/"):
+        return True
+
+    return False
+
+
+def validate_csrf_token(
+    request: Request,
+    secret_key,
+    cookie_name: str = CSRF_COOKIE_NAME,
+    header_name: str = CSRF_HEADER_NAME,
+) -> bool:
+    """Validate CSRF token using double-submit cookie pattern."""
+    try:
+        # Get token from header
+        header_token = request.headers.get(header_name)
+        if not header_token:
+            logger.debug("No CSRF token in header")
+            return False
+
+        # Get token from cookie
+        cookie_token = request.cookies.get(cookie_name)
+        if not cookie_token:
+            logger.debug("No CSRF token in cookie")
+            return False
+
+        # Validate token format
+        if not _is_valid_token_format(header_token) or not _is_valid_token_format(
+            cookie_token
+        ):
+            logger.debug("Invalid CSRF token format")
+            return False
+
+        # Compare tokens (double-submit pattern)
+        if not hmac.compare_digest(header_token, cookie_token):
+            logger.debug("CSRF tokens don't match")
+            return False
+
+        # Verify token signature
+        if not _verify_token_signature(header_token, secret_key):
+            logger.debug("CSRF token signature invalid")
+            return False
+
+        return True
+
+    except Exception as e:
+        logger.error(f"CSRF validation error: {e}")
+        return False
+
+
+def _is_valid_token_format(token: str) -> bool:
+    """Check if token has valid format."""
+    if not token or len(token) != 64:  # 32 bytes = 64 hex chars
+        return False
+
+    try:
+        # Check if it's valid hex
+        bytes.fromhex(token)
+        return True
+    except ValueError:
+        return False
+
+
+def _verify_token_signature(token: str, secret_key) -> bool:
+    """Verify token signature."""
+    try:
+        # Extract signature and payload
+        if len(token) != 64:
+            return False
+
+        payload = token[:32]  # First 32 chars
+        signature = token[32:]  # Last 32 chars
+
+        # Verify signature
+        expected_signature = hmac.new(
+            _key_bytes(secret_key), payload.encode(), hashlib.sha256
+        ).hexdigest()[:32]
+
+        return hmac.compare_digest(signature, expected_signature)
+    except Exception:
+        return False
+
+
+def set_csrf_cookie(
+    response: Response,
+    secret_key,
+    cookie_name: str = CSRF_COOKIE_NAME,
+    max_age: int = CSRF_COOKIE_MAX_AGE,
+    secure: bool = True,  # HTTPS only
+    httponly: bool = False,  # Allow JavaScript access for double-submit
+    samesite: str = "strict",
+) -> None:
+    """Set a freshly generated CSRF token cookie on ``response``."""
+    try:
+        response.set_cookie(
+            key=cookie_name,
+            value=generate_csrf_token(secret_key),
+            max_age=max_age,
+            secure=secure,
+            httponly=httponly,
+            samesite=samesite,
+            path="/",
+        )
+    except Exception as e:
+        logger.error(f"Failed to set CSRF cookie: {e}")
+
+
+def generate_csrf_token(secret_key) -> str:
+    """Generate a new signed CSRF token."""
+    try:
+        # Generate random payload
+        payload = secrets.token_hex(16)  # 16 bytes = 32 hex chars
+
+        # Generate signature
+        signature = hmac.new(
+            _key_bytes(secret_key), payload.encode(), hashlib.sha256
+        ).hexdigest()[
+            :32
+        ]  # First 32 chars of signature
+
+        return payload + signature
+    except Exception as e:
+        logger.error(f"Failed to generate CSRF token: {e}")
+        return secrets.token_hex(32)  # Fallback to simple random token
+
+
 class CSRFProtectionMiddleware(BaseHTTPMiddleware):
     """CSRF protection middleware using double-submit cookie pattern."""
 
@@ -24,16 +199,14 @@ class CSRFProtectionMiddleware(BaseHTTPMiddleware):
         self,
         app,
         secret_key: str,
-        cookie_name: str = "csrf_token",
-        header_name: str = "X-CSRF-Token",
+        cookie_name: str = CSRF_COOKIE_NAME,
+        header_name: str = CSRF_HEADER_NAME,
     ):
         super().__init__(app)
-        self.secret_key = (
-            secret_key.encode() if isinstance(secret_key, str) else secret_key
-        )
+        self.secret_key = _key_bytes(secret_key)
         self.cookie_name = cookie_name
         self.header_name = header_name
-        self.cookie_max_age = 3600  # 1 hour
+        self.cookie_max_age = CSRF_COOKIE_MAX_AGE
         self.cookie_secure = True  # HTTPS only
         self.cookie_httponly = False  # Allow JavaScript access for double-submit
         self.cookie_samesite = "strict"
@@ -90,151 +263,29 @@ class CSRFProtectionMiddleware(BaseHTTPMiddleware):
 
     def _should_skip_csrf(self, request: Request) -> bool:
         """Determine if CSRF protection should be skipped for this request."""
-        # Skip for safe methods
-        if request.method in ["GET", "HEAD", "OPTIONS"]:
-            return True
-
-        # Skip CSRF when using Authorization Bearer token (stateless API auth)
-        # CSRF primarily protects cookie-based auth; Bearer tokens are not subject to CSRF
-        auth_header = request.headers.get("authorization") or request.headers.get("Authorization")
-        if auth_header and auth_header.lower().startswith("bearer "):
-            return True
-
-        # Skip during automated tests for all endpoints: httpx TestClient uses hosts
-        # like "test" / "testserver". We don't want CSRF to mask other validation errors in tests.
-        try:
-            host = (request.headers.get("host") or "").lower()
-            if host.startswith("test") or host.startswith("testserver"):
-                return True
-        except Exception:
-            # Be conservative if header access fails
-            pass
-
-        # Skip for certain API endpoints that don't need CSRF
-        skip_paths = [
-            "/health",
-            "/metrics",
-            "/docs",
-            "/openapi.json",
-            "/redoc",
-            "/auth/login",  # Login endpoint
-            "/auth/token",  # OAuth2 token endpoint
-            "/api/auth/token",  # OAuth2 token endpoint (with /api prefix)
-            "/auth/register",  # Registration endpoint
-            "/api/auth/register",  # Registration endpoint (with /api prefix)
-        ]
-
-        if any(request.url.path.startswith(path) for path in skip_paths):
-            return True
-
-        # Skip for WebSocket connections
-        if request.url.path.startswith("/ws/"):
-            return True
-
-        return False
+        return should_skip_csrf(request)
 
     def _validate_csrf_token(self, request: Request) -> bool:
         """Validate CSRF token using double-submit cookie pattern."""
-        try:
-            # Get token from header
-            header_token = request.headers.get(self.header_name)
-            if not header_token:
-                logger.debug("No CSRF token in header")
-                return False
-
-            # Get token from cookie
-            cookie_token = request.cookies.get(self.cookie_name)
-            if not cookie_token:
-                logger.debug("No CSRF token in cookie")
-                return False
-
-            # Validate token format
-            if not self._is_valid_token_format(
-                header_token
-            ) or not self._is_valid_token_format(cookie_token):
-                logger.debug("Invalid CSRF token format")
-                return False
-
-            # Compare tokens (double-submit pattern)
-            if not hmac.compare_digest(header_token, cookie_token):
-                logger.debug("CSRF tokens don't match")
-                return False
-
-            # Verify token signature
-            if not self._verify_token_signature(header_token):
-                logger.debug("CSRF token signature invalid")
-                return False
-
-            return True
-
-        except Exception as e:
-            logger.error(f"CSRF validation error: {e}")
-            return False
-
-    def _is_valid_token_format(self, token: str) -> bool:
-        """Check if token has valid format."""
-        if not token or len(token) != 64:  # 32 bytes = 64 hex chars
-            return False
-
-        try:
-            # Check if it's valid hex
-            bytes.fromhex(token)
-            return True
-        except ValueError:
-            return False
-
-    def _verify_token_signature(self, token: str) -> bool:
-        """Verify token signature."""
-        try:
-            # Extract signature and payload
-            if len(token) != 64:
-                return False
-
-            payload = token[:32]  # First 32 chars
-            signature = token[32:]  # Last 32 chars
-
-            # Verify signature
-            expected_signature = hmac.new(
-                self.secret_key, payload.encode(), hashlib.sha256
-            ).hexdigest()[:32]
-
-            return hmac.compare_digest(signature, expected_signature)
-        except Exception:
-            return False
+        return validate_csrf_token(
+            request, self.secret_key, self.cookie_name, self.header_name
+        )
 
     def _set_csrf_cookie(self, response: Response):
         """Set CSRF token cookie."""
-        try:
-            token = self._generate_csrf_token()
-            response.set_cookie(
-                key=self.cookie_name,
-                value=token,
-                max_age=self.cookie_max_age,
-                secure=self.cookie_secure,
-                httponly=self.cookie_httponly,
-                samesite=self.cookie_samesite,
-                path="/",
-            )
-        except Exception as e:
-            logger.error(f"Failed to set CSRF cookie: {e}")
+        set_csrf_cookie(
+            response,
+            self.secret_key,
+            cookie_name=self.cookie_name,
+            max_age=self.cookie_max_age,
+            secure=self.cookie_secure,
+            httponly=self.cookie_httponly,
+            samesite=self.cookie_samesite,
+        )
 
     def _generate_csrf_token(self) -> str:
         """Generate a new CSRF token."""
-        try:
-            # Generate random payload
-            payload = secrets.token_hex(16)  # 16 bytes = 32 hex chars
-
-            # Generate signature
-            signature = hmac.new(
-                self.secret_key, payload.encode(), hashlib.sha256
-            ).hexdigest()[
-                :32
-            ]  # First 32 chars of signature
-
-            return payload + signature
-        except Exception as e:
-            logger.error(f"Failed to generate CSRF token: {e}")
-            return secrets.token_hex(32)  # Fallback to simple random token
+        return generate_csrf_token(self.secret_key)
 
 
 def get_csrf_token_from_request(request: Request) -> Optional[str]:
@@ -6,13 +6,26 @@ This module provides comprehensive rate limiting including:
 - IP-based rate limiting
 - Burst protection
 - Rate limit headers
+
+Limits are enforced with sliding-window counters: each client keeps, per
+window, only the count of the current and previous fixed window, and the
+previous count is weighted by how much of it still overlaps the sliding
+window. Memory per client is constant regardless of request rate. Counters
+live in a ``RateLimitStore``; the in-memory store shards clients across
+independently locked maps and evicts clients whose windows have fully
+expired, while the SQLite store shares counters between uvicorn workers.
 """
 
+import asyncio
 import logging
+import sqlite3
+import threading
 import time
-from collections import defaultdict, deque
+import zlib
+from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Dict, Optional, Tuple
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from fastapi import HTTPException, Request, status
 from fastapi.responses import JSONResponse
@@ -20,6 +33,22 @@ from starlette.middleware.base import BaseHTTPMiddleware
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_SHARDS = 16
+DEFAULT_SWEEP_INTERVAL_SECONDS = 60.0
+DEFAULT_RATE_LIMIT_DB = Path("data") / "rate_limits.db"
+
+# (window_start, current_count, previous_count)
+WindowCounter = Tuple[float, int, int]
+
+
+def _performance_settings() -> dict[str, Any]:
+    try:
+        from src.config import get_settings
+
+        return dict(get_settings().performance or {})
+    except Exception:
+        return {}
+
 
 @dataclass
 class RateLimit:
@@ -30,11 +59,251 @@ class RateLimit:
     burst_limit: int = 10
     burst_window_seconds: int = 60
 
+    def windows(self) -> List[Tuple[int, int]]:
+        """(window_seconds, limit) pairs checked in order: burst, minute, hour."""
+        return [
+            (self.burst_window_seconds, self.burst_limit),
+            (60, self.requests_per_minute),
+            (3600, self.requests_per_hour),
+        ]
+
+
+def slide_window(
+    counter: Optional[WindowCounter], window: int, now: float
+) -> Tuple[WindowCounter, float]:
+    """Advance a counter to the fixed window containing ``now``.
+
+    Returns:
+        The advanced counter and the estimated number of requests in the
+        sliding window ending at ``now``.
+    """
+    current_start = now - (now % window)
+    start, current, previous = counter or (current_start, 0, 0)
+    if start != current_start:
+        previous = current if start == current_start - window else 0
+        current = 0
+        start = current_start
+    overlap = 1.0 - (now - start) / window
+    return (start, current, previous), previous * overlap + current
+
+
+def apply_hit(
+    counters: Sequence[Optional[WindowCounter]],
+    windows: Sequence[Tuple[int, int]],
+    now: float,
+) -> Tuple[Optional[int], List[WindowCounter], List[float]]:
+    """Count one request against every window unless any of them is full.
+
+    Args:
+        counters: Stored counter per window (None when never seen).
+        windows: (window_seconds, limit) pairs, in the same order.
+        now: Current time.
+
+    Returns:
+        Tuple of (index of the first exceeded window or None, counters to
+        store, estimated request counts including this request if admitted).
+    """
+    advanced: List[WindowCounter] = []
+    estimates: List[float] = []
+    exceeded: Optional[int] = None
+    for index, ((window, limit), counter) in enumerate(zip(windows, counters)):
+        counter, estimate = slide_window(counter, window, now)
+        if exceeded is None and estimate >= limit:
+            exceeded = index
+        advanced.append(counter)
+        estimates.append(estimate)
+
+    if exceeded is None:
+        advanced = [(start, current + 1, previous) for start, current, previous in advanced]
+        estimates = [estimate + 1 for estimate in estimates]
+    return exceeded, advanced, estimates
+
+
+class RateLimitStore(ABC):
+    """Storage for per-client sliding-window counters."""
+
+    @abstractmethod
+    def hit(
+        self, key: str, windows: Sequence[Tuple[int, int]], now: float
+    ) -> Tuple[Optional[int], List[float]]:
+        """Atomically check and count a request; see ``apply_hit``."""
+
+    async def hit_async(
+        self, key: str, windows: Sequence[Tuple[int, int]], now: float
+    ) -> Tuple[Optional[int], List[float]]:
+        """``hit`` for the event loop; stores that block override this."""
+        return self.hit(key, windows, now)
+
+
+class _Shard:
+    __slots__ = ("lock", "clients", "last_sweep")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        # key -> [expires_at, counter per window]
+        self.clients: Dict[str, list] = {}
+        self.last_sweep = 0.0
+
+
+class MemoryRateLimitStore(RateLimitStore):
+    """Process-local counters in independently locked shards.
+
+    A client's counters are all zero two windows after its last request, so
+    such clients are evicted without changing any limit decision. Each shard
+    sweeps itself at most every ``sweep_interval`` seconds.
+    """
+
+    def __init__(
+        self,
+        shards: int = DEFAULT_SHARDS,
+        sweep_interval: float = DEFAULT_SWEEP_INTERVAL_SECONDS,
+    ) -> None:
+        self._shards = [_Shard() for _ in range(max(1, shards))]
+        self.sweep_interval = sweep_interval
+
+    def _shard(self, key: str) -> _Shard:
+        return self._shards[zlib.crc32(key.encode()) % len(self._shards)]
+
+    def hit(
+        self, key: str, windows: Sequence[Tuple[int, int]], now: float
+    ) -> Tuple[Optional[int], List[float]]:
+        shard = self._shard(key)
+        with shard.lock:
+            if now - shard.last_sweep >= self.sweep_interval:
+                self._sweep(shard, now)
+            entry = shard.clients.get(key)
+            counters = entry[1] if entry is not None else [None] * len(windows)
+            if len(counters) != len(windows):
+                counters = [None] * len(windows)
+            exceeded, counters, estimates = apply_hit(counters, windows, now)
+            if exceeded is None or entry is not None:
+                expires_at = now + 2 * max(window for window, _ in windows)
+                shard.clients[key] = [expires_at, counters]
+        return exceeded, estimates
+
+    def _sweep(self, shard: _Shard, now: float) -> None:
+        expired = [key for key, (expires_at, _) in shard.clients.items() if expires_at <= now]
+        for key in expired:
+            del shard.clients[key]
+        shard.last_sweep = now
+
+    def evict_idle(self, now: Optional[float] = None) -> None:
+        """Sweep every shard immediately."""
+        now = time.time() if now is None else now
+        for shard in self._shards:
+            with shard.lock:
+                self._sweep(shard, now)
+
+    def __len__(self) -> int:
+        return sum(len(shard.clients) for shard in self._shards)
+
+
+class SQLiteRateLimitStore(RateLimitStore):
+    """Counters in a WAL-mode SQLite file shared by every worker process.
+
+    Each check runs in a ``BEGIN IMMEDIATE`` transaction, so concurrent
+    workers serialize on the database lock instead of double-counting.
+    """
+
+    def __init__(
+        self,
+        db_path: str | Path = DEFAULT_RATE_LIMIT_DB,
+        sweep_interval: float = DEFAULT_SWEEP_INTERVAL_SECONDS,
+    ) -> None:
+        self.db_path = str(db_path)
+        self.sweep_interval = sweep_interval
+        self._local = threading.local()
+        self._last_sweep = 0.0
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connection()
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS rate_limit_counters (
+                client_key TEXT NOT NULL,
+                slot INTEGER NOT NULL,
+                window_start REAL NOT NULL,
+                current_count INTEGER NOT NULL,
+                previous_count INTEGER NOT NULL,
+                expires_at REAL NOT NULL,
+                PRIMARY KEY (client_key, slot)
+            ) WITHOUT ROWID
+        """
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_rate_limit_expires ON rate_limit_counters (expires_at)"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def hit(
+        self, key: str, windows: Sequence[Tuple[int, int]], now: float
+    ) -> Tuple[Optional[int], List[float]]:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if now - self._last_sweep >= self.sweep_interval:
+                conn.execute("DELETE FROM rate_limit_counters WHERE expires_at <= ?", (now,))
+                self._last_sweep = now
+            rows = conn.execute(
+                """
+                SELECT slot, window_start, current_count, previous_count
+                FROM rate_limit_counters WHERE client_key = ?
+            """,
+                (key,),
+            ).fetchall()
+            counters: List[Optional[WindowCounter]] = [None] * len(windows)
+            for slot, start, current, previous in rows:
+                if slot < len(counters):
+                    counters[slot] = (start, current, previous)
+            exceeded, counters, estimates = apply_hit(counters, windows, now)
+            if exceeded is None:
+                expires_at = now + 2 * max(window for window, _ in windows)
+                conn.executemany(
+                    """
+                    INSERT OR REPLACE INTO rate_limit_counters
+                    (client_key, slot, window_start, current_count, previous_count, expires_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                    [
+                        (key, slot, start, current, previous, expires_at)
+                        for slot, (start, current, previous) in enumerate(counters)
+                    ],
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return exceeded, estimates
+
+    async def hit_async(
+        self, key: str, windows: Sequence[Tuple[int, int]], now: float
+    ) -> Tuple[Optional[int], List[float]]:
+        # BEGIN IMMEDIATE may wait up to the busy timeout; keep it off the loop
+        return await asyncio.to_thread(self.hit, key, windows, now)
+
+
+def create_rate_limit_store() -> RateLimitStore:
+    """Build the store selected by ``performance.rate_limit_backend``."""
+    perf = _performance_settings()
+    backend = str(perf.get("rate_limit_backend", "memory")).lower()
+    if backend == "sqlite":
+        return SQLiteRateLimitStore(perf.get("rate_limit_db_path", DEFAULT_RATE_LIMIT_DB))
+    if backend != "memory":
+        logger.warning("Unknown rate_limit_backend %r, using in-memory counters", backend)
+    return MemoryRateLimitStore(shards=int(perf.get("rate_limit_shards", DEFAULT_SHARDS)))
+
 
 class EnhancedRateLimiter:
     """Enhanced rate limiter with per-endpoint configuration."""
 
-    def __init__(self):
+    def __init__(self, store: Optional[RateLimitStore] = None):
         # Default rate limits
         self.default_limits = RateLimit(
             requests_per_minute=60,
@@ -82,11 +351,8 @@ class EnhancedRateLimiter:
             ),
         }
 
-        # Request tracking: identifier -> deque of timestamps
-        self._request_history: Dict[str, deque] = defaultdict(lambda: deque())
-
-        # Burst tracking: identifier -> deque of timestamps
-        self._burst_history: Dict[str, deque] = defaultdict(lambda: deque())
+        # Sliding-window counters: one O(1) record per client
+        self.store = store if store is not None else create_rate_limit_store()
 
     def is_rate_limited(
         self, request: Request
@@ -94,71 +360,59 @@ class EnhancedRateLimiter:
         """
         Check if request should be rate limited.
 
+        Blocks on the store; middleware uses ``is_rate_limited_async``.
+
         Returns:
             Tuple of (is_limited, reason, headers_dict)
         """
         try:
-            # Get client identifier (IP + User ID if authenticated)
-            client_id = self._get_client_identifier(request)
-
-            # Get endpoint path
-            endpoint_path = self._get_endpoint_path(request)
-
-            # Get rate limit configuration
-            rate_limit = self.endpoint_limits.get(endpoint_path, self.default_limits)
-
-            now = time.time()
-
-            # Check burst limit
-            burst_limited, burst_reason = self._check_burst_limit(
-                client_id, rate_limit, now
-            )
-            if burst_limited:
-                return (
-                    True,
-                    burst_reason,
-                    self._get_rate_limit_headers(rate_limit, 0, 0),
-                )
-
-            # Check minute limit
-            minute_limited, minute_reason = self._check_minute_limit(
-                client_id, rate_limit, now
-            )
-            if minute_limited:
-                return (
-                    True,
-                    minute_reason,
-                    self._get_rate_limit_headers(rate_limit, 0, 0),
-                )
+            client_id, rate_limit = self._client_limit(request)
+            exceeded, estimates = self.store.hit(client_id, rate_limit.windows(), time.time())
+            return self._decision(rate_limit, exceeded, estimates)
+        except Exception as e:
+            logger.error(f"Rate limiting error: {e}")
+            # Fail open - don't block requests due to rate limiter errors
+            return False, None, {}
 
-            # Check hour limit
-            hour_limited, hour_reason = self._check_hour_limit(
-                client_id, rate_limit, now
+    async def is_rate_limited_async(
+        self, request: Request
+    ) -> Tuple[bool, Optional[str], Dict[str, int]]:
+        """``is_rate_limited`` without blocking the event loop on the store."""
+        try:
+            client_id, rate_limit = self._client_limit(request)
+            exceeded, estimates = await self.store.hit_async(
+                client_id, rate_limit.windows(), time.time()
             )
-            if hour_limited:
-                return True, hour_reason, self._get_rate_limit_headers(rate_limit, 0, 0)
-
-            # Record request
-            self._record_request(client_id, now)
+            return self._decision(rate_limit, exceeded, estimates)
+        except Exception as e:
+            logger.error(f"Rate limiting error: {e}")
+            return False, None, {}
 
-            # Calculate remaining requests
-            remaining_minute = self._calculate_remaining_minute(
-                client_id, rate_limit, now
-            )
-            remaining_hour = self._calculate_remaining_hour(client_id, rate_limit, now)
+    def _client_limit(self, request: Request) -> Tuple[str, RateLimit]:
+        """Client identifier (IP + User ID if authenticated) and its endpoint limit."""
+        client_id = self._get_client_identifier(request)
+        endpoint_path = self._get_endpoint_path(request)
+        return client_id, self.endpoint_limits.get(endpoint_path, self.default_limits)
 
+    def _decision(
+        self, rate_limit: RateLimit, exceeded: Optional[int], estimates: List[float]
+    ) -> Tuple[bool, Optional[str], Dict[str, int]]:
+        if exceeded is not None:
             return (
-                False,
-                None,
-                self._get_rate_limit_headers(
-                    rate_limit, remaining_minute, remaining_hour
-                ),
+                True,
+                self._limit_reason(rate_limit, exceeded),
+                self._get_rate_limit_headers(rate_limit, 0, 0),
             )
 
-        except Exception as e:
-            logger.error(f"Rate limiting error: {e}")
-            # Fail open - don't block requests due to rate limiter errors
-            return False, None, {}
+        # Calculate remaining requests
+        remaining_minute = max(0, int(rate_limit.requests_per_minute - estimates[1]))
+        remaining_hour = max(0, int(rate_limit.requests_per_hour - estimates[2]))
+
+        return (
+            False,
+            None,
+            self._get_rate_limit_headers(rate_limit, remaining_minute, remaining_hour),
+        )
 
     def _get_client_identifier(self, request: Request) -> str:
         """Get unique client identifier."""
@@ -182,94 +436,13 @@ class EnhancedRateLimiter:
         # Fallback to URL path
         return request.url.path
 
-    def _check_burst_limit(
-        self, client_id: str, rate_limit: RateLimit, now: float
-    ) -> Tuple[bool, Optional[str]]:
-        """Check burst rate limit."""
-        burst_window_start = now - rate_limit.burst_window_seconds
-
-        # Clean old burst history
-        burst_history = self._burst_history[client_id]
-        while burst_history and burst_history[0] < burst_window_start:
-            burst_history.popleft()
-
-        # Check if burst limit exceeded
-        if len(burst_history) >= rate_limit.burst_limit:
-            return (
-                True,
-                f"Burst limit exceeded: {rate_limit.burst_limit} requests per {rate_limit.burst_window_seconds} seconds",
-            )
-
-        # Record burst request
-        burst_history.append(now)
-        return False, None
-
-    def _check_minute_limit(
-        self, client_id: str, rate_limit: RateLimit, now: float
-    ) -> Tuple[bool, Optional[str]]:
-        """Check requests per minute limit."""
-        minute_start = now - 60
-
-        # Clean old history
-        request_history = self._request_history[client_id]
-        while request_history and request_history[0] < minute_start:
-            request_history.popleft()
-
-        # Check if limit exceeded
-        if len(request_history) >= rate_limit.requests_per_minute:
-            return (
-                True,
-                f"Rate limit exceeded: {rate_limit.requests_per_minute} requests per minute",
-            )
-
-        return False, None
-
-    def _check_hour_limit(
-        self, client_id: str, rate_limit: RateLimit, now: float
-    ) -> Tuple[bool, Optional[str]]:
-        """Check requests per hour limit."""
-        hour_start = now - 3600
-
-        # Count requests in the last hour
-        request_history = self._request_history[client_id]
-        hour_requests = sum(
-            1 for timestamp in request_history if timestamp >= hour_start
-        )
-
-        # Check if limit exceeded
-        if hour_requests >= rate_limit.requests_per_hour:
-            return (
-                True,
-                f"Rate limit exceeded: {rate_limit.requests_per_hour} requests per hour",
-            )
-
-        return False, None
-
-    def _record_request(self, client_id: str, now: float):
-        """Record a request."""
-        self._request_history[client_id].append(now)
-
-    def _calculate_remaining_minute(
-        self, client_id: str, rate_limit: RateLimit, now: float
-    ) -> int:
-        """Calculate remaining requests in current minute."""
-        minute_start = now - 60
-        request_history = self._request_history[client_id]
-        minute_requests = sum(
-            1 for timestamp in request_history if timestamp >= minute_start
-        )
-        return max(0, rate_limit.requests_per_minute - minute_requests)
-
-    def _calculate_remaining_hour(
-        self, client_id: str, rate_limit: RateLimit, now: float
-    ) -> int:
-        """Calculate remaining requests in current hour."""
-        hour_start = now - 3600
-        request_history = self._request_history[client_id]
-        hour_requests = sum(
-            1 for timestamp in request_history if timestamp >= hour_start
-        )
-        return max(0, rate_limit.requests_per_hour - hour_requests)
+    def _limit_reason(self, rate_limit: RateLimit, exceeded: int) -> str:
+        """Describe which window rejected the request."""
+        if exceeded == 0:
+            return f"Burst limit exceeded: {rate_limit.burst_limit} requests per {rate_limit.burst_window_seconds} seconds"
+        if exceeded == 1:
+            return f"Rate limit exceeded: {rate_limit.requests_per_minute} requests per minute"
+        return f"Rate limit exceeded: {rate_limit.requests_per_hour} requests per hour"
 
     def _get_rate_limit_headers(
         self, rate_limit: RateLimit, remaining_minute: int, remaining_hour: int
@@ -300,7 +473,7 @@ class EnhancedRateLimitMiddleware(BaseHTTPMiddleware):
                 return await call_next(request)
 
             # Check rate limit
-            is_limited, reason, headers = self.rate_limiter.is_rate_limited(request)
+            is_limited, reason, headers = await self.rate_limiter.is_rate_limited_async(request)
 
             if is_limited:
                 # Use structured logging via the 'extra' parameter instead of unsupported kwargs
@@ -312,20 +485,7 @@ class EnhancedRateLimitMiddleware(BaseHTTPMiddleware):
                     },
                 )
 
-                response = JSONResponse(
-                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                    content={
-                        "error": "RATE_LIMIT_EXCEEDED",
-                        "message": reason,
-                        "retry_after": 60,  # Retry after 60 seconds
-                    },
-                )
-
-                # Add rate limit headers
-                for key, value in headers.items():
-                    response.headers[key] = str(value)
-
-                return response
+                return rate_limit_response(reason, headers)
 
             # Process request
             response = await call_next(request)
@@ -343,36 +503,59 @@ class EnhancedRateLimitMiddleware(BaseHTTPMiddleware):
 
     def _should_skip_rate_limit(self, request: Request) -> bool:
         """Determine if rate limiting should be skipped."""
-        # DEVELOPMENT MODE: Skip all rate limiting
-        # This allows the frontend to make unlimited requests without hitting rate limits
-        import os
-        if os.getenv('DISABLE_RATE_LIMITING', 'true').lower() == 'true':
-            return True
-        
-        # Skip for OPTIONS requests (CORS preflight)
-        if request.method == "OPTIONS":
-            return True
-
-        # Normalize path (handle trailing slashes)
-        path = request.url.path.rstrip("/")
-
-        # Skip for health and metrics endpoints (including trailing slash variants)
-        if path in ["", "/health", "/metrics"]:
-            return True
-        
-        # Skip auth endpoints during development to allow login
-        if path in ["/auth/login", "/auth/token", "/auth/register"]:
+        return should_skip_rate_limit(request)
+
+
+def rate_limit_response(reason: str, headers: Dict[str, Any]) -> JSONResponse:
+    """Build the 429 response returned to rate-limited clients."""
+    response = JSONResponse(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        content={
+            "error": "RATE_LIMIT_EXCEEDED",
+            "message": reason,
+            "retry_after": 60,  # Retry after 60 seconds
+        },
+    )
+
+    # Add rate limit headers
+    for key, value in headers.items():
+        response.headers[key] = str(value)
+
+    return response
+
+
+def should_skip_rate_limit(request: Request) -> bool:
+    """Determine if rate limiting should be skipped."""
+    # DEVELOPMENT MODE: Skip all rate limiting
+    # This allows the frontend to make unlimited requests without hitting rate limits
+    import os
+    if os.getenv('DISABLE_RATE_LIMITING', 'true').lower() == 'true':
+        return True
+    
+    # Skip for OPTIONS requests (CORS preflight)
+    if request.method == "OPTIONS":
+        return True
+
+    # Normalize path (handle trailing slashes)
+    path = request.url.path.rstrip("/")
+
+    # Skip for health and metrics endpoints (including trailing slash variants)
+    if path in ["", "/health", "/metrics"]:
+        return True
+    
+    # Skip auth endpoints during development to allow login
+    if path in ["/auth/login", "/auth/token", "/auth/register"]:
+        return True
+
+    # Skip rate limiting when running tests (httpx TestClient host) to avoid 429s masking other assertions
+    try:
+        host = (request.headers.get("host") or "").lower()
+        if host.startswith("test") or host.startswith("testserver"):
             return True
+    except Exception:
+        pass
 
-        # Skip rate limiting when running tests (httpx TestClient host) to avoid 429s masking other assertions
-        try:
-            host = (request.headers.get("host") or "").lower()
-            if host.startswith("test") or host.startswith("testserver"):
-                return True
-        except Exception:
-            pass
-
-        return False
+    return False
 
 
 # Global rate limiter instance
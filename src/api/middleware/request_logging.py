@@ -11,13 +11,108 @@ Provides comprehensive logging of API requests and responses including:
 import json
 import logging
 import time
-from typing import Any, Dict
+from typing import Any, Dict, Mapping
 
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 
 logger = logging.getLogger(__name__)
 
+SENSITIVE_HEADERS = frozenset({
+    "authorization",
+    "cookie",
+    "x-api-key",
+    "x-auth-token",
+})
+
+
+def sanitize_headers(headers: Mapping[str, str]) -> Dict[str, str]:
+    """Remove sensitive information from headers."""
+    sanitized = {}
+    for key, value in headers.items():
+        if key.lower() in SENSITIVE_HEADERS:
+            sanitized[key] = "***REDACTED***"
+        else:
+            sanitized[key] = value
+    return sanitized
+
+
+def log_request_started(request: Request, request_id: str) -> None:
+    """Log incoming request details."""
+    # Sanitize headers
+    headers = sanitize_headers(request.headers)
+
+    # Get client IP
+    client_ip = request.client.host if request.client else "unknown"
+
+    # Log basic request info
+    logger.info(
+        f"Request started | "
+        f"id={request_id} | "
+        f"method={request.method} | "
+        f"url={request.url.path} | "
+        f"client_ip={client_ip} | "
+        f"user_agent={headers.get('user-agent', 'unknown')[:100]}"
+    )
+
+
+def log_response(
+    request: Request,
+    status_code: int,
+    headers: Mapping[str, str],
+    process_time: float,
+    request_id: str,
+) -> None:
+    """Log response details.
+
+    Args:
+        request: The request being answered.
+        status_code: Response status code.
+        headers: Response headers; only ``content-length`` is read.
+        process_time: Seconds spent handling the request.
+        request_id: Request id used to correlate log lines.
+    """
+    # Determine log level based on status code
+    if status_code >= 500:
+        log_level = "error"
+    elif status_code >= 400:
+        log_level = "warning"
+    else:
+        log_level = "info"
+
+    # Get response size
+    response_size = headers.get("content-length", "unknown")
+
+    # Log response details
+    getattr(logger, log_level)(
+        f"Request completed | "
+        f"id={request_id} | "
+        f"method={request.method} | "
+        f"url={request.url.path} | "
+        f"status={status_code} | "
+        f"time={process_time:.3f}s | "
+        f"size={response_size}"
+    )
+
+    # Log slow requests
+    if process_time > 5.0:  # Requests taking more than 5 seconds
+        logger.warning(
+            f"Slow request detected | "
+            f"id={request_id} | "
+            f"url={request.url.path} | "
+            f"time={process_time:.3f}s"
+        )
+
+    # Log error responses with more detail
+    if status_code >= 400:
+        logger.error(
+            f"Error response | "
+            f"id={request_id} | "
+            f"status={status_code} | "
+            f"url={request.url.path} | "
+            f"query={str(request.query_params)}"
+        )
+
 
 class RequestLoggingMiddleware(BaseHTTPMiddleware):
     """Comprehensive request/response logging middleware."""
@@ -26,12 +121,6 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
         super().__init__(app)
         self.log_body = log_body
         self.max_body_size = max_body_size
-        self.sensitive_headers = {
-            "authorization",
-            "cookie",
-            "x-api-key",
-            "x-auth-token",
-        }
 
     async def dispatch(self, request: Request, call_next):
         """Log request and response details."""
@@ -48,27 +137,13 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
         process_time = time.time() - start_time
 
         # Log response details
-        await self._log_response(request, response, process_time, request_id)
+        self._log_response(request, response, process_time, request_id)
 
         return response
 
     async def _log_request(self, request: Request, request_id: str):
         """Log incoming request details."""
-        # Sanitize headers
-        headers = self._sanitize_headers(dict(request.headers))
-
-        # Get client IP
-        client_ip = request.client.host if request.client else "unknown"
-
-        # Log basic request info
-        logger.info(
-            f"Request started | "
-            f"id={request_id} | "
-            f"method={request.method} | "
-            f"url={request.url.path} | "
-            f"client_ip={client_ip} | "
-            f"user_agent={headers.get('user-agent', 'unknown')[:100]}"
-        )
+        log_request_started(request, request_id)
 
         # Log request body if enabled and not too large
         if self.log_body and request.method in ["POST", "PUT", "PATCH"]:
@@ -89,57 +164,14 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
                     f"Could not read request body | id={request_id} | error={e}"
                 )
 
-    async def _log_response(
+    def _log_response(
         self, request: Request, response: Response, process_time: float, request_id: str
     ):
         """Log response details."""
-        # Determine log level based on status code
-        if response.status_code >= 500:
-            log_level = "error"
-        elif response.status_code >= 400:
-            log_level = "warning"
-        else:
-            log_level = "info"
-
-        # Get response size
-        response_size = response.headers.get("content-length", "unknown")
-
-        # Log response details
-        getattr(logger, log_level)(
-            f"Request completed | "
-            f"id={request_id} | "
-            f"method={request.method} | "
-            f"url={request.url.path} | "
-            f"status={response.status_code} | "
-            f"time={process_time:.3f}s | "
-            f"size={response_size}"
+        log_response(
+            request, response.status_code, response.headers, process_time, request_id
         )
 
-        # Log slow requests
-        if process_time > 5.0:  # Requests taking more than 5 seconds
-            logger.warning(
-                f"Slow request detected | "
-                f"id={request_id} | "
-                f"url={request.url.path} | "
-                f"time={process_time:.3f}s"
-            )
-
-        # Log error responses with more detail
-        if response.status_code >= 400:
-            logger.error(
-                f"Error response | "
-                f"id={request_id} | "
-                f"status={response.status_code} | "
-                f"url={request.url.path} | "
-                f"query={str(request.query_params)}"
-            )
-
     def _sanitize_headers(self, headers: Dict[str, str]) -> Dict[str, str]:
         """Remove sensitive information from headers."""
-        sanitized = {}
-        for key, value in headers.items():
-            if key.lower() in self.sensitive_headers:
-                sanitized[key] = "***REDACTED***"
-            else:
-                sanitized[key] = value
-        return sanitized
+        return sanitize_headers(headers)
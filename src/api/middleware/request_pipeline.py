@@ -0,0 +1,505 @@
+"""Single pure-ASGI middleware pipeline for HTTP requests.
+
+The API used to stack eight ``BaseHTTPMiddleware`` layers (request id,
+correlation id, CSRF, rate limiting, performance monitoring, data protection,
+authentication, threat screening, request logging) plus an
+``@app.middleware("http")`` security-header hook. Each layer spawned its own
+task and re-wrapped the response for every request. ``RequestPipelineMiddleware``
+runs the same behaviours as stages of one ASGI callable:
+
+* ``on_request`` runs outer-to-inner before the endpoint and may short-circuit
+  with a response (rate limit, CSRF, authentication, threat screening).
+* ``on_response`` runs inner-to-outer on the ``http.response.start`` message and
+  edits the headers in place, so the body is streamed through untouched.
+* ``on_error`` runs inner-to-outer when the endpoint raises before responding;
+  the first stage returning a response handles the error.
+
+Stage order matches the order of the old middleware stack.
+"""
+
+import logging
+import os
+import random
+import time
+import uuid
+from typing import Any, Optional, Sequence
+
+import psutil
+import structlog
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ...core.advanced_security_system import SecurityLevel, security_system
+from ...core.enhanced_logging import get_performance_logger, get_request_logger
+from ...core.performance_metrics_collector import metrics_collector
+from .csrf_protection import set_csrf_cookie, should_skip_csrf, validate_csrf_token
+from .enhanced_rate_limiting import get_rate_limiter, rate_limit_response, should_skip_rate_limit
+from .request_logging import log_request_started, log_response
+from .security_middleware import (
+    authenticate_request,
+    get_client_ip,
+    is_security_exempt,
+    requires_auth,
+    screen_request,
+)
+
+logger = logging.getLogger(__name__)
+
+SLOW_REQUEST_MS = 1000.0
+
+CONTENT_SECURITY_POLICY = (
+    "default-src 'self'; "
+    "script-src 'self' 'unsafe-inline' 'unsafe-eval'; "  # Allow inline scripts for Electron
+    "style-src 'self' 'unsafe-inline'; "
+    "img-src 'self' data: blob:; "
+    "font-src 'self' data:; "
+    "connect-src 'self' ws: wss:; "
+    "frame-ancestors 'none'; "
+    "base-uri 'self'; "
+    "form-action 'self'"
+)
+
+SECURITY_HEADERS = {
+    "X-Content-Type-Options": "nosniff",
+    "X-Frame-Options": "DENY",
+    "X-XSS-Protection": "1; mode=block",
+    "Referrer-Policy": "strict-origin-when-cross-origin",
+    "Permissions-Policy": "geolocation=(), microphone=(), camera=(), payment=(), usb=()",
+    "Content-Security-Policy": CONTENT_SECURITY_POLICY,
+    "Cross-Origin-Embedder-Policy": "require-corp",
+    "Cross-Origin-Opener-Policy": "same-origin",
+    "Cross-Origin-Resource-Policy": "same-origin",
+}
+
+
+def _performance_settings() -> dict[str, Any]:
+    try:
+        from src.config import get_settings
+
+        return dict(get_settings().performance or {})
+    except Exception:
+        return {}
+
+
+class PipelineContext:
+    """Per-request state shared by the pipeline stages."""
+
+    def __init__(self, scope: Scope, receive: Receive) -> None:
+        self.request = Request(scope, receive)
+        self.started = time.perf_counter()
+        self.correlation_id = str(uuid.uuid4())
+        self.status_code = 500
+        self.values: dict[str, Any] = {}
+
+    @property
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+
+class PipelineStage:
+    """One behaviour of the request pipeline; every hook is optional."""
+
+    async def on_request(self, ctx: PipelineContext) -> Optional[Response]:
+        return None
+
+    def on_response(self, ctx: PipelineContext, headers: MutableHeaders) -> None:
+        return None
+
+    def on_error(self, ctx: PipelineContext, exc: Exception) -> Optional[Response]:
+        return None
+
+
+class SecurityHeadersStage(PipelineStage):
+    """Adds the browser security headers to every response."""
+
+    def on_response(self, ctx: PipelineContext, headers: MutableHeaders) -> None:
+        for name, value in SECURITY_HEADERS.items():
+            headers[name] = value
+        if ctx.request.url.scheme == "https":
+            headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains; preload"
+        else:
+            headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
+
+
+class RequestIdStage(PipelineStage):
+    """Assigns ``request.state.request_id`` and echoes it in a response header."""
+
+    def __init__(self, header_name: str = "X-Request-ID") -> None:
+        self.header_name = header_name
+
+    async def on_request(self, ctx: PipelineContext) -> Optional[Response]:
+        request = ctx.request
+        request_id = request.headers.get(self.header_name) or str(uuid.uuid4())
+        request.state.request_id = request_id
+        logger.info(
+            f"Request started: {request.method} {request.url.path}",
+            extra={
+                "request_id": request_id,
+                "method": request.method,
+                "path": request.url.path,
+                "client_ip": request.client.host if request.client else None,
+                "user_agent": request.headers.get("user-agent"),
+            },
+        )
+        return None
+
+    def on_response(self, ctx: PipelineContext, headers: MutableHeaders) -> None:
+        request = ctx.request
+        headers[self.header_name] = request.state.request_id
+        logger.info(
+            f"Request completed: {request.method} {request.url.path} - {ctx.status_code}",
+            extra={
+                "request_id": request.state.request_id,
+                "method": request.method,
+                "path": request.url.path,
+                "status_code": ctx.status_code,
+            },
+        )
+
+    def on_error(self, ctx: PipelineContext, exc: Exception) -> Optional[Response]:
+        request = ctx.request
+        logger.error(
+            f"Request failed: {request.method} {request.url.path} - {exc}",
+            extra={
+                "request_id": request.state.request_id,
+                "method": request.method,
+                "path": request.url.path,
+                "error": str(exc),
+            },
+            exc_info=True,
+        )
+        return None
+
+
+class CorrelationIdStage(PipelineStage):
+    """Echoes the correlation id bound to structlog for this request."""
+
+    def on_response(self, ctx: PipelineContext, headers: MutableHeaders) -> None:
+        headers.append("X-Correlation-ID", ctx.correlation_id)
+
+
+class CSRFStage(PipelineStage):
+    """Double-submit cookie CSRF protection (see ``CSRFProtectionMiddleware``)."""
+
+    def __init__(self, secret_key: str) -> None:
+        self.secret_key = secret_key
+
+    async def on_request(self, ctx: PipelineContext) -> Optional[Response]:
+        request = ctx.request
+        try:
+            # DEVELOPMENT MODE: CSRF protection is disabled unless DISABLE_CSRF=false
+            if os.getenv("DISABLE_CSRF", "true").lower() == "true":
+                return None
+            if should_skip_csrf(request):
+                return None
+            if request.method in ["POST", "PUT", "DELETE", "PATCH"] and not validate_csrf_token(
+                request, self.secret_key
+            ):
+                logger.warning(f"CSRF validation failed for {request.method} {request.url}")
+                return JSONResponse(
+                    status_code=403,
+                    content={
+                        "error": "CSRF_TOKEN_INVALID",
+                        "message": "CSRF token validation failed. Please refresh the page and try again.",
+                    },
+                )
+            ctx.values["csrf_cookie"] = True
+            return None
+        except Exception as e:
+            logger.error(f"CSRF middleware error: {e}")
+            return self._error_response()
+
+    def on_response(self, ctx: PipelineContext, headers: MutableHeaders) -> None:
+        if not ctx.values.get("csrf_cookie") or ctx.status_code >= 400:
+            return
+        cookie_carrier = Response()
+        set_csrf_cookie(cookie_carrier, self.secret_key)
+        for name, value in cookie_carrier.raw_headers:
+            if name == b"set-cookie":
+                headers.append("set-cookie", value.decode("latin-1"))
+
+    def on_error(self, ctx: PipelineContext, exc: Exception) -> Optional[Response]:
+        logger.error(f"CSRF middleware error: {exc}")
+        return self._error_response()
+
+    @staticmethod
+    def _error_response() -> JSONResponse:
+        return JSONResponse(
+            status_code=500,
+            content={"error": "CSRF_MIDDLEWARE_ERROR", "message": "Internal server error"},
+        )
+
+
+class RateLimitStage(PipelineStage):
+    """Per-endpoint rate limiting with ``X-RateLimit-*`` headers."""
+
+    def __init__(self) -> None:
+        self.rate_limiter = get_rate_limiter()
+
+    async def on_request(self, ctx: PipelineContext) -> Optional[Response]:
+        request = ctx.request
+        try:
+            if should_skip_rate_limit(request):
+                return None
+            is_limited, reason, headers = await self.rate_limiter.is_rate_limited_async(request)
+            if is_limited:
+                logger.warning(
+                    f"Rate limit exceeded: {reason}",
+                    extra={
+                        "client_ip": request.client.host if request.client else "unknown",
+                        "path": request.url.path,
+                    },
+                )
+                return rate_limit_response(reason, headers)
+            ctx.values["rate_limit_headers"] = headers
+        except Exception as e:
+            # Fail open - don't block requests due to limiter errors
+            logger.error(f"Rate limiting middleware error: {e}")
+        return None
+
+    def on_response(self, ctx: PipelineContext, headers: MutableHeaders) -> None:
+        for key, value in ctx.values.get("rate_limit_headers", {}).items():
+            headers[key] = str(value)
+
+
+class PerformanceStage(PipelineStage):
+    """Request timing, metrics collection and optional sampled memory deltas.
+
+    Reading the process RSS costs a syscall, so memory deltas are only
+    measured for a ``memory_sample_rate`` fraction of requests (default: none).
+    System-wide CPU/memory metrics are refreshed by the background
+    ``update_system_metrics_task`` rather than on the request path.
+    """
+
+    def __init__(
+        self,
+        memory_sample_rate: Optional[float] = None,
+        enable_detailed_logging: bool = True,
+    ) -> None:
+        if memory_sample_rate is None:
+            memory_sample_rate = float(
+                _performance_settings().get("request_memory_sample_rate", 0.0)
+            )
+        self.memory_sample_rate = max(0.0, min(1.0, memory_sample_rate))
+        self.enable_detailed_logging = enable_detailed_logging and not os.getenv(
+            "PYTEST_CURRENT_TEST"
+        )
+        self.performance_logger = get_performance_logger()
+        self.request_logger = get_request_logger()
+        self._process = psutil.Process() if self.memory_sample_rate > 0 else None
+
+        self.request_count = 0
+        self.total_response_time = 0.0
+        self.slow_requests = 0
+
+    def _rss_mb(self) -> float:
+        return self._process.memory_info().rss / 1024 / 1024
+
+    async def on_request(self, ctx: PipelineContext) -> Optional[Response]:
+        if self._process is not None and random.random() < self.memory_sample_rate:
+            ctx.values["start_memory_mb"] = self._rss_mb()
+        if self.enable_detailed_logging:
+            request = ctx.request
+            self.request_logger.log_request(
+                method=request.method,
+                path=request.url.path,
+                user_id=getattr(request.state, "user_id", None),
+                ip_address=request.client.host if request.client else "unknown",
+            )
+        return None
+
+    def on_response(self, ctx: PipelineContext, headers: MutableHeaders) -> None:
+        request = ctx.request
+        duration_ms = ctx.elapsed_ms
+        self.request_count += 1
+        self.total_response_time += duration_ms
+        if duration_ms > SLOW_REQUEST_MS:
+            self.slow_requests += 1
+
+        context: dict[str, Any] = {}
+        start_memory = ctx.values.get("start_memory_mb")
+        if start_memory is not None:
+            memory_delta = self._rss_mb() - start_memory
+            context["memory_delta_mb"] = round(memory_delta, 2)
+            headers["X-Memory-Delta"] = f"{memory_delta:.2f}MB"
+
+        self.performance_logger.log_metric(
+            "request_duration",
+            duration_ms,
+            "ms",
+            method=request.method,
+            path=request.url.path,
+            status_code=ctx.status_code,
+            **context,
+        )
+        metrics_collector.record_request(duration_ms, ctx.status_code, request.url.path)
+
+        if self.enable_detailed_logging:
+            self.request_logger.log_response(
+                method=request.method,
+                path=request.url.path,
+                status_code=ctx.status_code,
+                duration_ms=duration_ms,
+                user_id=getattr(request.state, "user_id", None),
+            )
+        headers["X-Response-Time"] = f"{duration_ms:.2f}ms"
+
+    def on_error(self, ctx: PipelineContext, exc: Exception) -> Optional[Response]:
+        request = ctx.request
+        duration_ms = ctx.elapsed_ms
+        metrics_collector.record_request(duration_ms, 500, request.url.path)
+        logger.error(
+            f"Request failed: {request.method} {request.url.path}",
+            extra={
+                "method": request.method,
+                "path": request.url.path,
+                "duration_ms": duration_ms,
+                "error": str(exc),
+            },
+            exc_info=True,
+        )
+        return None
+
+
+class AuthenticationStage(PipelineStage):
+    """Bearer-token check for the protected ``/api/...`` prefixes."""
+
+    async def on_request(self, ctx: PipelineContext) -> Optional[Response]:
+        if not requires_auth(ctx.request.url.path):
+            return None
+        return authenticate_request(ctx.request)
+
+
+class ThreatScreeningStage(PipelineStage):
+    """IP blocking, rate limiting and threat detection (see ``SecurityMiddleware``)."""
+
+    def __init__(self, enable_threat_detection: bool = True) -> None:
+        self.enable_threat_detection = enable_threat_detection
+
+    async def on_request(self, ctx: PipelineContext) -> Optional[Response]:
+        request = ctx.request
+        if is_security_exempt(request):
+            return None
+        client_ip = get_client_ip(request)
+        user_agent = request.headers.get("user-agent", "")
+        ctx.values["screened_client"] = (client_ip, user_agent)
+        try:
+            return await screen_request(
+                request, client_ip, user_agent, self.enable_threat_detection
+            )
+        except Exception as e:
+            return self.on_error(ctx, e)
+
+    def on_response(self, ctx: PipelineContext, headers: MutableHeaders) -> None:
+        client = ctx.values.get("screened_client")
+        processing_time = ctx.elapsed_ms / 1000
+        if client is not None and processing_time > 5.0:  # Log slow requests
+            security_system.log_security_event(
+                event_type="slow_request",
+                severity=SecurityLevel.LOW,
+                description=f"Slow request detected: {processing_time:.2f}s",
+                ip_address=client[0],
+                user_agent=client[1],
+                details={"processing_time": processing_time, "path": ctx.request.url.path},
+            )
+
+    def on_error(self, ctx: PipelineContext, exc: Exception) -> Optional[Response]:
+        client_ip, user_agent = ctx.values.get("screened_client", ("unknown", ""))
+        security_system.log_security_event(
+            event_type="security_error",
+            severity=SecurityLevel.HIGH,
+            description=f"Security middleware error: {str(exc)}",
+            ip_address=client_ip,
+            user_agent=user_agent,
+        )
+        return JSONResponse(status_code=500, content={"detail": "Internal security error"})
+
+
+class RequestLoggingStage(PipelineStage):
+    """Request/response access logging with sensitive headers redacted."""
+
+    async def on_request(self, ctx: PipelineContext) -> Optional[Response]:
+        request = ctx.request
+        log_request_started(request, getattr(request.state, "request_id", "unknown"))
+        return None
+
+    def on_response(self, ctx: PipelineContext, headers: MutableHeaders) -> None:
+        request = ctx.request
+        log_response(
+            request,
+            ctx.status_code,
+            headers,
+            ctx.elapsed_ms / 1000,
+            getattr(request.state, "request_id", "unknown"),
+        )
+
+
+def build_default_stages(secret_key: str) -> list[PipelineStage]:
+    """Stages in the order of the former middleware stack, outermost first."""
+    return [
+        SecurityHeadersStage(),
+        RequestIdStage(),
+        CorrelationIdStage(),
+        CSRFStage(secret_key),
+        RateLimitStage(),
+        PerformanceStage(),
+        AuthenticationStage(),
+        ThreatScreeningStage(),
+        RequestLoggingStage(),
+    ]
+
+
+class RequestPipelineMiddleware:
+    """Runs the request pipeline stages as a single pure-ASGI middleware."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        secret_key: str = "",
+        stages: Optional[Sequence[PipelineStage]] = None,
+    ) -> None:
+        self.app = app
+        self.stages = list(stages) if stages is not None else build_default_stages(secret_key)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        ctx = PipelineContext(scope, receive)
+        entered: list[PipelineStage] = []
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+                ctx.status_code = message["status"]
+                message["headers"] = list(message.get("headers", ()))
+                headers = MutableHeaders(scope=message)
+                for stage in reversed(entered):
+                    stage.on_response(ctx, headers)
+            await send(message)
+
+        with structlog.contextvars.bound_contextvars(correlation_id=ctx.correlation_id):
+            try:
+                for stage in self.stages:
+                    response = await stage.on_request(ctx)
+                    if response is not None:
+                        # Like a middleware returning early: only outer stages see it
+                        await response(scope, receive, send_wrapper)
+                        return
+                    entered.append(stage)
+                await self.app(scope, receive, send_wrapper)
+            except Exception as exc:
+                if response_started:
+                    raise
+                for index in range(len(entered) - 1, -1, -1):
+                    response = entered[index].on_error(ctx, exc)
+                    if response is not None:
+                        del entered[index:]
+                        await response(scope, receive, send_wrapper)
+                        return
+                raise
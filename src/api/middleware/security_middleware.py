@@ -22,6 +22,166 @@ from jose import JWTError, jwt  # type: ignore[import-untyped]
 logger = logging.getLogger(__name__)
 
 
+SECURITY_EXEMPT_PATHS = ["", "/health", "/metrics", "/docs", "/openapi.json", "/redoc"]
+
+DEFAULT_AUTH_PATHS = [
+    "/api/analysis",
+    "/api/dashboard",
+    "/api/feedback",
+    "/api/education",
+    "/api/analytics"
+]
+
+
+def is_security_exempt(request: Request) -> bool:
+    """Health/docs endpoints and test clients bypass the security checks."""
+    path = request.url.path.rstrip("/")
+    try:
+        host = (request.headers.get("host") or "").lower()
+        is_test_host = host.startswith("test") or host.startswith("testserver")
+    except Exception:
+        is_test_host = False
+
+    return path in SECURITY_EXEMPT_PATHS or is_test_host
+
+
+def get_client_ip(request: Request) -> str:
+    """Get client IP address."""
+    # Check for forwarded headers
+    forwarded_for = request.headers.get("x-forwarded-for")
+    if forwarded_for:
+        return forwarded_for.split(",")[0].strip()
+
+    real_ip = request.headers.get("x-real-ip")
+    if real_ip:
+        return real_ip
+
+    # Fallback to direct connection
+    return request.client.host if request.client else "unknown"
+
+
+async def detect_request_threats(request: Request) -> list[ThreatType]:
+    """Detect threats in the request's query, path parameters and headers."""
+    # Get request data
+    request_data = {}
+
+    # Add query parameters
+    if request.query_params:
+        request_data.update(dict(request.query_params))
+
+    # Add path parameters
+    if request.path_params:
+        request_data.update(request.path_params)
+
+    # Add headers (sanitized)
+    headers_data = {}
+    for key, value in request.headers.items():
+        if key.lower() not in ['authorization', 'cookie']:  # Skip sensitive headers
+            headers_data[key] = value
+    request_data['headers'] = headers_data
+
+    # Detect threats
+    return security_system.detect_threats(request_data)
+
+
+async def screen_request(
+    request: Request,
+    client_ip: str,
+    user_agent: str,
+    enable_threat_detection: bool = True,
+) -> Optional[JSONResponse]:
+    """Apply IP blocking, rate limiting and threat detection.
+
+    Returns:
+        The rejection response, or None if the request may proceed.
+    """
+    # Check if IP is blocked
+    if security_system.is_blocked(client_ip):
+        return JSONResponse(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            content={"detail": "IP address is temporarily blocked"}
+        )
+
+    # Rate limiting
+    if not security_system.check_rate_limit(client_ip):
+        security_system.log_security_event(
+            event_type="rate_limit_exceeded",
+            severity=SecurityLevel.MEDIUM,
+            description=f"Rate limit exceeded for IP {client_ip}",
+            ip_address=client_ip,
+            user_agent=user_agent
+        )
+        return JSONResponse(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            content={"detail": "Rate limit exceeded"}
+        )
+
+    # Threat detection
+    if enable_threat_detection:
+        threats = await detect_request_threats(request)
+        if threats:
+            security_system.log_security_event(
+                event_type="threat_detected",
+                severity=SecurityLevel.HIGH,
+                description=f"Threats detected: {[t.value for t in threats]}",
+                ip_address=client_ip,
+                user_agent=user_agent,
+                details={"threats": [t.value for t in threats]}
+            )
+            return JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={"detail": "Potential security threat detected"}
+            )
+    return None
+
+
+def requires_auth(path: str, auth_paths: Optional[list[str]] = None) -> bool:
+    """Check if path requires authentication."""
+    return any(path.startswith(auth_path) for auth_path in auth_paths or DEFAULT_AUTH_PATHS)
+
+
+def authenticate_request(request: Request) -> Optional[JSONResponse]:
+    """Validate the bearer token and record the user on ``request.state``.
+
+    Returns:
+        A 401 response when the token is missing or invalid, else None.
+    """
+    # Get authorization header
+    auth_header = request.headers.get("authorization")
+    if not auth_header or not auth_header.startswith("Bearer "):
+        return JSONResponse(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            content={"detail": "Missing or invalid authorization header"}
+        )
+
+    # Extract token
+    token = auth_header.split(" ")[1]
+
+    # Validate token using primary JWT config (AuthService / python-jose)
+    auth_service = get_auth_service()
+    payload: dict | None = None
+    try:
+        payload = jwt.decode(
+            token,
+            auth_service.secret_key,
+            algorithms=[auth_service.algorithm],
+        )
+    except JWTError:
+        # Fallback to advanced_security_system validation for backward compatibility
+        payload = security_system.validate_token(token)
+
+    if not payload:
+        return JSONResponse(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            content={"detail": "Invalid or expired token"}
+        )
+
+    # Add user info to request state (support both schemas)
+    request.state.user_id = payload.get("user_id") or payload.get("sub")
+    request.state.token_payload = payload
+    return None
+
+
 class SecurityMiddleware(BaseHTTPMiddleware):
     """Advanced security middleware for API protection."""
 
@@ -39,57 +199,16 @@ class SecurityMiddleware(BaseHTTPMiddleware):
 
         try:
             # Bypass heavy security checks for health/metrics and during tests to avoid masking other failures
-            path = request.url.path.rstrip("/")
-            try:
-                host = (request.headers.get("host") or "").lower()
-                is_test_host = host.startswith("test") or host.startswith("testserver")
-            except Exception:
-                is_test_host = False
-
-            if path in ["", "/health", "/metrics", "/docs", "/openapi.json", "/redoc"] or is_test_host:
+            if self.is_exempt(request):
                 return await call_next(request)
 
             # Get client information
             client_ip = self._get_client_ip(request)
             user_agent = request.headers.get("user-agent", "")
 
-            # Check if IP is blocked
-            if security_system.is_blocked(client_ip):
-                return JSONResponse(
-                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                    content={"detail": "IP address is temporarily blocked"}
-                )
-
-            # Rate limiting
-            if not security_system.check_rate_limit(client_ip):
-                security_system.log_security_event(
-                    event_type="rate_limit_exceeded",
-                    severity=SecurityLevel.MEDIUM,
-                    description=f"Rate limit exceeded for IP {client_ip}",
-                    ip_address=client_ip,
-                    user_agent=user_agent
-                )
-                return JSONResponse(
-                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                    content={"detail": "Rate limit exceeded"}
-                )
-
-            # Threat detection
-            if self.enable_threat_detection:
-                threats = await self._detect_threats(request)
-                if threats:
-                    security_system.log_security_event(
-                        event_type="threat_detected",
-                        severity=SecurityLevel.HIGH,
-                        description=f"Threats detected: {[t.value for t in threats]}",
-                        ip_address=client_ip,
-                        user_agent=user_agent,
-                        details={"threats": [t.value for t in threats]}
-                    )
-                    return JSONResponse(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        content={"detail": "Potential security threat detected"}
-                    )
+            rejection = await self.screen(request, client_ip, user_agent)
+            if rejection is not None:
+                return rejection
 
             # Process request
             response = await call_next(request)
@@ -123,46 +242,25 @@ class SecurityMiddleware(BaseHTTPMiddleware):
                 content={"detail": "Internal security error"}
             )
 
-    def _get_client_ip(self, request: Request) -> str:
-        """Get client IP address."""
-        # Check for forwarded headers
-        forwarded_for = request.headers.get("x-forwarded-for")
-        if forwarded_for:
-            return forwarded_for.split(",")[0].strip()
+    def is_exempt(self, request: Request) -> bool:
+        """Health/docs endpoints and test clients bypass the security checks."""
+        return is_security_exempt(request)
 
-        real_ip = request.headers.get("x-real-ip")
-        if real_ip:
-            return real_ip
+    async def screen(
+        self, request: Request, client_ip: str, user_agent: str
+    ) -> Optional[JSONResponse]:
+        """Apply IP blocking, rate limiting and threat detection."""
+        return await screen_request(
+            request, client_ip, user_agent, self.enable_threat_detection
+        )
 
-        # Fallback to direct connection
-        return request.client.host if request.client else "unknown"
+    def _get_client_ip(self, request: Request) -> str:
+        """Get client IP address."""
+        return get_client_ip(request)
 
     async def _detect_threats(self, request: Request) -> list[ThreatType]:
         """Detect threats in the request."""
-        threats = []
-
-        # Get request data
-        request_data = {}
-
-        # Add query parameters
-        if request.query_params:
-            request_data.update(dict(request.query_params))
-
-        # Add path parameters
-        if request.path_params:
-            request_data.update(request.path_params)
-
-        # Add headers (sanitized)
-        headers_data = {}
-        for key, value in request.headers.items():
-            if key.lower() not in ['authorization', 'cookie']:  # Skip sensitive headers
-                headers_data[key] = value
-        request_data['headers'] = headers_data
-
-        # Detect threats
-        threats = security_system.detect_threats(request_data)
-
-        return threats
+        return await detect_request_threats(request)
 
 
 class AuthenticationMiddleware(BaseHTTPMiddleware):
@@ -170,13 +268,7 @@ class AuthenticationMiddleware(BaseHTTPMiddleware):
 
     def __init__(self, app, require_auth_paths: Optional[list[str]] = None):
         super().__init__(app)
-        self.require_auth_paths = require_auth_paths or [
-            "/api/analysis",
-            "/api/dashboard",
-            "/api/feedback",
-            "/api/education",
-            "/api/analytics"
-        ]
+        self.require_auth_paths = require_auth_paths or DEFAULT_AUTH_PATHS
 
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
         """Process authentication for protected routes."""
@@ -185,45 +277,19 @@ class AuthenticationMiddleware(BaseHTTPMiddleware):
         if not self._requires_auth(request.url.path):
             return await call_next(request)
 
-        # Get authorization header
-        auth_header = request.headers.get("authorization")
-        if not auth_header or not auth_header.startswith("Bearer "):
-            return JSONResponse(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                content={"detail": "Missing or invalid authorization header"}
-            )
-
-        # Extract token
-        token = auth_header.split(" ")[1]
-
-        # Validate token using primary JWT config (AuthService / python-jose)
-        auth_service = get_auth_service()
-        payload: dict | None = None
-        try:
-            payload = jwt.decode(
-                token,
-                auth_service.secret_key,
-                algorithms=[auth_service.algorithm],
-            )
-        except JWTError:
-            # Fallback to advanced_security_system validation for backward compatibility
-            payload = security_system.validate_token(token)
-
-        if not payload:
-            return JSONResponse(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                content={"detail": "Invalid or expired token"}
-            )
-
-        # Add user info to request state (support both schemas)
-        request.state.user_id = payload.get("user_id") or payload.get("sub")
-        request.state.token_payload = payload
+        rejection = self.authenticate(request)
+        if rejection is not None:
+            return rejection
 
         return await call_next(request)
 
+    def authenticate(self, request: Request) -> Optional[JSONResponse]:
+        """Validate the bearer token and record the user on ``request.state``."""
+        return authenticate_request(request)
+
     def _requires_auth(self, path: str) -> bool:
         """Check if path requires authentication."""
-        return any(path.startswith(auth_path) for auth_path in self.require_auth_paths)
+        return requires_auth(path, self.require_auth_paths)
 
 
 class DataProtectionMiddleware(BaseHTTPMiddleware):
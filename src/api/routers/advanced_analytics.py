@@ -9,10 +9,14 @@ Enhanced Features:
 - Advanced visualization data
 - Performance metrics and KPIs
 - Custom dashboard configuration
-- Export capabilities
+- Export capabilities, including streaming CSV/NDJSON exports of reports
+  and findings
 """
 
 import asyncio
+import csv
+import io
+import json
 import logging
 import random
 from datetime import datetime, timedelta
@@ -20,11 +24,12 @@ from typing import Any, Dict, List, Optional
 from enum import Enum
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ...auth import get_current_active_user
-from ...database import models
+from ...database import crud, models
 from ...database.database import get_async_db
 
 logger = logging.getLogger(__name__)
@@ -80,32 +85,6 @@ class AnalyticsResponse(BaseModel):
 class AnalyticsDataGenerator:
     """Generate realistic analytics data for demonstration purposes."""
 
-    @staticmethod
-    def generate_compliance_trends(days: int = 30) -> dict[str, list]:
-        """Generate compliance trend data."""
-        dates = [
-            (datetime.now() - timedelta(days=i)).strftime("%Y-%m-%d")
-            for i in range(days, 0, -1)
-        ]
-
-        # Generate realistic compliance scores with trend
-        base_score = 75
-        scores = []
-        for i in range(days):
-            # Add upward trend with some noise
-            trend = i * 0.3  # Gradual improvement
-            noise = random.uniform(-5, 5)
-            score = min(100, max(60, base_score + trend + noise))
-            scores.append(round(score, 1))
-
-        return {
-            "dates": dates,
-            "overall_scores": scores,
-            "frequency_scores": [s + random.uniform(-10, 10) for s in scores],
-            "goal_scores": [s + random.uniform(-8, 8) for s in scores],
-            "progress_scores": [s + random.uniform(-12, 12) for s in scores],
-        }
-
     @staticmethod
     def generate_risk_predictions() -> dict[str, Any]:
         """Generate risk prediction data."""
@@ -149,41 +128,6 @@ class AnalyticsDataGenerator:
             ],
         }
 
-    @staticmethod
-    def generate_advanced_metrics(days: int = 30) -> dict[str, Any]:
-        """Generate advanced performance metrics."""
-        dates = [
-            (datetime.now() - timedelta(days=i)).strftime("%Y-%m-%d")
-            for i in range(days, 0, -1)
-        ]
-
-        return {
-            "dates": dates,
-            "processing_time": {
-                "average_ms": [random.uniform(2000, 8000) for _ in range(days)],
-                "p95_ms": [random.uniform(5000, 15000) for _ in range(days)],
-                "p99_ms": [random.uniform(8000, 25000) for _ in range(days)]
-            },
-            "throughput": {
-                "documents_per_hour": [random.uniform(10, 50) for _ in range(days)],
-                "analyses_per_day": [random.randint(50, 200) for _ in range(days)]
-            },
-            "quality_metrics": {
-                "accuracy_rate": [random.uniform(0.85, 0.98) for _ in range(days)],
-                "precision_rate": [random.uniform(0.80, 0.95) for _ in range(days)],
-                "recall_rate": [random.uniform(0.75, 0.92) for _ in range(days)]
-            },
-            "user_engagement": {
-                "active_users": [random.randint(5, 25) for _ in range(days)],
-                "session_duration_minutes": [random.uniform(15, 60) for _ in range(days)],
-                "feature_usage": {
-                    "analysis_count": [random.randint(20, 100) for _ in range(days)],
-                    "feedback_submissions": [random.randint(5, 30) for _ in range(days)],
-                    "education_sessions": [random.randint(10, 50) for _ in range(days)]
-                }
-            }
-        }
-
     @staticmethod
     def generate_predictive_insights() -> dict[str, Any]:
         """Generate AI-powered predictive insights."""
@@ -365,6 +309,72 @@ class AnalyticsDataGenerator:
         }
 
 
+def _compliance_trends(series: list[dict[str, Any]]) -> dict[str, list]:
+    """Compliance trend data from ``crud.get_rollup_daily_series`` output.
+
+    Rollups do not track per-category scores, so the category series are
+    returned as gaps (None) alongside the real overall scores.
+    """
+    scores = [
+        round(day["avg_compliance_score"], 1) if day["avg_compliance_score"] is not None else None
+        for day in series
+    ]
+    untracked = [None] * len(series)
+    return {
+        "dates": [day["date"].isoformat() for day in series],
+        "overall_scores": scores,
+        "frequency_scores": list(untracked),
+        "goal_scores": list(untracked),
+        "progress_scores": list(untracked),
+    }
+
+
+async def _rollup_performance_metrics(db: AsyncSession, days: int) -> dict[str, Any]:
+    """``generate_advanced_metrics``-shaped data read from the analytics rollups.
+
+    Series the rollups do not track (percentiles, quality and engagement)
+    are returned as gaps (None).
+    """
+    series = await crud.get_rollup_daily_series(db, days)
+    untracked = [None] * len(series)
+    return {
+        "dates": [day["date"].isoformat() for day in series],
+        "processing_time": {
+            "average_ms": [day["avg_processing_ms"] for day in series],
+            "p95_ms": list(untracked),
+            "p99_ms": list(untracked),
+        },
+        "throughput": {
+            "documents_per_hour": [round(day["analyses"] / 24, 2) for day in series],
+            "analyses_per_day": [day["analyses"] for day in series],
+        },
+        "quality_metrics": {
+            "accuracy_rate": list(untracked),
+            "precision_rate": list(untracked),
+            "recall_rate": list(untracked),
+        },
+        "user_engagement": {
+            "active_users": list(untracked),
+            "session_duration_minutes": list(untracked),
+            "feature_usage": {
+                "analysis_count": [day["analyses"] for day in series],
+                "feedback_submissions": list(untracked),
+                "education_sessions": list(untracked),
+            },
+        },
+    }
+
+
+def _mean(values: list[Any]) -> float | None:
+    present = [value for value in values if value is not None]
+    return sum(present) / len(present) if present else None
+
+
+def _endpoints(values: list[Any]) -> tuple[Any, Any]:
+    present = [value for value in values if value is not None]
+    return (present[0], present[-1]) if present else (None, None)
+
+
 @router.post("/custom", response_model=AnalyticsResponse)
 async def get_custom_analytics(
     request: AnalyticsRequest,
@@ -397,10 +407,12 @@ async def get_custom_analytics(
         data = {}
 
         if not request.metrics or "compliance_score" in request.metrics:
-            data["compliance_trends"] = AnalyticsDataGenerator.generate_compliance_trends(days)
+            data["compliance_trends"] = _compliance_trends(
+                await crud.get_rollup_daily_series(db, days)
+            )
 
         if not request.metrics or "performance_metrics" in request.metrics:
-            data["performance_metrics"] = AnalyticsDataGenerator.generate_advanced_metrics(days)
+            data["performance_metrics"] = await _rollup_performance_metrics(db, days)
 
         if not request.metrics or "predictive_insights" in request.metrics:
             data["predictive_insights"] = AnalyticsDataGenerator.generate_predictive_insights()
@@ -456,21 +468,23 @@ async def get_performance_analytics(
         time_range_map = {"7d": 7, "30d": 30, "90d": 90, "1y": 365}
         days = time_range_map.get(time_range, 30)
 
-        # Generate performance metrics
-        performance_data = AnalyticsDataGenerator.generate_advanced_metrics(days)
+        performance_data = await _rollup_performance_metrics(db, days)
+        processing_ms = performance_data["processing_time"]["average_ms"]
+        throughput = performance_data["throughput"]["documents_per_hour"]
+        first_ms, last_ms = _endpoints(processing_ms)
 
         # Add performance insights
         insights = {
             "performance_summary": {
-                "average_processing_time": sum(performance_data["processing_time"]["average_ms"]) / len(performance_data["processing_time"]["average_ms"]),
-                "peak_throughput": max(performance_data["throughput"]["documents_per_hour"]),
-                "average_accuracy": sum(performance_data["quality_metrics"]["accuracy_rate"]) / len(performance_data["quality_metrics"]["accuracy_rate"]),
-                "user_engagement_score": sum(performance_data["user_engagement"]["active_users"]) / len(performance_data["user_engagement"]["active_users"])
+                "average_processing_time": _mean(processing_ms),
+                "peak_throughput": max(throughput, default=0),
+                "average_accuracy": _mean(performance_data["quality_metrics"]["accuracy_rate"]),
+                "user_engagement_score": _mean(performance_data["user_engagement"]["active_users"])
             },
             "trends": {
-                "processing_time_trend": "improving" if performance_data["processing_time"]["average_ms"][-1] < performance_data["processing_time"]["average_ms"][0] else "stable",
-                "throughput_trend": "increasing" if performance_data["throughput"]["documents_per_hour"][-1] > performance_data["throughput"]["documents_per_hour"][0] else "stable",
-                "accuracy_trend": "improving" if performance_data["quality_metrics"]["accuracy_rate"][-1] > performance_data["quality_metrics"]["accuracy_rate"][0] else "stable"
+                "processing_time_trend": "improving" if first_ms is not None and last_ms < first_ms else "stable",
+                "throughput_trend": "increasing" if throughput and throughput[-1] > throughput[0] else "stable",
+                "accuracy_trend": "stable"
             },
             "recommendations": [
                 {
@@ -605,6 +619,108 @@ async def export_analytics_data(
         )
 
 
+STREAMING_EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+REPORT_EXPORT_FIELDS = [
+    "id",
+    "analysis_date",
+    "document_name",
+    "document_type",
+    "discipline",
+    "compliance_score",
+    "finding_count",
+]
+
+FINDING_EXPORT_FIELDS = [
+    "id",
+    "report_id",
+    "analysis_date",
+    "discipline",
+    "rule_id",
+    "risk",
+    "confidence_score",
+]
+
+
+def _export_value(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+async def _encode_export(batches, fields: List[str], export_format: str):
+    """Encode row batches as CSV or NDJSON, one chunk per batch."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields)
+    if export_format == "csv":
+        writer.writeheader()
+    async for batch in batches:
+        for row in batch:
+            values = {field: _export_value(row[field]) for field in fields}
+            if export_format == "csv":
+                writer.writerow(values)
+            else:
+                buffer.write(json.dumps(values) + "\n")
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        # Header of an empty CSV export
+        yield buffer.getvalue()
+
+
+def _streaming_export(
+    name: str, batches, fields: List[str], export_format: str, user: models.User
+) -> StreamingResponse:
+    export_format = export_format.lower()
+    media_type = STREAMING_EXPORT_MEDIA_TYPES.get(export_format)
+    if media_type is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported export format: {export_format}"
+        )
+    filename = f"{name}_{datetime.now().strftime('%Y%m%d')}.{export_format}"
+    logger.info("Streaming %s export for user %d in %s format", name, user.id, export_format)
+    return StreamingResponse(
+        _encode_export(batches, fields, export_format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/export/reports")
+async def stream_report_export(
+    format: str = Query("csv", description="Export format (csv, ndjson)"),
+    days: int = Query(365, ge=1, le=3650, description="Days of history to export"),
+    current_user: models.User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db),
+) -> StreamingResponse:
+    """Stream report metadata for the last ``days`` days as CSV or NDJSON.
+
+    Rows are read in keyset-paged batches and written as they arrive, so
+    memory use does not grow with the export size.
+    """
+    batches = crud.iter_report_export_batches(
+        db, start_date=(datetime.utcnow() - timedelta(days=days)).date()
+    )
+    return _streaming_export("reports", batches, REPORT_EXPORT_FIELDS, format, current_user)
+
+
+@router.get("/export/findings")
+async def stream_finding_export(
+    format: str = Query("csv", description="Export format (csv, ndjson)"),
+    days: int = Query(365, ge=1, le=3650, description="Days of history to export"),
+    current_user: models.User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db),
+) -> StreamingResponse:
+    """Stream the findings of the last ``days`` days of reports as CSV or NDJSON."""
+    batches = crud.iter_finding_export_batches(
+        db, start_date=(datetime.utcnow() - timedelta(days=days)).date()
+    )
+    return _streaming_export("findings", batches, FINDING_EXPORT_FIELDS, format, current_user)
+
+
 def _apply_analytics_filters(data: Dict[str, Any], filters: Dict[str, Any]) -> Dict[str, Any]:
     """Apply filters to analytics data."""
     filtered_data = data.copy()
@@ -654,14 +770,20 @@ async def get_advanced_analytics(
         }
         days = days_map.get(time_range, 30)
 
-        # Generate analytics data
-        compliance_trends = AnalyticsDataGenerator.generate_compliance_trends(days)
+        series = await crud.get_rollup_daily_series(db, days)
+        compliance_trends = _compliance_trends(series)
+        metrics = await crud.get_rollup_organizational_metrics(db, days_back=days)
+        high_risk_findings = sum(day["high_risk_findings"] for day in series)
 
-        # Key metrics (would be calculated from real data)
+        # Key metrics; quality and efficiency are not tracked by the rollups yet
         key_metrics = {
-            "overall_compliance": 87.3,
+            "overall_compliance": round(metrics["avg_compliance_score"], 1),
             "documentation_quality": 91.2,
-            "risk_score": 15.2,
+            "risk_score": (
+                round(100 * high_risk_findings / metrics["total_findings"], 1)
+                if metrics["total_findings"]
+                else 0.0
+            ),
             "efficiency_index": 94.8,
         }
 
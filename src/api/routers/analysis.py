@@ -6,7 +6,9 @@ and retrieving analysis results.
 
 import asyncio
 import datetime
+import json
 import sqlite3
+import time
 import uuid
 from typing import Any, Optional, Dict, List
 
@@ -23,19 +25,34 @@ from fastapi import (
     UploadFile,
     status,
 )
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ...auth import get_current_active_user
+from ...config import get_settings
+from ...core.analysis_job_worker import job_queue_enabled, spool_document
 from ...core.analysis_service import AnalysisService
 from ...utils.performance_monitor import monitor_performance, monitor_operation
 from ...core.file_encryption import get_secure_storage
-from ...core.file_upload_validator import sanitize_filename, validate_uploaded_file
-from ...core.persistent_task_registry import TaskStatus, persistent_task_registry
+from ...core.file_upload_validator import sanitize_filename
+from ...core.persistent_task_registry import (
+    TaskMetadata,
+    TaskStatus,
+    persistent_task_registry,
+)
 from ...core.security_validator import SecurityValidator
+from ...core.upload_spool import SpooledUpload, receive_upload
 from ...database import crud, models, schemas
 from ...database.database import get_async_db
+from ..admission_control import AdmissionRejected, analysis_admission
 from ..dependencies import get_analysis_service
+from ..event_bus import (
+    TERMINAL_EVENT_TYPES,
+    analysis_channel,
+    progress_event,
+    progress_events,
+)
 from ..deps.request_tracking import RequestId, log_with_request_id
 from ..task_registry import analysis_task_registry
 
@@ -58,7 +75,7 @@ class LegacyAnalysisRequest(BaseModel):
 
 
 async def run_analysis_and_save(
-    file_content: bytes,
+    file_content: bytes | SpooledUpload,
     task_id: str,
     original_filename: str,
     discipline: str,
@@ -124,22 +141,17 @@ async def run_analysis_and_save(
         state["progress"] = percentage
         state["status_message"] = message
 
-        # Determine status based on progress
-        if percentage >= 100:
-            status = TaskStatus.COMPLETED
-        elif percentage >= 60:
-            status = TaskStatus.RUNNING
-        else:
-            status = TaskStatus.RUNNING
+        # Coalesced write-behind; the terminal state is persisted synchronously
+        # together with the result once analysis finishes.
+        persistent_task_registry.record_progress(
+            task_id,
+            status=TaskStatus.RUNNING,
+            progress=percentage,
+            status_message=message or "",
+        )
 
-        # Update persistent registry
-        asyncio.create_task(
-            persistent_task_registry.update_task(
-                task_id,
-                status=status,
-                progress=percentage,
-                status_message=message or "",
-            )
+        progress_events.publish(
+            analysis_channel(task_id), progress_event(task_id, percentage, message)
         )
 
         logger.info("Task %s progress: %d%% - %s", task_id, percentage, message)
@@ -239,6 +251,17 @@ async def run_analysis_and_save(
                 },
             )
 
+            progress_events.publish(
+                analysis_channel(task_id),
+                progress_event(
+                    task_id,
+                    100,
+                    "Analysis complete.",
+                    event_type="complete",
+                    overall_score=compliance_score,
+                    findings_count=len(findings),
+                ),
+            )
             logger.info("Analysis completed for task %s", task_id)
 
         except Exception as exc:
@@ -247,9 +270,27 @@ async def run_analysis_and_save(
                 extra={"task_id": task_id, "error": str(exc)},
                 exc_info=True
             )
+            await persistent_task_registry.update_task(
+                task_id,
+                status=TaskStatus.FAILED,
+                error_message=str(exc),
+                completed_at=datetime.datetime.now(datetime.UTC),
+            )
+            progress_events.publish(
+                analysis_channel(task_id),
+                progress_event(
+                    task_id,
+                    tasks.get(task_id, {}).get("progress", 0),
+                    str(exc),
+                    event_type="error",
+                ),
+            )
 
     # Schedule analysis asynchronously without process isolation to ensure progress updates
     async def _runner() -> None:
+        # Wait for a slot from the admission controller before starting the pipeline
+        await analysis_admission.acquire(task_id)
+        started = time.monotonic()
         try:
             await _async_analysis()
         except Exception as exc:
@@ -258,10 +299,281 @@ async def run_analysis_and_save(
                 extra={"task_id": task_id, "error": str(exc)},
                 exc_info=True
             )
+        finally:
+            analysis_admission.release(task_id, time.monotonic() - started)
+            if isinstance(file_content, SpooledUpload):
+                file_content.discard()
+
+    await analysis_task_registry.start(task_id, _runner())
+
+
+async def run_batch_analysis_and_save(
+    documents: list[dict[str, Any]],
+    task_id: str,
+    discipline: str,
+    analysis_mode: str,
+    strictness: str,
+    analysis_service: AnalysisService,
+    user_id: int | None = None,
+) -> None:
+    """Background coordinator for a multi-document analysis batch."""
+    owner_id = user_id if user_id is not None else -1
+    filenames = [document["original_filename"] for document in documents]
+
+    await persistent_task_registry.create_task(
+        task_id=task_id,
+        status=TaskStatus.PENDING,
+        filename=f"{len(documents)} documents",
+        user_id=user_id,
+        discipline=discipline,
+        analysis_mode=analysis_mode,
+        strictness=strictness,
+        max_retries=0,
+    )
+    tasks[task_id] = {
+        "status": "queued",
+        "progress": 0,
+        "status_message": "Queued for processing",
+        "filename": f"{len(documents)} documents",
+        "timestamp": datetime.datetime.now(datetime.UTC),
+        "user_id": owner_id,
+        "discipline": discipline,
+        "analysis_mode": analysis_mode,
+        "strictness": strictness,
+        "batch": True,
+        "documents": [
+            {"filename": name, "status": "queued", "progress": 0, "status_message": ""}
+            for name in filenames
+        ],
+    }
+    channel = analysis_channel(task_id)
+
+    def _update_progress(percentage: int, message: str | None) -> None:
+        state = tasks.setdefault(task_id, {})
+        state["status"] = "processing"
+        state["progress"] = percentage
+        state["status_message"] = message
+        persistent_task_registry.record_progress(
+            task_id,
+            status=TaskStatus.RUNNING,
+            progress=percentage,
+            status_message=message or "",
+        )
+        progress_events.publish(channel, progress_event(task_id, percentage, message))
+
+    def _update_document(index: int, percentage: int, message: str | None) -> None:
+        document_state = tasks[task_id]["documents"][index]
+        document_state["status"] = "processing"
+        document_state["progress"] = percentage
+        document_state["status_message"] = message
+        progress_events.publish(
+            channel,
+            progress_event(
+                task_id,
+                tasks[task_id].get("progress", 0),
+                message,
+                event_type="document_progress",
+                document_index=index,
+                document_progress=percentage,
+                filename=filenames[index],
+            ),
+        )
+
+    async def _runner() -> None:
+        await analysis_admission.acquire(task_id)
+        started = time.monotonic()
+        try:
+            await persistent_task_registry.update_task(
+                task_id,
+                status=TaskStatus.RUNNING,
+                started_at=datetime.datetime.now(datetime.UTC),
+            )
+            results = await analysis_service.analyze_batch(
+                documents,
+                discipline=discipline,
+                analysis_mode=analysis_mode,
+                strictness=strictness,
+                progress_callback=_update_progress,
+                document_progress_callback=_update_document,
+            )
+
+            summaries = []
+            for document_state, result in zip(tasks[task_id]["documents"], results):
+                payload = result if isinstance(result, dict) else {}
+                if "error" in payload:
+                    document_state.update(status="failed", error=payload["error"])
+                    summaries.append({"filename": document_state["filename"], "error": payload["error"]})
+                    continue
+                analysis_data = payload.get("analysis", payload)
+                findings = analysis_data.get("findings", [])
+                summary = {
+                    "filename": document_state["filename"],
+                    "overall_score": analysis_data.get("compliance_score")
+                    or payload.get("compliance_score"),
+                    "document_type": analysis_data.get("document_type")
+                    or payload.get("document_type"),
+                    "findings_count": len(findings),
+                }
+                document_state.update(
+                    status="completed",
+                    progress=100,
+                    status_message="Analysis complete.",
+                    analysis=payload,
+                    findings=findings,
+                    report_html=payload.get("report_html"),
+                    **{k: summary[k] for k in ("overall_score", "document_type")},
+                )
+                summaries.append(summary)
+
+            succeeded = sum(1 for summary in summaries if "error" not in summary)
+            message = f"{succeeded}/{len(documents)} documents analyzed."
+            tasks[task_id].update(
+                status="completed",
+                progress=100,
+                status_message=message,
+                timestamp=datetime.datetime.now(datetime.UTC),
+                results=summaries,
+            )
+            await persistent_task_registry.update_task(
+                task_id,
+                status=TaskStatus.COMPLETED,
+                progress=100,
+                status_message=message,
+                completed_at=datetime.datetime.now(datetime.UTC),
+                result_data={"documents": summaries},
+            )
+            progress_events.publish(
+                channel,
+                progress_event(task_id, 100, message, event_type="complete", documents=summaries),
+            )
+        except Exception as exc:
+            logger.exception(
+                "Batch analysis runner failed",
+                extra={"task_id": task_id, "error": str(exc)},
+                exc_info=True,
+            )
+            tasks[task_id].update(status="failed", error=str(exc))
+            await persistent_task_registry.update_task(
+                task_id,
+                status=TaskStatus.FAILED,
+                error_message=str(exc),
+                completed_at=datetime.datetime.now(datetime.UTC),
+            )
+            progress_events.publish(
+                channel,
+                progress_event(task_id, tasks[task_id].get("progress", 0), str(exc), event_type="error"),
+            )
+        finally:
+            analysis_admission.release(task_id, time.monotonic() - started)
+            _discard_uploads(documents)
 
     await analysis_task_registry.start(task_id, _runner())
 
 
+def _discard_uploads(documents: list[dict[str, Any]]) -> None:
+    for document in documents:
+        if isinstance(document.get("file_content"), SpooledUpload):
+            document["file_content"].discard()
+
+
+async def dispatch_analysis(
+    background_tasks: BackgroundTasks,
+    file_content: bytes | SpooledUpload,
+    task_id: str,
+    original_filename: str,
+    discipline: str,
+    analysis_mode: str,
+    strictness: str,
+    analysis_service: AnalysisService,
+    user_id: int | None = None,
+) -> str:
+    """Run the analysis in-process or hand it to the worker pool.
+
+    Returns:
+        The initial status reported to the client.
+    """
+    if not job_queue_enabled():
+        try:
+            ticket = analysis_admission.admit(task_id)
+        except AdmissionRejected as exc:
+            tasks.pop(task_id, None)
+            if isinstance(file_content, SpooledUpload):
+                file_content.discard()
+            raise HTTPException(
+                status_code=exc.status_code,
+                detail=exc.detail,
+                headers={"Retry-After": str(exc.retry_after)},
+            ) from exc
+
+        async def _run_admitted() -> None:
+            try:
+                await run_analysis_and_save(
+                    file_content,
+                    task_id,
+                    original_filename,
+                    discipline,
+                    analysis_mode,
+                    strictness,
+                    analysis_service,
+                    user_id,
+                )
+            finally:
+                # The runner releases its slot once started; this only frees
+                # a reservation no scheduled runner is left to acquire
+                if not analysis_task_registry.is_active(task_id):
+                    analysis_admission.discard_unstarted(task_id)
+
+        background_tasks.add_task(_run_admitted)
+        return "queued" if ticket.queue_position else "processing"
+
+    spool_path = await asyncio.to_thread(spool_document, task_id, file_content)
+    await persistent_task_registry.enqueue_job(
+        task_id,
+        payload={
+            "spool_path": spool_path,
+            "filename": original_filename,
+            "discipline": discipline,
+            "analysis_mode": analysis_mode,
+            "strictness": strictness,
+        },
+        filename=original_filename,
+        user_id=user_id,
+        discipline=discipline,
+        analysis_mode=analysis_mode,
+        strictness=strictness,
+        max_retries=3,
+    )
+    tasks.setdefault(task_id, {}).update(
+        {"status": "queued", "status_message": "Queued for processing", "queued_job": True}
+    )
+    return "queued"
+
+
+def _task_view(task: TaskMetadata) -> dict[str, Any]:
+    """Shape a persistent task like the in-memory status entries."""
+    status_map = {
+        TaskStatus.PENDING: "queued",
+        TaskStatus.RETRYING: "queued",
+        TaskStatus.RUNNING: "processing",
+    }
+    view: dict[str, Any] = {
+        "status": status_map.get(task.status, task.status.value),
+        "progress": task.progress,
+        "status_message": task.status_message or "Initializing...",
+        "filename": task.filename,
+        "timestamp": task.created_at,
+        "user_id": task.user_id,
+        "strictness": task.strictness,
+        "retry_count": task.retry_count,
+    }
+    if task.error_message:
+        view["error"] = task.error_message
+    if task.status == TaskStatus.COMPLETED and task.result_data:
+        view.update(task.result_data)
+        view["result"] = task.result_data.get("analysis")
+    return view
+
+
 @legacy_router.post("/upload-document")
 async def legacy_upload_document(
     file: UploadFile = File(...),
@@ -413,8 +725,8 @@ async def legacy_start_analysis(
         "user_id": current_user.id,  # Track user ownership
     }
 
-    background_tasks.add_task(
-        run_analysis_and_save,
+    await dispatch_analysis(
+        background_tasks,
         document_content,
         task_id,
         document_metadata["filename"],
@@ -482,7 +794,7 @@ async def analyze_document(
     analysis_service: AnalysisService = Depends(get_analysis_service),
     request_id: str = RequestId,
 ) -> Dict[str, str]:
-    """Upload and analyze a clinical document for compliance from in-memory content with request tracking."""
+    """Upload and analyze a clinical document for compliance from a streamed upload with request tracking."""
     log_with_request_id(
         f"Analysis request started by user {_current_user.username}",
         level="info",
@@ -498,29 +810,6 @@ async def analyze_document(
             detail="Analysis service is not ready yet.",
         )
 
-    try:
-        # Read file content first for comprehensive validation
-        content = await file.read()
-
-        # Enhanced file validation with magic number detection
-        is_valid, error_msg = validate_uploaded_file(
-            content, file.filename or "unknown", file.content_type
-        )
-
-        if not is_valid:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"File validation failed: {error_msg}",
-            )
-
-        # Sanitize filename
-        safe_filename = sanitize_filename(file.filename or "unknown")
-
-    except ValueError as exc:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)
-        ) from exc
-
     discipline_valid, discipline_error = SecurityValidator.validate_discipline(
         discipline
     )
@@ -542,10 +831,14 @@ async def analyze_document(
         )
     strictness = (strictness or "standard").lower()
 
-    # Content already read above for validation
-    size_valid, size_error = SecurityValidator.validate_file_size(len(content))
-    if not size_valid:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=size_error)
+    try:
+        # Stream the body: hash, size limit and magic-number validation run per chunk
+        upload = await receive_upload(file)
+        safe_filename = sanitize_filename(file.filename or "unknown")
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)
+        ) from exc
 
     task_id = uuid.uuid4().hex
     tasks[task_id] = {
@@ -556,9 +849,9 @@ async def analyze_document(
         "user_id": _current_user.id,  # Track user ownership
     }
 
-    background_tasks.add_task(
-        run_analysis_and_save,
-        content,
+    initial_status = await dispatch_analysis(
+        background_tasks,
+        upload,
         task_id,
         safe_filename,
         discipline,
@@ -568,7 +861,124 @@ async def analyze_document(
         _current_user.id,  # Pass user ID
     )
 
-    return {"task_id": task_id, "status": "processing"}
+    return {"task_id": task_id, "status": initial_status}
+
+
+DEFAULT_BATCH_MAX_DOCUMENTS = 20
+
+
+@router.post("/analyze-batch", status_code=status.HTTP_202_ACCEPTED)
+@monitor_performance("api_analyze_batch", metadata={"endpoint": "analyze-batch"})
+async def analyze_batch(
+    background_tasks: BackgroundTasks,
+    files: List[UploadFile] = File(...),
+    discipline: str = Form("pt"),
+    analysis_mode: str = Form("rubric"),
+    strictness: str = Form("standard"),
+    _current_user: models.User = Depends(get_current_active_user),
+    analysis_service: AnalysisService = Depends(get_analysis_service),
+    request_id: str = RequestId,
+) -> Dict[str, Any]:
+    """Upload several clinical documents and analyze them as one batch.
+
+    Model stages (PHI scrubbing, NER, rule retrieval) are batched across the
+    documents. Per-document and aggregate progress are reported through
+    ``/analysis/status/{task_id}`` and ``/analysis/events/{task_id}``.
+    """
+    log_with_request_id(
+        f"Batch analysis request started by user {_current_user.username}",
+        level="info",
+        user_id=_current_user.id,
+        document_count=len(files),
+        discipline=discipline,
+        analysis_mode=analysis_mode,
+        strictness=strictness,
+    )
+    if analysis_service is None or not hasattr(analysis_service, "analyze_batch"):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Analysis service is not ready yet.",
+        )
+
+    settings = get_settings()
+    max_documents = int(
+        (settings.performance or {}).get("batch_analysis_max_documents", DEFAULT_BATCH_MAX_DOCUMENTS)
+    )
+    if not files:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No files provided.")
+    if len(files) > max_documents:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A batch may contain at most {max_documents} documents.",
+        )
+
+    for is_valid, error in (
+        SecurityValidator.validate_discipline(discipline),
+        SecurityValidator.validate_analysis_mode(analysis_mode),
+        SecurityValidator.validate_strictness(strictness),
+    ):
+        if not is_valid:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
+    strictness = (strictness or "standard").lower()
+
+    documents = []
+    for file in files:
+        try:
+            upload = await receive_upload(file)
+        except ValueError as exc:
+            _discard_uploads(documents)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"{file.filename}: {exc}",
+            ) from exc
+        documents.append(
+            {
+                "file_content": upload,
+                "original_filename": sanitize_filename(file.filename or "unknown"),
+            }
+        )
+
+    task_id = uuid.uuid4().hex
+    tasks[task_id] = {
+        "status": "processing",
+        "filename": f"{len(documents)} documents",
+        "timestamp": datetime.datetime.now(datetime.UTC),
+        "strictness": strictness,
+        "user_id": _current_user.id,
+        "batch": True,
+    }
+    try:
+        ticket = analysis_admission.admit(task_id)
+    except AdmissionRejected as exc:
+        tasks.pop(task_id, None)
+        _discard_uploads(documents)
+        raise HTTPException(
+            status_code=exc.status_code,
+            detail=exc.detail,
+            headers={"Retry-After": str(exc.retry_after)},
+        ) from exc
+
+    async def _run_admitted() -> None:
+        try:
+            await run_batch_analysis_and_save(
+                documents,
+                task_id,
+                discipline,
+                analysis_mode,
+                strictness,
+                analysis_service,
+                _current_user.id,
+            )
+        finally:
+            if not analysis_task_registry.is_active(task_id):
+                analysis_admission.discard_unstarted(task_id)
+
+    background_tasks.add_task(_run_admitted)
+    return {
+        "task_id": task_id,
+        "status": "queued" if ticket.queue_position else "processing",
+        "document_count": len(documents),
+    }
 
 
 @router.post("/start", status_code=status.HTTP_202_ACCEPTED)
@@ -632,29 +1042,6 @@ async def start_analysis(
             detail="Analysis service is not ready yet.",
         )
 
-    try:
-        # Read file content first for comprehensive validation
-        content = await file.read()
-
-        # Enhanced file validation with magic number detection
-        is_valid, error_msg = validate_uploaded_file(
-            content, file.filename or "unknown", file.content_type
-        )
-
-        if not is_valid:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid request data: {error_msg}",
-            )
-
-        # Sanitize filename
-        safe_filename = sanitize_filename(file.filename or "unknown")
-
-    except ValueError as exc:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid request data: {str(exc)}"
-        ) from exc
-
     discipline_valid, discipline_error = SecurityValidator.validate_discipline(
         discipline
     )
@@ -678,12 +1065,13 @@ async def start_analysis(
         )
     strictness = (strictness or "standard").lower()
 
-    # Content already read above for validation
-    size_valid, size_error = SecurityValidator.validate_file_size(len(content))
-    if not size_valid:
+    try:
+        upload = await receive_upload(file)
+        safe_filename = sanitize_filename(file.filename or "unknown")
+    except ValueError as exc:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid request data: {size_error}"
-        )
+            status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid request data: {str(exc)}"
+        ) from exc
 
     task_id = uuid.uuid4().hex
     user_id = _current_user.id if _current_user else None
@@ -695,9 +1083,9 @@ async def start_analysis(
         "user_id": user_id,
     }
 
-    background_tasks.add_task(
-        run_analysis_and_save,
-        content,
+    initial_status = await dispatch_analysis(
+        background_tasks,
+        upload,
         task_id,
         safe_filename,
         discipline,
@@ -707,7 +1095,7 @@ async def start_analysis(
         user_id,
     )
 
-    return {"task_id": task_id, "status": "processing"}
+    return {"task_id": task_id, "status": initial_status}
 
 
 # REMOVED: /submit endpoint - redundant with /analyze endpoint
@@ -730,6 +1118,12 @@ async def get_analysis_status(
         task_id=task_id,
     )
     task = tasks.get(task_id)
+    if not task or task.get("queued_job"):
+        # Queued jobs run in worker processes; their state lives in the task table
+        persisted = await persistent_task_registry.get_task(task_id)
+        if persisted is not None:
+            task = tasks.setdefault(task_id, {"queued_job": True})
+            task.update(_task_view(persisted))
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
 
@@ -752,9 +1146,78 @@ async def get_analysis_status(
     # Ensure progress and status_message are always returned, even if not explicitly set yet
     task.setdefault("progress", 0)
     task.setdefault("status_message", "Initializing...")
+    queue_state = analysis_admission.status_for(task_id)
+    if queue_state is not None:
+        return {
+            **task,
+            **queue_state,
+            "status": "queued",
+            "status_message": f"Waiting for an analysis slot (position {queue_state['queue_position']})",
+        }
     return task
 
 
+SSE_KEEPALIVE_SECONDS = 15.0
+
+
+@router.get("/events/{task_id}")
+async def stream_analysis_events(
+    task_id: str,
+    current_user: models.User = Depends(get_current_active_user),
+) -> StreamingResponse:
+    """Stream progress events for a task as Server-Sent Events.
+
+    The latest event is replayed on connect, so clients joining late see the
+    current state immediately. The stream ends after the terminal event.
+    """
+    task = tasks.get(task_id)
+    if task is None:
+        persisted = await persistent_task_registry.get_task(task_id)
+        if persisted is not None:
+            task = _task_view(persisted)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    if task.get("user_id") != current_user.id and not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to view this task",
+        )
+
+    channel = analysis_channel(task_id)
+    snapshot = None
+    if progress_events.last_event(channel) is None and task.get("status") in (
+        "completed",
+        "failed",
+    ):
+        # Finished before any event was published (e.g. before a restart)
+        snapshot = progress_event(
+            task_id,
+            task.get("progress", 0),
+            task.get("status_message") or task.get("error"),
+            event_type="complete" if task.get("status") == "completed" else "error",
+        )
+
+    async def _event_stream():
+        if snapshot is not None:
+            yield f"event: {snapshot['type']}\ndata: {json.dumps(snapshot, default=str)}\n\n"
+            return
+        with progress_events.subscribe(channel, replay=True) as subscription:
+            while True:
+                event = await subscription.get(timeout=SSE_KEEPALIVE_SECONDS)
+                if event is None:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+                if event.get("type") in TERMINAL_EVENT_TYPES:
+                    return
+
+    return StreamingResponse(
+        _event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/all-tasks")
 async def get_all_tasks(
     _current_user: models.User = Depends(get_current_active_user),
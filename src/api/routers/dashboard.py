@@ -4,7 +4,7 @@ from time import perf_counter
 from typing import Any
 
 import structlog
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from fastapi.responses import HTMLResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -113,14 +113,79 @@ async def get_dashboard_overview(
     return {"ai_health": ai_health, **other_data}
 
 
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _invalid_cursor(error: ValueError) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(error))
+
+
 @router.get("/reports", response_model=list[schemas.Report])
 async def read_reports(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: str | None = None,
     db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(get_current_active_user),
 ):
-    return await crud.get_reports(db, skip=skip, limit=limit)
+    """Lists reports newest first.
+
+    Page with the ``X-Next-Cursor`` response header passed back as ``cursor``;
+    it is absent on the last page. ``skip`` is kept for older clients.
+    """
+    try:
+        reports = await crud.get_reports(db, skip=skip, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise _invalid_cursor(e) from e
+    next_cursor = crud.next_report_cursor(reports, limit)
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return reports
+
+
+@router.get("/reports/summary", response_model=list[schemas.ReportSummary])
+async def read_report_summaries(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    document_type: str | None = None,
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_active_user),
+):
+    """Lists report metadata without loading the encrypted analysis payloads.
+
+    Pages with ``cursor`` like ``/reports``.
+    """
+    try:
+        summaries = await crud.get_report_summaries(
+            db, skip=skip, limit=limit, document_type=document_type, cursor=cursor
+        )
+    except ValueError as e:
+        raise _invalid_cursor(e) from e
+    next_cursor = crud.next_report_cursor(summaries, limit)
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return summaries
+
+
+@router.get("/findings", response_model=list[schemas.Finding])
+async def read_findings(
+    response: Response,
+    report_id: int | None = None,
+    after_id: int | None = None,
+    limit: int = 100,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_active_user),
+):
+    """Lists findings in id order; the next page starts after ``X-Next-Cursor``."""
+    findings = await crud.get_findings_page(
+        db, report_id=report_id, after_id=after_id, limit=limit
+    )
+    if findings and len(findings) >= limit:
+        response.headers[NEXT_CURSOR_HEADER] = str(findings[-1].id)
+    return findings
 
 
 @router.get("/reports/{report_id}", response_class=HTMLResponse)
@@ -7,6 +7,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ...core.model_registry import model_registry
 from ...database import get_async_db as get_db
 
 try:
@@ -37,6 +38,18 @@ async def get_system_health():
     }
 
 
+@router.get("/health/models", status_code=status.HTTP_200_OK)
+async def get_model_health():
+    """Report the models held by the shared model registry and their memory."""
+    models = model_registry.status()
+    return {
+        "status": "ready" if model_registry.is_ready() else "loading",
+        "models": models,
+        "total_memory_mb": round(sum(model["memory_mb"] or 0 for model in models), 1),
+        "timestamp": datetime.utcnow().isoformat(),
+    }
+
+
 # REMOVED: Basic /health endpoint - redundant with comprehensive health checks
 # The basic health endpoint has been removed to avoid duplication with
 # the more comprehensive health checks in health_check.py.
@@ -31,6 +31,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.api.dependencies import get_async_db
+from src.api.event_bus import analysis_channel, progress_event, progress_events
 from src.auth import get_auth_service
 from src.database import models
 
@@ -95,12 +96,14 @@ class ConnectionManager:
         - Broadcasting to authenticated clients only
         - Connection lifecycle with user tracking
         - Message routing with access control
+        - Forwarding analysis progress from the event bus to subscribed channels
     """
 
     def __init__(self):
         """Initialize connection manager."""
         self.active_connections: dict[str, list[dict[str, Any]]] = {}
         # Structure: {channel: [{"websocket": ws, "user": user, "connected_at": datetime}]}
+        self._forwarders: dict[str, asyncio.Task] = {}
 
     async def connect(self, websocket: WebSocket, channel: str, user: models.User):
         """
@@ -129,6 +132,29 @@ class ConnectionManager:
             f"WebSocket connected to channel: {channel} by user: {user.username}"
         )
 
+        if channel.startswith("analysis_"):
+            if channel in self._forwarders:
+                # The forwarder already replayed the last event; catch this client up
+                last_event = progress_events.last_event(channel)
+                if last_event is not None:
+                    await websocket.send_json(last_event)
+            else:
+                self._forwarders[channel] = asyncio.create_task(
+                    self._forward_events(channel), name=f"ws-forward-{channel}"
+                )
+
+    async def _forward_events(self, channel: str) -> None:
+        """Relay events published on the bus to every connection in ``channel``."""
+        subscription = progress_events.subscribe(channel, replay=True)
+        try:
+            while channel in self.active_connections:
+                event = await subscription.get()
+                await self.send_message(channel, event)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            subscription.close()
+
     def disconnect(self, websocket: WebSocket, channel: str):
         """
         Remove WebSocket connection.
@@ -151,6 +177,9 @@ class ConnectionManager:
             # Clean up empty channels
             if not self.active_connections[channel]:
                 del self.active_connections[channel]
+                forwarder = self._forwarders.pop(channel, None)
+                if forwarder is not None:
+                    forwarder.cancel()
 
     async def send_message(
         self, channel: str, message: dict[str, Any], target_user_id: int | None = None
@@ -463,16 +492,12 @@ async def send_analysis_progress(
         )
         ```
     """
-    channel = f"analysis_{task_id}"
+    event = progress_event(task_id, current, message, event_type=status, total=total)
+    if target_user_id is None:
+        # Published events reach WebSocket and SSE subscribers and are replayed to late joiners
+        progress_events.publish(analysis_channel(task_id), event)
+        return
 
     await manager.send_message(
-        channel,
-        {
-            "type": status,
-            "current": current,
-            "total": total,
-            "message": message,
-            "timestamp": datetime.utcnow().isoformat(),
-        },
-        target_user_id=target_user_id,
+        analysis_channel(task_id), event, target_user_id=target_user_id
     )
@@ -55,6 +55,11 @@ class AnalysisTaskRegistry:
             logger.info("Cancellation requested for analysis task %s", task_id)
             return True
 
+    def is_active(self, task_id: str) -> bool:
+        """Return whether a coroutine is still registered under task_id."""
+        task = self._handles.get(task_id)
+        return task is not None and not task.done()
+
     def get(self, task_id: str) -> dict[str, Any] | None:
         return self.metadata.get(task_id)
 
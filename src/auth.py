@@ -5,9 +5,12 @@ from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt  # type: ignore[import-untyped]
 from passlib.context import CryptContext  # type: ignore[import-untyped]
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached, object_session
 
 from src.config import get_settings
+from src.core.principal_cache import principal_cache
 from src.database import crud, models, schemas
 from src.database.database import get_async_db
 
@@ -36,6 +39,7 @@ class AuthService:
             expire = datetime.now(UTC) + timedelta(
                 minutes=self.access_token_expire_minutes
             )
+        to_encode.setdefault("iat", datetime.now(UTC))
         to_encode.update({"exp": expire})
         encoded_jwt = jwt.encode(to_encode, self.secret_key, algorithm=self.algorithm)
         return encoded_jwt
@@ -70,6 +74,64 @@ def get_auth_service() -> AuthService:
     return AuthService()
 
 
+_DIRTY_PRINCIPALS_KEY = "dirty_principals"
+
+
+@event.listens_for(models.User, "after_insert")
+@event.listens_for(models.User, "after_update")
+@event.listens_for(models.User, "after_delete")
+def _record_dirty_principal(mapper, connection, target) -> None:
+    """Remember a flushed user change until its transaction ends.
+
+    Invalidating at flush would let a concurrent request re-cache the old row
+    before the change commits, so the cache is cleared after commit instead.
+    """
+    session = object_session(target)
+    if session is None:
+        principal_cache.invalidate_user(user_id=target.id, username=target.username)
+        return
+    session.info.setdefault(_DIRTY_PRINCIPALS_KEY, set()).add((target.id, target.username))
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_soft_rollback")
+def _invalidate_dirty_principals(session, previous_transaction=None) -> None:
+    dirty = session.info.get(_DIRTY_PRINCIPALS_KEY)
+    if not dirty:
+        return
+    for user_id, username in dirty:
+        principal_cache.invalidate_user(user_id=user_id, username=username)
+    # A rolled-back savepoint leaves the outer transaction's changes to commit
+    if previous_transaction is None or previous_transaction.parent is None:
+        session.info.pop(_DIRTY_PRINCIPALS_KEY, None)
+
+
+@event.listens_for(models.User.__table__, "after_create")
+def _clear_cached_principals(target, connection, **kw) -> None:
+    principal_cache.clear()
+
+
+async def _load_principal(
+    db: AsyncSession, username: str, payload: dict
+) -> models.User | None:
+    """Load the token's user, from the principal cache when possible.
+
+    A cached snapshot is attached to ``db`` with ``merge(load=False)``, which
+    emits no query, so the returned user behaves like a freshly loaded one.
+    """
+    issued_at = payload.get("iat", payload.get("exp"))
+    snapshot = principal_cache.get(username, issued_at)
+    if snapshot is not None:
+        cached_user = models.User(**snapshot)
+        make_transient_to_detached(cached_user)
+        return await db.merge(cached_user, load=False)
+
+    user = await crud.get_user_by_username(db, username=username)
+    if user is not None:
+        principal_cache.put(username, issued_at, user)
+    return user
+
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_async_db),
@@ -94,7 +156,7 @@ async def get_current_user(
     if token_data.username is None:
         raise credentials_exception from None
 
-    user = await crud.get_user_by_username(db, username=token_data.username)
+    user = await _load_principal(db, token_data.username, payload)
     if user is None:
         raise credentials_exception from None
     return user
@@ -145,7 +207,7 @@ async def get_optional_current_active_user(
         username: str | None = payload.get("sub")
         if not username:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-        user = await crud.get_user_by_username(db, username=username)
+        user = await _load_principal(db, username, payload)
         if not user or not user.is_active:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Inactive or invalid user")
         return user
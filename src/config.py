@@ -28,6 +28,10 @@ class DatabaseSettings(BaseModel):
     pool_recycle: int = 3600
     sqlite_optimizations: bool = True
     connection_timeout: int = 20
+    # SQLite WAL connections serving reads next to the single writer (0 = one shared connection)
+    read_pool_size: int = 4
+    # Prepared statements cached per asyncpg connection
+    statement_cache_size: int = 500
 
 
 class AuthSettings(BaseModel):
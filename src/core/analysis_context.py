@@ -0,0 +1,137 @@
+"""Per-analysis context shared by the stages of the compliance pipeline.
+
+``AnalysisService`` and ``ComplianceAnalyzer`` both need the clinical entities,
+the retrieved compliance rules and the document-type classification for the
+same scrubbed text. An ``AnalysisContext`` is created once per analysis and
+handed from stage to stage so that each expensive stage runs exactly once. The
+attached ``StageTrace`` records how often each stage actually executed and how
+often a cached result was reused, which makes redundant work visible.
+"""
+
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+ENTITY_EXTRACTION = "entity_extraction"
+RULE_RETRIEVAL = "rule_retrieval"
+DOCUMENT_CLASSIFICATION = "document_classification"
+
+
+@dataclass
+class StageTrace:
+    """Counts stage executions and reuses within a single analysis."""
+
+    executions: dict[str, int] = field(default_factory=dict)
+    reuses: dict[str, int] = field(default_factory=dict)
+    durations_ms: dict[str, float] = field(default_factory=dict)
+
+    def record_execution(self, stage: str, duration_ms: float = 0.0) -> None:
+        """Record that a stage ran."""
+        self.executions[stage] = self.executions.get(stage, 0) + 1
+        self.durations_ms[stage] = self.durations_ms.get(stage, 0.0) + duration_ms
+        if self.executions[stage] > 1:
+            logger.warning(
+                "Stage %s executed %d times in one analysis",
+                stage,
+                self.executions[stage],
+            )
+
+    def record_reuse(self, stage: str) -> None:
+        """Record that a stage result was served from the context."""
+        self.reuses[stage] = self.reuses.get(stage, 0) + 1
+
+    @property
+    def redundant_executions(self) -> dict[str, int]:
+        """Executions beyond the first, per stage."""
+        return {stage: count - 1 for stage, count in self.executions.items() if count > 1}
+
+    def as_dict(self) -> dict[str, Any]:
+        """Serialize the trace for inclusion in analysis metadata."""
+        redundant = self.redundant_executions
+        return {
+            "executions": dict(self.executions),
+            "reuses": dict(self.reuses),
+            "durations_ms": {k: round(v, 2) for k, v in self.durations_ms.items()},
+            "redundant_executions": redundant,
+            "total_redundant_executions": sum(redundant.values()),
+        }
+
+
+@dataclass
+class AnalysisContext:
+    """Carries stage results for one document through the analysis pipeline."""
+
+    document_text: str
+    discipline: str
+    doc_type: str | None = None
+    trace: StageTrace = field(default_factory=StageTrace)
+    _results: dict[str, Any] = field(default_factory=dict, repr=False)
+
+    @property
+    def entities(self) -> list[dict[str, Any]] | None:
+        return self._results.get(ENTITY_EXTRACTION)
+
+    @property
+    def retrieved_rules(self) -> list[dict[str, Any]] | None:
+        return self._results.get(RULE_RETRIEVAL)
+
+    def has_result(self, stage: str) -> bool:
+        return stage in self._results
+
+    def applies_to(self, document_text: str) -> bool:
+        """Return True if this context was built for ``document_text``."""
+        return self.document_text == document_text
+
+    async def run_stage(self, stage: str, compute: Callable[[], Awaitable[T]]) -> T:
+        """Return the stage result, running ``compute`` only on first use.
+
+        Args:
+            stage: The stage name, e.g. ``ENTITY_EXTRACTION``.
+            compute: Coroutine factory producing the stage result. Exceptions
+                propagate and leave the stage unresolved.
+
+        Returns:
+            The stored or freshly computed stage result.
+
+        """
+        if stage in self._results:
+            self.trace.record_reuse(stage)
+            return self._results[stage]
+
+        start_time = time.perf_counter()
+        value = await compute()
+        self.trace.record_execution(stage, (time.perf_counter() - start_time) * 1000)
+        self._results[stage] = value
+        if stage == DOCUMENT_CLASSIFICATION and isinstance(value, str):
+            self.doc_type = value
+        return value
+
+    def record_result(self, stage: str, value: Any, duration_ms: float = 0.0) -> None:
+        """Store a stage result computed outside the context, e.g. in a batch."""
+        if stage in self._results:
+            self.trace.record_reuse(stage)
+            return
+        self.trace.record_execution(stage, duration_ms)
+        self._results[stage] = value
+        if stage == DOCUMENT_CLASSIFICATION and isinstance(value, str):
+            self.doc_type = value
+
+    def entity_summary(self) -> str:
+        """Format the extracted entities for prompts and retrieval queries."""
+        entities = self.entities or []
+        if not entities:
+            return "No specific entities extracted."
+        return ", ".join(
+            f"{entity.get('entity_group', '')}: {entity.get('word', '')}"
+            for entity in entities
+        )
+
+    def rule_query(self) -> str:
+        """Build the rule-retrieval query shared by every pipeline stage."""
+        return f"{self.discipline} {self.doc_type or ''} {self.entity_summary()}"
@@ -0,0 +1,331 @@
+"""Standalone worker pool for queued document analyses.
+
+When ``performance.analysis_job_queue`` is enabled the API only spools the
+uploaded document (encrypted) and enqueues a job row in the persistent task
+table. Worker processes started with::
+
+    python -m src.core.analysis_job_worker --processes 2
+
+claim jobs under a lease, keep the lease alive with heartbeats while the
+analysis runs, and write progress and the final result back to the task table.
+A job whose worker dies stops heartbeating; once its lease expires any worker
+returns it to the queue (or fails it after ``max_retries``).
+"""
+
+import argparse
+import asyncio
+import datetime
+import logging
+import multiprocessing
+import os
+import socket
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from .persistent_task_registry import (
+    DEFAULT_LEASE_SECONDS,
+    PersistentTaskRegistry,
+    TaskMetadata,
+    TaskStatus,
+    persistent_task_registry,
+)
+from .upload_spool import SpooledUpload, iter_encrypted_chunks, write_encrypted_chunk
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SPOOL_DIR = Path("temp") / "analysis_jobs"
+DEFAULT_POLL_INTERVAL = 1.0
+
+
+def _performance_settings() -> Dict[str, Any]:
+    try:
+        from src.config import get_settings
+
+        return dict(get_settings().performance or {})
+    except Exception:
+        return {}
+
+
+def job_queue_enabled() -> bool:
+    """Return True when analyses should be queued for worker processes."""
+    return bool(_performance_settings().get("analysis_job_queue", False))
+
+
+def _spool_dir() -> Path:
+    return Path(_performance_settings().get("analysis_job_spool_dir", DEFAULT_SPOOL_DIR))
+
+
+def spool_document(task_id: str, content: bytes | SpooledUpload) -> str:
+    """Encrypt an uploaded document to the job spool and return its path.
+
+    A streamed upload that was already spooled to disk is moved into the job
+    spool instead of being decrypted and re-encrypted.
+    """
+    spool_dir = _spool_dir()
+    spool_dir.mkdir(parents=True, exist_ok=True)
+    path = spool_dir / f"{task_id}.enc"
+    if isinstance(content, SpooledUpload):
+        return content.persist_encrypted(path)
+    with open(path, "wb") as handle:
+        write_encrypted_chunk(handle, content)
+    return str(path)
+
+
+def load_spooled_document(path: str) -> bytes:
+    """Read and decrypt a spooled document."""
+    return b"".join(iter_encrypted_chunks(path))
+
+
+def discard_spooled_document(path: Optional[str]) -> None:
+    """Remove a spooled document once its job reached a terminal state."""
+    if not path:
+        return
+    try:
+        Path(path).unlink(missing_ok=True)
+    except OSError as exc:
+        logger.warning("Failed to remove spooled document %s: %s", path, exc)
+
+
+async def _build_analysis_service() -> Any:
+    """Create an AnalysisService the same way the API does at startup."""
+    from src.config import get_settings
+
+    from .analysis_service import AnalysisService
+
+    if getattr(get_settings(), "use_ai_mocks", False):
+        return AnalysisService()
+
+    from .hybrid_retriever import HybridRetriever
+
+    retriever = HybridRetriever()
+    await retriever.initialize()
+    return AnalysisService(retriever=retriever)
+
+
+class AnalysisJobWorker:
+    """Claims queued analysis jobs and runs them to completion."""
+
+    def __init__(
+        self,
+        registry: PersistentTaskRegistry | None = None,
+        worker_id: str | None = None,
+        analysis_service: Any = None,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        service_factory: Callable[[], Any] | None = None,
+    ) -> None:
+        self.registry = registry or persistent_task_registry
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.analysis_service = analysis_service
+        self.lease_seconds = lease_seconds
+        self.heartbeat_interval = max(lease_seconds / 3, 0.05)
+        self.poll_interval = poll_interval
+        self._service_factory = service_factory or _build_analysis_service
+
+    async def run(self, stop_event: asyncio.Event | None = None) -> None:
+        """Process jobs until ``stop_event`` is set."""
+        stop_event = stop_event or asyncio.Event()
+        logger.info("Analysis worker %s started", self.worker_id)
+        while not stop_event.is_set():
+            try:
+                processed = await self.run_once()
+            except Exception as exc:
+                logger.exception("Analysis worker loop error: %s", exc)
+                processed = False
+            if not processed:
+                try:
+                    await asyncio.wait_for(stop_event.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+        await self.registry.close()
+        logger.info("Analysis worker %s stopped", self.worker_id)
+
+    async def run_once(self) -> bool:
+        """Requeue expired leases, then claim and run at most one job.
+
+        Returns:
+            True if a job was claimed.
+        """
+        await self.registry.requeue_expired_leases()
+        job = await self.registry.claim_next_job(self.worker_id, self.lease_seconds)
+        if job is None:
+            return False
+        await self._process(job)
+        return True
+
+    async def _process(self, job: TaskMetadata) -> None:
+        payload = job.payload or {}
+        lease_lost = asyncio.Event()
+        analysis = asyncio.create_task(self._execute(job, payload))
+        heartbeat = asyncio.create_task(self._heartbeat(job.task_id, lease_lost, analysis))
+        try:
+            result = await analysis
+        except asyncio.CancelledError:
+            if not lease_lost.is_set():
+                raise
+            logger.warning(
+                "Lease for job %s lost; abandoning it to another worker", job.task_id
+            )
+            return
+        except Exception as exc:
+            await self._record_failure(job, payload, exc)
+            return
+        finally:
+            heartbeat.cancel()
+
+        completed = await self.registry.update_task(
+            job.task_id,
+            expected_lease_owner=self.worker_id,
+            status=TaskStatus.COMPLETED,
+            progress=100,
+            status_message="Analysis complete.",
+            completed_at=datetime.datetime.now(datetime.UTC),
+            lease_owner=None,
+            lease_expires_at=None,
+            result_data=result,
+        )
+        if not completed:
+            # Another worker reclaimed the job and still needs its spooled document
+            logger.warning(
+                "Job %s finished on %s after its lease expired; discarding result",
+                job.task_id,
+                self.worker_id,
+            )
+            return
+        discard_spooled_document(payload.get("spool_path"))
+        logger.info("Job %s completed by %s", job.task_id, self.worker_id)
+
+    async def _heartbeat(
+        self, task_id: str, lease_lost: asyncio.Event, analysis: asyncio.Task
+    ) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            if not await self.registry.renew_lease(task_id, self.worker_id, self.lease_seconds):
+                lease_lost.set()
+                analysis.cancel()
+                return
+
+    async def _execute(self, job: TaskMetadata, payload: Dict[str, Any]) -> Dict[str, Any]:
+        if self.analysis_service is None:
+            self.analysis_service = await self._service_factory()
+
+        content = await asyncio.to_thread(load_spooled_document, payload["spool_path"])
+
+        def _update_progress(percentage: int, message: str | None) -> None:
+            self.registry.record_progress(
+                job.task_id,
+                worker_id=self.worker_id,
+                status=TaskStatus.RUNNING,
+                progress=min(int(percentage), 99),
+                status_message=message or "",
+            )
+
+        _update_progress(0, "Analysis started.")
+        result = await self.analysis_service.analyze_document(
+            file_content=content,
+            original_filename=payload.get("filename") or job.filename,
+            discipline=payload.get("discipline") or job.discipline,
+            analysis_mode=payload.get("analysis_mode") or job.analysis_mode,
+            strictness=payload.get("strictness") or job.strictness,
+            progress_callback=_update_progress,
+        )
+
+        analysis_payload = result if isinstance(result, dict) else {}
+        analysis_data = analysis_payload.get("analysis", analysis_payload)
+        return {
+            "analysis": analysis_payload,
+            "findings": analysis_data.get("findings", []),
+            "overall_score": analysis_data.get("compliance_score")
+            or analysis_payload.get("compliance_score"),
+            "document_type": analysis_data.get("document_type")
+            or analysis_payload.get("document_type"),
+            "report_html": analysis_payload.get("report_html"),
+            "strictness": payload.get("strictness") or job.strictness,
+        }
+
+    async def _record_failure(
+        self, job: TaskMetadata, payload: Dict[str, Any], exc: Exception
+    ) -> None:
+        logger.exception("Job %s failed on %s: %s", job.task_id, self.worker_id, exc)
+        if job.retry_count < job.max_retries:
+            await self.registry.update_task(
+                job.task_id,
+                expected_lease_owner=self.worker_id,
+                status=TaskStatus.RETRYING,
+                retry_count=job.retry_count + 1,
+                error_message=str(exc),
+                lease_owner=None,
+                lease_expires_at=None,
+            )
+            return
+        failed = await self.registry.update_task(
+            job.task_id,
+            expected_lease_owner=self.worker_id,
+            status=TaskStatus.FAILED,
+            error_message=str(exc),
+            completed_at=datetime.datetime.now(datetime.UTC),
+            lease_owner=None,
+            lease_expires_at=None,
+        )
+        if failed:
+            discard_spooled_document(payload.get("spool_path"))
+
+
+def _worker_process_main(lease_seconds: float, poll_interval: float, db_path: str) -> None:
+    logging.basicConfig(level=logging.INFO)
+    registry = PersistentTaskRegistry(db_path=db_path)
+    worker = AnalysisJobWorker(
+        registry=registry, lease_seconds=lease_seconds, poll_interval=poll_interval
+    )
+    try:
+        asyncio.run(worker.run())
+    except KeyboardInterrupt:
+        pass
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Start a supervised pool of analysis worker processes."""
+    parser = argparse.ArgumentParser(description="Run queued compliance analyses.")
+    parser.add_argument("--processes", type=int, default=1, help="Worker processes to run")
+    parser.add_argument("--lease-seconds", type=float, default=DEFAULT_LEASE_SECONDS)
+    parser.add_argument("--poll-interval", type=float, default=DEFAULT_POLL_INTERVAL)
+    parser.add_argument("--db-path", default=persistent_task_registry.db_path)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    ctx = multiprocessing.get_context("spawn")
+    worker_args = (args.lease_seconds, args.poll_interval, args.db_path)
+
+    def _spawn() -> multiprocessing.Process:
+        process = ctx.Process(target=_worker_process_main, args=worker_args, daemon=False)
+        process.start()
+        return process
+
+    processes = [_spawn() for _ in range(max(1, args.processes))]
+    logger.info("Started %d analysis worker processes", len(processes))
+    try:
+        while True:
+            time.sleep(args.poll_interval)
+            for index, process in enumerate(processes):
+                if not process.is_alive():
+                    # Its job (if any) is requeued by the survivors once the lease expires
+                    logger.warning(
+                        "Worker process %s exited with %s; restarting",
+                        process.pid,
+                        process.exitcode,
+                    )
+                    processes[index] = _spawn()
+    except KeyboardInterrupt:
+        logger.info("Stopping analysis workers")
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join(timeout=10)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
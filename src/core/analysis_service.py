@@ -4,12 +4,19 @@ import hashlib
 import inspect
 import json
 import logging
+import time
 import uuid
 from collections.abc import Callable
 from pathlib import Path
 from typing import Any, List, Dict, Optional, Union, Callable, TYPE_CHECKING
 
 from src.config import get_settings as _get_settings
+from src.core.analysis_context import (
+    DOCUMENT_CLASSIFICATION,
+    ENTITY_EXTRACTION,
+    RULE_RETRIEVAL,
+    AnalysisContext,
+)
 from src.core.analysis_utils import enrich_analysis_result, trim_document_text
 from src.core.cache_service import cache_service
 from src.core.checklist_service import DeterministicChecklistService as ChecklistService
@@ -32,6 +39,7 @@ from src.core.multi_tier_cache import MultiTierCacheSystem, CacheTier, EvictionP
 from src.core.clinical_education_engine import ClinicalEducationEngine, CompetencyArea
 from src.core.human_feedback_system import HumanFeedbackSystem
 from src.core.text_utils import sanitize_human_text
+from src.core.upload_spool import SpooledUpload
 from src.utils.prompt_manager import PromptManager
 from src.utils.performance_monitor import monitor_performance, monitor_operation
 
@@ -327,6 +335,51 @@ class AnalysisService:
             return await obj
         return obj
 
+    def _extract_text(
+        self, file_content: bytes | SpooledUpload, original_filename: str | None
+    ) -> str:
+        """Parse an uploaded document into plain text via a short-lived temp file."""
+        temp_dir = Path(self._settings.paths.temp_upload_dir)
+        temp_dir.mkdir(parents=True, exist_ok=True)
+        temp_file_path = temp_dir / f"temp_{uuid.uuid4().hex}_{original_filename or 'file'}"
+        try:
+            if isinstance(file_content, SpooledUpload):
+                file_content.copy_to(temp_file_path)
+            else:
+                temp_file_path.write_bytes(file_content)
+            chunks = parse_document_content(str(temp_file_path))
+            return " ".join(
+                c.get("sentence", "") for c in chunks if isinstance(c, dict)
+            ).strip()
+        except Exception as e:
+            logger.error("Failed to process file content: %s", e)
+            raise ValueError(f"Failed to process file content: {e}")
+        finally:
+            # Clean up temp file immediately after parsing
+            try:
+                if temp_file_path.exists():
+                    temp_file_path.unlink()
+                    logger.info("Cleaned up temporary file: %s", temp_file_path)
+            except Exception as e:
+                logger.warning("Failed to clean up temp file %s: %s", temp_file_path, e)
+
+    async def _classify_scrubbed_text(self, scrubbed_text: str) -> str:
+        """Classify the document type, fast-tracking short documents."""
+        if len(scrubbed_text) < AnalysisConstants.FAST_TRACK_DOCUMENT_LENGTH:
+            return AnalysisConstants.DEFAULT_DOC_TYPE  # Default for fast processing
+        doc_type_raw = await self._maybe_await(
+            self.document_classifier.classify_document(scrubbed_text)
+        )
+        return sanitize_human_text(doc_type_raw or AnalysisConstants.DEFAULT_DOC_TYPE)
+
+    async def _prepare_text(self, text: str) -> str:
+        """Trim the document and apply spelling correction to long texts."""
+        trimmed_text = trim_document_text(text)
+        # Skip heavy preprocessing for faster analysis - basic cleaning only
+        if len(trimmed_text) < AnalysisConstants.LIGHT_PREPROCESSING_LENGTH:
+            return trimmed_text.strip()
+        return await self._maybe_await(self.preprocessing.correct_text(trimmed_text))
+
     def _get_analysis_cache_key(
         self,
         content_hash: str,
@@ -350,9 +403,10 @@ class AnalysisService:
         analysis_mode: Optional[str] = None,
         strictness: Optional[str] = None,
         document_text: Optional[str] = None,
-        file_content: Optional[bytes] = None,
+        file_content: Optional[Union[bytes, SpooledUpload]] = None,
         original_filename: Optional[str] = None,
         progress_callback: Optional[Callable[[int, Optional[str]], None]] = None,
+        analysis_context: Optional[AnalysisContext] = None,
     ) -> Dict[str, Any]:
         # Ensure models are registered
         if not hasattr(self, "_models_registered"):
@@ -372,9 +426,11 @@ class AnalysisService:
         normalized_strictness = (
             strictness or AnalysisConstants.DEFAULT_STRICTNESS
         ).lower()
-        temp_file_path: Path | None = None
         try:
-            if file_content:
+            if isinstance(file_content, SpooledUpload):
+                # Hashed while the upload was streamed in
+                content_hash = file_content.sha256
+            elif file_content:
                 content_hash = hashlib.sha256(file_content).hexdigest()
             elif document_text:
                 content_hash = hashlib.sha256(document_text.encode()).hexdigest()
@@ -419,30 +475,7 @@ class AnalysisService:
 
             _update_progress(5, "Parsing document content...")
             if file_content:
-                temp_dir = Path(self._settings.paths.temp_upload_dir)
-                temp_dir.mkdir(parents=True, exist_ok=True)
-                temp_file_path = (
-                    temp_dir / f"temp_{uuid.uuid4().hex}_{original_filename or 'file'}"
-                )
-                try:
-                    temp_file_path.write_bytes(file_content)
-                    chunks = parse_document_content(str(temp_file_path))
-                    text_to_process = " ".join(
-                        c.get("sentence", "") for c in chunks if isinstance(c, dict)
-                    ).strip()
-                except Exception as e:
-                    logger.error("Failed to process file content: %s", e)
-                    raise ValueError(f"Failed to process file content: {e}")
-                finally:
-                    # Clean up temp file immediately after parsing
-                    try:
-                        if temp_file_path.exists():
-                            temp_file_path.unlink()
-                            logger.info("Cleaned up temporary file: %s", temp_file_path)
-                    except Exception as e:
-                        logger.warning(
-                            "Failed to clean up temp file %s: %s", temp_file_path, e
-                        )
+                text_to_process = self._extract_text(file_content, original_filename)
             else:  # document_text must exist
                 text_to_process = document_text or ""
 
@@ -536,58 +569,74 @@ class AnalysisService:
 
             # --- Start of Optimized Two-Stage Pipeline ---
 
-            # Stage 0: Initial text processing (optimized for speed)
-            _update_progress(25, "Preprocessing document text...")
-            trimmed_text = trim_document_text(text_to_process)
-            # Skip heavy preprocessing for faster analysis - basic cleaning only
-            corrected_text = (
-                trimmed_text.strip()
-                if len(trimmed_text) < 5000
-                else await self._maybe_await(
-                    self.preprocessing.correct_text(trimmed_text)
+            if analysis_context is not None:
+                # Prepared by analyze_batch: text is already preprocessed and scrubbed
+                _update_progress(35, "Using batch-prepared redacted text...")
+                scrubbed_text = analysis_context.document_text
+            else:
+                # Stage 0: Initial text processing (optimized for speed)
+                _update_progress(25, "Preprocessing document text...")
+                corrected_text = await self._prepare_text(text_to_process)
+
+                # Stage 1: PHI Redaction (Security First)
+                _update_progress(35, "Performing PHI redaction...")
+                scrubbed_text = await asyncio.to_thread(
+                    self.phi_scrubber.scrub, corrected_text
+                )
+                analysis_context = AnalysisContext(
+                    document_text=scrubbed_text, discipline=discipline_clean
                 )
-            )
-
-            # Stage 1: PHI Redaction (Security First)
-            _update_progress(35, "Performing PHI redaction...")
-            scrubbed_text = self.phi_scrubber.scrub(corrected_text)
 
             # Stage 2: Clinical Analysis on Anonymized Text (optimized)
             _update_progress(45, "Classifying document type...")
 
-            # Fast-track for shorter documents (skip heavy classification)
-            if len(scrubbed_text) < 2000:
-                doc_type_clean = "Progress Note"  # Default for fast processing
-                _update_progress(50, "Using fast-track classification...")
-            else:
-                _update_progress(48, "Running document classification...")
-                doc_type_raw = await self._maybe_await(
-                    self.document_classifier.classify_document(scrubbed_text)
-                )
-                doc_type_clean = sanitize_human_text(doc_type_raw or "Progress Note")
+            async def _classify_document() -> str:
+                # Fast-track for shorter documents (skip heavy classification)
+                if len(scrubbed_text) < AnalysisConstants.FAST_TRACK_DOCUMENT_LENGTH:
+                    _update_progress(50, "Using fast-track classification...")
+                else:
+                    _update_progress(48, "Running document classification...")
+                doc_type = await self._classify_scrubbed_text(scrubbed_text)
                 _update_progress(55, "Document classification completed...")
+                return doc_type
+
+            doc_type_clean = await analysis_context.run_stage(
+                DOCUMENT_CLASSIFICATION, _classify_document
+            )
 
             _update_progress(60, "Running compliance analysis...")
 
             # Enhanced context optimization and confidence calibration
             _update_progress(62, "Optimizing context and confidence...")
 
-            # Extract entities for context optimization
-            ner_service = getattr(self, "clinical_ner_service", None)
-            entities = ner_service.extract_entities(scrubbed_text) if ner_service else []
+            # Extract entities once; the compliance analyzer reuses them via the context
+            async def _extract_entities() -> list[dict[str, Any]]:
+                ner_service = getattr(self, "clinical_ner_service", None)
+                if ner_service is None:
+                    return []
+                return await asyncio.to_thread(ner_service.extract_entities, scrubbed_text)
 
-            # Retrieve relevant rules
-            retriever = getattr(self, "retriever", None)
-            if retriever is not None:
-                retrieved_rules = await retriever.retrieve(
-                    query=f"{discipline_clean} {doc_type_clean} compliance",
+            entities = await analysis_context.run_stage(
+                ENTITY_EXTRACTION, _extract_entities
+            )
+
+            # Retrieve relevant rules once, with the same query the analyzer would use
+            async def _retrieve_rules() -> list[dict[str, Any]]:
+                retriever = getattr(self, "retriever", None)
+                if retriever is None:
+                    return []
+                return await retriever.retrieve(
+                    query=analysis_context.rule_query(),
                     top_k=5,
+                    category_filter=discipline_clean,
                     discipline=discipline_clean,
                     document_type=doc_type_clean,
                     context_entities=[e.get('word', '') for e in entities]
                 )
-            else:
-                retrieved_rules = []
+
+            retrieved_rules = await analysis_context.run_stage(
+                RULE_RETRIEVAL, _retrieve_rules
+            )
 
             # Context optimization is now integrated into the explanation engine
             context_rules = [rule.get('content', '') for rule in retrieved_rules]
@@ -608,6 +657,7 @@ class AnalysisService:
                     "discipline": discipline_clean,
                     "doc_type": doc_type_clean,
                     "strictness": normalized_strictness,
+                    "analysis_context": analysis_context,
                 }
 
                 # Adjust kwargs based on analyzer signature to keep compatibility with custom analyzers
@@ -625,6 +675,8 @@ class AnalysisService:
                     analysis_kwargs.pop("strictness", None)
                 if "progress_callback" not in params:
                     analysis_kwargs.pop("progress_callback", None)
+                if "analysis_context" not in params:
+                    analysis_kwargs.pop("analysis_context", None)
 
                 supports_progress = "progress_callback" in params
                 if supports_progress:
@@ -657,12 +709,23 @@ class AnalysisService:
                 fact_check_results = []
                 fact_checker = getattr(self, 'fact_checker_service', None)
                 if fact_checker is not None:
-                    for finding in findings:
-                        if finding.get('confidence', 0) > 0.7:  # Only fact-check high-confidence findings
-                            premise = optimized_text
-                            hypothesis = finding.get('issue_title', '')
-                            is_consistent = fact_checker.check_consistency(premise, hypothesis)
-                            fact_check_results.append(is_consistent)
+                    # Only fact-check high-confidence findings, in one batched call
+                    # that windows the document down to the relevant sentences.
+                    fact_check_pairs = [
+                        (optimized_text, finding.get('issue_title', ''))
+                        for finding in findings
+                        if finding.get('confidence', 0) > 0.7
+                    ]
+                    if fact_check_pairs:
+                        if hasattr(fact_checker, 'check_consistency_batch'):
+                            fact_check_results = await asyncio.to_thread(
+                                fact_checker.check_consistency_batch, fact_check_pairs
+                            )
+                        else:
+                            fact_check_results = [
+                                fact_checker.check_consistency(premise, hypothesis)
+                                for premise, hypothesis in fact_check_pairs
+                            ]
 
                 # Calculate context relevance
                 context_relevance = len(optimized_rules) / max(1, len(context_rules)) if context_rules else 0.5
@@ -938,6 +1001,7 @@ class AnalysisService:
             if analysis_mode and not metadata.get("analysis_mode"):
                 metadata["analysis_mode"] = analysis_mode
             metadata["strictness"] = normalized_strictness
+            metadata["stage_trace"] = analysis_context.trace.as_dict()
 
             _update_progress(95, "Generating report...")
             # Add timeout to report generation
@@ -997,25 +1061,222 @@ class AnalysisService:
             return AnalysisOutput(final_report)
 
         finally:
-            if temp_file_path:
-                try:
-                    if temp_file_path.exists():
-                        temp_file_path.unlink()
-                        logger.info("Cleaned up temporary file: %s", temp_file_path)
-                    else:
-                        logger.debug(
-                            "Temporary file already removed: %s", temp_file_path
-                        )
-                except Exception as exc:
-                    logger.warning(
-                        "Failed to remove temporary file %s: %s", temp_file_path, exc
-                    )
             # Clean up task files
             cleanup_service = get_cleanup_service()
             await cleanup_service.cleanup_task_files(
                 task_id if "task_id" in locals() else "unknown"
             )
 
+    async def analyze_batch(
+        self,
+        documents: list[dict[str, Any]],
+        discipline: str = "pt",
+        analysis_mode: Optional[str] = None,
+        strictness: Optional[str] = None,
+        progress_callback: Optional[Callable[[int, Optional[str]], None]] = None,
+        document_progress_callback: Optional[
+            Callable[[int, int, Optional[str]], None]
+        ] = None,
+    ) -> list[Dict[str, Any]]:
+        """Analyze several documents, batching the shared model stages.
+
+        Documents are parsed in parallel. In the real pipeline the texts are
+        then PHI-scrubbed with one ``scrub_many`` call, entities are extracted
+        with one batched NER pass and rules are retrieved with one batched
+        embedding call. Each document's compliance analysis then reuses these
+        results through its ``AnalysisContext``.
+
+        Args:
+            documents: One dict per document with ``file_content`` or
+                ``document_text`` and an optional ``original_filename``.
+            discipline: Discipline applied to every document.
+            analysis_mode: Analysis mode applied to every document.
+            strictness: Strictness applied to every document.
+            progress_callback: Receives aggregate progress for the batch.
+            document_progress_callback: Receives ``(index, percentage, message)``
+                for individual documents.
+
+        Returns:
+            One entry per document, in input order: the analysis output, or a
+            dict with ``error`` and ``original_filename`` if that document failed.
+
+        """
+        total = len(documents)
+        if total == 0:
+            return []
+
+        settings = getattr(self, "_settings", None) or _get_settings()
+        perf = dict(getattr(settings, "performance", None) or {})
+        parse_concurrency = max(1, int(perf.get("batch_parse_concurrency", 4)))
+        analysis_concurrency = max(1, int(perf.get("batch_analysis_concurrency", 1)))
+
+        document_progress = [0] * total
+        completed = 0
+
+        def _report(index: int, percentage: int, message: Optional[str]) -> None:
+            document_progress[index] = max(document_progress[index], int(percentage))
+            if document_progress_callback:
+                document_progress_callback(index, int(percentage), message)
+            if progress_callback:
+                progress_callback(
+                    sum(document_progress) // total,
+                    f"{completed}/{total} documents analyzed",
+                )
+
+        results: list[Any] = [None] * total
+        filenames = [doc.get("original_filename") for doc in documents]
+
+        # Stage 1: parse every upload in parallel worker threads
+        parse_limit = asyncio.Semaphore(parse_concurrency)
+
+        async def _parse(index: int) -> Optional[str]:
+            document = documents[index]
+            async with parse_limit:
+                _report(index, 5, "Parsing document content...")
+                if document.get("file_content"):
+                    text = await asyncio.to_thread(
+                        self._extract_text, document["file_content"], filenames[index]
+                    )
+                else:
+                    text = document.get("document_text") or ""
+            if not text:
+                raise ValueError("No text content could be extracted from the document.")
+            _report(index, 15, "Document parsing completed successfully...")
+            return text
+
+        parsed = await asyncio.gather(
+            *(_parse(i) for i in range(total)), return_exceptions=True
+        )
+        texts: list[Optional[str]] = []
+        for index, outcome in enumerate(parsed):
+            if isinstance(outcome, Exception):
+                results[index] = {"error": str(outcome), "original_filename": filenames[index]}
+                texts.append(None)
+            else:
+                texts.append(outcome)
+
+        # Stage 2: shared model stages across all documents (real pipeline only)
+        contexts: list[Optional[AnalysisContext]] = [None] * total
+        if not self.use_mocks:
+            contexts = await self._prepare_batch_contexts(
+                texts, sanitize_human_text(discipline or "Unknown"), _report
+            )
+
+        # Stage 3: per-document compliance analysis reusing the prepared contexts
+        analysis_limit = asyncio.Semaphore(analysis_concurrency)
+
+        async def _analyze(index: int) -> None:
+            nonlocal completed
+            async with analysis_limit:
+                try:
+                    results[index] = await self.analyze_document(
+                        discipline=discipline,
+                        analysis_mode=analysis_mode,
+                        strictness=strictness,
+                        document_text=texts[index],
+                        original_filename=filenames[index],
+                        progress_callback=lambda pct, msg: _report(index, pct, msg),
+                        analysis_context=contexts[index],
+                    )
+                except Exception as exc:
+                    logger.error(
+                        "Batch analysis failed for document %d (%s): %s",
+                        index,
+                        filenames[index],
+                        exc,
+                    )
+                    results[index] = {"error": str(exc), "original_filename": filenames[index]}
+            completed += 1
+            _report(index, 100, "Analysis complete.")
+
+        await asyncio.gather(
+            *(_analyze(i) for i in range(total) if texts[i] is not None)
+        )
+        return results
+
+    async def _prepare_batch_contexts(
+        self,
+        texts: list[Optional[str]],
+        discipline_clean: str,
+        report: Callable[[int, int, Optional[str]], None],
+    ) -> list[Optional[AnalysisContext]]:
+        """Scrub, classify, extract entities and retrieve rules for a batch."""
+        contexts: list[Optional[AnalysisContext]] = [None] * len(texts)
+        # Very large documents take the chunked path inside analyze_document
+        indices = [
+            i
+            for i, text in enumerate(texts)
+            if text is not None and len(text) // 4 <= 2000
+        ]
+        if not indices:
+            return contexts
+
+        for i in indices:
+            report(i, 25, "Preprocessing document text...")
+        prepared = [await self._prepare_text(texts[i]) for i in indices]
+
+        for i in indices:
+            report(i, 35, "Performing PHI redaction...")
+        if hasattr(self.phi_scrubber, "scrub_many"):
+            scrubbed = await asyncio.to_thread(self.phi_scrubber.scrub_many, prepared)
+        else:
+            scrubbed = [
+                await asyncio.to_thread(self.phi_scrubber.scrub, text) for text in prepared
+            ]
+        for i, text in zip(indices, scrubbed):
+            contexts[i] = AnalysisContext(document_text=text, discipline=discipline_clean)
+
+        for i in indices:
+            report(i, 45, "Classifying document type...")
+            started = time.perf_counter()
+            doc_type = await self._classify_scrubbed_text(contexts[i].document_text)
+            contexts[i].record_result(
+                DOCUMENT_CLASSIFICATION, doc_type, (time.perf_counter() - started) * 1000
+            )
+
+        ner_service = getattr(self, "clinical_ner_service", None)
+        started = time.perf_counter()
+        if ner_service is None:
+            entity_lists = [[] for _ in indices]
+        elif hasattr(ner_service, "extract_entities_batch"):
+            entity_lists = await asyncio.to_thread(
+                ner_service.extract_entities_batch, list(scrubbed)
+            )
+        else:
+            entity_lists = [
+                await asyncio.to_thread(ner_service.extract_entities, text)
+                for text in scrubbed
+            ]
+        share_ms = (time.perf_counter() - started) * 1000 / len(indices)
+        for i, entities in zip(indices, entity_lists):
+            contexts[i].record_result(ENTITY_EXTRACTION, entities, share_ms)
+            report(i, 55, "Clinical entities extracted...")
+
+        retriever = getattr(self, "retriever", None)
+        requests = [
+            {
+                "query": contexts[i].rule_query(),
+                "top_k": 5,
+                "category_filter": discipline_clean,
+                "discipline": discipline_clean,
+                "document_type": contexts[i].doc_type,
+                "context_entities": [e.get("word", "") for e in contexts[i].entities or []],
+            }
+            for i in indices
+        ]
+        started = time.perf_counter()
+        if retriever is None:
+            rule_lists = [[] for _ in indices]
+        elif hasattr(retriever, "retrieve_batch"):
+            rule_lists = await retriever.retrieve_batch(requests)
+        else:
+            rule_lists = [await retriever.retrieve(**request) for request in requests]
+        share_ms = (time.perf_counter() - started) * 1000 / len(indices)
+        for i, rules in zip(indices, rule_lists):
+            contexts[i].record_result(RULE_RETRIEVAL, rules, share_ms)
+            report(i, 58, "Compliance rules retrieved...")
+        return contexts
+
     async def _run_mock_pipeline(
         self,
         *,
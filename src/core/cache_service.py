@@ -318,6 +318,82 @@ class NERCache:
         cls._cache.clear()
 
 
+class FactCheckCache:
+    """Cache for fact-check verdicts keyed by model, premise hash and hypothesis."""
+
+    _cache = MemoryAwareLRUCache(max_memory_mb=64)
+
+    @staticmethod
+    def _key(model_name: str, premise: str, hypothesis: str) -> str:
+        return _hash_key(model_name, _hash_key(premise), hypothesis)
+
+    @classmethod
+    def get_verdict(cls, model_name: str, premise: str, hypothesis: str) -> bool | None:
+        return cls._cache.get(cls._key(model_name, premise, hypothesis))
+
+    @classmethod
+    def set_verdict(
+        cls,
+        model_name: str,
+        premise: str,
+        hypothesis: str,
+        verdict: bool,
+        ttl_hours: float | None = 24.0,
+    ) -> None:
+        cls._cache.set(
+            cls._key(model_name, premise, hypothesis), verdict, ttl_hours=ttl_hours
+        )
+
+    @classmethod
+    def memory_usage_mb(cls) -> float:
+        return cls._cache._current_memory_mb()
+
+    @classmethod
+    def entry_count(cls) -> int:
+        return len(cls._cache)
+
+    @classmethod
+    def clear(cls) -> None:
+        """Clear all cached fact-check verdicts."""
+        cls._cache.clear()
+
+
+class TipCache:
+    """Cache for personalized tips keyed by rule id and normalized issue text."""
+
+    _cache = MemoryAwareLRUCache(max_memory_mb=32)
+
+    @staticmethod
+    def _key(rule_id: str | None, issue: str) -> str:
+        normalized = " ".join(
+            "".join(ch for ch in issue.lower() if ch.isalnum() or ch.isspace()).split()
+        )
+        return _hash_key("tip", str(rule_id or ""), normalized)
+
+    @classmethod
+    def get_tip(cls, rule_id: str | None, issue: str) -> str | None:
+        return cls._cache.get(cls._key(rule_id, issue))
+
+    @classmethod
+    def set_tip(
+        cls, rule_id: str | None, issue: str, tip: str, ttl_hours: float | None = 72.0
+    ) -> None:
+        cls._cache.set(cls._key(rule_id, issue), tip, ttl_hours=ttl_hours)
+
+    @classmethod
+    def memory_usage_mb(cls) -> float:
+        return cls._cache._current_memory_mb()
+
+    @classmethod
+    def entry_count(cls) -> int:
+        return len(cls._cache)
+
+    @classmethod
+    def clear(cls) -> None:
+        """Clear all cached tips."""
+        cls._cache.clear()
+
+
 def get_cache_stats() -> dict[str, float]:
     """Return basic statistics about in-memory caches."""
     vm = psutil.virtual_memory()
@@ -325,6 +401,8 @@ def get_cache_stats() -> dict[str, float]:
     ner_usage = NERCache.memory_usage_mb()
     llm_usage = LLMResponseCache.memory_usage_mb()
     doc_usage = DocumentCache.memory_usage_mb()
+    fact_check_usage = FactCheckCache.memory_usage_mb()
+    tip_usage = TipCache.memory_usage_mb()
     direct_entries = len(cache_service._direct_cache)
     direct_usage = 0.0
     for value in cache_service._direct_cache.values():
@@ -339,18 +417,29 @@ def get_cache_stats() -> dict[str, float]:
         + NERCache.entry_count()
         + LLMResponseCache.entry_count()
         + DocumentCache.entry_count()
+        + FactCheckCache.entry_count()
+        + TipCache.entry_count()
     )
 
     return {
         "total_entries": total_entries,
         "memory_usage_mb": round(
-            direct_usage + embedding_usage + ner_usage + llm_usage + doc_usage, 3
+            direct_usage
+            + embedding_usage
+            + ner_usage
+            + llm_usage
+            + doc_usage
+            + fact_check_usage
+            + tip_usage,
+            3,
         ),
         "system_memory_percent": float(vm.percent),
         "embedding_entries": EmbeddingCache.entry_count(),
         "ner_entries": NERCache.entry_count(),
         "llm_entries": LLMResponseCache.entry_count(),
         "doc_entries": DocumentCache.entry_count(),
+        "fact_check_entries": FactCheckCache.entry_count(),
+        "tip_entries": TipCache.entry_count(),
         "direct_entries": direct_entries,
     }
 
@@ -361,6 +450,8 @@ def cleanup_all_caches() -> None:
     NERCache.clear()
     DocumentCache.clear()
     LLMResponseCache.clear()
+    FactCheckCache.clear()
+    TipCache.clear()
     cache_service.clear_disk_cache()
 
 
@@ -370,6 +461,8 @@ __all__ = [
     "MemoryAwareLRUCache",
     "EmbeddingCache",
     "NERCache",
+    "FactCheckCache",
+    "TipCache",
     "DocumentCache",
     "LLMResponseCache",
     "get_cache_stats",
@@ -28,6 +28,12 @@ import numpy as np
 import sqlalchemy
 import sqlalchemy.exc
 
+from src.core.analysis_context import (
+    ENTITY_EXTRACTION,
+    RULE_RETRIEVAL,
+    AnalysisContext,
+)
+from src.core.cache_service import TipCache
 from src.core.confidence_calibrator import ConfidenceCalibrator
 from src.core.explanation import ExplanationEngine
 from src.core.fact_checker_service import FactCheckerService
@@ -40,6 +46,10 @@ from src.utils.prompt_manager import PromptManager
 
 logger = logging.getLogger(__name__)
 CONFIDENCE_THRESHOLD = 0.7
+# Defaults for concurrent tip generation; overridable through the performance
+# section of config.yaml (tip_concurrency, tip_time_budget_seconds).
+TIP_CONCURRENCY = 4
+TIP_TIME_BUDGET_SECONDS = 30.0
 
 
 class ComplianceAnalyzer:
@@ -259,6 +269,7 @@ class ComplianceAnalyzer:
         doc_type: str,
         strictness: str | None = None,
         progress_callback: Callable[[int, str | None], None] | None = None,
+        analysis_context: AnalysisContext | None = None,
     ) -> dict[str, Any]:
         """Analyzes a given document for compliance based on discipline and document type.
 
@@ -275,6 +286,9 @@ class ComplianceAnalyzer:
             discipline: The clinical discipline relevant to the document (e.g., "pt", "ot").
             doc_type: The type of the document (e.g., "progress_note", "evaluation").
             strictness: Optional strictness setting ("lenient", "standard", or "strict") to adjust scoring sensitivity.
+            progress_callback: Optional callback receiving (percentage, message) updates.
+            analysis_context: Optional per-analysis context; entities and rules it
+                already holds for the same text are reused instead of recomputed.
 
         Returns:
             A dictionary containing the comprehensive analysis result, including findings, explanations, and tips.
@@ -285,55 +299,30 @@ class ComplianceAnalyzer:
         if strictness_level not in {"lenient", "standard", "strict"}:
             strictness_level = "standard"
 
+        # Reuse stage results already computed upstream for the same text
+        if analysis_context is None or not analysis_context.applies_to(document_text):
+            analysis_context = AnalysisContext(
+                document_text=document_text, discipline=discipline, doc_type=doc_type
+            )
+        elif analysis_context.doc_type is None:
+            analysis_context.doc_type = doc_type
+
         # Extract entities with timeout to prevent hanging
         if progress_callback:
             progress_callback(10, "Extracting clinical entities...")
-        try:
-            if self.ner_service:
-                entities = await asyncio.wait_for(
-                    asyncio.to_thread(self.ner_service.extract_entities, document_text),
-                    timeout=30.0,  # 30 second timeout for NER
-                )
-            else:
-                entities = []
-        except TimeoutError:
-            logger.exception("NER extraction timed out after 30 seconds")
-            entities = []
-        except (FileNotFoundError, PermissionError, OSError) as e:
-            logger.exception("NER extraction failed: %s", e)
-            entities = []
-        entity_list_str = (
-            ", ".join(
-                f"{entity['entity_group']}: {entity['word']}" for entity in entities
-            )
-            if entities
-            else "No specific entities extracted."
+        entities = await analysis_context.run_stage(
+            ENTITY_EXTRACTION, lambda: self._extract_entities(document_text)
         )
+        entity_list_str = analysis_context.entity_summary()
 
-        search_query = f"{discipline} {doc_type} {entity_list_str}"
         if progress_callback:
             progress_callback(30, "Retrieving compliance rules...")
-        try:
-            # Add timeout to retrieval to prevent hanging
-            retrieved_rules = await asyncio.wait_for(
-                self.retriever.retrieve(
-                    search_query,
-                    category_filter=discipline,
-                    discipline=discipline,
-                    document_type=doc_type,
-                    context_entities=(
-                        [entity["word"] for entity in entities] if entities else None
-                    ),
-                ),
-                timeout=60.0,  # 1 minute timeout for rule retrieval
-            )
-            logger.info("Retrieved %d rules for analysis.", len(retrieved_rules))
-        except TimeoutError:
-            logger.exception("Rule retrieval timed out after 1 minute")
-            retrieved_rules = []
-        except (sqlalchemy.exc.SQLAlchemyError, sqlite3.Error) as e:
-            logger.exception("Rule retrieval failed: %s", e)
-            retrieved_rules = []
+        retrieved_rules = await analysis_context.run_stage(
+            RULE_RETRIEVAL,
+            lambda: self._retrieve_rules(
+                analysis_context.rule_query(), discipline, doc_type, entities
+            ),
+        )
 
         formatted_rules = self._format_rules_for_prompt(retrieved_rules)
         if self.prompt_manager:
@@ -500,6 +489,50 @@ class ComplianceAnalyzer:
         logger.info("Compliance analysis complete.")
         return final_analysis
 
+    async def _extract_entities(self, document_text: str) -> list[dict[str, Any]]:
+        """Run NER with a timeout, returning an empty list on failure."""
+        try:
+            if self.ner_service:
+                return await asyncio.wait_for(
+                    asyncio.to_thread(self.ner_service.extract_entities, document_text),
+                    timeout=30.0,  # 30 second timeout for NER
+                )
+        except TimeoutError:
+            logger.exception("NER extraction timed out after 30 seconds")
+        except (FileNotFoundError, PermissionError, OSError) as e:
+            logger.exception("NER extraction failed: %s", e)
+        return []
+
+    async def _retrieve_rules(
+        self,
+        search_query: str,
+        discipline: str,
+        doc_type: str,
+        entities: list[dict[str, Any]],
+    ) -> list[dict[str, Any]]:
+        """Retrieve compliance rules with a timeout, returning an empty list on failure."""
+        try:
+            # Add timeout to retrieval to prevent hanging
+            retrieved_rules = await asyncio.wait_for(
+                self.retriever.retrieve(
+                    search_query,
+                    category_filter=discipline,
+                    discipline=discipline,
+                    document_type=doc_type,
+                    context_entities=(
+                        [entity["word"] for entity in entities] if entities else None
+                    ),
+                ),
+                timeout=60.0,  # 1 minute timeout for rule retrieval
+            )
+            logger.info("Retrieved %d rules for analysis.", len(retrieved_rules))
+            return retrieved_rules
+        except TimeoutError:
+            logger.exception("Rule retrieval timed out after 1 minute")
+        except (sqlalchemy.exc.SQLAlchemyError, sqlite3.Error) as e:
+            logger.exception("Rule retrieval failed: %s", e)
+        return []
+
     def _extract_findings_from_text(
         self, text_response: str, document_text: str
     ) -> dict[str, Any]:
@@ -685,6 +718,11 @@ class ComplianceAnalyzer:
         - Marking findings with low confidence.
         - Generating personalized tips using NLG (if enabled).
 
+        Findings are processed concurrently, bounded by the ``tip_concurrency``
+        performance setting. Tips are cached by rule id and issue, and once the
+        per-report ``tip_time_budget_seconds`` is spent the remaining findings
+        fall back to their ``suggestion`` text.
+
         Args:
             explained_analysis: The analysis result with explanations.
             retrieved_rules: The list of rules retrieved for the analysis.
@@ -697,76 +735,114 @@ class ComplianceAnalyzer:
         if not isinstance(findings, list):
             return explained_analysis
 
-        for finding in findings:
-            rule_id = finding.get("rule_id")
-            associated_rule = next(
-                (r for r in retrieved_rules if r.get("id") == rule_id), None
-            )
+        from src.config import get_settings
 
-            # RAG-based fact-checking (preferred) or traditional fact-checking
-            if associated_rule:
-                is_plausible = True
-
-                # Try RAG-based fact-checking first
-                if self.rag_fact_checker and self.rag_fact_checker.is_ready():
-                    try:
-                        # Check if deep fact-checking is enabled in settings
-                        from src.config import get_settings
-
-                        settings = get_settings()
-                        deep_check = getattr(
-                            settings.performance, "enable_deep_fact_checking", False
-                        )
-
-                        is_plausible = (
-                            await self.rag_fact_checker.check_finding_plausibility(
-                                finding, associated_rule, deep_check=deep_check
-                            )
-                        )
-                    except Exception as e:
-                        logger.warning(
-                            f"RAG fact-checking failed: {e}, falling back to traditional"
-                        )
-                        # Fall back to traditional fact-checking
-                        if self.fact_checker_service:
-                            is_plausible = (
-                                self.fact_checker_service.is_finding_plausible(
-                                    finding, associated_rule
-                                )
-                            )
-
-                # Fall back to traditional fact-checking if RAG is not available
-                elif self.fact_checker_service:
-                    is_plausible = self.fact_checker_service.is_finding_plausible(
-                        finding, associated_rule
-                    )
+        performance = get_settings().performance or {}
+        deep_check = bool(performance.get("enable_deep_fact_checking", False))
+        concurrency = max(1, int(performance.get("tip_concurrency", TIP_CONCURRENCY)))
+        budget = float(
+            performance.get("tip_time_budget_seconds", TIP_TIME_BUDGET_SECONDS)
+        )
 
-                if not is_plausible:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + budget
+        semaphore = asyncio.Semaphore(concurrency)
+        rules_by_id: dict[Any, dict[str, Any]] = {}
+        for rule in retrieved_rules:
+            rules_by_id.setdefault(rule.get("id"), rule)
+
+        async def _process(finding: dict[str, Any]) -> None:
+            async with semaphore:
+                associated_rule = rules_by_id.get(finding.get("rule_id"))
+                if associated_rule and not await self._is_finding_plausible(
+                    finding, associated_rule, deep_check
+                ):
                     finding["is_disputed"] = True
 
-            # Confidence threshold check (may have been updated by calibration)
-            confidence = finding.get("confidence", 1.0)
-            if (
-                isinstance(confidence, float | int)
-                and confidence < CONFIDENCE_THRESHOLD
-                and not finding.get(
-                    "confidence_calibrated", False
-                )  # Skip if already calibrated
-            ):
-                finding["is_low_confidence"] = True
-
-            if self.nlg_service:
-                tip = await asyncio.to_thread(
-                    self.nlg_service.generate_personalized_tip, finding
+                # Confidence threshold check (may have been updated by calibration)
+                confidence = finding.get("confidence", 1.0)
+                if (
+                    isinstance(confidence, float | int)
+                    and confidence < CONFIDENCE_THRESHOLD
+                    and not finding.get(
+                        "confidence_calibrated", False
+                    )  # Skip if already calibrated
+                ):
+                    finding["is_low_confidence"] = True
+
+                if self.nlg_service:
+                    finding["personalized_tip"] = await self._generate_tip(
+                        finding, deadline - loop.time()
+                    )
+                else:
+                    finding.setdefault(
+                        "personalized_tip",
+                        finding.get("suggestion", "Tip generation unavailable."),
+                    )
+
+        await asyncio.gather(
+            *(_process(finding) for finding in findings if isinstance(finding, dict))
+        )
+        return explained_analysis
+
+    async def _is_finding_plausible(
+        self, finding: dict[str, Any], associated_rule: dict[str, Any], deep_check: bool
+    ) -> bool:
+        """RAG-based fact-checking (preferred) or traditional fact-checking."""
+        # Try RAG-based fact-checking first
+        if self.rag_fact_checker and self.rag_fact_checker.is_ready():
+            try:
+                return await self.rag_fact_checker.check_finding_plausibility(
+                    finding, associated_rule, deep_check=deep_check
                 )
-                finding["personalized_tip"] = tip
-            else:
-                finding.setdefault(
-                    "personalized_tip",
-                    finding.get("suggestion", "Tip generation unavailable."),
+            except Exception as e:
+                logger.warning(
+                    f"RAG fact-checking failed: {e}, falling back to traditional"
                 )
+                # Fall back to traditional fact-checking
+                if self.fact_checker_service:
+                    return await asyncio.to_thread(
+                        self.fact_checker_service.is_finding_plausible,
+                        finding,
+                        associated_rule,
+                    )
+                return True
 
-        return explained_analysis
+        # Fall back to traditional fact-checking if RAG is not available
+        if self.fact_checker_service:
+            return await asyncio.to_thread(
+                self.fact_checker_service.is_finding_plausible, finding, associated_rule
+            )
+        return True
+
+    async def _generate_tip(self, finding: dict[str, Any], remaining: float) -> str:
+        """Return a cached or freshly generated tip within the remaining time budget."""
+        fallback = finding.get("suggestion", "Tip generation unavailable.")
+        rule_id = finding.get("rule_id")
+        issue = str(finding.get("issue_title") or finding.get("title") or "")
+        cacheable = bool(rule_id or issue)
+
+        if cacheable:
+            cached_tip = TipCache.get_tip(rule_id, issue)
+            if cached_tip is not None:
+                return cached_tip
+
+        if remaining <= 0:
+            logger.info("Tip time budget exhausted; using suggestion text")
+            return fallback
+
+        try:
+            tip = await asyncio.wait_for(
+                asyncio.to_thread(self.nlg_service.generate_personalized_tip, finding),
+                timeout=remaining,
+            )
+        except TimeoutError:
+            logger.warning("Tip generation exceeded the report time budget")
+            return fallback
+
+        if cacheable and tip and tip != fallback:
+            TipCache.set_tip(rule_id, issue, tip)
+        return tip
 
     @staticmethod
     def _format_rules_for_prompt(rules: list[dict[str, Any]]) -> str:
@@ -1,18 +1,17 @@
 import json
 import logging
+import math
 import sqlite3
-import statistics
 import threading
+from collections import defaultdict
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import Enum
 from pathlib import Path
 from typing import Any
 
-import requests
 import sqlalchemy
 import sqlalchemy.exc
-from requests.exceptions import HTTPError
 
 logger = logging.getLogger(__name__)
 
@@ -93,90 +92,294 @@ class MetricBuffer:
             return len(self._buffer)
 
 
-class TimeSeriesStorage:
-    """SQLite-based time-series storage for metrics."""
+# Width of the rollup buckets kept for each aggregation level
+BUCKET_SECONDS = {
+    AggregationLevel.SHORT_TERM: 60,
+    AggregationLevel.MEDIUM_TERM: 300,
+    AggregationLevel.LONG_TERM: 3600,
+}
+
+# Downsampling retention: raw points are dropped first, coarser rollups are
+# kept longer. Each is further capped by the retention passed to cleanup.
+DEFAULT_RETENTION_DAYS = {
+    AggregationLevel.RAW: 2,
+    AggregationLevel.SHORT_TERM: 7,
+    AggregationLevel.MEDIUM_TERM: 30,
+    AggregationLevel.LONG_TERM: 365,
+}
+
+RAW_PARTITION_PREFIX = "raw_metrics_"
+
+# How often the background loop moves buffered metrics into storage
+FLUSH_INTERVAL_SECONDS = 1.0
+
+# Tables of the previous single-table schema, migrated and dropped on open
+LEGACY_TABLES = ("raw_metrics", "aggregated_metrics")
+LEGACY_MIGRATION_BATCH_SIZE = 5000
+
+# ``PRAGMA auto_vacuum`` value for INCREMENTAL
+AUTO_VACUUM_INCREMENTAL = 2
+
+
+def _bucket_starts(timestamp: str) -> tuple[str, str, str]:
+    """Short, medium and long bucket starts of an ISO ``timestamp``, in ``BUCKET_SECONDS`` order.
+
+    Works on the string so ingestion avoids parsing every point; the bucket
+    starts are ISO timestamps themselves.
+    """
+    minute = timestamp[:16]
+    five_minutes = f"{timestamp[:14]}{int(timestamp[14:16]) // 5 * 5:02d}"
+    return f"{minute}:00", f"{five_minutes}:00", f"{timestamp[:13]}:00:00"
 
-    def __init__(self, db_path: str = "metrics.db"):
-        import threading
 
+def _partition_name(timestamp: str) -> str:
+    """Daily raw partition holding an ISO ``timestamp``."""
+    return RAW_PARTITION_PREFIX + timestamp[:10].replace("-", "")
+
+
+def _sample_std(count: int, total: float, total_sq: float) -> float:
+    """Sample standard deviation from running sums, matching ``statistics.stdev``."""
+    if count < 2:
+        return 0.0
+    return math.sqrt(max(total_sq - total * total / count, 0.0) / (count - 1))
+
+
+class TimeSeriesStorage:
+    """SQLite-based time-series storage for metrics.
+
+    Raw points go to daily partition tables (``raw_metrics_YYYYMMDD``) that
+    only hold a timestamp, a series id, the value and optional metadata;
+    name, source, unit, type and tags are stored once per series in
+    ``metric_series``. Every flush also folds the points into per-bucket
+    running count/sum/sum of squares/min/max rows in ``metric_rollups`` for
+    each aggregation level, so aggregates never rescan raw data. Retention
+    drops whole raw partitions and downsamples by keeping coarser rollups
+    longer (``DEFAULT_RETENTION_DAYS``). Databases written with the old
+    ``raw_metrics``/``aggregated_metrics`` tables are migrated on open.
+    """
+
+    def __init__(
+        self,
+        db_path: str = "metrics.db",
+        retention_days: dict[AggregationLevel, int] | None = None,
+    ):
         self.db_path = db_path
+        self.retention_days = {**DEFAULT_RETENTION_DAYS, **(retention_days or {})}
+        self.rollup_updates = dict.fromkeys(BUCKET_SECONDS, 0)
         self._lock = threading.Lock()
+        self._series_ids: dict[tuple, int] = {}
+        self._partitions: set[str] = set()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
         self._init_database()
 
     def _init_database(self) -> None:
         """Initialize database schema."""
         with self._lock:
-            conn = sqlite3.connect(self.db_path)
-            try:
-                # Raw metrics table
-                conn.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS raw_metrics (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        timestamp TEXT NOT NULL,
-                        name TEXT NOT NULL,
-                        value REAL NOT NULL,
-                        unit TEXT,
-                        type TEXT,
-                        source TEXT NOT NULL,
-                        tags TEXT,
-                        metadata TEXT,
-                        created_at TEXT DEFAULT CURRENT_TIMESTAMP
-                    )
+            conn = self._conn
+            auto_vacuum = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+            has_tables = conn.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()[0] > 0
+            # Takes effect immediately on a new file; an existing file only
+            # switches on its next VACUUM (run below, once)
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
                 """
+                CREATE TABLE IF NOT EXISTS metric_series (
+                    id INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    unit TEXT,
+                    type TEXT,
+                    tags TEXT NOT NULL,
+                    UNIQUE (name, source, unit, type, tags)
                 )
-
-                # Aggregated metrics table
-                conn.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS aggregated_metrics (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        timestamp TEXT NOT NULL,
-                        name TEXT NOT NULL,
-                        source TEXT NOT NULL,
-                        aggregation_level TEXT NOT NULL,
-                        count INTEGER NOT NULL,
-                        min_value REAL NOT NULL,
-                        max_value REAL NOT NULL,
-                        avg_value REAL NOT NULL,
-                        sum_value REAL NOT NULL,
-                        std_dev REAL,
-                        tags TEXT,
-                        metadata TEXT,
-                        created_at TEXT DEFAULT CURRENT_TIMESTAMP
-                    )
+            """
+            )
+            conn.execute(
                 """
+                CREATE TABLE IF NOT EXISTS metric_rollups (
+                    aggregation_level TEXT NOT NULL,
+                    bucket_start TEXT NOT NULL,
+                    series_id INTEGER NOT NULL,
+                    count INTEGER NOT NULL,
+                    sum_value REAL NOT NULL,
+                    sum_sq_value REAL NOT NULL,
+                    min_value REAL NOT NULL,
+                    max_value REAL NOT NULL,
+                    PRIMARY KEY (aggregation_level, bucket_start, series_id)
+                ) WITHOUT ROWID
+            """
+            )
+            conn.commit()
+
+            for (series_id, name, source, unit, metric_type, tags) in conn.execute(
+                "SELECT id, name, source, unit, type, tags FROM metric_series"
+            ):
+                self._series_ids[(name, source, unit, metric_type, tags)] = series_id
+            self._partitions = {
+                row[0]
+                for row in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE ?",
+                    (RAW_PARTITION_PREFIX + "%",),
                 )
+            }
+            self._migrate_legacy_tables()
+            if has_tables and auto_vacuum != AUTO_VACUUM_INCREMENTAL:
+                logger.info("Rebuilding %s to enable incremental auto-vacuum", self.db_path)
+                conn.execute("VACUUM")
+            logger.debug("Database schema initialized")
 
-                # Create indexes for better query performance
-                conn.execute(
-                    "CREATE INDEX IF NOT EXISTS idx_raw_timestamp ON raw_metrics(timestamp)"
-                )
-                conn.execute(
-                    "CREATE INDEX IF NOT EXISTS idx_raw_name ON raw_metrics(name)"
-                )
-                conn.execute(
-                    "CREATE INDEX IF NOT EXISTS idx_raw_source ON raw_metrics(source)"
-                )
-
-                conn.execute(
-                    "CREATE INDEX IF NOT EXISTS idx_agg_timestamp ON aggregated_metrics(timestamp)"
-                )
-                conn.execute(
-                    "CREATE INDEX IF NOT EXISTS idx_agg_name ON aggregated_metrics(name)"
-                )
-                conn.execute(
-                    "CREATE INDEX IF NOT EXISTS idx_agg_level ON aggregated_metrics(aggregation_level)"
-                )
+    def _migrate_legacy_tables(self) -> None:
+        """Fold the old ``raw_metrics``/``aggregated_metrics`` tables into the new schema.
 
+        Rows are moved in batches; each batch is inserted and deleted from the
+        legacy table in one transaction, so an interrupted migration resumes
+        without duplicating points. The emptied tables are dropped.
+        """
+        conn = self._conn
+        legacy = {
+            row[0]
+            for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name IN (?, ?)",
+                LEGACY_TABLES,
+            )
+        }
+        try:
+            if "raw_metrics" in legacy:
+                migrated = 0
+                while rows := conn.execute(
+                    "SELECT id, timestamp, name, value, unit, type, source, tags, metadata "
+                    "FROM raw_metrics ORDER BY id LIMIT ?",
+                    (LEGACY_MIGRATION_BATCH_SIZE,),
+                ).fetchall():
+                    self._insert_raw(
+                        [
+                            {
+                                "timestamp": row[1],
+                                "name": row[2],
+                                "value": row[3],
+                                "unit": row[4],
+                                "type": row[5],
+                                "source": row[6],
+                                "tags": json.loads(row[7]) if row[7] else None,
+                                "metadata": json.loads(row[8]) if row[8] else None,
+                            }
+                            for row in rows
+                        ]
+                    )
+                    conn.execute("DELETE FROM raw_metrics WHERE id <= ?", (rows[-1][0],))
+                    conn.commit()
+                    migrated += len(rows)
+                conn.execute("DROP TABLE raw_metrics")
+                conn.commit()
+                logger.info("Migrated %s legacy raw metrics", migrated)
+
+            if "aggregated_metrics" in legacy:
+                migrated = 0
+                while rows := conn.execute(
+                    "SELECT id, timestamp, name, source, aggregation_level, count, "
+                    "min_value, max_value, avg_value, sum_value, std_dev, tags "
+                    "FROM aggregated_metrics ORDER BY id LIMIT ?",
+                    (LEGACY_MIGRATION_BATCH_SIZE,),
+                ).fetchall():
+                    metrics = [
+                        AggregatedMetric(
+                            timestamp=datetime.fromisoformat(row[1]),
+                            name=row[2],
+                            source=row[3],
+                            aggregation_level=AggregationLevel(row[4]),
+                            count=row[5],
+                            min_value=row[6],
+                            max_value=row[7],
+                            avg_value=row[8],
+                            sum_value=row[9],
+                            std_dev=row[10],
+                            tags=json.loads(row[11]) if row[11] else {},
+                            metadata={},
+                        )
+                        for row in rows
+                        # Raw-level rows have no rollup bucket
+                        if row[4] in {level.value for level in BUCKET_SECONDS} and row[5] > 0
+                    ]
+                    self._merge_rollups(self._rollup_rows(metrics))
+                    conn.execute(
+                        "DELETE FROM aggregated_metrics WHERE id <= ?", (rows[-1][0],)
+                    )
+                    conn.commit()
+                    migrated += len(metrics)
+                conn.execute("DROP TABLE aggregated_metrics")
                 conn.commit()
-                logger.debug("Database schema initialized")
+                logger.info("Migrated %s legacy aggregated metrics", migrated)
 
-            finally:
-                conn.close()
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            # Leave the remaining legacy rows for the next start
+            logger.exception("Error migrating legacy metric tables: %s", e)
+            conn.rollback()
+
+    def _series_id(
+        self,
+        name: str,
+        source: str,
+        unit: str | None,
+        metric_type: str | None,
+        tags: dict[str, str] | None,
+    ) -> int:
+        tags_json = json.dumps(tags, sort_keys=True) if tags else "{}"
+        key = (name, source, unit, metric_type, tags_json)
+        series_id = self._series_ids.get(key)
+        if series_id is None:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO metric_series (name, source, unit, type, tags) "
+                "VALUES (?, ?, ?, ?, ?)",
+                key,
+            )
+            series_id = self._conn.execute(
+                "SELECT id FROM metric_series WHERE name = ? AND source = ? "
+                "AND unit IS ? AND type IS ? AND tags = ?",
+                key,
+            ).fetchone()[0]
+            self._series_ids[key] = series_id
+        return series_id
+
+    def _ensure_partition(self, partition: str) -> None:
+        if partition in self._partitions:
+            return
+        self._conn.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {partition} (
+                timestamp TEXT NOT NULL,
+                series_id INTEGER NOT NULL,
+                value REAL NOT NULL,
+                metadata TEXT
+            )
+        """
+        )
+        self._conn.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{partition}_timestamp ON {partition}(timestamp)"
+        )
+        self._partitions.add(partition)
+
+    def _merge_rollups(self, rows: list[tuple]) -> None:
+        """Fold (level, bucket, series, count, sum, sum_sq, min, max) rows into the rollups."""
+        self._conn.executemany(
+            """
+            INSERT INTO metric_rollups
+            (aggregation_level, bucket_start, series_id, count,
+             sum_value, sum_sq_value, min_value, max_value)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (aggregation_level, bucket_start, series_id) DO UPDATE SET
+                count = count + excluded.count,
+                sum_value = sum_value + excluded.sum_value,
+                sum_sq_value = sum_sq_value + excluded.sum_sq_value,
+                min_value = MIN(min_value, excluded.min_value),
+                max_value = MAX(max_value, excluded.max_value)
+        """,
+            rows,
+        )
 
     def store_raw_metrics(self, metrics: list[dict[str, Any]]) -> int:
-        """Store raw metrics in database.
+        """Store raw metrics and update the rollups of every level.
 
         Args:
             metrics: List of metric dictionaries
@@ -189,46 +392,106 @@ class TimeSeriesStorage:
             return 0
 
         with self._lock:
-            conn = sqlite3.connect(self.db_path)
             try:
-                cursor = conn.cursor()
-
-                for metric in metrics:
-                    cursor.execute(
-                        """
-                        INSERT INTO raw_metrics
-                        (timestamp, name, value, unit, type, source, tags, metadata)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                        (
-                            metric.get("timestamp"),
-                            metric.get("name"),
-                            metric.get("value"),
-                            metric.get("unit"),
-                            metric.get("type"),
-                            metric.get("source"),
-                            json.dumps(metric.get("tags", {})),
-                            json.dumps(metric.get("metadata", {})),
-                        ),
-                    )
-
-                conn.commit()
+                per_level = self._insert_raw(metrics)
+                self._conn.commit()
+                for level, buckets in per_level.items():
+                    self.rollup_updates[level] += len(buckets)
                 return len(metrics)
 
-            except (
-                requests.RequestException,
-                ConnectionError,
-                TimeoutError,
-                HTTPError,
-            ) as e:
+            except (sqlite3.Error, TypeError, ValueError) as e:
                 logger.exception("Error storing raw metrics: %s", e)
-                conn.rollback()
+                self._conn.rollback()
                 return 0
-            finally:
-                conn.close()
+
+    def _insert_raw(
+        self, metrics: list[dict[str, Any]]
+    ) -> dict[AggregationLevel, dict[tuple[str, int], list[float]]]:
+        """Write ``metrics`` to their partitions and rollups without committing.
+
+        Returns:
+            The rollup buckets touched, per aggregation level.
+        """
+        series_cache: dict[tuple, int] = {}
+        partitions: dict[str, list[tuple]] = defaultdict(list)
+        # Short-term partials per (minute, series); coarser levels are
+        # derived from these instead of from every point
+        minutes: dict[tuple[str, int], list[float]] = {}
+        for metric in metrics:
+            timestamp = metric.get("timestamp") or datetime.now()
+            if not isinstance(timestamp, str):
+                timestamp = timestamp.isoformat()
+            tags = metric.get("tags")
+            series_key = (
+                metric.get("name"),
+                metric.get("source"),
+                metric.get("unit"),
+                metric.get("type", metric.get("metric_type")),
+                tuple(sorted(tags.items())) if tags else (),
+            )
+            series_id = series_cache.get(series_key)
+            if series_id is None:
+                series_id = self._series_id(*series_key[:4], tags)
+                series_cache[series_key] = series_id
+            value = float(metric.get("value"))
+            metadata = metric.get("metadata")
+            partitions[timestamp[:10]].append(
+                (timestamp, series_id, value, json.dumps(metadata) if metadata else None)
+            )
+
+            bucket = (timestamp[:16], series_id)
+            partial = minutes.get(bucket)
+            if partial is None:
+                minutes[bucket] = [1, value, value * value, value, value]
+            else:
+                partial[0] += 1
+                partial[1] += value
+                partial[2] += value * value
+                if value < partial[3]:
+                    partial[3] = value
+                if value > partial[4]:
+                    partial[4] = value
+
+        for rows in partitions.values():
+            partition = _partition_name(rows[0][0])
+            self._ensure_partition(partition)
+            self._conn.executemany(
+                f"INSERT INTO {partition} (timestamp, series_id, value, metadata) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+
+        levels = (
+            AggregationLevel.SHORT_TERM,
+            AggregationLevel.MEDIUM_TERM,
+            AggregationLevel.LONG_TERM,
+        )
+        per_level: dict[AggregationLevel, dict[tuple[str, int], list[float]]] = {
+            level: {} for level in levels
+        }
+        for (minute, series_id), partial in minutes.items():
+            for level, bucket_start in zip(levels, _bucket_starts(minute), strict=True):
+                merged = per_level[level].get((bucket_start, series_id))
+                if merged is None:
+                    per_level[level][(bucket_start, series_id)] = list(partial)
+                else:
+                    merged[0] += partial[0]
+                    merged[1] += partial[1]
+                    merged[2] += partial[2]
+                    merged[3] = min(merged[3], partial[3])
+                    merged[4] = max(merged[4], partial[4])
+        self._merge_rollups(
+            [
+                (level.value, bucket_start, series_id, *partial)
+                for level, buckets in per_level.items()
+                for (bucket_start, series_id), partial in buckets.items()
+            ]
+        )
+
+        return per_level
 
     def store_aggregated_metrics(self, metrics: list[AggregatedMetric]) -> int:
-        """Store aggregated metrics in database.
+        """Merge externally computed aggregates into the rollups.
 
         Args:
             metrics: List of aggregated metrics
@@ -241,43 +504,45 @@ class TimeSeriesStorage:
             return 0
 
         with self._lock:
-            conn = sqlite3.connect(self.db_path)
             try:
-                cursor = conn.cursor()
-
-                for metric in metrics:
-                    cursor.execute(
-                        """
-                        INSERT INTO aggregated_metrics
-                        (timestamp, name, source, aggregation_level, count,
-                         min_value, max_value, avg_value, sum_value, std_dev, tags, metadata)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                        (
-                            metric.timestamp.isoformat(),
-                            metric.name,
-                            metric.source,
-                            metric.aggregation_level.value,
-                            metric.count,
-                            metric.min_value,
-                            metric.max_value,
-                            metric.avg_value,
-                            metric.sum_value,
-                            metric.std_dev,
-                            json.dumps(metric.tags),
-                            json.dumps(metric.metadata),
-                        ),
-                    )
-
-                conn.commit()
+                self._merge_rollups(self._rollup_rows(metrics))
+                self._conn.commit()
                 return len(metrics)
 
-            except (json.JSONDecodeError, ValueError, KeyError) as e:
+            except (sqlite3.Error, ValueError, ZeroDivisionError) as e:
                 logger.exception("Error storing aggregated metrics: %s", e)
-                conn.rollback()
+                self._conn.rollback()
                 return 0
-            finally:
-                conn.close()
+
+    def _rollup_rows(self, metrics: list[AggregatedMetric]) -> list[tuple]:
+        """Convert aggregates to ``_merge_rollups`` rows via their running sums."""
+        rows = []
+        for metric in metrics:
+            std_dev = metric.std_dev or 0.0
+            sum_sq = std_dev * std_dev * (metric.count - 1) + (
+                metric.sum_value * metric.sum_value / metric.count
+            )
+            bucket_start = dict(
+                zip(BUCKET_SECONDS, _bucket_starts(metric.timestamp.isoformat()), strict=True)
+            )[metric.aggregation_level]
+            rows.append(
+                (
+                    metric.aggregation_level.value,
+                    bucket_start,
+                    self._series_id(metric.name, metric.source, None, None, metric.tags),
+                    metric.count,
+                    metric.sum_value,
+                    sum_sq,
+                    metric.min_value,
+                    metric.max_value,
+                )
+            )
+        return rows
+
+    def _partitions_between(self, start_time: datetime, end_time: datetime) -> list[str]:
+        first = _partition_name(start_time.isoformat())
+        last = _partition_name(end_time.isoformat())
+        return sorted(name for name in self._partitions if first <= name <= last)
 
     def query_raw_metrics(
         self,
@@ -299,33 +564,30 @@ class TimeSeriesStorage:
 
         """
         with self._lock:
-            conn = sqlite3.connect(self.db_path)
             try:
-                cursor = conn.cursor()
-
-                query = """
-                    SELECT timestamp, name, value, unit, type, source, tags, metadata
-                    FROM raw_metrics
-                    WHERE timestamp >= ? AND timestamp <= ?
-                """
-                params = [start_time.isoformat(), end_time.isoformat()]
-
+                filters = ""
+                params: list[Any] = [start_time.isoformat(), end_time.isoformat()]
                 if metric_name:
-                    query += " AND name = ?"
+                    filters += " AND s.name = ?"
                     params.append(metric_name)
-
                 if source:
-                    query += " AND source = ?"
+                    filters += " AND s.source = ?"
                     params.append(source)
 
-                query += " ORDER BY timestamp"
-
-                cursor.execute(query, params)
-                rows = cursor.fetchall()
-
                 metrics = []
-                for row in rows:
-                    metrics.append(
+                # Partitions are days, so their concatenation stays in time order
+                for partition in self._partitions_between(start_time, end_time):
+                    rows = self._conn.execute(
+                        f"""
+                        SELECT r.timestamp, s.name, r.value, s.unit, s.type, s.source,
+                               s.tags, r.metadata
+                        FROM {partition} r JOIN metric_series s ON s.id = r.series_id
+                        WHERE r.timestamp >= ? AND r.timestamp <= ?{filters}
+                        ORDER BY r.timestamp
+                    """,
+                        params,
+                    )
+                    metrics.extend(
                         {
                             "timestamp": row[0],
                             "name": row[1],
@@ -336,6 +598,7 @@ class TimeSeriesStorage:
                             "tags": json.loads(row[6]) if row[6] else {},
                             "metadata": json.loads(row[7]) if row[7] else {},
                         }
+                        for row in rows
                     )
 
                 return metrics
@@ -343,8 +606,6 @@ class TimeSeriesStorage:
             except (sqlalchemy.exc.SQLAlchemyError, sqlite3.Error) as e:
                 logger.exception("Error querying raw metrics: %s", e)
                 return []
-            finally:
-                conn.close()
 
     def query_aggregated_metrics(
         self,
@@ -364,69 +625,73 @@ class TimeSeriesStorage:
             source: Optional source filter
 
         Returns:
-            List of aggregated metrics
+            List of aggregated metrics, one per bucket and series, timestamped
+            with the bucket start
 
         """
         with self._lock:
-            conn = sqlite3.connect(self.db_path)
             try:
-                cursor = conn.cursor()
-
                 query = """
-                    SELECT timestamp, name, source, aggregation_level, count,
-                           min_value, max_value, avg_value, sum_value, std_dev, tags, metadata
-                    FROM aggregated_metrics
-                    WHERE timestamp >= ? AND timestamp <= ? AND aggregation_level = ?
+                    SELECT r.bucket_start, s.name, s.source, r.count, r.sum_value,
+                           r.sum_sq_value, r.min_value, r.max_value, s.tags
+                    FROM metric_rollups r JOIN metric_series s ON s.id = r.series_id
+                    WHERE r.aggregation_level = ? AND r.bucket_start >= ? AND r.bucket_start <= ?
                 """
                 params = [
+                    aggregation_level.value,
                     start_time.isoformat(),
                     end_time.isoformat(),
-                    aggregation_level.value,
                 ]
 
                 if metric_name:
-                    query += " AND name = ?"
+                    query += " AND s.name = ?"
                     params.append(metric_name)
 
                 if source:
-                    query += " AND source = ?"
+                    query += " AND s.source = ?"
                     params.append(source)
 
-                query += " ORDER BY timestamp"
-
-                cursor.execute(query, params)
-                rows = cursor.fetchall()
-
-                metrics = []
-                for row in rows:
-                    metrics.append(
-                        AggregatedMetric(
-                            timestamp=datetime.fromisoformat(row[0]),
-                            name=row[1],
-                            source=row[2],
-                            aggregation_level=AggregationLevel(row[3]),
-                            count=row[4],
-                            min_value=row[5],
-                            max_value=row[6],
-                            avg_value=row[7],
-                            sum_value=row[8],
-                            std_dev=row[9],
-                            tags=json.loads(row[10]) if row[10] else {},
-                            metadata=json.loads(row[11]) if row[11] else {},
-                        )
+                query += " ORDER BY r.bucket_start"
+
+                return [
+                    AggregatedMetric(
+                        timestamp=datetime.fromisoformat(bucket_start),
+                        name=name,
+                        source=metric_source,
+                        aggregation_level=aggregation_level,
+                        count=count,
+                        min_value=min_value,
+                        max_value=max_value,
+                        avg_value=total / count,
+                        sum_value=total,
+                        std_dev=_sample_std(count, total, total_sq),
+                        tags=json.loads(tags) if tags else {},
+                        metadata={},
                     )
-
-                return metrics
+                    for (
+                        bucket_start,
+                        name,
+                        metric_source,
+                        count,
+                        total,
+                        total_sq,
+                        min_value,
+                        max_value,
+                        tags,
+                    ) in self._conn.execute(query, params)
+                ]
 
             except (sqlalchemy.exc.SQLAlchemyError, sqlite3.Error) as e:
                 logger.exception("Error querying aggregated metrics: %s", e)
                 return []
-            finally:
-                conn.close()
 
     def cleanup_old_data(self, retention_days: int) -> tuple[int, int]:
         """Clean up old data beyond retention period.
 
+        Raw partitions older than the raw retention are dropped whole and
+        rollups are deleted per level, each level keeping the shorter of its
+        own retention and ``retention_days``.
+
         Args:
             retention_days: Number of days to retain data
 
@@ -434,40 +699,44 @@ class TimeSeriesStorage:
             Tuple of (raw_deleted, aggregated_deleted)
 
         """
-        cutoff_time = datetime.now() - timedelta(days=retention_days)
+        now = datetime.now()
+
+        def cutoff(level: AggregationLevel) -> str:
+            days = min(self.retention_days[level], retention_days)
+            return (now - timedelta(days=days)).isoformat()
 
         with self._lock:
-            conn = sqlite3.connect(self.db_path)
             try:
-                cursor = conn.cursor()
-
-                # Delete old raw metrics
-                cursor.execute(
-                    "DELETE FROM raw_metrics WHERE timestamp < ?",
-                    (cutoff_time.isoformat()),
-                )
-                raw_deleted = cursor.rowcount
-
-                # Delete old aggregated metrics
-                cursor.execute(
-                    "DELETE FROM aggregated_metrics WHERE timestamp < ?",
-                    (cutoff_time.isoformat()),
-                )
-                aggregated_deleted = cursor.rowcount
-
-                conn.commit()
-
-                # Vacuum database to reclaim space
-                conn.execute("VACUUM")
+                raw_deleted = 0
+                oldest_kept = _partition_name(cutoff(AggregationLevel.RAW))
+                for partition in sorted(self._partitions):
+                    if partition >= oldest_kept:
+                        break
+                    raw_deleted += self._conn.execute(
+                        f"SELECT COUNT(*) FROM {partition}"
+                    ).fetchone()[0]
+                    self._conn.execute(f"DROP TABLE {partition}")
+                    self._partitions.discard(partition)
+
+                aggregated_deleted = 0
+                for level in BUCKET_SECONDS:
+                    aggregated_deleted += self._conn.execute(
+                        "DELETE FROM metric_rollups WHERE aggregation_level = ? "
+                        "AND bucket_start < ?",
+                        (level.value, cutoff(level)),
+                    ).rowcount
+
+                self._conn.commit()
+
+                # Return freed pages to the file system without a full VACUUM
+                self._conn.execute("PRAGMA incremental_vacuum")
 
                 return raw_deleted, aggregated_deleted
 
             except (sqlalchemy.exc.SQLAlchemyError, sqlite3.Error) as e:
                 logger.exception("Error cleaning up old data: %s", e)
-                conn.rollback()
+                self._conn.rollback()
                 return 0, 0
-            finally:
-                conn.close()
 
     def get_storage_stats(self) -> dict[str, Any]:
         """Get storage statistics.
@@ -477,17 +746,15 @@ class TimeSeriesStorage:
 
         """
         with self._lock:
-            conn = sqlite3.connect(self.db_path)
             try:
-                cursor = conn.cursor()
-
-                # Count raw metrics
-                cursor.execute("SELECT COUNT(*) FROM raw_metrics")
-                raw_count = cursor.fetchone()[0]
-
-                # Count aggregated metrics
-                cursor.execute("SELECT COUNT(*) FROM aggregated_metrics")
-                agg_count = cursor.fetchone()[0]
+                partitions = sorted(self._partitions)
+                raw_count = sum(
+                    self._conn.execute(f"SELECT COUNT(*) FROM {partition}").fetchone()[0]
+                    for partition in partitions
+                )
+                agg_count = self._conn.execute(
+                    "SELECT COUNT(*) FROM metric_rollups"
+                ).fetchone()[0]
 
                 # Get database file size
                 db_size = (
@@ -496,29 +763,38 @@ class TimeSeriesStorage:
                     else 0
                 )
 
-                # Get oldest and newest timestamps
-                cursor.execute("SELECT MIN(timestamp), MAX(timestamp) FROM raw_metrics")
-                raw_range = cursor.fetchone()
+                oldest = newest = None
+                if partitions:
+                    oldest = self._conn.execute(
+                        f"SELECT MIN(timestamp) FROM {partitions[0]}"
+                    ).fetchone()[0]
+                    newest = self._conn.execute(
+                        f"SELECT MAX(timestamp) FROM {partitions[-1]}"
+                    ).fetchone()[0]
 
                 return {
                     "raw_metrics_count": raw_count,
                     "aggregated_metrics_count": agg_count,
+                    "raw_partitions": len(partitions),
                     "database_size_bytes": db_size,
-                    "oldest_metric": raw_range[0] if raw_range[0] else None,
-                    "newest_metric": raw_range[1] if raw_range[1] else None,
+                    "oldest_metric": oldest,
+                    "newest_metric": newest,
                 }
 
-            except (FileNotFoundError, PermissionError, OSError) as e:
+            except (sqlite3.Error, OSError) as e:
                 logger.exception("Error getting storage stats: %s", e)
                 return {}
-            finally:
-                conn.close()
+
+    def close(self) -> None:
+        """Close the storage connection."""
+        with self._lock:
+            self._conn.close()
 
 
 class DataAggregator:
     """Processes and aggregates performance metrics with time-series storage."""
 
-    def __init__(self, buffer_size: int = 10000, db_path: str = "metrics.db"):
+    def __init__(self, buffer_size: int = 100_000, db_path: str = "metrics.db"):
         import threading
         from datetime import datetime
 
@@ -577,25 +853,40 @@ class DataAggregator:
 
         logger.debug("Background threads started")
 
-    def _aggregation_loop(self) -> None:
-        """Background loop for processing and aggregating metrics."""
-        while not self._stop_event.is_set():
-            try:
-                # Process buffered metrics
-                buffered_metrics = self.buffer.get_and_clear()
-                if buffered_metrics:
-                    stored_count = self.storage.store_raw_metrics(buffered_metrics)
+    def _flush_buffer(self) -> dict[AggregationLevel, int]:
+        """Store buffered metrics; the storage updates the rollups as it goes.
 
-                    with self._lock:
-                        self._metrics_stored += stored_count
+        Returns:
+            Number of rollup buckets updated per aggregation level
 
-                    logger.debug("Stored %s raw metrics", stored_count)
+        """
+        buffered_metrics = self.buffer.get_and_clear()
+        if not buffered_metrics:
+            return {}
 
-                # Perform aggregations
-                self._perform_aggregations()
+        before = dict(self.storage.rollup_updates)
+        stored_count = self.storage.store_raw_metrics(buffered_metrics)
+        updated = {
+            level: count - before[level]
+            for level, count in self.storage.rollup_updates.items()
+        }
+        now = datetime.now()
 
-                # Sleep for a short interval
-                self._stop_event.wait(5.0)  # Process every 5 seconds
+        with self._lock:
+            self._metrics_stored += stored_count
+            self._aggregations_created += sum(updated.values())
+            for level in updated:
+                self._last_aggregation[level] = now
+
+        logger.debug("Stored %s raw metrics", stored_count)
+        return updated
+
+    def _aggregation_loop(self) -> None:
+        """Background loop for storing and aggregating buffered metrics."""
+        while not self._stop_event.is_set():
+            try:
+                self._flush_buffer()
+                self._stop_event.wait(FLUSH_INTERVAL_SECONDS)
 
             except Exception as e:
                 logger.exception("Error in aggregation loop: %s", e)
@@ -607,13 +898,14 @@ class DataAggregator:
             try:
                 # Clean up old data
                 raw_deleted, agg_deleted = self.storage.cleanup_old_data(
-                    self.config.retention_days
+                    getattr(getattr(self, "config", None), "retention_days", 365)
                 )
 
                 if raw_deleted > 0 or agg_deleted > 0:
                     logger.info(
-                        "Cleaned up %s raw metrics and {agg_deleted} aggregated metrics",
+                        "Cleaned up %s raw metrics and %s aggregated metrics",
                         raw_deleted,
+                        agg_deleted,
                     )
 
                 # Sleep for an hour before next cleanup
@@ -623,111 +915,6 @@ class DataAggregator:
                 logger.exception("Error in cleanup loop: %s", e)
                 self._stop_event.wait(300.0)  # Wait 5 minutes on error
 
-    def _perform_aggregations(self) -> None:
-        """Perform time-based aggregations."""
-        now = datetime.now()
-
-        # Short-term aggregation (1-minute)
-        if (
-            now - self._last_aggregation[AggregationLevel.SHORT_TERM]
-        ).total_seconds() >= 60:
-            self._create_aggregations(AggregationLevel.SHORT_TERM, timedelta(minutes=1))
-            self._last_aggregation[AggregationLevel.SHORT_TERM] = now
-
-        # Medium-term aggregation (5-minute)
-        if (
-            now - self._last_aggregation[AggregationLevel.MEDIUM_TERM]
-        ).total_seconds() >= 300:
-            self._create_aggregations(
-                AggregationLevel.MEDIUM_TERM, timedelta(minutes=5)
-            )
-            self._last_aggregation[AggregationLevel.MEDIUM_TERM] = now
-
-        # Long-term aggregation (1-hour)
-        if (
-            now - self._last_aggregation[AggregationLevel.LONG_TERM]
-        ).total_seconds() >= 3600:
-            self._create_aggregations(AggregationLevel.LONG_TERM, timedelta(hours=1))
-            self._last_aggregation[AggregationLevel.LONG_TERM] = now
-
-    def _create_aggregations(self, level: AggregationLevel, window: timedelta) -> None:
-        """Create aggregations for a specific time window.
-
-        Args:
-            level: Aggregation level
-            window: Time window for aggregation
-
-        """
-        try:
-            end_time = datetime.now()
-            start_time = end_time - window
-
-            # Get raw metrics for the time window
-            raw_metrics = self.storage.query_raw_metrics(start_time, end_time)
-
-            if not raw_metrics:
-                return
-
-            # Group metrics by name and source
-            grouped_metrics: dict[tuple[str, str], list[dict[str, Any]]] = {}
-            for metric in raw_metrics:
-                key = (metric["name"], metric["source"])
-                if key not in grouped_metrics:
-                    grouped_metrics[key] = []
-                grouped_metrics[key].append(metric)
-
-            # Create aggregated metrics
-            aggregated_metrics: list[AggregatedMetric] = []
-            for (name, source), metric_group in grouped_metrics.items():
-                if not metric_group:
-                    continue
-
-                values = [m["value"] for m in metric_group]
-
-                # Calculate statistics
-                count = len(values)
-                min_value = min(values)
-                max_value = max(values)
-                avg_value = sum(values) / count
-                sum_value = sum(values)
-                std_dev = statistics.stdev(values) if count > 1 else 0.0
-
-                # Combine tags and metadata
-                all_tags = {}
-                all_metadata = {}
-                for metric in metric_group:
-                    all_tags.update(metric.get("tags", {}))
-                    all_metadata.update(metric.get("metadata", {}))
-
-                aggregated_metric = AggregatedMetric(
-                    timestamp=end_time,
-                    name=name,
-                    source=source,
-                    aggregation_level=level,
-                    count=count,
-                    min_value=min_value,
-                    max_value=max_value,
-                    avg_value=avg_value,
-                    sum_value=sum_value,
-                    std_dev=std_dev,
-                    tags=all_tags,
-                    metadata=all_metadata,
-                )
-
-                aggregated_metrics.append(aggregated_metric)
-
-            # Store aggregated metrics
-            if aggregated_metrics:
-                stored_count = self.storage.store_aggregated_metrics(aggregated_metrics)
-
-                with self._lock:
-                    self._aggregations_created += stored_count
-
-                logger.debug("Created %s {level.value} aggregations", stored_count)
-
-        except Exception:
-            logger.exception("Error creating %s aggregations: {e}", level.value)
-
     def get_metrics(
         self,
         start_time: datetime,
@@ -810,35 +997,15 @@ class DataAggregator:
         return stats
 
     def force_aggregation(self) -> dict[str, int]:
-        """Force immediate aggregation of all levels.
+        """Force immediate storage and aggregation of buffered metrics.
 
         Returns:
-            Dictionary with aggregation counts
+            Dictionary with the number of rollup buckets updated per level
 
         """
         try:
-            results = {}
-
-            # Force all aggregation levels
-            for level in [
-                AggregationLevel.SHORT_TERM,
-                AggregationLevel.MEDIUM_TERM,
-                AggregationLevel.LONG_TERM,
-            ]:
-                if level == AggregationLevel.SHORT_TERM:
-                    window = timedelta(minutes=1)
-                elif level == AggregationLevel.MEDIUM_TERM:
-                    window = timedelta(minutes=5)
-                else:
-                    window = timedelta(hours=1)
-
-                before_count = self._aggregations_created
-                self._create_aggregations(level, window)
-                after_count = self._aggregations_created
-
-                results[level.value] = after_count - before_count
-
-            return results
+            updated = self._flush_buffer()
+            return {level.value: updated.get(level, 0) for level in BUCKET_SECONDS}
 
         except (RuntimeError, AttributeError) as e:
             logger.exception("Error forcing aggregation: %s", e)
@@ -867,12 +1034,11 @@ class DataAggregator:
                 self._cleanup_thread.join(timeout=5.0)
 
             # Process any remaining buffered metrics
-            buffered_metrics = self.buffer.get_and_clear()
-            if buffered_metrics:
-                self.storage.store_raw_metrics(buffered_metrics)
-                logger.debug(
-                    "Stored %s final metrics during cleanup", len(buffered_metrics)
-                )
+            buffered_count = self.buffer.size()
+            if buffered_count:
+                self._flush_buffer()
+                logger.debug("Stored %s final metrics during cleanup", buffered_count)
+            self.storage.close()
 
             logger.debug("Data aggregator cleaned up")
 
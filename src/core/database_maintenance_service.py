@@ -15,7 +15,7 @@ logger = logging.getLogger(__name__)
 class DatabaseMaintenanceService:
     """A service to handle database maintenance tasks, such as purging old reports."""
 
-    def __init__(self, db_path: str, retention_days: int = 90):
+    def __init__(self, db_path: str | None = None, retention_days: int = 90):
         """Initializes the DatabaseMaintenanceService.
 
         Args:
@@ -49,13 +49,15 @@ class DatabaseMaintenanceService:
 
         async with AsyncSessionLocal() as db:
             try:
-                num_deleted = await crud.delete_reports_older_than(
-                    db, days=retention_days
+                counts = await crud.cleanup_old_data(
+                    db, days_to_keep=retention_days, dry_run=False
                 )
-                if num_deleted > 0:
+                if counts["reports"] or counts["snapshots"]:
                     logger.info(
-                        "Successfully purged %d old reports from the database.",
-                        num_deleted,
+                        "Successfully purged %d old reports and %d snapshots (%.0f rows/s).",
+                        counts["reports"],
+                        counts["snapshots"],
+                        counts["rows_per_second"],
                     )
                 else:
                     logger.info("No old reports found to purge.")
@@ -94,3 +96,57 @@ class DatabaseMaintenanceService:
                 e,
                 exc_info=True,
             )
+
+    async def refresh_analytics_rollups_async(self, full: bool = False) -> int:
+        """Rebuilds the daily analytics rollups from the reports table.
+
+        The rollups are maintained incrementally as reports are created; this
+        backfills history and repairs drift from deleted reports. A full
+        rebuild runs when requested or when the rollup table is empty,
+        otherwise only the most recent ``analytics_rollup_refresh_days`` days
+        (performance setting, default 7) are recomputed.
+
+        Returns:
+            int: Number of rollup rows written, or 0 on failure.
+        """
+        performance = getattr(self.settings, "performance", None) or {}
+        refresh_days = int(performance.get("analytics_rollup_refresh_days", 7))
+
+        async with AsyncSessionLocal() as db:
+            try:
+                if full or not await crud.has_analytics_rollups(db):
+                    logger.info("Backfilling analytics rollups from all reports.")
+                    return await crud.rebuild_analytics_rollups(db)
+                return await crud.rebuild_analytics_rollups(db, days_back=refresh_days)
+            except (sqlalchemy.exc.SQLAlchemyError, sqlite3.Error) as e:
+                logger.error(
+                    "An error occurred while refreshing analytics rollups: %s",
+                    e,
+                    exc_info=True,
+                )
+                return 0
+
+    def refresh_analytics_rollups(self, loop: asyncio.AbstractEventLoop) -> int:
+        """Synchronous entry point for the scheduled analytics rollup refresh.
+
+        The async engine's connection pools belong to the application's event
+        loop, so the refresh is submitted to ``loop`` and this scheduler
+        thread waits for it instead of starting a loop of its own.
+
+        Args:
+            loop (asyncio.AbstractEventLoop): The loop the application runs on.
+
+        Returns:
+            int: Number of rollup rows written, or 0 on failure.
+        """
+        logger.info("Scheduler triggered: Refreshing analytics rollups.")
+        try:
+            future = asyncio.run_coroutine_threadsafe(
+                self.refresh_analytics_rollups_async(), loop
+            )
+            return future.result()
+        except Exception as e:
+            logger.error(
+                "Scheduled analytics rollup refresh failed: %s", e, exc_info=True
+            )
+            return 0
@@ -5,6 +5,7 @@ from typing import Any
 from sentence_transformers import SentenceTransformer
 
 from src.config import get_settings
+from src.core.model_registry import model_registry
 
 logger = logging.getLogger(__name__)
 
@@ -44,7 +45,9 @@ class EmbeddingService:
         self.is_loading = True
         try:
             logger.info("Loading sentence transformer model: %s", self.model_name)
-            self._model = SentenceTransformer(self.model_name)
+            self._model = model_registry.acquire_for(
+                self, SentenceTransformer, self.model_name
+            )
             logger.info("Sentence transformer model loaded successfully.")
         except Exception as e:
             logger.critical(
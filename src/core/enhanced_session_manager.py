@@ -15,6 +15,8 @@ from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Set
 
+from .principal_cache import principal_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -146,6 +148,7 @@ class EnhancedSessionManager:
         self, user_id: int, keep_current: Optional[str] = None
     ) -> int:
         """Invalidate all sessions for a user, optionally keeping one."""
+        principal_cache.invalidate_user(user_id=user_id)
         try:
             user_session_ids = list(self._user_sessions.get(user_id, set()))
             invalidated_count = 0
@@ -1,13 +1,28 @@
 import json
 import logging
+import re
 from typing import Any
 
 import requests
 from requests.exceptions import HTTPError
 from transformers import pipeline
 
+from src.core.cache_service import FactCheckCache
+
 logger = logging.getLogger(__name__)
 
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+|\n+")
+_WORD = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its no not of on or "
+    "that the this to was were with without".split()
+)
+_BATCH_ANSWER = re.compile(r"(\d+)\s*[:.)\-]\s*(yes|no)", re.IGNORECASE)
+
+
+def _content_words(text: str) -> set[str]:
+    return {word for word in _WORD.findall(text.lower()) if word not in _STOPWORDS}
+
 
 class FactCheckerService:
     """Check factual consistency using either a small NLI model or the main LLM.
@@ -49,11 +64,44 @@ class FactCheckerService:
             return bool(self.llm_service) and bool(self.llm_service.is_ready())
         return self.classifier is not None
 
-    def check_consistency(self, premise: str, hypothesis: str) -> bool:
-        """Checks if the hypothesis is supported by the premise.
-        Returns True if the hypothesis is consistent, False otherwise.
+    @staticmethod
+    def select_premise_window(
+        premise: str, hypothesis: str, max_sentences: int = 3, max_chars: int = 1200
+    ) -> str:
+        """Return the premise sentences most relevant to the hypothesis.
+
+        Sentences are scored by the number of content words they share with the
+        hypothesis; the best ``max_sentences`` are kept in document order. When
+        nothing overlaps, the start of the premise is used.
+
+        Args:
+            premise: The full premise text (typically the whole document).
+            hypothesis: The statement being checked.
+            max_sentences: Maximum number of sentences to keep.
+            max_chars: Upper bound on the length of the returned window.
+
+        Returns:
+            A premise window suitable for a single NLI check.
+
         """
-        # Ensure backend is ready
+        if not premise or len(premise) <= max_chars:
+            return premise or ""
+
+        sentences = [part.strip() for part in _SENTENCE_SPLIT.split(premise) if part.strip()]
+        hypothesis_words = _content_words(hypothesis)
+        scored = [
+            (len(_content_words(sentence) & hypothesis_words), index)
+            for index, sentence in enumerate(sentences)
+        ]
+        best = [index for score, index in sorted(scored, key=lambda s: (-s[0], s[1])) if score > 0]
+        if not best:
+            return premise[:max_chars]
+
+        window = " ".join(sentences[index] for index in sorted(best[:max_sentences]))
+        return window[:max_chars]
+
+    def _ensure_ready(self) -> bool:
+        """Load the backend if needed; return False when checks must fail open."""
         if self.backend == "pipeline":
             if not self.is_ready():
                 self.load_model()
@@ -61,42 +109,143 @@ class FactCheckerService:
                 logger.warning(
                     "Fact-checker pipeline not available. Skipping consistency check."
                 )
-                return True  # Fail open, assuming consistency
-        else:  # llm backend
-            if not self.is_ready():
-                logger.warning("LLM backend not ready for fact checking; failing open")
-                return True
+                return False
+        elif not self.is_ready():
+            logger.warning("LLM backend not ready for fact checking; failing open")
+            return False
+        return True
+
+    def check_consistency(self, premise: str, hypothesis: str) -> bool:
+        """Checks if the hypothesis is supported by the premise.
+        Returns True if the hypothesis is consistent, False otherwise.
+        """
+        return self.check_consistency_batch([(premise, hypothesis)], use_windows=False)[0]
+
+    def check_consistency_batch(
+        self, pairs: list[tuple[str, str]], use_windows: bool = True
+    ) -> list[bool]:
+        """Check many (premise, hypothesis) pairs with a single model call.
 
+        Args:
+            pairs: ``(premise, hypothesis)`` tuples to verify.
+            use_windows: Replace each premise with the sentences most relevant
+                to its hypothesis before checking.
+
+        Returns:
+            One verdict per pair, in input order. Checks fail open (True) when
+            the backend is unavailable or errors.
+
+        """
+        if not pairs:
+            return []
+        verdicts: list[bool] = [True] * len(pairs)
+        if not self._ensure_ready():
+            return verdicts
+
+        windows = [
+            (
+                self.select_premise_window(premise, hypothesis)
+                if use_windows
+                else premise,
+                hypothesis,
+            )
+            for premise, hypothesis in pairs
+        ]
+
+        pending: dict[tuple[str, str], list[int]] = {}
+        for index, (premise, hypothesis) in enumerate(windows):
+            cached = FactCheckCache.get_verdict(self.model_name, premise, hypothesis)
+            if cached is not None:
+                verdicts[index] = cached
+            else:
+                pending.setdefault((premise, hypothesis), []).append(index)
+
+        if not pending:
+            return verdicts
+
+        unique_pairs = list(pending)
         try:
             if self.backend == "llm" and self.llm_service is not None:
-                # Simple NLI-style instruction expecting yes/no
-                nli_prompt = (
-                    "You are a clinical compliance NLI checker.\n"
-                    "Decide if the hypothesis is supported by the premise.\n"
-                    "Answer strictly with 'YES' or 'NO'.\n\n"
-                    f"Premise: {premise}\n"
-                    f"Hypothesis: {hypothesis}\n"
-                    "Answer:"
-                )
-                raw = self.llm_service.generate(nli_prompt, max_new_tokens=8, temperature=0.0)
-                text = (raw or "").strip().lower()
-                return text.startswith("yes")
+                results = self._check_with_llm(unique_pairs)
             else:
-                # Pipeline backend (e.g., flan-t5-small)
-                prompt = (
-                    f"Premise: {premise}\nHypothesis: {hypothesis}\n"
-                    "Is the hypothesis supported by the premise?"
-                )
-                if self.classifier is None:
-                    logger.error("Classifier is not loaded")
-                    return True  # Fail open
-                result = self.classifier(prompt, max_length=50)
-                answer = (result[0].get("generated_text", "")).lower()
-                return "yes" in answer or "supported" in answer
-
+                results = self._check_with_pipeline(unique_pairs)
         except (json.JSONDecodeError, ValueError, KeyError) as e:
             logger.exception("Error during fact-checking: %s", e)
-            return True  # Fail open
+            return verdicts  # Fail open
+
+        for pair, verdict in zip(unique_pairs, results):
+            FactCheckCache.set_verdict(self.model_name, pair[0], pair[1], verdict)
+            for index in pending[pair]:
+                verdicts[index] = verdict
+        return verdicts
+
+    def _check_with_pipeline(self, pairs: list[tuple[str, str]]) -> list[bool]:
+        """Run every pair through the text2text pipeline in one batched call."""
+        if self.classifier is None:
+            logger.error("Classifier is not loaded")
+            return [True] * len(pairs)  # Fail open
+        prompts = [
+            f"Premise: {premise}\nHypothesis: {hypothesis}\n"
+            "Is the hypothesis supported by the premise?"
+            for premise, hypothesis in pairs
+        ]
+        if len(prompts) == 1:
+            outputs = [self.classifier(prompts[0], max_length=50)]
+        else:
+            outputs = self.classifier(prompts, max_length=50, batch_size=len(prompts))
+
+        verdicts = []
+        for output in outputs:
+            if isinstance(output, list):
+                output = output[0] if output else {}
+            answer = (output.get("generated_text", "")).lower()
+            verdicts.append("yes" in answer or "supported" in answer)
+        return verdicts
+
+    def _check_with_llm(self, pairs: list[tuple[str, str]]) -> list[bool]:
+        """Ask the LLM about every pair in one numbered prompt.
+
+        Pairs whose answer cannot be parsed from the combined response are
+        re-checked individually.
+        """
+        if len(pairs) == 1:
+            return [self._check_pair_with_llm(*pairs[0])]
+
+        numbered = "\n\n".join(
+            f"Pair {number}\nPremise: {premise}\nHypothesis: {hypothesis}"
+            for number, (premise, hypothesis) in enumerate(pairs, start=1)
+        )
+        prompt = (
+            "You are a clinical compliance NLI checker.\n"
+            "For each numbered pair, decide if the hypothesis is supported by the premise.\n"
+            "Answer with one line per pair in the form '<number>: YES' or '<number>: NO'.\n\n"
+            f"{numbered}\n\nAnswers:"
+        )
+        raw = self.llm_service.generate(
+            prompt, max_new_tokens=6 * len(pairs), temperature=0.0
+        )
+        answers = {
+            int(number): answer.lower() == "yes"
+            for number, answer in _BATCH_ANSWER.findall(raw or "")
+        }
+        return [
+            answers[number] if number in answers else self._check_pair_with_llm(*pair)
+            for number, pair in enumerate(pairs, start=1)
+        ]
+
+    def _check_pair_with_llm(self, premise: str, hypothesis: str) -> bool:
+        # Simple NLI-style instruction expecting yes/no
+        nli_prompt = (
+            "You are a clinical compliance NLI checker.\n"
+            "Decide if the hypothesis is supported by the premise.\n"
+            "Answer strictly with 'YES' or 'NO'.\n\n"
+            f"Premise: {premise}\n"
+            f"Hypothesis: {hypothesis}\n"
+            "Answer:"
+        )
+        raw = self.llm_service.generate(nli_prompt, max_new_tokens=8, temperature=0.0)
+        text = (raw or "").strip().lower()
+        return text.startswith("yes")
 
     def is_finding_plausible(self, finding: dict, rule: dict) -> bool:
         """Check if a finding is plausible given the associated rule.
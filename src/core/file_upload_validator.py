@@ -7,6 +7,7 @@ This module provides comprehensive file validation including:
 - Virus scanning integration points
 """
 
+import codecs
 import logging
 import mimetypes
 from pathlib import Path
@@ -242,6 +243,130 @@ class FileMagicValidator:
         return filename
 
 
+class StreamingFileValidator:
+    """Incremental counterpart of ``FileMagicValidator.validate_file``.
+
+    Uploads are fed chunk by chunk, so validation runs while the request body
+    is being received and never needs the whole file in memory. Pattern
+    matching carries an overlap between chunks so signatures that straddle a
+    chunk boundary are still detected.
+    """
+
+    HEAD_BYTES = 16
+    _CONTROL_BYTES = bytes(b for b in range(32) if b not in b"\t\n\r")
+
+    def __init__(self, filename: str, content_type: Optional[str] = None) -> None:
+        self.filename = filename
+        self.content_type = content_type
+        self.file_ext = Path(filename).suffix.lower().lstrip(".")
+        self.size = 0
+        self.error: Optional[str] = None
+        self._head = b""
+        self._tail = b""
+        patterns = FileMagicValidator.DANGEROUS_PATTERNS + [b"/JavaScript", b"macro"]
+        self._overlap = max(len(pattern) for pattern in patterns) - 1
+        self._patterns = [pattern.lower() for pattern in FileMagicValidator.DANGEROUS_PATTERNS]
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._utf8_valid = True
+        self._utf8_chars = 0
+        self._binary_bytes = 0
+        self._has_text = False
+        if self.file_ext not in FileMagicValidator.MAGIC_SIGNATURES:
+            self.error = f"File type '{self.file_ext}' is not allowed"
+
+    @property
+    def is_valid(self) -> bool:
+        return self.error is None
+
+    def feed(self, chunk: bytes) -> bool:
+        """Validate the next chunk of the upload.
+
+        Returns:
+            False as soon as the upload is known to be invalid.
+        """
+        if self.error is not None or not chunk:
+            return self.error is None
+        try:
+            self._feed(chunk)
+        except Exception as e:
+            logger.error(f"File validation error: {e}")
+            self.error = "File validation failed due to internal error"
+        return self.error is None
+
+    def _feed(self, chunk: bytes) -> None:
+        self.size += len(chunk)
+        max_size = FileMagicValidator.MAX_FILE_SIZES[self.file_ext]
+        if self.size > max_size:
+            self.error = (
+                f"File size exceeds maximum allowed size for {self.file_ext} files "
+                f"({max_size // (1024 * 1024)}MB)"
+            )
+            return
+
+        if len(self._head) < self.HEAD_BYTES:
+            self._head += chunk[: self.HEAD_BYTES - len(self._head)]
+            if len(self._head) >= self.HEAD_BYTES and not self._magic_matches():
+                self.error = (
+                    f"File content does not match expected format for {self.file_ext} files"
+                )
+                return
+
+        window = (self._tail + chunk).lower()
+        self._tail = window[-self._overlap :]
+        for pattern in self._patterns:
+            if pattern in window:
+                logger.warning(f"Dangerous pattern detected in file: {pattern}")
+                self.error = "File contains potentially malicious content"
+                return
+        if self._head.startswith(b"%PDF-") and (b"/JavaScript" in window or b"/JS" in window):
+            logger.warning("PDF contains JavaScript")
+            self.error = "File contains potentially malicious content"
+            return
+        if self._head.startswith(b"PK\x03\x04") and (b"vba" in window or b"macro" in window):
+            logger.warning("Office document contains macros")
+            self.error = "File contains potentially malicious content"
+            return
+
+        if self.file_ext == "txt":
+            self._binary_bytes += len(chunk) - len(chunk.translate(None, self._CONTROL_BYTES))
+            self._has_text = self._has_text or bool(chunk.strip())
+            if self._utf8_valid:
+                try:
+                    self._utf8_chars += len(self._utf8.decode(chunk))
+                except UnicodeDecodeError:
+                    self._utf8_valid = False
+
+    def _magic_matches(self) -> bool:
+        return FileMagicValidator._validate_magic_number(self._head, self.file_ext)
+
+    def result(self) -> Tuple[bool, str]:
+        """Finish validation once the whole upload has been fed."""
+        if self.error is None:
+            if self.size == 0:
+                self.error = "File is empty"
+            elif not self._magic_matches():
+                self.error = (
+                    f"File content does not match expected format for {self.file_ext} files"
+                )
+            elif self.file_ext == "txt" and not self._text_is_valid():
+                self.error = "Text file contains invalid characters or encoding"
+        if self.error is not None:
+            return False, self.error
+        return True, "File validation passed"
+
+    def _text_is_valid(self) -> bool:
+        if self._utf8_valid:
+            try:
+                self._utf8_chars += len(self._utf8.decode(b"", final=True))
+            except UnicodeDecodeError:
+                self._utf8_valid = False
+        # Undecodable UTF-8 falls back to latin-1, one character per byte
+        characters = self._utf8_chars if self._utf8_valid else self.size
+        if not self._has_text:
+            return False
+        return self._binary_bytes <= characters * 0.1
+
+
 def validate_uploaded_file(
     file_content: bytes, filename: str, content_type: Optional[str] = None
 ) -> Tuple[bool, str]:
@@ -1,5 +1,7 @@
 import logging
 import sqlite3
+import threading
+from typing import Any
 
 import numpy as np
 import sqlalchemy
@@ -25,6 +27,7 @@ except Exception:  # pragma: no cover - environment dependent
 from src.config import get_settings
 
 from .cache_service import cache_service
+from .model_registry import model_registry
 from .query_expander import QueryExpander
 
 try:  # pragma: no cover - optional dependency during tests
@@ -40,6 +43,44 @@ except (
 logger = logging.getLogger(__name__)
 
 
+def _feature_enabled(settings: Any, name: str, default: bool) -> bool:
+    features_cfg = getattr(settings, "features", {}) or {}
+    if isinstance(features_cfg, dict):
+        return bool(features_cfg.get(name, default))
+    return bool(getattr(features_cfg, name, default))
+
+
+def _model_names(settings: Any) -> tuple[str, str | None]:
+    """Dense model and, when the reranker is enabled, reranker model names."""
+    dense_model_name = getattr(
+        settings.retrieval, "dense_model_name", "pritamdeka/S-PubMedBert-MS-MARCO"
+    )
+    reranker_model_name = getattr(
+        settings.models, "reranker", "cross-encoder/ms-marco-MiniLM-L-6-v2"
+    )
+    if not _feature_enabled(settings, "enable_reranker", False):
+        reranker_model_name = None
+    return dense_model_name, reranker_model_name
+
+
+def warm_retriever_models() -> list[threading.Thread]:
+    """Start loading the retriever's models in the model registry.
+
+    The models load on background threads and stay resident; a
+    ``HybridRetriever`` built afterwards shares them instead of loading its own.
+
+    Returns:
+        The threads started for models that were not already registered.
+    """
+    if not _SENTENCE_AVAILABLE:
+        return []
+    dense_model_name, reranker_model_name = _model_names(get_settings())
+    threads = [model_registry.warm(SentenceTransformer, dense_model_name)]
+    if reranker_model_name:
+        threads.append(model_registry.warm(CrossEncoder, reranker_model_name))
+    return [thread for thread in threads if thread is not None]
+
+
 class HybridRetriever:
     """Combine keyword, dense retrieval, and reranking with cached embeddings and query expansion."""
 
@@ -52,35 +93,19 @@ class HybridRetriever:
         settings = get_settings()
         self.rules = rules or self._load_rules_from_db()
 
-        dense_model_name = getattr(
-            settings.retrieval, "dense_model_name", "pritamdeka/S-PubMedBert-MS-MARCO"
-        )
-        reranker_model_name = getattr(
-            settings.models, "reranker", "cross-encoder/ms-marco-MiniLM-L-6-v2"
+        dense_model_name, reranker_model_name = _model_names(settings)
+        self.use_reranker = reranker_model_name is not None and _SENTENCE_AVAILABLE
+        self.use_query_expansion = _feature_enabled(
+            settings, "enable_query_expansion", True
         )
 
-        features_cfg = getattr(settings, "features", {}) or {}
-        if isinstance(features_cfg, dict):
-            self.use_reranker = (
-                bool(features_cfg.get("enable_reranker", False)) and _SENTENCE_AVAILABLE
-            )
-            self.use_query_expansion = bool(
-                features_cfg.get("enable_query_expansion", True)
-            )
-        else:
-            self.use_reranker = (
-                bool(getattr(features_cfg, "enable_reranker", False))
-                and _SENTENCE_AVAILABLE
-            )
-            self.use_query_expansion = bool(
-                getattr(features_cfg, "enable_query_expansion", True)
-            )
-
         # Initialize dense retriever only if available
         self.dense_retriever = None
         if _SENTENCE_AVAILABLE:
             try:
-                self.dense_retriever = SentenceTransformer(dense_model_name)  # type: ignore[misc]
+                self.dense_retriever = model_registry.acquire_for(
+                    self, SentenceTransformer, dense_model_name
+                )
             except Exception as exc:  # pragma: no cover - defensive
                 logger.warning(
                     "Failed to initialize dense model '%s': %s", dense_model_name, exc
@@ -90,7 +115,9 @@ class HybridRetriever:
         self.reranker = None
         if self.use_reranker and reranker_model_name and _SENTENCE_AVAILABLE:
             try:
-                self.reranker = CrossEncoder(reranker_model_name)  # type: ignore[misc]
+                self.reranker = model_registry.acquire_for(
+                    self, CrossEncoder, reranker_model_name
+                )
             except (sqlalchemy.exc.SQLAlchemyError, sqlite3.Error, Exception) as exc:
                 logger.warning(
                     "Failed to initialize reranker '%s': %s", reranker_model_name, exc
@@ -160,7 +187,85 @@ class HybridRetriever:
         if not self.rules or not self.corpus:
             return []
 
-        # 0. Query Expansion (if enabled)
+        expanded_query, expansion_result = self._expand_query(
+            query, discipline, document_type, context_entities
+        )
+        query_embedding = (
+            self._get_embedding(expanded_query) if self._dense_available() else None
+        )
+        return self._rank(
+            query,
+            expanded_query,
+            expansion_result,
+            query_embedding,
+            top_k=top_k,
+            k=k,
+            category_filter=category_filter,
+        )
+
+    async def retrieve_batch(
+        self, requests: list[dict[str, Any]]
+    ) -> list[list[dict[str, str]]]:
+        """Retrieve rules for several queries, encoding all of them at once.
+
+        Args:
+            requests: One dict per query holding the keyword arguments
+                accepted by ``retrieve`` (``query`` is required).
+
+        Returns:
+            The retrieved rules for each request, in input order.
+        """
+        if not requests:
+            return []
+        if not self.rules or not self.corpus:
+            return [[] for _ in requests]
+
+        expansions = [
+            self._expand_query(
+                request["query"],
+                request.get("discipline"),
+                request.get("document_type"),
+                request.get("context_entities"),
+            )
+            for request in requests
+        ]
+        embeddings: list[Any] = [None] * len(requests)
+        if self._dense_available():
+            encoded = self.dense_retriever.encode(
+                [expanded for expanded, _ in expansions], convert_to_tensor=True
+            )
+            embeddings = [encoded[i : i + 1] for i in range(len(requests))]
+
+        return [
+            self._rank(
+                request["query"],
+                expanded_query,
+                expansion_result,
+                embedding,
+                top_k=request.get("top_k", 5),
+                k=request.get("k", 60),
+                category_filter=request.get("category_filter"),
+            )
+            for request, (expanded_query, expansion_result), embedding in zip(
+                requests, expansions, embeddings
+            )
+        ]
+
+    def _dense_available(self) -> bool:
+        return (
+            self.corpus_embeddings is not None
+            and _SENTENCE_AVAILABLE
+            and self.dense_retriever is not None
+        )
+
+    def _expand_query(
+        self,
+        query: str,
+        discipline: str | None,
+        document_type: str | None,
+        context_entities: list[str] | None,
+    ) -> tuple[str, Any]:
+        """Apply query expansion, returning the expanded query and its metadata."""
         expanded_query = query
         expansion_result = None
 
@@ -186,7 +291,19 @@ class HybridRetriever:
             except (sqlalchemy.exc.SQLAlchemyError, sqlite3.Error, Exception) as e:
                 logger.warning("Query expansion failed, using original query: %s", e)
                 expanded_query = query
+        return expanded_query, expansion_result
 
+    def _rank(
+        self,
+        query: str,
+        expanded_query: str,
+        expansion_result: Any,
+        query_embedding: Any,
+        top_k: int = 5,
+        k: int = 60,
+        category_filter: str | None = None,
+    ) -> list[dict[str, str]]:
+        """Fuse BM25 and dense ranks with RRF, rerank and filter."""
         # 1. Hybrid Retrieval (BM25 + Dense) with RRF
         tokenized_query = expanded_query.lower().split()
         bm25_scores = (
@@ -200,12 +317,7 @@ class HybridRetriever:
         }
 
         # Dense retrieval only if embeddings available
-        if (
-            self.corpus_embeddings is not None
-            and _SENTENCE_AVAILABLE
-            and self.dense_retriever is not None
-        ):
-            query_embedding = self._get_embedding(expanded_query)
+        if query_embedding is not None and self._dense_available():
             dense_scores_tensor = cos_sim(query_embedding, self.corpus_embeddings)[0]
             dense_scores = (
                 dense_scores_tensor.cpu().numpy()
@@ -22,21 +22,40 @@ class MetaAnalyticsService:
     async def get_organizational_overview(
         self, db: AsyncSession, days_back: int, discipline_filter: str | None = None
     ) -> dict[str, Any]:
-        """Gathers a comprehensive overview of organizational analytics."""
+        """Gathers a comprehensive overview of organizational analytics.
+
+        Report metrics, the discipline breakdown and weekly trends are read
+        from the daily analytics rollups. Until the rollups have been
+        backfilled they fall back to aggregating the reports directly.
+        """
 
         # Note: The discipline_filter is not yet used in these queries, but is here for future enhancements.
 
-        organizational_metrics = await crud.get_organizational_metrics(
-            db, days_back=days_back
-        )
-        discipline_breakdown = await crud.get_discipline_breakdown(
-            db, days_back=days_back
-        )
+        if await crud.has_analytics_rollups(db):
+            organizational_metrics = await crud.get_rollup_organizational_metrics(
+                db, days_back=days_back
+            )
+            discipline_breakdown = await crud.get_rollup_discipline_breakdown(
+                db, days_back=days_back
+            )
+            team_trends = await crud.get_rollup_performance_trends(
+                db, days_back=days_back
+            )
+        else:
+            organizational_metrics = await crud.get_organizational_metrics(
+                db, days_back=days_back
+            )
+            discipline_breakdown = await crud.get_discipline_breakdown(
+                db, days_back=days_back
+            )
+            team_trends = await crud.get_team_performance_trends(
+                db, days_back=days_back
+            )
+
         team_habit_breakdown = await crud.get_team_habit_breakdown(
             db, days_back=days_back
         )
         training_needs = await crud.get_training_needs(db, days_back=days_back)
-        team_trends = await crud.get_team_performance_trends(db, days_back=days_back)
         benchmarks = await crud.get_benchmark_data(db)
 
         return {
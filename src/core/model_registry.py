@@ -0,0 +1,243 @@
+"""Process-wide registry of loaded ML models.
+
+Several services load the same models independently: the API startup and the
+AI warm-up each built a ``HybridRetriever`` with its own SentenceTransformer
+(and optional CrossEncoder), doubling peak memory and startup time. Services
+now ``acquire`` models here instead. Each model is loaded once per
+``(loader, name, revision, device)`` key, shared by reference count, and
+unloaded when the last holder releases it.
+
+Models can also be warmed in the background with ``warm``. Each entry reports
+its readiness state (``loading``, ``ready`` or ``failed``) and approximate
+memory, which ``/health/models`` exposes.
+"""
+
+import gc
+import logging
+import threading
+import time
+import weakref
+from typing import Any, Callable, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+
+
+class ModelKey(NamedTuple):
+    """Identity of a loaded model."""
+
+    loader: Callable[..., Any]
+    name: str
+    revision: Optional[str] = None
+    device: Optional[str] = None
+
+
+class _Entry:
+    __slots__ = ("key", "state", "model", "error", "refs", "pinned", "loaded", "load_seconds", "memory_bytes")
+
+    def __init__(self, key: ModelKey) -> None:
+        self.key = key
+        self.state = LOADING
+        self.model: Any = None
+        self.error: Optional[str] = None
+        self.refs = 0
+        self.pinned = False
+        self.loaded = threading.Event()
+        self.load_seconds: Optional[float] = None
+        self.memory_bytes: Optional[int] = None
+
+
+def estimate_model_memory(model: Any) -> Optional[int]:
+    """Approximate bytes held by a torch-backed model's parameters and buffers."""
+    try:
+        tensors = list(model.parameters()) + list(model.buffers())
+    except Exception:
+        return None
+    try:
+        return int(sum(tensor.numel() * tensor.element_size() for tensor in tensors))
+    except Exception:
+        return None
+
+
+class ModelRegistry:
+    """Loads each model once and shares it by reference count."""
+
+    def __init__(self) -> None:
+        self._entries: dict[ModelKey, _Entry] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(
+        loader: Callable[..., Any],
+        name: str,
+        revision: Optional[str] = None,
+        device: Optional[str] = None,
+    ) -> ModelKey:
+        return ModelKey(loader, name, revision, device)
+
+    def acquire(
+        self,
+        loader: Callable[..., Any],
+        name: str,
+        revision: Optional[str] = None,
+        device: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """Return the shared model, loading it on first use.
+
+        ``loader(name, **kwargs)`` is called with ``revision``/``device`` when
+        they are set. Concurrent callers for the same key wait for the single
+        load. Every successful ``acquire`` must be paired with ``release``.
+
+        Raises:
+            Exception: Whatever the loader raised; failed loads are not cached.
+            TimeoutError: The model did not finish loading within ``timeout``.
+        """
+        key = self.key(loader, name, revision, device)
+        entry, owner = self._reserve(key)
+        if owner:
+            self._load(entry)
+        elif not entry.loaded.wait(timeout):
+            self._unreserve(entry)
+            raise TimeoutError(f"Timed out waiting for model {name!r} to load")
+
+        if entry.state != READY:
+            self._unreserve(entry)
+            raise RuntimeError(f"Model {name!r} failed to load: {entry.error}")
+        return entry.model
+
+    def release(
+        self,
+        loader: Callable[..., Any],
+        name: str,
+        revision: Optional[str] = None,
+        device: Optional[str] = None,
+    ) -> None:
+        """Drop one reference; the model is unloaded when none remain."""
+        with self._lock:
+            entry = self._entries.get(self.key(loader, name, revision, device))
+            if entry is None or entry.refs == 0:
+                return
+            entry.refs -= 1
+            if entry.refs > 0 or entry.pinned:
+                return
+            del self._entries[entry.key]
+        entry.model = None
+        logger.info("Unloaded model %s", name)
+        gc.collect()
+
+    def acquire_for(
+        self,
+        owner: Any,
+        loader: Callable[..., Any],
+        name: str,
+        revision: Optional[str] = None,
+        device: Optional[str] = None,
+    ) -> Any:
+        """``acquire`` a model and release it when ``owner`` is garbage collected."""
+        model = self.acquire(loader, name, revision, device)
+        weakref.finalize(owner, self.release, loader, name, revision, device)
+        return model
+
+    def warm(
+        self,
+        loader: Callable[..., Any],
+        name: str,
+        revision: Optional[str] = None,
+        device: Optional[str] = None,
+    ) -> threading.Thread | None:
+        """Load a model on a background thread and keep it resident.
+
+        Returns:
+            The loading thread, or None if the model is already loaded or loading.
+        """
+        key = self.key(loader, name, revision, device)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.pinned = True
+                return None
+            entry = self._entries[key] = _Entry(key)
+            entry.pinned = True
+
+        thread = threading.Thread(
+            target=self._load, args=(entry,), name=f"warm-{name}", daemon=True
+        )
+        thread.start()
+        return thread
+
+    def is_ready(self) -> bool:
+        """True when no registered model is still loading."""
+        with self._lock:
+            return all(entry.state != LOADING for entry in self._entries.values())
+
+    def status(self) -> list[dict[str, Any]]:
+        """Describe every registered model for health reporting."""
+        with self._lock:
+            entries = list(self._entries.values())
+        return [
+            {
+                "name": entry.key.name,
+                "loader": getattr(entry.key.loader, "__name__", repr(entry.key.loader)),
+                "revision": entry.key.revision,
+                "device": entry.key.device,
+                "state": entry.state,
+                "references": entry.refs,
+                "pinned": entry.pinned,
+                "load_seconds": entry.load_seconds,
+                "memory_mb": (
+                    round(entry.memory_bytes / (1024 * 1024), 1)
+                    if entry.memory_bytes is not None
+                    else None
+                ),
+                "error": entry.error,
+            }
+            for entry in entries
+        ]
+
+    def _reserve(self, key: ModelKey) -> tuple[_Entry, bool]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.state == FAILED:
+                del self._entries[key]
+                entry = None
+            owner = entry is None
+            if owner:
+                entry = self._entries[key] = _Entry(key)
+            entry.refs += 1
+            return entry, owner
+
+    def _unreserve(self, entry: _Entry) -> None:
+        with self._lock:
+            entry.refs = max(0, entry.refs - 1)
+            if entry.state == FAILED and entry.refs == 0 and not entry.pinned:
+                self._entries.pop(entry.key, None)
+
+    def _load(self, entry: _Entry) -> None:
+        key = entry.key
+        kwargs = {}
+        if key.revision is not None:
+            kwargs["revision"] = key.revision
+        if key.device is not None:
+            kwargs["device"] = key.device
+
+        logger.info("Loading model %s", key.name)
+        started = time.perf_counter()
+        try:
+            entry.model = key.loader(key.name, **kwargs)
+            entry.memory_bytes = estimate_model_memory(entry.model)
+            entry.state = READY
+            logger.info("Loaded model %s in %.1fs", key.name, time.perf_counter() - started)
+        except Exception as exc:
+            entry.error = str(exc)
+            entry.state = FAILED
+            logger.warning("Failed to load model %s: %s", key.name, exc)
+        finally:
+            entry.load_seconds = round(time.perf_counter() - started, 3)
+            entry.loaded.set()
+
+
+model_registry = ModelRegistry()
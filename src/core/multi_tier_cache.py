@@ -712,6 +712,15 @@ class MultiTierCacheSystem:
         logger.info("Multi-tier cache system shut down")
 
 
+def report_cache_tag(report_id: int) -> str:
+    """Tag for cache entries derived from a stored report.
+
+    Entries set with this tag are invalidated when the report is deleted,
+    e.g. by the retention purge in ``crud.cleanup_old_data``.
+    """
+    return f"report:{report_id}"
+
+
 # Global instance for backward compatibility
 # Global instance - lazy initialization
 multi_tier_cache = None
@@ -7,7 +7,11 @@ resolve overlapping predictions.
 """
 
 import logging
+import os
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
 # MONKEY-PATCH: Add back the file_utils module which was removed in transformers > 4.21
 # This is required to load older models that have not been updated.
@@ -32,6 +36,13 @@ from src.core.cache_service import NERCache
 
 logger = logging.getLogger(__name__)
 
+# Defaults for batched inference; each can be overridden through the
+# ``performance`` section of config.yaml (ner_batch_size, ner_window_chars,
+# ner_window_overlap, ner_max_workers).
+DEFAULT_NER_BATCH_SIZE = 8
+DEFAULT_NER_WINDOW_CHARS = 2000
+DEFAULT_NER_WINDOW_OVERLAP = 200
+
 try:
     from presidio_analyzer import AnalyzerEngine  # type: ignore
 
@@ -41,6 +52,17 @@ except ImportError:
     PRESIDIO_AVAILABLE = False
 
 
+def _physical_core_count() -> int:
+    """Return the number of physical CPU cores, falling back to logical cores."""
+    try:
+        import psutil  # type: ignore[import-untyped]
+
+        cores = psutil.cpu_count(logical=False)
+    except Exception:
+        cores = None
+    return max(1, cores or os.cpu_count() or 1)
+
+
 def get_presidio_wrapper():
     """Return a Presidio AnalyzerEngine if available."""
     if PRESIDIO_AVAILABLE and AnalyzerEngine is not None:
@@ -65,6 +87,8 @@ class ClinicalNERService:
         self.pipelines = self._initialize_pipelines()
         self.models = self.pipelines  # Alias for compatibility
         self.presidio_wrapper = get_presidio_wrapper()
+        self._executor: ThreadPoolExecutor | None = None
+        self._executor_lock = threading.Lock()
 
         # Clinical patterns for clinician name extraction
         self.clinical_patterns = {
@@ -96,6 +120,92 @@ class ClinicalNERService:
                 )
         return pipelines
 
+    @staticmethod
+    def _performance_settings() -> dict[str, Any]:
+        """Return the ``performance`` settings block, or an empty dict if unavailable."""
+        try:
+            from src.config import (
+                get_settings,  # lazy import to avoid cycles at module import
+            )
+
+            return dict(get_settings().performance or {})
+        except Exception:
+            return {}
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Lazily create the thread pool used to run ensemble models concurrently."""
+        with self._executor_lock:
+            if self._executor is None:
+                configured = self._performance_settings().get("ner_max_workers")
+                max_workers = int(configured or _physical_core_count())
+                max_workers = max(1, min(max_workers, len(self.pipelines) or 1))
+                self._executor = ThreadPoolExecutor(
+                    max_workers=max_workers, thread_name_prefix="clinical-ner"
+                )
+            return self._executor
+
+    def shutdown(self) -> None:
+        """Release the ensemble thread pool."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+    @staticmethod
+    def _split_into_windows(
+        text: str, window_chars: int, overlap: int
+    ) -> list[tuple[int, str]]:
+        """Split text into overlapping windows aligned on whitespace.
+
+        Args:
+            text: The text to split.
+            window_chars: Maximum number of characters per window.
+            overlap: Number of characters shared by consecutive windows so that
+                entities crossing a boundary are seen whole by at least one window.
+
+        Returns:
+            A list of ``(offset, window_text)`` tuples.
+
+        """
+        window_chars = max(1, window_chars)
+        overlap = max(0, min(overlap, window_chars // 2))
+        length = len(text)
+        if length <= window_chars:
+            return [(0, text)]
+
+        windows: list[tuple[int, str]] = []
+        start = 0
+        while start < length:
+            end = min(start + window_chars, length)
+            if end < length:
+                boundary = text.rfind(" ", start + overlap + 1, end)
+                if boundary > start:
+                    end = boundary
+            windows.append((start, text[start:end]))
+            if end >= length:
+                break
+            next_start = max(end - overlap, start + 1)
+            space = text.find(" ", next_start, end)
+            start = space + 1 if space != -1 else next_start
+        return windows
+
+    @staticmethod
+    def _run_pipeline_batch(
+        pipe: Any, inputs: list[str], batch_size: int
+    ) -> list[list[dict[str, Any]]]:
+        """Run one pipeline over a list of inputs and return one result list per input."""
+        try:
+            outputs = pipe(inputs, batch_size=batch_size)
+        except TypeError:
+            # Pipelines (or test doubles) that do not accept batch_size.
+            outputs = [pipe(item) for item in inputs]
+
+        if not isinstance(outputs, list):
+            outputs = list(outputs or [])
+        if len(inputs) == 1 and (not outputs or isinstance(outputs[0], dict)):
+            outputs = [outputs]
+        return [list(result or []) for result in outputs]
+
     def extract_entities(self, text: str) -> list[dict[str, Any]]:
         """Extracts and merges clinical entities from the text using the model ensemble.
 
@@ -106,53 +216,117 @@ class ClinicalNERService:
             A merged and deduplicated list of detected clinical entities.
 
         """
-        # Allow performance flag to skip advanced NER entirely (for CPU-friendly runs)
-        try:
-            from src.config import (
-                get_settings,  # lazy import to avoid cycles at module import
-            )
+        if not self.pipelines or not text or not text.strip():
+            return []
+        return self.extract_entities_batch([text])[0]
 
-            if bool(get_settings().performance.get("skip_advanced_ner", False)):
-                return []
-        except Exception:
-            pass
+    def extract_entities_batch(self, texts: list[str]) -> list[list[dict[str, Any]]]:
+        """Extracts clinical entities from many documents in batched model calls.
 
-        if not self.pipelines or not text.strip():
-            return []
+        Long documents are split into overlapping windows, and every window from
+        every uncached document is sent through each pipeline in a single batched
+        call. The ensemble models run concurrently on a thread pool sized to the
+        number of physical cores. Results are merged per document with
+        ``_merge_entities`` and stored in ``NERCache``.
+
+        Args:
+            texts: The documents to analyze.
+
+        Returns:
+            A list of merged entity lists, in the same order as ``texts``.
+
+        """
+        results: list[list[dict[str, Any]]] = [[] for _ in texts]
+
+        # Allow performance flag to skip advanced NER entirely (for CPU-friendly runs)
+        perf = self._performance_settings()
+        if bool(perf.get("skip_advanced_ner", False)) or not self.pipelines:
+            return results
 
-        # Check cache first for performance optimization
         model_identifier = (
             "_".join(self.model_names) if self.model_names else "default_ner"
         )
-        cached_results = NERCache.get_ner_results(text, model_identifier)
-        if cached_results is not None:
-            logger.debug("Cache hit for NER results (model: %s)", model_identifier)
-            return cached_results
+
+        # Check cache first and collect the documents that still need inference
+        pending: dict[str, list[int]] = {}
+        for index, text in enumerate(texts):
+            if not isinstance(text, str) or not text.strip():
+                continue
+            if text in pending:
+                pending[text].append(index)
+                continue
+            cached_results = NERCache.get_ner_results(text, model_identifier)
+            if cached_results is not None:
+                logger.debug("Cache hit for NER results (model: %s)", model_identifier)
+                results[index] = cached_results
+            else:
+                pending[text] = [index]
+
+        if not pending:
+            return results
 
         start_time = time.time()
-        all_entities = []
-        for pipe in self.pipelines:
+        batch_size = int(perf.get("ner_batch_size", DEFAULT_NER_BATCH_SIZE))
+        window_chars = int(perf.get("ner_window_chars", DEFAULT_NER_WINDOW_CHARS))
+        overlap = int(perf.get("ner_window_overlap", DEFAULT_NER_WINDOW_OVERLAP))
+
+        # Flatten every window of every pending document into one batch
+        pending_texts = list(pending)
+        window_owner: list[tuple[int, int]] = []
+        window_inputs: list[str] = []
+        for doc_index, text in enumerate(pending_texts):
+            for offset, window in self._split_into_windows(text, window_chars, overlap):
+                window_owner.append((doc_index, offset))
+                window_inputs.append(window)
+
+        def _run(pipe: Any) -> list[list[dict[str, Any]]]:
+            return self._run_pipeline_batch(pipe, window_inputs, batch_size)
+
+        if len(self.pipelines) > 1:
+            executor = self._get_executor()
+            futures = [executor.submit(_run, pipe) for pipe in self.pipelines]
+            runs = [future.result for future in futures]
+        else:
+            runs = [partial(_run, pipe) for pipe in self.pipelines]
+
+        pipeline_outputs: list[list[list[dict[str, Any]]]] = []
+        for run in runs:
             try:
-                entities = pipe(text)
-                if entities:
-                    all_entities.extend(entities)
+                pipeline_outputs.append(run())
             except Exception as e:
                 logger.warning("A clinical NER pipeline failed during execution: %s", e)
 
-        merged_entities = self._merge_entities(all_entities)
+        per_document: list[list[dict[str, Any]]] = [[] for _ in pending_texts]
+        for outputs in pipeline_outputs:
+            for (doc_index, offset), entities in zip(window_owner, outputs):
+                for entity in entities:
+                    # Without offsets a windowed entity cannot be placed in the text
+                    if entity.get("start") is None or entity.get("end") is None:
+                        continue
+                    shifted = dict(entity)
+                    shifted["start"] = int(entity["start"]) + offset
+                    shifted["end"] = int(entity["end"]) + offset
+                    per_document[doc_index].append(shifted)
 
         # Cache the results for future use
         processing_time = time.time() - start_time
         ttl_hours = (
             24.0 if processing_time > 2.0 else 48.0
         )  # Longer TTL for quick processing
-        NERCache.set_ner_results(text, model_identifier, merged_entities, ttl_hours)
+        for doc_index, text in enumerate(pending_texts):
+            merged_entities = self._merge_entities(per_document[doc_index])
+            NERCache.set_ner_results(text, model_identifier, merged_entities, ttl_hours)
+            for index in pending[text]:
+                results[index] = merged_entities
 
         logger.debug(
-            "NER processing completed in %ss, cached with TTL {ttl_hours}h",
+            "NER processed %d documents (%d windows) in %.2fs, cached with TTL %sh",
+            len(pending_texts),
+            len(window_inputs),
             processing_time,
+            ttl_hours,
         )
-        return merged_entities
+        return results
 
     def _merge_entities(self, entities: list[dict[str, Any]]) -> list[dict[str, Any]]:
         """Merges overlapping entities based on score and span length."""
@@ -162,8 +336,8 @@ class ClinicalNERService:
         # Normalize entities to a consistent format
         for entity in entities:
             entity["word"] = (entity.get("word") or "").strip()
-            entity["start"] = int(entity.get("start", 0))
-            entity["end"] = int(entity.get("end", 0))
+            entity["start"] = int(entity.get("start") or 0)
+            entity["end"] = int(entity.get("end") or 0)
             entity["score"] = float(entity.get("score", 0.0))
 
         # Sort by start position, then by score descending to prioritize higher-confidence entities
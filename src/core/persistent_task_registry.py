@@ -7,7 +7,9 @@ import asyncio
 import json
 import logging
 import sqlite3
+import threading
 import time
+from concurrent.futures import Future
 from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
 from enum import Enum
@@ -46,19 +48,250 @@ class TaskMetadata:
     retry_count: int = 0
     max_retries: int = 3
     result_data: Optional[Dict[str, Any]] = None
+    payload: Optional[Dict[str, Any]] = None
+    lease_owner: Optional[str] = None
+    lease_expires_at: Optional[float] = None
 
     def __post_init__(self):
         if self.created_at is None:
             self.created_at = datetime.now(timezone.utc)
 
 
+TERMINAL_STATUSES = frozenset(
+    {TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED}
+)
+DEFAULT_FLUSH_INTERVAL = 0.25
+DEFAULT_LEASE_SECONDS = 60.0
+
+# Columns added for the durable job queue; created on existing databases too.
+JOB_COLUMNS = {
+    "payload": "TEXT NULL",
+    "lease_owner": "TEXT NULL",
+    "lease_expires_at": "REAL NULL",
+    "heartbeat_at": "REAL NULL",
+}
+
+
+def _encode_field(field: str, value: Any) -> Any:
+    """Convert a task field to the value stored in SQLite."""
+    if field == "status" and isinstance(value, TaskStatus):
+        return value.value
+    if field in ("created_at", "started_at", "completed_at") and isinstance(
+        value, datetime
+    ):
+        return value.isoformat()
+    if field in ("result_data", "payload") and isinstance(value, dict):
+        return json.dumps(value)
+    return value
+
+
+class ProgressSink:
+    """Write-behind sink that coalesces task updates onto one writer thread.
+
+    Progress updates are merged per task in memory, so only the latest value of
+    each field is written. A dedicated thread owns a single long-lived WAL
+    connection and flushes the pending updates every ``flush_interval``
+    seconds, grouping rows with the same column set into one ``executemany``
+    transaction. Writes that must be durable before the caller continues go
+    through ``write`` and are applied, in order, after any pending progress.
+    """
+
+    def __init__(self, db_path: str, flush_interval: float = DEFAULT_FLUSH_INTERVAL):
+        self.db_path = db_path
+        self.flush_interval = flush_interval
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        # Lease owner each pending task's progress is guarded by
+        self._lease_guards: Dict[str, str] = {}
+        self._direct: List[tuple[str, Dict[str, Any], Optional[str], Future]] = []
+        # Futures taken by the flush in progress
+        self._inflight: List[Future] = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+        self.flush_count = 0
+        self.rows_written = 0
+
+    def record(
+        self, task_id: str, fields: Dict[str, Any], lease_owner: Optional[str] = None
+    ) -> None:
+        """Merge ``fields`` into the pending state for ``task_id``.
+
+        When ``lease_owner`` is given the flush only applies the fields while
+        that worker still holds the task's lease; otherwise they are dropped.
+        """
+        with self._lock:
+            self._pending.setdefault(task_id, {}).update(fields)
+            if lease_owner is not None:
+                self._lease_guards[task_id] = lease_owner
+        self._ensure_thread()
+
+    def pending_for(self, task_id: str) -> Dict[str, Any]:
+        """Return the not-yet-persisted fields for ``task_id``."""
+        with self._lock:
+            return dict(self._pending.get(task_id, {}))
+
+    def write(
+        self, task_id: str, fields: Dict[str, Any], lease_owner: Optional[str] = None
+    ) -> Future:
+        """Queue a write that is applied on the next flush and signal completion.
+
+        When ``lease_owner`` is given the row is only updated while that worker
+        still holds the task's lease.
+
+        Returns:
+            A future resolving to the number of rows updated.
+        """
+        future: Future = Future()
+        with self._lock:
+            self._direct.append((task_id, dict(fields), lease_owner, future))
+        self._ensure_thread()
+        self._wakeup.set()
+        return future
+
+    def discard(self, task_id: str) -> None:
+        """Drop pending progress for a task that no longer exists."""
+        with self._lock:
+            self._pending.pop(task_id, None)
+            self._lease_guards.pop(task_id, None)
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """Block until everything recorded so far has been written."""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        self.write("", {}).result(timeout=timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Flush outstanding updates and stop the writer thread."""
+        thread = self._thread
+        if thread is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        thread.join(timeout=timeout)
+        self._thread = None
+        self._stopping = False
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="task-progress-writer", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        conn: Optional[sqlite3.Connection] = None
+        try:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            while True:
+                self._wakeup.wait(self.flush_interval)
+                self._wakeup.clear()
+                stopping = self._stopping
+                self._flush_once(conn)
+                if stopping:
+                    break
+        except Exception as e:
+            logger.error("Task progress writer stopped", error=str(e))
+            self._fail_outstanding(e)
+        finally:
+            if conn is not None:
+                conn.close()
+
+    def _fail_outstanding(self, error: Exception) -> None:
+        """Fail every write still waiting on this thread.
+
+        Clearing ``_thread`` under the lock makes the next ``record`` or
+        ``write`` start a fresh writer, so no caller waits on a dead thread.
+        """
+        with self._lock:
+            waiting = self._inflight + [future for *_, future in self._direct]
+            self._inflight, self._direct = [], []
+            if self._thread is threading.current_thread():
+                self._thread = None
+        for future in waiting:
+            if not future.done():
+                future.set_exception(error)
+
+    def _flush_once(self, conn: sqlite3.Connection) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            guards, self._lease_guards = self._lease_guards, {}
+            direct, self._direct = self._direct, []
+            self._inflight = [future for *_, future in direct]
+        if not pending and not direct:
+            return
+
+        try:
+            # Group coalesced rows by column set and lease guard so each group
+            # is one executemany
+            groups: Dict[tuple, List[tuple]] = {}
+            for task_id, fields in pending.items():
+                columns = tuple(sorted(fields))
+                values = tuple(_encode_field(c, fields[c]) for c in columns)
+                owner = guards.get(task_id)
+                if owner is None:
+                    groups.setdefault((columns, False), []).append(values + (task_id,))
+                else:
+                    groups.setdefault((columns, True), []).append(
+                        values + (task_id, owner)
+                    )
+
+            with conn:
+                for (columns, guarded), rows in groups.items():
+                    assignments = ", ".join(f"{column} = ?" for column in columns)
+                    where = "task_id = ? AND lease_owner = ?" if guarded else "task_id = ?"
+                    cursor = conn.executemany(
+                        f"UPDATE tasks SET {assignments} WHERE {where}", rows
+                    )
+                    self.rows_written += cursor.rowcount
+                    if guarded and cursor.rowcount < len(rows):
+                        logger.debug(
+                            "Dropped progress from workers that lost their lease",
+                            dropped=len(rows) - cursor.rowcount,
+                        )
+            self.flush_count += 1
+        except Exception as e:
+            logger.error(
+                "Failed to flush task progress", tasks=len(pending), error=str(e)
+            )
+
+        for task_id, fields, owner, future in direct:
+            if not fields:
+                future.set_result(0)
+                continue
+            try:
+                columns = list(fields)
+                assignments = ", ".join(f"{column} = ?" for column in columns)
+                values = [_encode_field(c, fields[c]) for c in columns] + [task_id]
+                where = "task_id = ?"
+                if owner is not None:
+                    where += " AND lease_owner = ?"
+                    values.append(owner)
+                with conn:
+                    cursor = conn.execute(
+                        f"UPDATE tasks SET {assignments} WHERE {where}", values
+                    )
+                self.rows_written += 1
+                future.set_result(cursor.rowcount)
+            except Exception as e:
+                future.set_exception(e)
+        self._inflight = []
+
+
 class PersistentTaskRegistry:
     """Persistent task registry using SQLite for task state management."""
 
-    def __init__(self, db_path: str = "tasks.db"):
+    def __init__(self, db_path: str = "tasks.db", flush_interval: float = DEFAULT_FLUSH_INTERVAL):
         self.db_path = db_path
         self._lock = asyncio.Lock()
         self._init_database()
+        self._progress = ProgressSink(db_path, flush_interval=flush_interval)
 
     def _init_database(self) -> None:
         """Initialize the SQLite database with task table."""
@@ -98,6 +331,14 @@ class PersistentTaskRegistry:
                     "CREATE INDEX IF NOT EXISTS idx_tasks_created_at ON tasks(created_at)"
                 )
 
+                existing = {row[1] for row in conn.execute("PRAGMA table_info(tasks)")}
+                for column, definition in JOB_COLUMNS.items():
+                    if column not in existing:
+                        conn.execute(f"ALTER TABLE tasks ADD COLUMN {column} {definition}")
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_tasks_lease ON tasks(status, lease_expires_at)"
+                )
+
                 conn.commit()
                 logger.info("Task database initialized", db_path=self.db_path)
 
@@ -117,8 +358,8 @@ class PersistentTaskRegistry:
                         INSERT INTO tasks (
                             task_id, status, progress, status_message, filename,
                             user_id, discipline, analysis_mode, strictness,
-                            created_at, retry_count, max_retries
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                            created_at, retry_count, max_retries, payload
+                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                     """,
                         (
                             task.task_id,
@@ -133,6 +374,7 @@ class PersistentTaskRegistry:
                             task.created_at.isoformat(),
                             task.retry_count,
                             task.max_retries,
+                            _encode_field("payload", task.payload),
                         ),
                     )
                     conn.commit()
@@ -144,53 +386,72 @@ class PersistentTaskRegistry:
                 logger.error("Failed to create task", task_id=task_id, error=str(e))
                 raise
 
-    async def update_task(self, task_id: str, **kwargs) -> bool:
-        """Update an existing task."""
-        async with self._lock:
-            try:
-                # Build dynamic update query
-                update_fields = []
-                values = []
-
-                for field, value in kwargs.items():
-                    if field == "status" and isinstance(value, TaskStatus):
-                        value = value.value
-                    elif field in [
-                        "created_at",
-                        "started_at",
-                        "completed_at",
-                    ] and isinstance(value, datetime):
-                        value = value.isoformat()
-                    elif field == "result_data" and isinstance(value, dict):
-                        value = json.dumps(value)
-
-                    update_fields.append(f"{field} = ?")
-                    values.append(value)
-
-                if not update_fields:
-                    return True
-
-                values.append(task_id)
-
-                with sqlite3.connect(self.db_path) as conn:
-                    cursor = conn.execute(
-                        f"UPDATE tasks SET {', '.join(update_fields)} WHERE task_id = ?",
-                        values,
-                    )
-                    conn.commit()
-
-                    if cursor.rowcount > 0:
-                        logger.debug(
-                            "Task updated", task_id=task_id, fields=list(kwargs.keys())
-                        )
-                        return True
-                    else:
-                        logger.warning("Task not found for update", task_id=task_id)
-                        return False
+    def record_progress(
+        self, task_id: str, worker_id: Optional[str] = None, **kwargs
+    ) -> None:
+        """Record a non-terminal task update without waiting for the write.
+
+        Updates are coalesced per task and persisted in the background by the
+        progress sink. Terminal statuses are not accepted here; use
+        ``update_task`` so that they are written before the caller continues.
+
+        Args:
+            task_id: Task to update.
+            worker_id: Lease owner reporting the progress. When given, the
+                update is dropped if the worker no longer holds the lease, so
+                a stale worker cannot flip a requeued job back to running.
+            **kwargs: Task columns to update.
+        """
+        status = kwargs.get("status")
+        if isinstance(status, str):
+            status = TaskStatus(status)
+        if status in TERMINAL_STATUSES:
+            raise ValueError(
+                "Terminal task states must be persisted with update_task()"
+            )
+        self._progress.record(task_id, kwargs, lease_owner=worker_id)
+
+    async def update_task(
+        self, task_id: str, expected_lease_owner: Optional[str] = None, **kwargs
+    ) -> bool:
+        """Update an existing task and wait until the change is persisted.
+
+        The write is applied on the progress writer thread after any pending
+        progress for the task, so a later progress flush can never overwrite it.
+
+        Args:
+            task_id: Task to update.
+            expected_lease_owner: When given, only update the task while this
+                worker still holds its lease.
+            **kwargs: Columns to set.
+
+        Returns:
+            True when a row was updated.
+        """
+        if not kwargs:
+            return True
+        try:
+            rowcount = await asyncio.wrap_future(
+                self._progress.write(task_id, kwargs, lease_owner=expected_lease_owner)
+            )
+            if rowcount > 0:
+                logger.debug(
+                    "Task updated", task_id=task_id, fields=list(kwargs.keys())
+                )
+                return True
+            if expected_lease_owner is not None:
+                logger.warning(
+                    "Task update skipped: lease no longer held",
+                    task_id=task_id,
+                    worker_id=expected_lease_owner,
+                )
+            else:
+                logger.warning("Task not found for update", task_id=task_id)
+            return False
 
-            except Exception as e:
-                logger.error("Failed to update task", task_id=task_id, error=str(e))
-                return False
+        except Exception as e:
+            logger.error("Failed to update task", task_id=task_id, error=str(e))
+            return False
 
     async def get_task(self, task_id: str) -> Optional[TaskMetadata]:
         """Get a task by ID."""
@@ -202,9 +463,9 @@ class PersistentTaskRegistry:
                 )
                 row = cursor.fetchone()
 
-                if row:
-                    return self._row_to_task(row)
-                return None
+            if row:
+                return self._apply_pending(self._row_to_task(row))
+            return None
 
         except Exception as e:
             logger.error("Failed to get task", task_id=task_id, error=str(e))
@@ -223,7 +484,7 @@ class PersistentTaskRegistry:
                 )
                 rows = cursor.fetchall()
 
-                return [self._row_to_task(row) for row in rows]
+                return [self._apply_pending(self._row_to_task(row)) for row in rows]
 
         except Exception as e:
             logger.error("Failed to get tasks by user: %s", str(e), extra={"user_id": user_id})
@@ -260,6 +521,7 @@ class PersistentTaskRegistry:
                     )
                     conn.commit()
 
+                    self._progress.discard(task_id)
                     if cursor.rowcount > 0:
                         logger.info("Task deleted", task_id=task_id)
                         return True
@@ -298,6 +560,134 @@ class PersistentTaskRegistry:
                 logger.error("Failed to cleanup old tasks", error=str(e))
                 return 0
 
+    async def enqueue_job(
+        self, task_id: str, payload: Dict[str, Any], **kwargs
+    ) -> TaskMetadata:
+        """Persist a task that a worker process will pick up with ``claim_next_job``."""
+        kwargs.setdefault("status", TaskStatus.PENDING)
+        return await self.create_task(task_id, payload=payload, **kwargs)
+
+    async def claim_next_job(
+        self, worker_id: str, lease_seconds: float = DEFAULT_LEASE_SECONDS
+    ) -> Optional[TaskMetadata]:
+        """Lease the oldest queued job to ``worker_id``.
+
+        The select and update run in one ``BEGIN IMMEDIATE`` transaction, so two
+        workers can never claim the same job.
+        """
+        return await asyncio.to_thread(self._claim_next_job_sync, worker_id, lease_seconds)
+
+    def _claim_next_job_sync(
+        self, worker_id: str, lease_seconds: float
+    ) -> Optional[TaskMetadata]:
+        now = time.time()
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            conn.row_factory = sqlite3.Row
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    """
+                    SELECT task_id FROM tasks
+                    WHERE status IN ('pending', 'retrying') AND payload IS NOT NULL
+                    ORDER BY created_at
+                    LIMIT 1
+                """
+                ).fetchone()
+                if row is None:
+                    conn.execute("COMMIT")
+                    return None
+                conn.execute(
+                    """
+                    UPDATE tasks
+                    SET status = 'running', lease_owner = ?, lease_expires_at = ?,
+                        heartbeat_at = ?, started_at = ?, error_message = NULL
+                    WHERE task_id = ?
+                """,
+                    (
+                        worker_id,
+                        now + lease_seconds,
+                        now,
+                        datetime.now(timezone.utc).isoformat(),
+                        row["task_id"],
+                    ),
+                )
+                claimed = conn.execute(
+                    "SELECT * FROM tasks WHERE task_id = ?", (row["task_id"],)
+                ).fetchone()
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+
+        logger.info("Job claimed", task_id=claimed["task_id"], worker_id=worker_id)
+        return self._row_to_task(claimed)
+
+    async def renew_lease(
+        self, task_id: str, worker_id: str, lease_seconds: float = DEFAULT_LEASE_SECONDS
+    ) -> bool:
+        """Extend the lease held by ``worker_id``; False means the lease was lost."""
+        try:
+            return await asyncio.to_thread(
+                self._renew_lease_sync, task_id, worker_id, lease_seconds
+            )
+        except Exception as e:
+            logger.error("Failed to renew lease", task_id=task_id, error=str(e))
+            return False
+
+    def _renew_lease_sync(self, task_id: str, worker_id: str, lease_seconds: float) -> bool:
+        now = time.time()
+        with sqlite3.connect(self.db_path, timeout=30) as conn:
+            cursor = conn.execute(
+                """
+                UPDATE tasks SET lease_expires_at = ?, heartbeat_at = ?
+                WHERE task_id = ? AND lease_owner = ? AND status = 'running'
+            """,
+                (now + lease_seconds, now, task_id, worker_id),
+            )
+            conn.commit()
+            return cursor.rowcount > 0
+
+    async def requeue_expired_leases(self) -> int:
+        """Return jobs whose worker stopped heartbeating to the queue.
+
+        Jobs that have used up ``max_retries`` are marked failed instead.
+        """
+        try:
+            requeued = await asyncio.to_thread(self._requeue_expired_leases_sync)
+        except Exception as e:
+            logger.error("Failed to requeue expired leases", error=str(e))
+            return 0
+        if requeued > 0:
+            logger.warning("Requeued jobs with expired leases", count=requeued)
+        return requeued
+
+    def _requeue_expired_leases_sync(self) -> int:
+        now = time.time()
+        with sqlite3.connect(self.db_path, timeout=30) as conn:
+            cursor = conn.execute(
+                """
+                UPDATE tasks
+                SET status = CASE WHEN retry_count < max_retries
+                                  THEN 'retrying' ELSE 'failed' END,
+                    error_message = CASE WHEN retry_count < max_retries
+                                         THEN 'Worker lease expired; requeued'
+                                         ELSE 'Worker lease expired; retries exhausted' END,
+                    completed_at = CASE WHEN retry_count < max_retries
+                                        THEN NULL ELSE ? END,
+                    retry_count = retry_count + 1,
+                    lease_owner = NULL,
+                    lease_expires_at = NULL
+                WHERE status = 'running' AND lease_expires_at IS NOT NULL
+                  AND lease_expires_at < ?
+            """,
+                (datetime.now(timezone.utc).isoformat(), now),
+            )
+            conn.commit()
+            return cursor.rowcount
+
     async def get_task_statistics(self) -> Dict[str, Any]:
         """Get task statistics."""
         try:
@@ -341,6 +731,15 @@ class PersistentTaskRegistry:
             logger.error("Failed to get task statistics", error=str(e))
             return {}
 
+    def _apply_pending(self, task: TaskMetadata) -> TaskMetadata:
+        """Overlay progress that has been recorded but not yet flushed."""
+        for field, value in self._progress.pending_for(task.task_id).items():
+            if field == "status" and isinstance(value, str):
+                value = TaskStatus(value)
+            if hasattr(task, field):
+                setattr(task, field, value)
+        return task
+
     def _row_to_task(self, row: sqlite3.Row) -> TaskMetadata:
         """Convert database row to TaskMetadata object."""
         try:
@@ -369,6 +768,14 @@ class PersistentTaskRegistry:
                         "Failed to parse result_data", task_id=row["task_id"]
                     )
 
+            keys = row.keys()
+            payload = None
+            if "payload" in keys and row["payload"]:
+                try:
+                    payload = json.loads(row["payload"])
+                except json.JSONDecodeError:
+                    logger.warning("Failed to parse payload", task_id=row["task_id"])
+
             return TaskMetadata(
                 task_id=row["task_id"],
                 status=TaskStatus(row["status"]),
@@ -386,15 +793,24 @@ class PersistentTaskRegistry:
                 retry_count=row["retry_count"],
                 max_retries=row["max_retries"],
                 result_data=result_data,
+                payload=payload,
+                lease_owner=row["lease_owner"] if "lease_owner" in keys else None,
+                lease_expires_at=(
+                    row["lease_expires_at"] if "lease_expires_at" in keys else None
+                ),
             )
 
         except Exception as e:
             logger.error("Failed to convert row to task", error=str(e))
             raise
 
+    async def flush(self) -> None:
+        """Wait until all recorded progress has been written."""
+        await asyncio.to_thread(self._progress.flush)
+
     async def close(self) -> None:
-        """Close the database connection."""
-        # SQLite connections are automatically closed, but we can add cleanup here
+        """Flush pending progress and stop the writer thread."""
+        await asyncio.to_thread(self._progress.close)
         logger.info("Task registry closed")
 
 
@@ -2,7 +2,11 @@ from __future__ import annotations
 
 """State-of-the-art PHI scrubbing service built on the Presidio framework."""
 
+import copy
 import logging
+import re
+from functools import lru_cache
+from typing import Any
 
 try:
     from presidio_analyzer import AnalyzerEngine, RecognizerRegistry
@@ -16,6 +20,67 @@ except ImportError:  # pragma: no cover - optional dependency
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_SEGMENT_CHARS = 1200
+DEFAULT_SEGMENT_OVERLAP = 100
+
+# Section breaks and sentence ends are preferred places to cut a document.
+_BOUNDARY_PATTERN = re.compile(r"\n\s*\n|(?<=[.!?;])\s+|\n")
+
+# Cheap signals that a segment may contain PHI: digits (dates, phone numbers,
+# identifiers), e-mail/URL markers, honorifics and capitalised words that do
+# not start a sentence (names, places). Sentence-initial names are invisible
+# to this check, which is why the regex-only pre-pass is opt-in.
+_PHI_CANDIDATE_PATTERN = re.compile(
+    r"\d"
+    r"|@|https?://|www\."
+    r"|\b(?:Dr|Mr|Mrs|Ms|Miss|Mx)\b\.?"
+    r"|(?<=[a-z0-9,;:)] )[A-Z][a-z]+"
+)
+
+
+@lru_cache(maxsize=1)
+def _shared_presidio_engines() -> tuple[Any, Any]:
+    """Build the Presidio analyzer and anonymizer once per process.
+
+    Constructing the recognizer registry loads the NLP model and every
+    predefined recognizer; Presidio compiles each recognizer's regex lazily and
+    keeps it on the pattern object, so sharing one engine also shares the
+    compiled patterns across documents and service instances.
+    """
+    registry = None
+    analyzer = None
+    anonymizer = None
+    if RecognizerRegistry is not None:
+        try:
+            registry = RecognizerRegistry()
+        except Exception as exc:
+            logger.warning("Failed to initialize Presidio recognizer registry: %s", exc)
+    if AnalyzerEngine is not None:
+        try:
+            analyzer = AnalyzerEngine(
+                registry=registry if registry is not None else RecognizerRegistry(),
+                supported_languages=["en"],
+            )
+        except Exception as exc:
+            logger.exception("Failed to initialize Presidio AnalyzerEngine: %s", exc)
+            analyzer = None
+    if AnonymizerEngine is not None:
+        try:
+            anonymizer = AnonymizerEngine()
+        except Exception as exc:
+            logger.exception("Failed to initialize Presidio AnonymizerEngine: %s", exc)
+            anonymizer = None
+    return analyzer, anonymizer
+
+
+def _performance_settings() -> dict[str, Any]:
+    try:
+        from src.config import get_settings
+
+        return dict(get_settings().performance or {})
+    except Exception:
+        return {}
+
 
 class PhiScrubberService:
     """A robust service for scrubbing Protected Health Information (PHI)."""
@@ -26,10 +91,41 @@ class PhiScrubberService:
         wrapper: object | None = None,
         analyzer: AnalyzerEngine | None = None,
         anonymizer: AnonymizerEngine | None = None,
+        segment_chars: int | None = None,
+        segment_overlap: int | None = None,
+        regex_prefilter: bool | None = None,
     ) -> None:
-        """Initialise Presidio-based scrubbing service with injectable components."""
+        """Initialise Presidio-based scrubbing service with injectable components.
+
+        Args:
+            replacement: Token substituted for every detected PHI span.
+            wrapper: Object exposing both ``analyze`` and ``anonymize``.
+            analyzer: Optional Presidio ``AnalyzerEngine``.
+            anonymizer: Optional Presidio ``AnonymizerEngine``.
+            segment_chars: Target segment length for sentence-level analysis.
+            segment_overlap: Characters each segment re-reads from its
+                predecessor so that entities crossing a boundary are detected.
+            regex_prefilter: Skip NLP analysis for segments with no PHI candidates.
+
+        """
         self.default_replacement = replacement
 
+        perf = _performance_settings()
+        self.segment_chars = max(
+            1, int(segment_chars or perf.get("phi_segment_chars", DEFAULT_SEGMENT_CHARS))
+        )
+        overlap = (
+            segment_overlap
+            if segment_overlap is not None
+            else perf.get("phi_segment_overlap", DEFAULT_SEGMENT_OVERLAP)
+        )
+        self.segment_overlap = max(0, min(int(overlap), self.segment_chars // 2))
+        self.regex_prefilter = bool(
+            regex_prefilter
+            if regex_prefilter is not None
+            else perf.get("phi_regex_prefilter", False)
+        )
+
         self._custom_wrapper = False
         if wrapper is not None:
             self.analyzer = wrapper
@@ -37,68 +133,172 @@ class PhiScrubberService:
             self._custom_wrapper = True
             return
 
-        registry = None
-        if analyzer is None and RecognizerRegistry is not None:
-            try:
-                registry = RecognizerRegistry()
-            except Exception as exc:
-                logger.warning(
-                    "Failed to initialize Presidio recognizer registry: %s", exc
-                )
-        if analyzer is None and AnalyzerEngine is not None:
-            try:
-                analyzer = AnalyzerEngine(
-                    registry=registry if registry is not None else RecognizerRegistry(),
-                    supported_languages=["en"],
-                )
-            except Exception as exc:
-                logger.exception(
-                    "Failed to initialize Presidio AnalyzerEngine: %s", exc
-                )
-                analyzer = None
-        if anonymizer is None and AnonymizerEngine is not None:
-            try:
-                anonymizer = AnonymizerEngine()
-            except Exception as exc:
-                logger.exception(
-                    "Failed to initialize Presidio AnonymizerEngine: %s", exc
-                )
-                anonymizer = None
+        if analyzer is None or anonymizer is None:
+            shared_analyzer, shared_anonymizer = _shared_presidio_engines()
+            analyzer = analyzer or shared_analyzer
+            anonymizer = anonymizer or shared_anonymizer
 
         self.analyzer = analyzer
         self.anonymizer = anonymizer
 
     def scrub(self, text: str, replacement_token: str | None = None) -> str:
         """Analyze and scrub PHI from text using Presidio components."""
-        if not isinstance(text, str) or not text.strip():
-            return text
+        return self.scrub_many([text], replacement_token=replacement_token)[0]
+
+    def scrub_many(
+        self, texts: list[str], replacement_token: str | None = None
+    ) -> list[str]:
+        """Scrub PHI from several documents in one batched pass.
+
+        Each document is split at section and sentence boundaries into
+        overlapping segments. Segments from every document are analyzed
+        together (through spaCy ``nlp.pipe`` when Presidio is used), detected
+        spans are mapped back to document offsets and merged, and each document
+        is anonymized once.
+
+        Args:
+            texts: The documents to scrub.
+            replacement_token: Optional override for the replacement token.
+
+        Returns:
+            The scrubbed documents, in input order. Non-text or blank inputs and
+            documents whose analysis fails are returned unchanged.
+
+        """
+        results: list[Any] = list(texts)
+        pending = [
+            index
+            for index, text in enumerate(texts)
+            if isinstance(text, str) and text.strip()
+        ]
+        if not pending:
+            return results
 
         if not self.analyzer or not self.anonymizer or OperatorConfig is None:
             logger.warning("Presidio is not available; returning original text.")
-            return text
+            return results
 
         token = replacement_token or self.default_replacement
+        operators = {"DEFAULT": OperatorConfig("replace", {"new_value": token})}
+
+        owners: list[tuple[int, int]] = []
+        segments: list[str] = []
+        for index in pending:
+            for offset, segment in self._split_segments(texts[index]):
+                owners.append((index, offset))
+                segments.append(segment)
 
         try:
-            if not self.analyzer or not self.anonymizer:
-                logger.warning(
-                    "Analyzer or anonymizer not available, returning original text"
-                )
-                return text
-
-            if self._custom_wrapper:
-                analyzer_results = self.analyzer.analyze(text)  # type: ignore[attr-defined]
-            else:
-                analyzer_results = self.analyzer.analyze(text=text, language="en")  # type: ignore[attr-defined]
-            anonymized_result = self.anonymizer.anonymize(  # type: ignore[attr-defined]
-                text=text,
-                analyzer_results=analyzer_results,
-                operators={"DEFAULT": OperatorConfig("replace", {"new_value": token})},
-            )
-            return anonymized_result.text
+            segment_results = self._analyze_segments(segments)
         except Exception as exc:
             logger.error("Error scrubbing text with Presidio: %s", exc, exc_info=True)
-            return text
+            return results
+
+        per_document: dict[int, list[Any]] = {index: [] for index in pending}
+        for (index, offset), found in zip(owners, segment_results):
+            for result in found:
+                shifted = copy.copy(result)
+                shifted.start = result.start + offset
+                shifted.end = result.end + offset
+                per_document[index].append(shifted)
+
+        for index in pending:
+            try:
+                anonymized_result = self.anonymizer.anonymize(  # type: ignore[attr-defined]
+                    text=texts[index],
+                    analyzer_results=self._merge_results(per_document[index]),
+                    operators=operators,
+                )
+                results[index] = anonymized_result.text
+            except Exception as exc:
+                logger.error(
+                    "Error scrubbing text with Presidio: %s", exc, exc_info=True
+                )
+        return results
+
+    def _split_segments(self, text: str) -> list[tuple[int, str]]:
+        """Split text into overlapping segments cut at sentence/section boundaries.
+
+        Returns:
+            A list of ``(offset, segment_text)`` tuples covering the whole text.
+
+        """
+        length = len(text)
+        if length <= self.segment_chars:
+            return [(0, text)]
+
+        cut_points = [match.end() for match in _BOUNDARY_PATTERN.finditer(text)]
+        segments: list[tuple[int, str]] = []
+        start = 0
+        cursor = 0
+        while start < length:
+            limit = start + self.segment_chars
+            end = length if limit >= length else limit
+            if end < length:
+                while cursor < len(cut_points) and cut_points[cursor] <= start:
+                    cursor += 1
+                probe = cursor
+                best = None
+                while probe < len(cut_points) and cut_points[probe] <= limit:
+                    best = cut_points[probe]
+                    probe += 1
+                if best is not None and best > start + self.segment_overlap:
+                    end = best
+
+            # Re-read the tail of the previous segment so boundary entities are whole
+            seg_start = start
+            if segments and self.segment_overlap:
+                seg_start = max(0, start - self.segment_overlap)
+                space = text.find(" ", seg_start, start)
+                if space != -1:
+                    seg_start = space + 1
+            segments.append((seg_start, text[seg_start:end]))
+            start = end
+        return segments
+
+    def _analyze_segments(self, segments: list[str]) -> list[list[Any]]:
+        """Run PHI detection over segments, batching NLP work where possible."""
+        outputs: list[list[Any]] = [[] for _ in segments]
+        to_analyze = [
+            position
+            for position, segment in enumerate(segments)
+            if segment.strip()
+            and (not self.regex_prefilter or _PHI_CANDIDATE_PATTERN.search(segment))
+        ]
+        if not to_analyze:
+            return outputs
+
+        if self._custom_wrapper:
+            for position in to_analyze:
+                outputs[position] = list(self.analyzer.analyze(segments[position]))  # type: ignore[attr-defined]
+            return outputs
+
+        nlp_engine = getattr(self.analyzer, "nlp_engine", None)
+        batch_texts = [segments[position] for position in to_analyze]
+        if nlp_engine is not None and hasattr(nlp_engine, "process_batch"):
+            artifacts = nlp_engine.process_batch(texts=batch_texts, language="en")
+            for position, (_, nlp_artifacts) in zip(to_analyze, artifacts):
+                outputs[position] = self.analyzer.analyze(  # type: ignore[attr-defined]
+                    text=segments[position], language="en", nlp_artifacts=nlp_artifacts
+                )
+        else:
+            for position in to_analyze:
+                outputs[position] = self.analyzer.analyze(  # type: ignore[attr-defined]
+                    text=segments[position], language="en"
+                )
+        return outputs
+
+    @staticmethod
+    def _merge_results(results: list[Any]) -> list[Any]:
+        """Collapse duplicate and overlapping spans found by neighbouring segments."""
+        merged: list[Any] = []
+        for result in sorted(results, key=lambda r: (r.start, -r.end)):
+            if merged and result.start < merged[-1].end:
+                if result.end > merged[-1].end:
+                    merged[-1].end = result.end
+                continue
+            merged.append(result)
+        return merged
 
 
 __all__ = ["PhiScrubberService"]
@@ -0,0 +1,128 @@
+"""Short-lived cache of authenticated principals.
+
+``get_current_user`` used to load the ``User`` row, including its Fernet
+encrypted preferences and license key, on every authenticated request. This
+cache keeps a snapshot of the row's column values for a few seconds, keyed on
+the username and the token's issued-at time, so repeated requests carrying
+the same token skip the query and the decryption.
+
+Entries are dropped whenever the user row is inserted, updated or deleted
+through the ORM and when the user's sessions are invalidated. Other worker
+processes see such changes once their entries expire, which bounds staleness
+by the TTL.
+"""
+
+import copy
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from sqlalchemy import inspect
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 30.0
+DEFAULT_MAX_ENTRIES = 1024
+
+
+def _performance_settings() -> dict[str, Any]:
+    try:
+        from src.config import get_settings
+
+        return dict(get_settings().performance or {})
+    except Exception:
+        return {}
+
+
+class PrincipalCache:
+    """TTL + LRU cache of user column snapshots keyed on (username, issued_at)."""
+
+    def __init__(
+        self,
+        ttl_seconds: Optional[float] = None,
+        max_entries: Optional[int] = None,
+    ) -> None:
+        perf = _performance_settings()
+        self.ttl_seconds = float(
+            ttl_seconds
+            if ttl_seconds is not None
+            else perf.get("principal_cache_ttl_seconds", DEFAULT_TTL_SECONDS)
+        )
+        self.max_entries = int(
+            max_entries
+            if max_entries is not None
+            else perf.get("principal_cache_max_entries", DEFAULT_MAX_ENTRIES)
+        )
+        self._entries: OrderedDict[tuple[str, Any], tuple[float, dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    def get(self, username: str, issued_at: Any) -> Optional[dict[str, Any]]:
+        """Return a copy of the cached column values, or None on a miss."""
+        if not self.enabled:
+            return None
+        key = (username, issued_at)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            snapshot = entry[1]
+        # Callers may mutate mutable columns such as preferences
+        return copy.deepcopy(snapshot)
+
+    def put(self, username: str, issued_at: Any, user: Any) -> None:
+        """Cache the loaded column values of an ORM ``user`` instance."""
+        if not self.enabled:
+            return
+        state = inspect(user)
+        columns = [attr.key for attr in state.mapper.column_attrs]
+        if any(key in state.unloaded for key in columns):
+            return
+        snapshot = copy.deepcopy({key: getattr(user, key) for key in columns})
+        with self._lock:
+            self._entries[(username, issued_at)] = (
+                time.monotonic() + self.ttl_seconds,
+                snapshot,
+            )
+            self._entries.move_to_end((username, issued_at))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_user(
+        self, user_id: Optional[int] = None, username: Optional[str] = None
+    ) -> int:
+        """Drop every entry for the user; returns the number removed."""
+        with self._lock:
+            stale = [
+                key
+                for key, (_, snapshot) in self._entries.items()
+                if (username is not None and key[0] == username)
+                or (user_id is not None and snapshot.get("id") == user_id)
+            ]
+            for key in stale:
+                del self._entries[key]
+        if stale:
+            logger.debug("Invalidated %d cached principals for user %s", len(stale), user_id or username)
+        return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+principal_cache = PrincipalCache()
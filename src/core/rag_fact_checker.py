@@ -13,6 +13,7 @@ from sentence_transformers import CrossEncoder
 
 from src.config import get_settings
 from src.core.hybrid_retriever import HybridRetriever
+from src.core.model_registry import model_registry
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -38,7 +39,9 @@ class RAGFactChecker:
             try:
                 logger.info("Loading cross-encoder reranker for fact-checking...")
                 # Use a lightweight cross-encoder for reranking
-                self.reranker = CrossEncoder("cross-encoder/ms-marco-MiniLM-L-6-v2")
+                self.reranker = model_registry.acquire_for(
+                    self, CrossEncoder, "cross-encoder/ms-marco-MiniLM-L-6-v2"
+                )
                 logger.info("Reranker loaded successfully")
             except Exception as e:
                 logger.warning(f"Failed to load reranker: {e}")
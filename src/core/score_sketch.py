@@ -0,0 +1,126 @@
+"""Mergeable sketch of compliance score distributions.
+
+Compliance scores are bounded to 0-100, so a fixed-resolution histogram is a
+mergeable quantile sketch with a known error bound: scores are bucketed into
+bins of ``1 / BINS_PER_POINT`` points, and histograms for different days or
+disciplines merge by adding bin counts. Each bin also carries the exact sum,
+sum of squares, minimum and maximum of its scores, so count, mean, standard
+deviation and range are exact and only quantiles are approximate (by at most
+half a bin, and exact for scores on the bin grid).
+
+The database keeps one histogram per day and discipline in
+``analytics_score_histogram``; ``crud.get_benchmark_data`` merges the rows of
+a window into a ``ScoreHistogram`` to answer benchmark queries.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+BINS_PER_POINT = 10
+
+
+def score_bin(score: float) -> int:
+    """Bin index of ``score``, rounding half up."""
+    return int(math.floor(score * BINS_PER_POINT + 0.5))
+
+
+@dataclass
+class ScoreBin:
+    """Aggregates of the scores falling into one bin."""
+
+    count: int = 0
+    total: float = 0.0
+    total_sq: float = 0.0
+    minimum: Optional[float] = None
+    maximum: Optional[float] = None
+
+    def merge(self, other: "ScoreBin") -> None:
+        self.count += other.count
+        self.total += other.total
+        self.total_sq += other.total_sq
+        if other.minimum is not None:
+            self.minimum = other.minimum if self.minimum is None else min(self.minimum, other.minimum)
+        if other.maximum is not None:
+            self.maximum = other.maximum if self.maximum is None else max(self.maximum, other.maximum)
+
+
+class ScoreHistogram:
+    """Fixed-resolution histogram answering count, mean, std and percentiles."""
+
+    def __init__(self) -> None:
+        self.bins: dict[int, ScoreBin] = {}
+
+    @classmethod
+    def from_scores(cls, scores: Iterable[float]) -> "ScoreHistogram":
+        histogram = cls()
+        for score in scores:
+            histogram.add(score)
+        return histogram
+
+    def add(self, score: float) -> None:
+        score = float(score)
+        self.add_bin(score_bin(score), ScoreBin(1, score, score * score, score, score))
+
+    def add_bin(self, index: int, aggregates: ScoreBin) -> None:
+        """Merge pre-aggregated bin values, e.g. a row read from the database."""
+        existing = self.bins.get(index)
+        if existing is None:
+            self.bins[index] = ScoreBin()
+            existing = self.bins[index]
+        existing.merge(aggregates)
+
+    def merge(self, other: "ScoreHistogram") -> None:
+        for index, aggregates in other.bins.items():
+            self.add_bin(index, aggregates)
+
+    @property
+    def count(self) -> int:
+        return sum(aggregates.count for aggregates in self.bins.values())
+
+    def mean(self) -> float:
+        count = self.count
+        if not count:
+            raise ValueError("Cannot compute the mean of an empty histogram")
+        return sum(aggregates.total for aggregates in self.bins.values()) / count
+
+    def std(self) -> float:
+        """Population standard deviation, matching ``numpy.std``."""
+        mean = self.mean()
+        total_sq = sum(aggregates.total_sq for aggregates in self.bins.values())
+        return math.sqrt(max(total_sq / self.count - mean * mean, 0.0))
+
+    def min(self) -> float:
+        return self.bins[min(self.bins)].minimum
+
+    def max(self) -> float:
+        return self.bins[max(self.bins)].maximum
+
+    def quantile(self, percent: float) -> float:
+        """Percentile with ``numpy.percentile``'s linear interpolation.
+
+        Each score is represented by its bin value, so results are exact for
+        scores on the bin grid and within half a bin otherwise.
+        """
+        count = self.count
+        if not count:
+            raise ValueError("Cannot compute percentiles of an empty histogram")
+        rank = percent / 100 * (count - 1)
+        lower_rank = math.floor(rank)
+        lower = self._value_at(lower_rank)
+        upper = self._value_at(min(lower_rank + 1, count - 1))
+        return lower + (upper - lower) * (rank - lower_rank)
+
+    def percentiles(self, percents: Iterable[float]) -> dict[float, float]:
+        return {percent: self.quantile(percent) for percent in percents}
+
+    def _value_at(self, rank: int) -> float:
+        seen = 0
+        for index in sorted(self.bins):
+            aggregates = self.bins[index]
+            seen += aggregates.count
+            if rank < seen:
+                if aggregates.minimum == aggregates.maximum and aggregates.minimum is not None:
+                    return aggregates.minimum
+                return index / BINS_PER_POINT
+        raise IndexError(rank)
@@ -13,6 +13,7 @@ from typing import Any, Dict, Optional, Set
 from jose import JWTError, jwt
 
 from src.auth import get_auth_service
+from src.core.principal_cache import principal_cache
 from src.database import models
 
 logger = logging.getLogger(__name__)
@@ -210,6 +211,7 @@ class SessionManager:
         Returns:
             Number of sessions invalidated
         """
+        principal_cache.invalidate_user(user_id=user_id)
         if user_id not in self._user_sessions:
             return 0
 
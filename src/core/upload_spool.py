@@ -0,0 +1,246 @@
+"""Streaming intake of uploaded documents.
+
+``receive_upload`` reads an ``UploadFile`` chunk by chunk, hashing and
+validating each chunk as it arrives and enforcing the upload size limit before
+the whole body has been received. Small uploads stay in memory; once an upload
+grows past the spool threshold its chunks are encrypted to a temporary spool
+file instead, so several large scans in flight no longer hold full copies of
+their content in RAM. The resulting ``SpooledUpload`` is the handle passed to
+the analysis pipeline in place of raw bytes.
+
+Spool files are a sequence of length-prefixed Fernet tokens, one per chunk,
+because Fernet can only encrypt complete messages.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import shutil
+import struct
+import uuid
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, Optional
+
+from .file_encryption import get_encryption_service
+from .file_upload_validator import StreamingFileValidator
+from .security_validator import SecurityValidator
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 256 * 1024
+DEFAULT_SPOOL_THRESHOLD = 1024 * 1024
+DEFAULT_SPOOL_DIR = Path("temp") / "upload_spool"
+
+_FRAME_HEADER = struct.Struct(">I")
+
+
+def _performance_settings() -> dict[str, Any]:
+    try:
+        from src.config import get_settings
+
+        return dict(get_settings().performance or {})
+    except Exception:
+        return {}
+
+
+class UploadRejectedError(ValueError):
+    """Raised when an upload fails validation or exceeds the size limit."""
+
+
+def write_encrypted_chunk(handle: Any, chunk: bytes) -> None:
+    """Append one encrypted frame to an open spool file."""
+    token = get_encryption_service().encrypt_file_content(chunk)
+    handle.write(_FRAME_HEADER.pack(len(token)))
+    handle.write(token)
+
+
+def iter_encrypted_chunks(path: str | Path) -> Iterator[bytes]:
+    """Yield the decrypted chunks of a spool file in order."""
+    encryption = get_encryption_service()
+    with open(path, "rb") as handle:
+        while header := handle.read(_FRAME_HEADER.size):
+            if len(header) < _FRAME_HEADER.size:
+                raise ValueError(f"Truncated spool file: {path}")
+            (length,) = _FRAME_HEADER.unpack(header)
+            token = handle.read(length)
+            if len(token) < length:
+                raise ValueError(f"Truncated spool file: {path}")
+            yield encryption.decrypt_file_content(token)
+
+
+class SpooledUpload:
+    """Handle to a received upload, held in memory or in an encrypted spool.
+
+    Attributes:
+        filename: Original filename as sent by the client.
+        content_type: MIME type from the upload.
+        size: Number of bytes received.
+        sha256: Hex SHA-256 digest of the plaintext content.
+        spool_path: Path of the encrypted spool file, or None when in memory.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        content_type: Optional[str],
+        size: int,
+        sha256: str,
+        content: Optional[bytes] = None,
+        spool_path: Optional[str] = None,
+    ) -> None:
+        self.filename = filename
+        self.content_type = content_type
+        self.size = size
+        self.sha256 = sha256
+        self.spool_path = spool_path
+        self._content = content
+
+    @property
+    def is_spooled(self) -> bool:
+        return self.spool_path is not None
+
+    def iter_chunks(self) -> Iterator[bytes]:
+        """Yield the plaintext content without materializing spooled uploads."""
+        if self.spool_path is None:
+            if self._content:
+                yield self._content
+            return
+        yield from iter_encrypted_chunks(self.spool_path)
+
+    def read_bytes(self) -> bytes:
+        """Return the full plaintext content."""
+        if self.spool_path is None:
+            return self._content or b""
+        return b"".join(self.iter_chunks())
+
+    def copy_to(self, path: str | Path) -> None:
+        """Write the plaintext content to ``path`` chunk by chunk."""
+        with open(path, "wb") as handle:
+            for chunk in self.iter_chunks():
+                handle.write(chunk)
+
+    def persist_encrypted(self, path: str | Path) -> str:
+        """Move (or write) the encrypted content to ``path`` and return it.
+
+        A spooled upload is renamed into place; an in-memory upload is written
+        as a single encrypted frame. The handle reads from ``path`` afterwards.
+        """
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if self.spool_path is not None:
+            shutil.move(self.spool_path, target)
+        else:
+            with open(target, "wb") as handle:
+                write_encrypted_chunk(handle, self._content or b"")
+            self._content = None
+        self.spool_path = str(target)
+        return self.spool_path
+
+    def discard(self) -> None:
+        """Release the content; removes the spool file if there is one."""
+        self._content = None
+        if self.spool_path is None:
+            return
+        try:
+            Path(self.spool_path).unlink(missing_ok=True)
+        except OSError as exc:
+            logger.warning("Failed to remove upload spool %s: %s", self.spool_path, exc)
+
+    def __repr__(self) -> str:
+        location = self.spool_path or "memory"
+        return f"SpooledUpload({self.filename!r}, size={self.size}, at={location})"
+
+
+async def receive_upload(
+    upload: Any,
+    chunk_size: Optional[int] = None,
+    spool_threshold: Optional[int] = None,
+    spool_dir: Optional[str | Path] = None,
+) -> SpooledUpload:
+    """Stream an ``UploadFile`` into a ``SpooledUpload``.
+
+    Each chunk is fed to the SHA-256 digest and a ``StreamingFileValidator``,
+    and the running size is checked with ``SecurityValidator.validate_file_size``,
+    so oversized or invalid uploads are rejected without reading the rest.
+
+    Args:
+        upload: A Starlette/FastAPI ``UploadFile``.
+        chunk_size: Bytes read per chunk.
+        spool_threshold: Size beyond which chunks are spooled to disk.
+        spool_dir: Directory for spool files.
+
+    Raises:
+        UploadRejectedError: The upload is empty, too large or fails validation.
+    """
+    perf = _performance_settings()
+    chunk_size = int(chunk_size or perf.get("upload_chunk_size_bytes", DEFAULT_CHUNK_SIZE))
+    spool_threshold = int(
+        spool_threshold
+        if spool_threshold is not None
+        else perf.get("upload_spool_threshold_bytes", DEFAULT_SPOOL_THRESHOLD)
+    )
+    spool_dir = Path(spool_dir or perf.get("upload_spool_dir", DEFAULT_SPOOL_DIR))
+
+    filename = upload.filename or "unknown"
+    validator = StreamingFileValidator(filename, upload.content_type)
+    if not validator.is_valid:
+        raise UploadRejectedError(f"File validation failed: {validator.error}")
+
+    digest = hashlib.sha256()
+    buffered: list[bytes] = []
+    buffered_size = 0
+    spool_path: Optional[Path] = None
+    spool_handle = None
+    try:
+        while chunk := await upload.read(chunk_size):
+            digest.update(chunk)
+            size_valid, size_error = SecurityValidator.validate_file_size(
+                validator.size + len(chunk)
+            )
+            if not size_valid:
+                raise UploadRejectedError(size_error or "File is too large")
+            if not validator.feed(chunk):
+                raise UploadRejectedError(f"File validation failed: {validator.error}")
+
+            if spool_handle is None and buffered_size + len(chunk) > spool_threshold:
+                spool_dir.mkdir(parents=True, exist_ok=True)
+                spool_path = spool_dir / f"upload_{uuid.uuid4().hex}.enc"
+                spool_handle = open(spool_path, "wb")
+                for pending in buffered:
+                    await asyncio.to_thread(write_encrypted_chunk, spool_handle, pending)
+                buffered.clear()
+            if spool_handle is not None:
+                await asyncio.to_thread(write_encrypted_chunk, spool_handle, chunk)
+            else:
+                buffered.append(chunk)
+                buffered_size += len(chunk)
+    except BaseException:
+        if spool_handle is not None:
+            spool_handle.close()
+            os.unlink(spool_path)
+        raise
+
+    if spool_handle is not None:
+        spool_handle.close()
+
+    is_valid, error = validator.result()
+    size_valid, size_error = SecurityValidator.validate_file_size(validator.size)
+    if not (is_valid and size_valid):
+        if spool_path is not None:
+            os.unlink(spool_path)
+        if not size_valid:
+            raise UploadRejectedError(size_error or "File is empty")
+        raise UploadRejectedError(f"File validation failed: {error}")
+
+    if spool_path is not None:
+        logger.info("Spooled %d byte upload %s to disk", validator.size, filename)
+    return SpooledUpload(
+        filename=filename,
+        content_type=upload.content_type,
+        size=validator.size,
+        sha256=digest.hexdigest(),
+        content=b"".join(buffered) if spool_path is None else None,
+        spool_path=str(spool_path) if spool_path is not None else None,
+    )
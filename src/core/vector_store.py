@@ -120,6 +120,36 @@ class VectorStore:
         except (sqlalchemy.exc.SQLAlchemyError, sqlite3.Error) as exc:
             logger.exception("Failed to add vectors to vector store: %s", exc)
 
+    def remove_ids(self, ids: list[int]) -> int:
+        """Removes the vectors of the given report ids, e.g. after a purge.
+
+        Returns:
+            The number of vectors removed.
+        """
+        if not self.is_initialized or not ids:
+            return 0
+
+        doomed = {int(vec_id) for vec_id in ids}
+        if _FAISS_AVAILABLE and self.index is not None:
+            removed = int(self.index.remove_ids(np.array(sorted(doomed), dtype="int64")))
+        else:
+            kept = [
+                (vec, vec_id)
+                for vec, vec_id in zip(self._fallback_vectors, self._fallback_ids, strict=True)
+                if vec_id not in doomed
+            ]
+            removed = len(self._fallback_ids) - len(kept)
+            self._fallback_vectors = [vec for vec, _ in kept]
+            self._fallback_ids = [vec_id for _, vec_id in kept]
+        self.report_ids = [vec_id for vec_id in self.report_ids if vec_id not in doomed]
+        if removed:
+            logger.info(
+                "Removed %s vectors from the index. Total vectors: %s",
+                removed,
+                self._total_vectors(),
+            )
+        return removed
+
     def search(
         self, query_vector: np.ndarray, k: int, threshold: float = 0.9
     ) -> list[tuple[int, float]]:
@@ -4,24 +4,36 @@
 Provides async database operations for users, rubrics, reports, and findings.
 """
 
+import asyncio
+import base64
+import binascii
 import datetime
+import json
 import logging
 import math
 import sqlite3
+import time
 from collections import Counter
+from collections.abc import AsyncIterator
 from datetime import date, timedelta
 from typing import Any
 
 import numpy as np
 import sqlalchemy
 import sqlalchemy.exc
-from sqlalchemy import func, select
+from sqlalchemy import func, literal, select, text
 from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import selectinload, undefer
+from sqlalchemy.orm.attributes import set_committed_value
 
+from ..config import get_settings
+from ..core import multi_tier_cache as multi_tier_cache_module
+from ..core.multi_tier_cache import report_cache_tag
+from ..core.score_sketch import BINS_PER_POINT, ScoreBin, ScoreHistogram, score_bin
 from ..core.vector_store import get_vector_store
 from . import models, schemas
+from .encryption import report_payload_cache
 
 logger = logging.getLogger(__name__)
 
@@ -334,52 +346,87 @@ async def get_dashboard_statistics(db: AsyncSession) -> dict[str, Any]:
         }
 
 
+def _report_finding_count(*criteria: Any):
+    """Correlated count of the findings of each ``AnalysisReport`` row.
+
+    Evaluated per selected report through the ``report_id`` index, so the cost
+    follows the reports in the window rather than the size of the findings
+    table (a grouped subquery would aggregate every finding first).
+    """
+    return (
+        select(func.count(models.Finding.id))
+        .where(models.Finding.report_id == models.AnalysisReport.id, *criteria)
+        .correlate(models.AnalysisReport)
+        .scalar_subquery()
+    )
+
+
+def _dialect_name(db: AsyncSession) -> str:
+    try:
+        # The session's own bind; routing a lookup through get_bind is unnecessary
+        return (db.bind or db.get_bind()).dialect.name
+    except Exception:
+        return "sqlite"
+
+
+def _report_age_days(db: AsyncSession, now: datetime.datetime):
+    """SQL expression for the age of ``AnalysisReport.analysis_date`` in days."""
+    if _dialect_name(db) == "sqlite":
+        # Julian day number of ``now``; stored datetimes are naive UTC
+        now_julian = now.timestamp() / 86400 + 2440587.5
+        return literal(now_julian) - func.julianday(models.AnalysisReport.analysis_date)
+    return (
+        literal(now.timestamp())
+        - func.extract("epoch", models.AnalysisReport.analysis_date)
+    ) / 86400
+
+
+def _report_week_index(db: AsyncSession, now: datetime.datetime):
+    """Whole weeks between ``AnalysisReport.analysis_date`` and ``now``."""
+    weeks = _report_age_days(db, now) / 7
+    if _dialect_name(db) == "sqlite":
+        # CAST truncates, which is floor for the non-negative ages queried
+        return sqlalchemy.cast(weeks, sqlalchemy.Integer)
+    # PostgreSQL rounds when casting to integer
+    return sqlalchemy.cast(func.floor(weeks), sqlalchemy.Integer)
+
+
 async def get_organizational_metrics(
     db: AsyncSession, days_back: int
 ) -> dict[str, Any]:
     """Computes high-level organizational metrics."""
     cutoff_date = datetime.datetime.now(datetime.UTC) - timedelta(days=days_back)
 
-    report_query = select(models.AnalysisReport).filter(
-        models.AnalysisReport.analysis_date >= cutoff_date
-    )
-    reports = list(
-        (
-            await db.execute(
-                report_query.options(selectinload(models.AnalysisReport.findings))
-            )
+    report_query = (
+        select(
+            func.count(models.AnalysisReport.id).label("total_analyses"),
+            func.avg(models.AnalysisReport.compliance_score).label("avg_score"),
+            func.coalesce(func.sum(_report_finding_count()), 0).label("total_findings"),
         )
-        .scalars()
-        .unique()
-        .all()
+        .select_from(models.AnalysisReport)
+        .where(models.AnalysisReport.analysis_date >= cutoff_date)
     )
-
-    total_analyses = len(reports)
-    total_findings = sum(len(r.findings) for r in reports)
-    avg_score = np.mean([r.compliance_score for r in reports]) if reports else 0
+    row = (await db.execute(report_query)).one()
 
     user_query = select(func.count(models.User.id))
     total_users = (await db.execute(user_query)).scalar_one_or_none() or 0
 
     return {
         "total_users": total_users,
-        "avg_compliance_score": avg_score,
-        "total_findings": total_findings,
-        "total_analyses": total_analyses,
+        "avg_compliance_score": float(row.avg_score) if row.avg_score is not None else 0,
+        "total_findings": int(row.total_findings),
+        "total_analyses": int(row.total_analyses),
     }
 
 
 async def get_discipline_breakdown(
     db: AsyncSession, days_back: int
 ) -> dict[str, dict[str, Any]]:
-    """Computes compliance metrics broken down by discipline, querying the JSON field."""
+    """Computes compliance metrics broken down by discipline."""
     cutoff_date = datetime.datetime.now(datetime.UTC) - timedelta(days=days_back)
 
-    try:
-        analysis_discipline = models.AnalysisReport.analysis_result["discipline"]
-        discipline_expr = analysis_discipline.as_string()
-    except NotImplementedError:
-        discipline_expr = models.AnalysisReport.discipline
+    # The encrypted analysis_result cannot be queried, so use the column copy
+    discipline_expr = models.AnalysisReport.discipline
 
     query = (
         select(
@@ -453,7 +500,12 @@ async def get_training_needs(db: AsyncSession, days_back: int) -> list[dict[str,
 async def get_team_performance_trends(
     db: AsyncSession, days_back: int
 ) -> list[dict[str, Any]]:
-    """Computes team performance trends grouped by week."""
+    """Computes team performance trends grouped by week.
+
+    Week 1 covers the 7 days before now, week 2 the 7 days before that, and so
+    on. Reports are bucketed and aggregated in SQL, so memory use does not
+    grow with the number of reports.
+    """
     if days_back <= 0:
         return []
 
@@ -461,134 +513,570 @@ async def get_team_performance_trends(
     num_weeks = max(1, math.ceil(days_back / 7))
     cutoff_date = now - datetime.timedelta(days=days_back)
 
+    week_index = _report_week_index(db, now).label("week_index")
     query = (
-        select(models.AnalysisReport)
-        .options(selectinload(models.AnalysisReport.findings))
-        .where(models.AnalysisReport.analysis_date >= cutoff_date)
+        select(
+            week_index,
+            func.avg(models.AnalysisReport.compliance_score).label("avg_score"),
+            func.coalesce(func.sum(_report_finding_count()), 0).label("total_findings"),
+        )
+        .select_from(models.AnalysisReport)
+        .where(
+            models.AnalysisReport.analysis_date >= cutoff_date,
+            models.AnalysisReport.analysis_date < now,
+        )
+        .group_by(week_index)
     )
-    result = await db.execute(query)
-    reports = list(result.scalars().unique().all())
-
-    def _as_aware(dt: datetime.datetime) -> datetime.datetime:
-        if dt.tzinfo is None or dt.tzinfo.utcoffset(dt) is None:
-            return dt.replace(tzinfo=datetime.UTC)
-        return dt.astimezone(datetime.UTC)
+    weekly = {row.week_index: row for row in (await db.execute(query)).all()}
 
     trends: list[dict[str, Any]] = []
     for index in range(num_weeks):
-        week_end = now - datetime.timedelta(days=index * 7)
-        week_start = week_end - datetime.timedelta(days=7)
+        row = weekly.get(index)
+        trends.append(
+            {
+                "week": index + 1,
+                "avg_compliance_score": (
+                    float(row.avg_score) if row is not None and row.avg_score is not None else 0.0
+                ),
+                "total_findings": int(row.total_findings) if row is not None else 0,
+            }
+        )
 
-        week_reports = [
-            report
-            for report in reports
-            if week_start <= _as_aware(report.analysis_date) < week_end
-        ]
+    return trends
+
+
+# --- Analytics rollups --- #
+
+_ROLLUP_SQL_COLUMNS = (
+    "report_count",
+    "score_sum",
+    "score_min",
+    "score_max",
+    "finding_count",
+    "high_risk_finding_count",
+)
+
+
+def _rollup_insert(db: AsyncSession, table: Any = models.AnalyticsDailyRollup):
+    """Dialect-specific INSERT supporting ``on_conflict_do_update``."""
+    if _dialect_name(db) == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(table)
+
+
+def _merged_min_max(table: Any, excluded: Any) -> dict[str, Any]:
+    """``on_conflict_do_update`` assignments widening ``score_min``/``score_max``."""
+    return {
+        "score_min": sqlalchemy.case(
+            (table.score_min.is_(None), excluded.score_min),
+            (excluded.score_min < table.score_min, excluded.score_min),
+            else_=table.score_min,
+        ),
+        "score_max": sqlalchemy.case(
+            (table.score_max.is_(None), excluded.score_max),
+            (excluded.score_max > table.score_max, excluded.score_max),
+            else_=table.score_max,
+        ),
+    }
+
+
+def _score_bin_expr(db: AsyncSession):
+    """SQL equivalent of ``score_sketch.score_bin`` for report scores."""
+    scaled = models.AnalysisReport.compliance_score * BINS_PER_POINT + 0.5
+    if _dialect_name(db) == "sqlite":
+        # CAST truncates, which is floor for the non-negative scores stored
+        return sqlalchemy.cast(scaled, sqlalchemy.Integer)
+    return sqlalchemy.cast(func.floor(scaled), sqlalchemy.Integer)
+
+
+def _rollup_window(days_back: int) -> tuple[date, date]:
+    """First and last day of the ``days_back`` most recent UTC days."""
+    today = datetime.datetime.now(datetime.UTC).date()
+    return today - timedelta(days=max(days_back, 1) - 1), today
+
+
+def _processing_ms(analysis_result: dict | None) -> float | None:
+    value = (analysis_result or {}).get("processing_time_ms")
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and value >= 0:
+        return float(value)
+    return None
+
+
+async def _increment_daily_rollup(
+    db: AsyncSession,
+    report: models.AnalysisReport,
+    findings_data: list[schemas.FindingCreate] | None,
+) -> None:
+    """Add a newly created report to its daily rollup row in the current transaction."""
+    rollup = models.AnalyticsDailyRollup
+    analysis_date = report.analysis_date or datetime.datetime.utcnow()
+    processing_ms = _processing_ms(report.analysis_result)
+    findings_data = findings_data or []
+
+    stmt = _rollup_insert(db).values(
+        day=analysis_date.date(),
+        discipline=report.discipline or "",
+        document_type=report.document_type or "",
+        report_count=1,
+        score_sum=report.compliance_score,
+        score_min=report.compliance_score,
+        score_max=report.compliance_score,
+        finding_count=len(findings_data),
+        high_risk_finding_count=sum(
+            1 for finding in findings_data if (finding.risk or "").lower() == "high"
+        ),
+        processing_ms_sum=processing_ms or 0.0,
+        processing_ms_count=1 if processing_ms is not None else 0,
+        updated_at=datetime.datetime.now(datetime.UTC),
+    )
+    excluded = stmt.excluded
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[rollup.day, rollup.discipline, rollup.document_type],
+        set_={
+            "report_count": rollup.report_count + excluded.report_count,
+            "score_sum": rollup.score_sum + excluded.score_sum,
+            **_merged_min_max(rollup, excluded),
+            "finding_count": rollup.finding_count + excluded.finding_count,
+            "high_risk_finding_count": (
+                rollup.high_risk_finding_count + excluded.high_risk_finding_count
+            ),
+            "processing_ms_sum": rollup.processing_ms_sum + excluded.processing_ms_sum,
+            "processing_ms_count": rollup.processing_ms_count + excluded.processing_ms_count,
+            "updated_at": excluded.updated_at,
+        },
+    )
+    await db.execute(stmt)
+
+    histogram = models.AnalyticsScoreHistogram
+    score = float(report.compliance_score)
+    stmt = _rollup_insert(db, histogram).values(
+        day=analysis_date.date(),
+        discipline=report.discipline or "",
+        bin=score_bin(score),
+        count=1,
+        score_sum=score,
+        score_sq_sum=score * score,
+        score_min=score,
+        score_max=score,
+    )
+    excluded = stmt.excluded
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[histogram.day, histogram.discipline, histogram.bin],
+        set_={
+            "count": histogram.count + excluded.count,
+            "score_sum": histogram.score_sum + excluded.score_sum,
+            "score_sq_sum": histogram.score_sq_sum + excluded.score_sq_sum,
+            **_merged_min_max(histogram, excluded),
+        },
+    )
+    await db.execute(stmt)
+
+
+def _report_day_expr(db: AsyncSession):
+    """SQL expression for the UTC day of ``AnalysisReport.analysis_date``."""
+    if _dialect_name(db) == "sqlite":
+        day_expr = func.date(models.AnalysisReport.analysis_date)
+    else:
+        day_expr = sqlalchemy.cast(models.AnalysisReport.analysis_date, sqlalchemy.Date)
+    return day_expr.label("day")
+
+
+def _as_date(value: Any) -> date:
+    return value if isinstance(value, date) else date.fromisoformat(str(value))
+
+
+def _score_histogram_query(db: AsyncSession, *group_by: Any):
+    """Aggregate report scores into score bins, grouped by ``group_by`` too."""
+    report = models.AnalysisReport
+    bin_expr = _score_bin_expr(db).label("bin")
+    return (
+        select(
+            *group_by,
+            bin_expr,
+            func.count(report.id).label("count"),
+            func.sum(report.compliance_score).label("score_sum"),
+            func.sum(report.compliance_score * report.compliance_score).label("score_sq_sum"),
+            func.min(report.compliance_score).label("score_min"),
+            func.max(report.compliance_score).label("score_max"),
+        )
+        .where(report.compliance_score.is_not(None))
+        .group_by(*group_by, bin_expr)
+    )
+
+
+async def rebuild_analytics_rollups(db: AsyncSession, days_back: int | None = None) -> int:
+    """Recompute daily rollups from the reports and findings tables.
+
+    Used to backfill history and to repair drift from reports that were
+    deleted or written outside ``create_analysis_report``. Processing times
+    live only in the encrypted ``analysis_result``, so the existing
+    ``processing_ms_*`` values of a row are kept rather than recomputed.
+
+    Args:
+        db: Database session
+        days_back: Number of most recent days to rebuild; None rebuilds all history
+
+    Returns:
+        int: Number of rollup rows written
+    """
+    rollup = models.AnalyticsDailyRollup
+    report = models.AnalysisReport
+    day_expr = _report_day_expr(db)
+    discipline_expr = func.coalesce(report.discipline, "").label("discipline")
+    document_type_expr = func.coalesce(report.document_type, "").label("document_type")
+
+    finding_count = _report_finding_count()
+    high_risk_count = _report_finding_count(func.lower(models.Finding.risk) == "high")
+    query = (
+        select(
+            day_expr,
+            discipline_expr,
+            document_type_expr,
+            func.count(report.id).label("report_count"),
+            func.sum(report.compliance_score).label("score_sum"),
+            func.min(report.compliance_score).label("score_min"),
+            func.max(report.compliance_score).label("score_max"),
+            func.coalesce(func.sum(finding_count), 0).label("finding_count"),
+            func.coalesce(func.sum(high_risk_count), 0).label("high_risk_count"),
+        )
+        .select_from(report)
+        .group_by(day_expr, discipline_expr, document_type_expr)
+    )
+    histogram_query = _score_histogram_query(db, day_expr, discipline_expr)
+    first_day = None
+    if days_back is not None:
+        first_day, _ = _rollup_window(days_back)
+        window = report.analysis_date >= datetime.datetime.combine(first_day, datetime.time.min)
+        query = query.where(window)
+        histogram_query = histogram_query.where(window)
+
+    now = datetime.datetime.now(datetime.UTC)
+    rows = []
+    for row in (await db.execute(query)).all():
+        rows.append(
+            {
+                "day": _as_date(row.day),
+                "discipline": row.discipline,
+                "document_type": row.document_type,
+                "report_count": int(row.report_count),
+                "score_sum": float(row.score_sum or 0.0),
+                "score_min": row.score_min,
+                "score_max": row.score_max,
+                "finding_count": int(row.finding_count),
+                "high_risk_finding_count": int(row.high_risk_count),
+                "updated_at": now,
+            }
+        )
 
-        if week_reports:
-            avg_score = float(
-                np.mean([report.compliance_score for report in week_reports])
+    try:
+        stale_query = select(
+            rollup.id, rollup.day, rollup.discipline, rollup.document_type
+        )
+        if first_day is not None:
+            stale_query = stale_query.where(rollup.day >= first_day)
+        rebuilt = {(row["day"], row["discipline"], row["document_type"]) for row in rows}
+        stale_ids = [
+            row.id
+            for row in (await db.execute(stale_query)).all()
+            if (row.day, row.discipline, row.document_type) not in rebuilt
+        ]
+        if stale_ids:
+            await db.execute(sqlalchemy.delete(rollup).where(rollup.id.in_(stale_ids)))
+
+        if rows:
+            stmt = _rollup_insert(db)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[rollup.day, rollup.discipline, rollup.document_type],
+                set_={
+                    name: stmt.excluded[name]
+                    for name in (*_ROLLUP_SQL_COLUMNS, "updated_at")
+                },
             )
-            total_findings = sum(len(report.findings) for report in week_reports)
-        else:
-            avg_score = 0.0
-            total_findings = 0
+            await db.execute(stmt, rows)
+
+        # Score histograms have no columns to preserve, so they are replaced
+        histogram = models.AnalyticsScoreHistogram
+        delete_histogram = sqlalchemy.delete(histogram)
+        if first_day is not None:
+            delete_histogram = delete_histogram.where(histogram.day >= first_day)
+        await db.execute(delete_histogram)
+        histogram_rows = [
+            {**row._asdict(), "day": _as_date(row.day)}
+            for row in (await db.execute(histogram_query)).all()
+        ]
+        if histogram_rows:
+            await db.execute(sqlalchemy.insert(histogram), histogram_rows)
+        await db.commit()
+    except (sqlalchemy.exc.SQLAlchemyError, sqlite3.Error) as e:
+        await db.rollback()
+        logger.error("Failed to rebuild analytics rollups: %s", e)
+        raise
 
-        trends.append(
+    logger.info(
+        "Rebuilt %d analytics rollup rows (%d stale removed)", len(rows), len(stale_ids)
+    )
+    return len(rows)
+
+
+async def has_analytics_rollups(db: AsyncSession) -> bool:
+    result = await db.execute(select(models.AnalyticsDailyRollup.id).limit(1))
+    return result.first() is not None
+
+
+async def get_rollup_organizational_metrics(
+    db: AsyncSession, days_back: int
+) -> dict[str, Any]:
+    """``get_organizational_metrics`` computed from the daily rollups."""
+    rollup = models.AnalyticsDailyRollup
+    first_day, _ = _rollup_window(days_back)
+    query = select(
+        func.coalesce(func.sum(rollup.report_count), 0).label("total_analyses"),
+        func.sum(rollup.score_sum).label("score_sum"),
+        func.coalesce(func.sum(rollup.finding_count), 0).label("total_findings"),
+    ).where(rollup.day >= first_day)
+    row = (await db.execute(query)).one()
+    total_users = (await db.execute(select(func.count(models.User.id)))).scalar_one_or_none() or 0
+
+    total_analyses = int(row.total_analyses)
+    return {
+        "total_users": total_users,
+        "avg_compliance_score": (
+            float(row.score_sum) / total_analyses if total_analyses else 0
+        ),
+        "total_findings": int(row.total_findings),
+        "total_analyses": total_analyses,
+    }
+
+
+async def get_rollup_discipline_breakdown(
+    db: AsyncSession, days_back: int
+) -> dict[str, dict[str, Any]]:
+    """``get_discipline_breakdown`` computed from the daily rollups."""
+    rollup = models.AnalyticsDailyRollup
+    first_day, _ = _rollup_window(days_back)
+    query = (
+        select(
+            rollup.discipline,
+            func.sum(rollup.score_sum).label("score_sum"),
+            func.sum(rollup.report_count).label("report_count"),
+        )
+        .where(rollup.day >= first_day, rollup.discipline != "")
+        .group_by(rollup.discipline)
+    )
+    breakdown: dict[str, dict[str, Any]] = {}
+    for row in (await db.execute(query)).all():
+        report_count = int(row.report_count or 0)
+        breakdown[row.discipline] = {
+            "avg_compliance_score": (
+                float(row.score_sum) / report_count if report_count else None
+            ),
+            "user_count": report_count,
+        }
+    return breakdown
+
+
+async def get_rollup_daily_series(
+    db: AsyncSession, days_back: int
+) -> list[dict[str, Any]]:
+    """Per-day totals for the ``days_back`` most recent days, oldest first.
+
+    Days without reports are included with zero counts and None averages.
+    """
+    rollup = models.AnalyticsDailyRollup
+    first_day, today = _rollup_window(days_back)
+    query = (
+        select(
+            rollup.day,
+            func.sum(rollup.report_count).label("report_count"),
+            func.sum(rollup.score_sum).label("score_sum"),
+            func.sum(rollup.finding_count).label("finding_count"),
+            func.sum(rollup.high_risk_finding_count).label("high_risk_count"),
+            func.sum(rollup.processing_ms_sum).label("processing_ms_sum"),
+            func.sum(rollup.processing_ms_count).label("processing_ms_count"),
+        )
+        .where(rollup.day >= first_day)
+        .group_by(rollup.day)
+    )
+    by_day = {row.day: row for row in (await db.execute(query)).all()}
+
+    series: list[dict[str, Any]] = []
+    for offset in range((today - first_day).days + 1):
+        day = first_day + timedelta(days=offset)
+        row = by_day.get(day)
+        report_count = int(row.report_count or 0) if row is not None else 0
+        processing_count = int(row.processing_ms_count or 0) if row is not None else 0
+        series.append(
             {
-                "week": index + 1,
-                "avg_compliance_score": avg_score,
-                "total_findings": total_findings,
+                "date": day,
+                "analyses": report_count,
+                "avg_compliance_score": (
+                    float(row.score_sum) / report_count if report_count else None
+                ),
+                "findings": int(row.finding_count or 0) if row is not None else 0,
+                "high_risk_findings": int(row.high_risk_count or 0) if row is not None else 0,
+                "avg_processing_ms": (
+                    float(row.processing_ms_sum) / processing_count if processing_count else None
+                ),
             }
         )
+    return series
 
-    return trends
+
+async def get_rollup_performance_trends(
+    db: AsyncSession, days_back: int
+) -> list[dict[str, Any]]:
+    """``get_team_performance_trends`` computed from the daily rollups.
+
+    Week 1 is the 7 most recent days including today, week 2 the 7 days
+    before that, and so on.
+    """
+    if days_back <= 0:
+        return []
+
+    num_weeks = max(1, math.ceil(days_back / 7))
+    weeks = [{"reports": 0, "score_sum": 0.0, "findings": 0} for _ in range(num_weeks)]
+    today = datetime.datetime.now(datetime.UTC).date()
+    for day in await get_rollup_daily_series(db, days_back):
+        week = weeks[min((today - day["date"]).days // 7, num_weeks - 1)]
+        if day["analyses"]:
+            week["reports"] += day["analyses"]
+            week["score_sum"] += day["avg_compliance_score"] * day["analyses"]
+        week["findings"] += day["findings"]
+
+    return [
+        {
+            "week": index + 1,
+            "avg_compliance_score": (
+                week["score_sum"] / week["reports"] if week["reports"] else 0.0
+            ),
+            "total_findings": week["findings"],
+        }
+        for index, week in enumerate(weeks)
+    ]
+
+
+async def _load_score_histogram(
+    db: AsyncSession, days_back: int, discipline: str | None = None
+) -> ScoreHistogram:
+    """Merge the daily score histograms of the last ``days_back`` days.
+
+    Until the histograms have been backfilled, report scores are binned in SQL
+    instead; either way only one row per populated bin is returned.
+    """
+    table = models.AnalyticsScoreHistogram
+    if (await db.execute(select(table.id).limit(1))).first() is not None:
+        first_day, _ = _rollup_window(days_back)
+        query = (
+            select(
+                table.bin,
+                func.sum(table.count).label("count"),
+                func.sum(table.score_sum).label("score_sum"),
+                func.sum(table.score_sq_sum).label("score_sq_sum"),
+                func.min(table.score_min).label("score_min"),
+                func.max(table.score_max).label("score_max"),
+            )
+            .where(table.day >= first_day)
+            .group_by(table.bin)
+        )
+        if discipline is not None:
+            query = query.where(table.discipline == discipline)
+    else:
+        cutoff_date = datetime.datetime.now(datetime.UTC) - timedelta(days=days_back)
+        query = _score_histogram_query(db).where(
+            models.AnalysisReport.analysis_date >= cutoff_date
+        )
+        if discipline is not None:
+            query = query.where(models.AnalysisReport.discipline == discipline)
+
+    histogram = ScoreHistogram()
+    for row in (await db.execute(query)).all():
+        histogram.add_bin(
+            int(row.bin),
+            ScoreBin(
+                int(row.count),
+                float(row.score_sum),
+                float(row.score_sq_sum),
+                row.score_min,
+                row.score_max,
+            ),
+        )
+    return histogram
 
 
 async def get_benchmark_data(
     db: AsyncSession,
     days_back: int = 365,
     min_analyses: int = 10,
+    discipline: str | None = None,
 ) -> dict[str, Any]:
     """Get benchmark data for compliance score percentiles.
 
+    Statistics come from merged daily score histograms (see
+    ``src.core.score_sketch``), so the cost grows with the number of days
+    rather than the number of reports. Count, mean, standard deviation and
+    range are exact; percentiles are within 0.05 points.
+
     Args:
         db: Database session
         days_back: Number of days to look back for data
         min_analyses: Minimum number of analyses required for meaningful benchmarks
+        discipline: Optional discipline to restrict the benchmarks to
 
     Returns:
         dict[str, Any]: Benchmark data with percentiles and metadata
     """
-    try:
-        # Calculate cutoff date
-        cutoff_date = datetime.datetime.now(datetime.UTC) - timedelta(days=days_back)
+    # Default benchmarks for insufficient data
+    default_benchmarks = {
+        "compliance_score_percentiles": {
+            "p10": 65.0,
+            "p25": 70.0,
+            "p50": 80.0,
+            "p75": 90.0,
+            "p90": 95.0,
+        },
+        "total_analyses": 0,
+        "data_quality": "insufficient",
+        "days_analyzed": days_back,
+        "last_updated": datetime.datetime.now(datetime.UTC).isoformat(),
+    }
 
-        # Query compliance scores within the time window
-        result = await db.execute(
-            select(models.AnalysisReport.compliance_score)
-            .where(
-                models.AnalysisReport.compliance_score.is_not(None),
-                models.AnalysisReport.analysis_date >= cutoff_date,
-            )
-            .order_by(models.AnalysisReport.compliance_score)
-        )
-        scores = [float(row[0]) for row in result.fetchall()]
-
-        # Default benchmarks for insufficient data
-        default_benchmarks = {
-            "compliance_score_percentiles": {
-                "p10": 65.0,
-                "p25": 70.0,
-                "p50": 80.0,
-                "p75": 90.0,
-                "p90": 95.0,
-            },
-            "total_analyses": 0,
-            "data_quality": "insufficient",
-            "days_analyzed": days_back,
-            "last_updated": datetime.datetime.now(datetime.UTC).isoformat(),
-        }
+    try:
+        histogram = await _load_score_histogram(db, days_back, discipline)
+        total_analyses = histogram.count
 
-        if len(scores) < min_analyses:
+        if total_analyses < min_analyses:
             logger.warning(
                 "Insufficient data for benchmarks: %d analyses (minimum: %d)",
-                len(scores),
+                total_analyses,
                 min_analyses,
             )
             return {
                 **default_benchmarks,
-                "total_analyses": len(scores),
+                "total_analyses": total_analyses,
             }
 
-        # Calculate percentiles using numpy
         percentiles = {
-            "p10": float(np.percentile(scores, 10)),
-            "p25": float(np.percentile(scores, 25)),
-            "p50": float(np.percentile(scores, 50)),
-            "p75": float(np.percentile(scores, 75)),
-            "p90": float(np.percentile(scores, 90)),
+            f"p{percent}": float(histogram.quantile(percent))
+            for percent in (10, 25, 50, 75, 90)
         }
 
-        # Calculate additional statistics
-        mean_score = float(np.mean(scores))
-        std_score = float(np.std(scores))
-
         benchmark_data = {
             "compliance_score_percentiles": percentiles,
-            "total_analyses": len(scores),
-            "mean_score": round(mean_score, 2),
-            "std_deviation": round(std_score, 2),
-            "data_quality": "good" if len(scores) >= min_analyses * 2 else "adequate",
+            "total_analyses": total_analyses,
+            "mean_score": round(histogram.mean(), 2),
+            "std_deviation": round(histogram.std(), 2),
+            "data_quality": "good" if total_analyses >= min_analyses * 2 else "adequate",
             "days_analyzed": days_back,
             "score_range": {
-                "min": float(min(scores)),
-                "max": float(max(scores)),
+                "min": float(histogram.min()),
+                "max": float(histogram.max()),
             },
             "last_updated": datetime.datetime.now(datetime.UTC).isoformat(),
         }
 
-        logger.debug("Generated benchmark data from %d analyses", len(scores))
+        logger.debug("Generated benchmark data from %d analyses", total_analyses)
         return benchmark_data
 
     except (sqlalchemy.exc.SQLAlchemyError, sqlite3.Error, ValueError) as e:
@@ -601,10 +1089,13 @@ async def get_benchmark_data(
 
 async def get_all_reports_with_embeddings(
     db: AsyncSession,
-) -> list[models.AnalysisReport]:
-    """Return all analysis reports that have an embedding stored efficiently."""
+) -> list[sqlalchemy.Row]:
+    """Return ``(id, document_embedding)`` rows for every report with an embedding.
+
+    Only the two columns are selected, so no encrypted fields are decrypted.
+    """
     query = (
-        select(models.AnalysisReport)
+        select(models.AnalysisReport.id, models.AnalysisReport.document_embedding)
         .where(models.AnalysisReport.document_embedding.isnot(None))
         .order_by(models.AnalysisReport.analysis_date.desc())
     )
@@ -613,15 +1104,32 @@ async def get_all_reports_with_embeddings(
     except OperationalError as exc:
         logger.warning("Unable to load existing embeddings: %s", exc)
         return []
-    return list(result.scalars().unique().all())
+    return list(result.all())
+
+
+def with_report_payload():
+    """Loader option that loads the encrypted ``analysis_result`` with a report query."""
+    return undefer(models.AnalysisReport.analysis_result_encrypted)
+
+
+async def load_report_payload(
+    db: AsyncSession, report: models.AnalysisReport
+) -> dict | None:
+    """Load (if needed) and decrypt the payload of a report from an async session."""
+    if "analysis_result_encrypted" not in report.__dict__:
+        await db.refresh(report, ["analysis_result_encrypted"])
+    return report.analysis_result
 
 
-async def get_report(db: AsyncSession, report_id: int) -> models.AnalysisReport | None:
+async def get_report(
+    db: AsyncSession, report_id: int, include_payload: bool = True
+) -> models.AnalysisReport | None:
     """Fetches a single analysis report with its findings eagerly loaded.
 
     Args:
         db: Database session
         report_id: ID of the report to fetch
+        include_payload: Whether to load the encrypted ``analysis_result``
 
     Returns:
         models.AnalysisReport | None: Report if found, None otherwise
@@ -639,6 +1147,8 @@ async def get_report(db: AsyncSession, report_id: int) -> models.AnalysisReport
             .options(selectinload(models.AnalysisReport.findings))
             .where(models.AnalysisReport.id == report_id)
         )
+        if include_payload:
+            query = query.options(with_report_payload())
         result = await db.execute(query)
         report = result.scalars().first()
 
@@ -656,6 +1166,40 @@ async def get_report(db: AsyncSession, report_id: int) -> models.AnalysisReport
         raise
 
 
+def _finding_rows(
+    report_id: int, findings_data: list[schemas.FindingCreate]
+) -> list[dict[str, Any]]:
+    return [
+        {
+            "report_id": report_id,
+            "rule_id": finding_data.rule_id,
+            "risk": finding_data.risk,
+            "personalized_tip": finding_data.personalized_tip,
+            "problematic_text": finding_data.problematic_text,
+            "confidence_score": finding_data.confidence_score,
+        }
+        for finding_data in findings_data
+    ]
+
+
+async def _insert_findings(
+    db: AsyncSession, rows: list[dict[str, Any]]
+) -> list[models.Finding]:
+    """Insert findings with a single batched ``INSERT ... RETURNING``.
+
+    Returns the persistent ``Finding`` instances in the order of ``rows``,
+    fully loaded, so no per-row refresh is needed.
+    """
+    if not rows:
+        return []
+    # sort_by_parameter_order would make SQLite fall back to one INSERT per
+    # row; ids are assigned in row order, so sort on them instead
+    result = await db.scalars(
+        sqlalchemy.insert(models.Finding).returning(models.Finding), rows
+    )
+    return sorted(result.all(), key=lambda finding: finding.id)
+
+
 async def create_analysis_report(
     db: AsyncSession,
     report_data: schemas.ReportCreate,
@@ -690,28 +1234,25 @@ async def create_analysis_report(
             document_type=report_data.document_type,
             analysis_result=report_data.analysis_result or {},
             document_embedding=report_data.document_embedding,
+            discipline=(report_data.analysis_result or {}).get("discipline"),
         )
         db.add(db_report)
         await db.flush()  # Get the report ID without committing
 
-        # Create findings if provided
-        if findings_data:
-            for finding_data in findings_data:
-                db_finding = models.Finding(
-                    report_id=db_report.id,
-                    rule_id=finding_data.rule_id,
-                    risk=finding_data.risk,
-                    personalized_tip=finding_data.personalized_tip,
-                    problematic_text=finding_data.problematic_text,
-                    confidence_score=finding_data.confidence_score,
-                )
-                db.add(db_finding)
+        # All findings go in one batched INSERT ... RETURNING
+        findings = await _insert_findings(
+            db, _finding_rows(db_report.id, findings_data or [])
+        )
+        set_committed_value(db_report, "findings", findings)
 
-        await db.commit()
-        await db.refresh(db_report)
+        # Keep the analytics rollups current in the same transaction
+        await _increment_daily_rollup(db, db_report, findings_data)
 
-        # Load findings for the response
-        await db.refresh(db_report, ["findings"])
+        await db.commit()
+        if db.sync_session.expire_on_commit:
+            await db.refresh(db_report)
+            # Load findings and the deferred payload for the response
+            await db.refresh(db_report, ["findings", "analysis_result_encrypted"])
 
         logger.info(
             "Created analysis report: %s with %d findings",
@@ -733,7 +1274,11 @@ async def find_similar_report(
     embedding: bytes | None = None,
     threshold: float = 0.85,
 ) -> models.AnalysisReport | None:
-    """Finds a similar report using the vector store, with a fallback to recency."""
+    """Finds a similar report using the vector store, with a fallback to recency.
+
+    The returned report's encrypted ``analysis_result`` is not loaded; use
+    ``load_report_payload`` if it is needed.
+    """
     candidate_ids: list[int] = []
     vector_store = get_vector_store()
 
@@ -763,14 +1308,14 @@ async def find_similar_report(
                 )
 
     for candidate_id in candidate_ids:
-        candidate = await get_report(db, candidate_id)
+        candidate = await get_report(db, candidate_id, include_payload=False)
         if candidate and (
             document_type is None or candidate.document_type == document_type
         ):
             return candidate
 
     for candidate_id in candidate_ids:
-        candidate = await get_report(db, candidate_id)
+        candidate = await get_report(db, candidate_id, include_payload=False)
         if candidate:
             return candidate
 
@@ -793,21 +1338,256 @@ async def find_similar_report(
 # ---------------------------------------------------------------------------
 
 
+# --- Keyset pagination and exports --- #
+
+DEFAULT_EXPORT_BATCH_SIZE = 1000
+
+
+def encode_report_cursor(analysis_date: datetime.datetime, report_id: int) -> str:
+    """Opaque cursor for the report listed after ``(analysis_date, report_id)``."""
+    raw = json.dumps([analysis_date.isoformat(), report_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_report_cursor(cursor: str) -> tuple[datetime.datetime, int]:
+    """Parse a cursor from ``encode_report_cursor``.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        analysis_date, report_id = json.loads(raw)
+        return datetime.datetime.fromisoformat(analysis_date), int(report_id)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid report cursor: {cursor!r}") from e
+
+
+def next_report_cursor(rows: list[Any], limit: int) -> str | None:
+    """Cursor for the page after ``rows``, or None when it was the last page.
+
+    Accepts report entities or summary mappings, as returned by
+    ``get_reports`` and ``get_report_summaries``.
+    """
+    if not rows or len(rows) < limit:
+        return None
+    last = rows[-1]
+    if isinstance(last, dict):
+        return encode_report_cursor(last["analysis_date"], last["id"])
+    return encode_report_cursor(last.analysis_date, last.id)
+
+
+def _newest_first(query: Any, cursor: str | None, skip: int) -> Any:
+    """Order reports newest first and page by cursor, or by offset without one.
+
+    The cursor condition seeks into the ``analysis_date`` index, so every page
+    costs the same; an offset walks past all the rows it skips.
+    """
+    report = models.AnalysisReport
+    query = query.order_by(report.analysis_date.desc(), report.id.desc())
+    if cursor is None:
+        return query.offset(max(skip, 0))
+    analysis_date, report_id = decode_report_cursor(cursor)
+    # The redundant ``<=`` bound gives the planner an index range to seek
+    return query.where(
+        report.analysis_date <= analysis_date,
+        sqlalchemy.or_(report.analysis_date < analysis_date, report.id < report_id),
+    )
+
+
 async def get_reports(
-    db: AsyncSession, skip: int = 0, limit: int = 100
+    db: AsyncSession, skip: int = 0, limit: int = 100, cursor: str | None = None
 ) -> list[models.AnalysisReport]:
-    """Return analysis reports with their findings eagerly loaded."""
-    query = (
-        select(models.AnalysisReport)
-        .options(selectinload(models.AnalysisReport.findings))
-        .order_by(models.AnalysisReport.analysis_date.desc())
-        .offset(max(skip, 0))
-        .limit(max(limit, 1))
-    )
+    """Return analysis reports with their findings and payloads loaded.
+
+    List views that only need report metadata should use
+    ``get_report_summaries``, which skips the encrypted payloads.
+
+    Args:
+        db: Database session
+        skip: Offset of the first report; ignored when ``cursor`` is given
+        limit: Maximum number of reports
+        cursor: Cursor from ``next_report_cursor`` for the previous page
+
+    Raises:
+        ValueError: If ``cursor`` is malformed
+    """
+    query = _newest_first(
+        select(models.AnalysisReport).options(
+            selectinload(models.AnalysisReport.findings), with_report_payload()
+        ),
+        cursor,
+        skip,
+    ).limit(max(limit, 1))
     result = await db.execute(query)
     return list(result.scalars().unique().all())
 
 
+async def get_report_summaries(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    document_type: str | None = None,
+    cursor: str | None = None,
+) -> list[dict[str, Any]]:
+    """Return report metadata for list views, newest first.
+
+    Selects only the listed columns plus a findings count, so neither the
+    encrypted analysis payloads nor the findings rows are loaded. Pages with
+    ``cursor`` like ``get_reports``.
+    """
+    report = models.AnalysisReport
+    query = select(
+        report.id,
+        report.document_name,
+        report.analysis_date,
+        report.compliance_score,
+        report.document_type,
+        report.discipline,
+        _report_finding_count().label("finding_count"),
+    )
+    query = _newest_first(query, cursor, skip).limit(max(limit, 1))
+    if document_type is not None:
+        query = query.where(report.document_type == document_type)
+    result = await db.execute(query)
+    return [dict(row._mapping) for row in result.all()]
+
+
+async def get_findings_page(
+    db: AsyncSession,
+    *,
+    report_id: int | None = None,
+    after_id: int | None = None,
+    limit: int = 100,
+) -> list[models.Finding]:
+    """Return findings in id order, starting after ``after_id``.
+
+    Pass the id of the last finding of a page as ``after_id`` to get the next.
+    """
+    query = select(models.Finding).order_by(models.Finding.id).limit(max(limit, 1))
+    if report_id is not None:
+        query = query.where(models.Finding.report_id == report_id)
+    if after_id is not None:
+        query = query.where(models.Finding.id > after_id)
+    result = await db.execute(query)
+    return list(result.scalars().all())
+
+
+def _export_batch_size(batch_size: int | None) -> int:
+    if batch_size is None:
+        batch_size = int(
+            _performance_settings().get("export_batch_size", DEFAULT_EXPORT_BATCH_SIZE)
+        )
+    return max(batch_size, 1)
+
+
+def _export_window(query: Any, start_date: date | None, end_date: date | None) -> Any:
+    start_dt = _as_datetime(start_date)
+    end_dt = _as_datetime(end_date, end=True)
+    if start_dt is not None:
+        query = query.where(models.AnalysisReport.analysis_date >= start_dt)
+    if end_dt is not None:
+        query = query.where(models.AnalysisReport.analysis_date <= end_dt)
+    return query
+
+
+async def iter_report_export_batches(
+    db: AsyncSession,
+    *,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    batch_size: int | None = None,
+) -> AsyncIterator[list[dict[str, Any]]]:
+    """Yield report metadata oldest first, in batches, for streaming exports.
+
+    Each batch is its own keyset query on ``(analysis_date, id)``, so memory
+    stays bounded by the batch size whatever the length of the window.
+    Encrypted analysis payloads are not exported.
+
+    Args:
+        db: Database session
+        start_date: First day to export
+        end_date: Last day to export
+        batch_size: Rows per query (performance setting ``export_batch_size``,
+            default 1000)
+    """
+    batch_size = _export_batch_size(batch_size)
+    report = models.AnalysisReport
+    query = _export_window(
+        select(
+            report.id,
+            report.analysis_date,
+            report.document_name,
+            report.document_type,
+            report.discipline,
+            report.compliance_score,
+            _report_finding_count().label("finding_count"),
+        ).order_by(report.analysis_date, report.id),
+        start_date,
+        end_date,
+    ).limit(batch_size)
+
+    last: tuple[datetime.datetime, int] | None = None
+    while True:
+        page = query
+        if last is not None:
+            page = page.where(
+                report.analysis_date >= last[0],
+                sqlalchemy.or_(report.analysis_date > last[0], report.id > last[1]),
+            )
+        rows = [dict(row._mapping) for row in (await db.execute(page)).all()]
+        if not rows:
+            return
+        yield rows
+        if len(rows) < batch_size:
+            return
+        last = (rows[-1]["analysis_date"], rows[-1]["id"])
+
+
+async def iter_finding_export_batches(
+    db: AsyncSession,
+    *,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    batch_size: int | None = None,
+) -> AsyncIterator[list[dict[str, Any]]]:
+    """Yield findings of the reports in a date window, in id-ordered batches.
+
+    Keyset paged on ``Finding.id`` like ``iter_report_export_batches``. The
+    encrypted tip and document excerpt are not exported.
+    """
+    batch_size = _export_batch_size(batch_size)
+    finding = models.Finding
+    query = _export_window(
+        select(
+            finding.id,
+            finding.report_id,
+            models.AnalysisReport.analysis_date,
+            models.AnalysisReport.discipline,
+            finding.rule_id,
+            finding.risk,
+            finding.confidence_score,
+        )
+        .join(models.AnalysisReport, finding.report_id == models.AnalysisReport.id)
+        .order_by(finding.id),
+        start_date,
+        end_date,
+    ).limit(batch_size)
+
+    after_id = 0
+    while True:
+        rows = [
+            dict(row._mapping)
+            for row in (await db.execute(query.where(finding.id > after_id))).all()
+        ]
+        if not rows:
+            return
+        yield rows
+        if len(rows) < batch_size:
+            return
+        after_id = rows[-1]["id"]
+
+
 async def get_findings_summary(db: AsyncSession) -> list[dict[str, Any]]:
     """Aggregate findings by rule identifier for high level dashboards."""
     query = (
@@ -1127,15 +1907,14 @@ async def get_user_habit_statistics(
 
     snapshot_query = (
         select(models.HabitProgressSnapshot)
-        .where(models.HabitProgressSnapshot.user_id == user_id)
+        .where(
+            models.HabitProgressSnapshot.user_id == user_id,
+            models.HabitProgressSnapshot.snapshot_date >= cutoff.date(),
+        )
         .order_by(models.HabitProgressSnapshot.snapshot_date.desc())
     )
     result = await db.execute(snapshot_query)
-    snapshots = [
-        snapshot
-        for snapshot in result.scalars().all()
-        if snapshot.snapshot_date >= cutoff.date()
-    ]
+    snapshots = list(result.scalars().all())
 
     total_findings = sum(snapshot.total_findings for snapshot in snapshots)
     average_consistency = (
@@ -1305,36 +2084,33 @@ async def bulk_create_findings(
     if not findings_data:
         return []
 
-    try:
-        findings = []
-        for finding_data in findings_data:
-            # Validate finding data
-            if not finding_data.rule_id or not finding_data.rule_id.strip():
-                raise ValueError("Rule ID cannot be empty")
-
-            if finding_data.risk not in ["High", "Medium", "Low"]:
-                raise ValueError("Risk must be High, Medium, or Low")
-
-            if not (0.0 <= finding_data.confidence_score <= 1.0):
-                raise ValueError("Confidence score must be between 0.0 and 1.0")
-
-            db_finding = models.Finding(
-                report_id=report_id,
-                rule_id=finding_data.rule_id.strip(),
-                risk=finding_data.risk,
-                personalized_tip=finding_data.personalized_tip,
-                problematic_text=finding_data.problematic_text,
-                confidence_score=finding_data.confidence_score,
-            )
-            findings.append(db_finding)
+    for finding_data in findings_data:
+        # Validate finding data
+        if not finding_data.rule_id or not finding_data.rule_id.strip():
+            raise ValueError("Rule ID cannot be empty")
+
+        if finding_data.risk not in ["High", "Medium", "Low"]:
+            raise ValueError("Risk must be High, Medium, or Low")
+
+        if not (0.0 <= finding_data.confidence_score <= 1.0):
+            raise ValueError("Confidence score must be between 0.0 and 1.0")
 
-        # Add all findings in bulk
-        db.add_all(findings)
+    rows = _finding_rows(report_id, findings_data)
+    for row in rows:
+        row["rule_id"] = row["rule_id"].strip()
+
+    try:
+        findings = await _insert_findings(db, rows)
+        finding_ids = [finding.id for finding in findings]
         await db.commit()
 
-        # Refresh all findings
-        for finding in findings:
-            await db.refresh(finding)
+        if db.sync_session.expire_on_commit:
+            # Reload the expired rows with one SELECT rather than one per finding
+            await db.execute(
+                select(models.Finding)
+                .where(models.Finding.id.in_(finding_ids))
+                .execution_options(populate_existing=True)
+            )
 
         logger.info("Created %d findings for report %d", len(findings), report_id)
         return findings
@@ -1469,18 +2245,122 @@ async def get_database_health(db: AsyncSession) -> dict[str, Any]:
         }
 
 
+DEFAULT_RETENTION_BATCH_SIZE = 500
+DEFAULT_RETENTION_BATCH_PAUSE_MS = 50
+
+
+def _performance_settings() -> dict[str, Any]:
+    try:
+        return dict(get_settings().performance or {})
+    except Exception:
+        return {}
+
+
+async def _purge_report_batch(
+    db: AsyncSession, cutoff_date: datetime.datetime, after_id: int, batch_size: int
+) -> tuple[list[int], int]:
+    """Delete the next id range of expired reports with their findings.
+
+    Returns:
+        The deleted report ids and the number of deleted findings.
+    """
+    report_ids = list(
+        (
+            await db.scalars(
+                select(models.AnalysisReport.id)
+                .where(
+                    models.AnalysisReport.analysis_date < cutoff_date,
+                    models.AnalysisReport.id > after_id,
+                )
+                .order_by(models.AnalysisReport.id)
+                .limit(batch_size)
+            )
+        ).all()
+    )
+    if not report_ids:
+        return [], 0
+
+    in_batch = (
+        models.AnalysisReport.id.between(report_ids[0], report_ids[-1]),
+        models.AnalysisReport.analysis_date < cutoff_date,
+    )
+    batch_report_ids = select(models.AnalysisReport.id).where(*in_batch)
+    batch_finding_ids = select(models.Finding.id).where(
+        models.Finding.report_id.in_(batch_report_ids)
+    )
+    await db.execute(
+        models.FeedbackAnnotation.__table__.delete().where(
+            models.FeedbackAnnotation.finding_id.in_(batch_finding_ids)
+        )
+    )
+    findings = await db.execute(
+        models.Finding.__table__.delete().where(models.Finding.report_id.in_(batch_report_ids))
+    )
+    await db.execute(models.AnalysisReport.__table__.delete().where(*in_batch))
+    return report_ids, findings.rowcount
+
+
+async def _purge_snapshot_batch(db: AsyncSession, cutoff_day: date, batch_size: int) -> int:
+    batch_ids = (
+        select(models.HabitProgressSnapshot.id)
+        .where(models.HabitProgressSnapshot.snapshot_date < cutoff_day)
+        .order_by(models.HabitProgressSnapshot.id)
+        .limit(batch_size)
+    )
+    result = await db.execute(
+        models.HabitProgressSnapshot.__table__.delete().where(
+            models.HabitProgressSnapshot.id.in_(batch_ids)
+        )
+    )
+    return result.rowcount
+
+
+async def _evict_purged_reports(report_ids: list[int]) -> None:
+    """Drop deleted reports from the vector index and in-process caches."""
+    get_vector_store().remove_ids(report_ids)
+    report_payload_cache.discard_rows(report_ids)
+    # Only the shared cache if it exists; creating it would start its background tasks
+    cache = multi_tier_cache_module.multi_tier_cache
+    if cache is not None:
+        await cache.invalidate_by_tags([report_cache_tag(report_id) for report_id in report_ids])
+
+
+async def _checkpoint_wal(db: AsyncSession) -> None:
+    """Fold the WAL back into the database file after a large purge."""
+    if _dialect_name(db) != "sqlite":
+        return
+    await db.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+    await db.commit()
+
+
 async def cleanup_old_data(
-    db: AsyncSession, days_to_keep: int = 365, dry_run: bool = True
-) -> dict[str, int]:
+    db: AsyncSession,
+    days_to_keep: int = 365,
+    dry_run: bool = True,
+    batch_size: int | None = None,
+    pause_seconds: float | None = None,
+) -> dict[str, Any]:
     """Clean up old data from the database.
 
+    Expired reports are deleted in id-ordered batches, each with its findings
+    and their feedback annotations in one short transaction, so the write
+    lock is released between batches and queued analyses can proceed. Each
+    committed batch is also removed from the vector store and the report
+    caches. Snapshots are purged the same way, and on SQLite the WAL is
+    checkpointed afterwards. A failure leaves earlier batches deleted.
+
     Args:
         db: Database session
         days_to_keep: Number of days of data to keep
         dry_run: If True, only count what would be deleted
+        batch_size: Rows per batch (performance setting
+            ``retention_batch_size``, default 500)
+        pause_seconds: Pause between batches (performance setting
+            ``retention_batch_pause_ms``, default 50ms)
 
     Returns:
-        dict[str, int]: Counts of records that would be/were deleted
+        dict[str, Any]: Counts of records that would be/were deleted; a purge
+        also reports ``findings``, ``elapsed_seconds`` and ``rows_per_second``
     """
     cutoff_date = datetime.datetime.now(datetime.UTC) - timedelta(days=days_to_keep)
 
@@ -1497,35 +2377,73 @@ async def cleanup_old_data(
         )
         old_snapshots_count = await db.scalar(old_snapshots_query) or 0
 
-        cleanup_counts = {
+        cleanup_counts: dict[str, Any] = {
             "reports": old_reports_count,
             "snapshots": old_snapshots_count,
         }
 
-        if not dry_run and (old_reports_count > 0 or old_snapshots_count > 0):
-            # Delete old reports (findings will be cascade deleted)
-            if old_reports_count > 0:
-                await db.execute(
-                    models.AnalysisReport.__table__.delete().where(
-                        models.AnalysisReport.analysis_date < cutoff_date
-                    )
-                )
+        if dry_run or (old_reports_count == 0 and old_snapshots_count == 0):
+            return cleanup_counts
 
-            # Delete old snapshots
-            if old_snapshots_count > 0:
-                await db.execute(
-                    models.HabitProgressSnapshot.__table__.delete().where(
-                        models.HabitProgressSnapshot.snapshot_date < cutoff_date.date()
+        performance = _performance_settings()
+        if batch_size is None:
+            batch_size = int(
+                performance.get("retention_batch_size", DEFAULT_RETENTION_BATCH_SIZE)
+            )
+        if pause_seconds is None:
+            pause_seconds = (
+                int(
+                    performance.get(
+                        "retention_batch_pause_ms", DEFAULT_RETENTION_BATCH_PAUSE_MS
                     )
                 )
+                / 1000
+            )
 
-            await db.commit()
-            logger.info(
-                "Cleaned up old data: %d reports, %d snapshots",
-                old_reports_count,
-                old_snapshots_count,
+        start = time.perf_counter()
+        reports_deleted = findings_deleted = snapshots_deleted = 0
+        last_id = 0
+        while True:
+            report_ids, finding_count = await _purge_report_batch(
+                db, cutoff_date, last_id, batch_size
             )
+            if not report_ids:
+                break
+            await db.commit()
+            last_id = report_ids[-1]
+            reports_deleted += len(report_ids)
+            findings_deleted += finding_count
+            await _evict_purged_reports(report_ids)
+            await asyncio.sleep(pause_seconds)
+
+        while True:
+            removed = await _purge_snapshot_batch(db, cutoff_date.date(), batch_size)
+            if not removed:
+                break
+            await db.commit()
+            snapshots_deleted += removed
+            await asyncio.sleep(pause_seconds)
 
+        await db.commit()
+        await _checkpoint_wal(db)
+
+        elapsed = time.perf_counter() - start
+        rows = reports_deleted + findings_deleted + snapshots_deleted
+        cleanup_counts.update(
+            reports=reports_deleted,
+            snapshots=snapshots_deleted,
+            findings=findings_deleted,
+            elapsed_seconds=round(elapsed, 3),
+            rows_per_second=round(rows / elapsed, 1) if elapsed > 0 else float(rows),
+        )
+        logger.info(
+            "Cleaned up old data: %d reports, %d findings, %d snapshots in %.2fs (%.0f rows/s)",
+            reports_deleted,
+            findings_deleted,
+            snapshots_deleted,
+            elapsed,
+            cleanup_counts["rows_per_second"],
+        )
         return cleanup_counts
 
     except (sqlalchemy.exc.SQLAlchemyError, sqlite3.Error) as e:
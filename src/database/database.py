@@ -1,6 +1,7 @@
 import logging
 import sqlite3
 from collections.abc import AsyncGenerator
+from dataclasses import dataclass
 from typing import Any
 
 import requests
@@ -8,13 +9,13 @@ import sqlalchemy
 import sqlalchemy.exc
 from fastapi import Depends
 from requests.exceptions import HTTPError
-from sqlalchemy import text, event
-from sqlalchemy.engine import Engine
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.orm import declarative_base
+from sqlalchemy import CompoundSelect, Select, text, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, declarative_base
 from sqlalchemy.pool import StaticPool
 
-from ..config import get_settings
+from ..config import DatabaseSettings, get_settings
 
 logger = logging.getLogger(__name__)
 
@@ -50,9 +51,11 @@ async def test_connection() -> bool:
         return False
 
 
-# Ensure the URL is async-compatible for SQLite
+# Ensure the URL uses an async driver
 if "sqlite" in DATABASE_URL and "aiosqlite" not in DATABASE_URL:
     DATABASE_URL = DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://")
+elif DATABASE_URL.startswith(("postgresql://", "postgres://")):
+    DATABASE_URL = "postgresql+asyncpg://" + DATABASE_URL.split("://", 1)[1]
 
 
 # --- Performance Configuration ---
@@ -82,51 +85,197 @@ logger.info(
 logger.info("Connection pool size: %s", POOL_SIZE)
 
 # --- Engine Configuration ---
-engine_args: dict[str, Any] = {
-    "echo": settings.database.echo,
-    "future": True,  # Use SQLAlchemy 2.0 style
-}
-
-# Configure connection pooling based on database type
-if "sqlite" not in DATABASE_URL:
-    # PostgreSQL, MySQL, etc. - use standard connection pooling
-    logger.info("Configuring standard connection pooling for non-SQLite database")
-    engine_args.update(
-        {
-            "pool_size": POOL_SIZE,
-            "max_overflow": MAX_OVERFLOW,
-            "pool_pre_ping": True,
-            "pool_recycle": POOL_RECYCLE,
-            "pool_timeout": POOL_TIMEOUT,
-        }
+@dataclass
+class EngineProfile:
+    """Engines serving one database.
+
+    ``writer`` takes every write and every statement that is not a plain
+    SELECT; ``reader`` serves reads. For SQLite files the writer is a single
+    pooled connection, so concurrent writers queue on the pool instead of
+    failing with ``database is locked``, while readers get their own WAL
+    connections and never wait behind a write transaction. Other databases
+    share one pooled engine for both roles.
+    """
+
+    writer: AsyncEngine
+    reader: AsyncEngine
+
+    @property
+    def split(self) -> bool:
+        return self.reader is not self.writer
+
+    async def dispose(self) -> None:
+        await self.writer.dispose()
+        if self.split:
+            await self.reader.dispose()
+
+
+def _is_memory_sqlite(url: str) -> bool:
+    database = make_url(url).database
+    return not database or database == ":memory:" or "mode=memory" in url
+
+
+def _apply_sqlite_pragmas(target: AsyncEngine, *pragmas: str) -> None:
+    """Run ``pragmas`` on every new DBAPI connection of ``target``."""
+
+    @event.listens_for(target.sync_engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(f"PRAGMA {pragma}")
+        cursor.close()
+
+
+def _postgres_engine_args(db_settings: DatabaseSettings) -> dict[str, Any]:
+    """Pool sizing and asyncpg prepared statement caching for PostgreSQL."""
+    return {
+        "pool_size": db_settings.pool_size,
+        "max_overflow": db_settings.max_overflow,
+        "pool_pre_ping": True,
+        "pool_recycle": db_settings.pool_recycle,
+        "pool_timeout": db_settings.pool_timeout,
+        "connect_args": {
+            # Per-connection LRU of prepared statements kept by SQLAlchemy's
+            # asyncpg adapter; repeated queries skip the parse/plan round trip
+            "prepared_statement_cache_size": db_settings.statement_cache_size,
+            "timeout": db_settings.connection_timeout,
+        },
+    }
+
+
+def build_engine_profile(url: str, db_settings: DatabaseSettings) -> EngineProfile:
+    """Create the engines for ``url`` according to ``db_settings``.
+
+    Args:
+        url: Async database URL (``sqlite+aiosqlite``, ``postgresql+asyncpg``, ...).
+        db_settings: Pool sizes, timeouts and cache sizes.
+
+    Returns:
+        The writer/reader engine pair.
+    """
+    base_args: dict[str, Any] = {
+        "echo": db_settings.echo,
+        "future": True,  # Use SQLAlchemy 2.0 style
+    }
+
+    if not url.startswith("sqlite"):
+        if url.startswith("postgresql+asyncpg"):
+            logger.info("Configuring asyncpg connection pool with statement caching")
+            shared = create_async_engine(url, **base_args, **_postgres_engine_args(db_settings))
+        else:
+            # MySQL, etc. - use standard connection pooling
+            logger.info("Configuring standard connection pooling for non-SQLite database")
+            shared = create_async_engine(
+                url,
+                **base_args,
+                pool_size=db_settings.pool_size,
+                max_overflow=db_settings.max_overflow,
+                pool_pre_ping=True,
+                pool_recycle=db_settings.pool_recycle,
+                pool_timeout=db_settings.pool_timeout,
+            )
+        return EngineProfile(writer=shared, reader=shared)
+
+    connect_args = {
+        "check_same_thread": False,  # Required for async SQLite
+        "timeout": db_settings.connection_timeout,
+    }
+    if _is_memory_sqlite(url) or db_settings.read_pool_size <= 0:
+        # In-memory databases exist per connection, so keep a single one
+        logger.info("Configuring SQLite with a single shared connection")
+        shared = create_async_engine(
+            url, **base_args, poolclass=StaticPool, connect_args=connect_args, pool_pre_ping=True
+        )
+        _apply_sqlite_pragmas(shared, "foreign_keys=ON")
+        return EngineProfile(writer=shared, reader=shared)
+
+    logger.info(
+        "Configuring SQLite with one writer and %s WAL reader connections",
+        db_settings.read_pool_size,
+    )
+    writer = create_async_engine(
+        url,
+        **base_args,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=db_settings.pool_timeout,
+        connect_args=connect_args,
+    )
+    # WAL lets readers proceed while the writer holds its transaction
+    _apply_sqlite_pragmas(writer, "journal_mode=WAL", "synchronous=NORMAL", "foreign_keys=ON")
+    reader = create_async_engine(
+        url,
+        **base_args,
+        pool_size=db_settings.read_pool_size,
+        max_overflow=0,
+        pool_timeout=db_settings.pool_timeout,
+        connect_args=connect_args,
     )
-else:
-    # SQLite-specific optimizations
-    logger.info("Configuring SQLite-specific optimizations")
-    engine_args.update(
-        {
-            "poolclass": StaticPool,
-            "connect_args": {
-                "check_same_thread": False,  # Required for async SQLite
-                "timeout": settings.database.connection_timeout,
-            },
-            # For SQLite, we use a single connection pool
-            "pool_pre_ping": True,
-        }
+    # A misrouted write fails loudly instead of contending for the write lock
+    _apply_sqlite_pragmas(reader, "query_only=ON", "foreign_keys=ON")
+    return EngineProfile(writer=writer, reader=reader)
+
+
+class RoutingSession(Session):
+    """Session sending SELECTs to the read engine until its transaction writes.
+
+    Flushes, DML, textual SQL and ``Session.connection()`` go to the writer.
+    Once a transaction has touched the writer, later reads stay there so they
+    see its uncommitted changes; the next transaction starts on the reader
+    again.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        profile: EngineProfile = self.info["engine_profile"]
+        if not profile.split:
+            return profile.writer.sync_engine
+        if clause is None and not self._flushing:
+            # A bare lookup, e.g. for the dialect, does not pin reads to the writer
+            return profile.writer.sync_engine
+        if (
+            self._flushing
+            or self.info.get("_writing")
+            or not isinstance(clause, (Select, CompoundSelect))
+            or clause._for_update_arg is not None
+        ):
+            self.info["_writing"] = True
+            return profile.writer.sync_engine
+        return profile.reader.sync_engine
+
+    def connection(self, bind_arguments=None, **kw):
+        # Callers may write through the raw connection
+        if self.info["engine_profile"].split:
+            self.info["_writing"] = True
+        return super().connection(bind_arguments, **kw)
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _reset_write_routing(session, transaction):
+    if transaction.parent is None:
+        session.info.pop("_writing", None)
+
+
+def make_session_factory(profile: EngineProfile) -> async_sessionmaker[AsyncSession]:
+    """Session factory routing reads and writes across ``profile``."""
+    return async_sessionmaker(
+        bind=profile.writer,
+        class_=AsyncSession,
+        sync_session_class=RoutingSession,
+        info={"engine_profile": profile},
+        expire_on_commit=False,  # Keep objects accessible after commit
+        autocommit=False,  # Explicit transaction control
+        autoflush=False,  # Manual flush control for better performance
     )
 
-# --- Create Engine ---
-engine = create_async_engine(DATABASE_URL, **engine_args)
+
+# --- Create Engines ---
+engine_profile = build_engine_profile(DATABASE_URL, settings.database)
+engine = engine_profile.writer
+read_engine = engine_profile.reader
 
 # --- Session Factory ---
 # Optimized session factory with proper configuration for medical data handling
-AsyncSessionLocal = async_sessionmaker(
-    bind=engine,
-    class_=AsyncSession,
-    expire_on_commit=False,  # Keep objects accessible after commit
-    autocommit=False,  # Explicit transaction control
-    autoflush=False,  # Manual flush control for better performance
-)
+AsyncSessionLocal = make_session_factory(engine_profile)
 
 # --- Declarative Base ---
 Base = declarative_base()
@@ -163,6 +312,13 @@ def get_db():
     return Depends(get_async_db)
 
 
+def _create_missing_indexes(sync_conn) -> None:
+    """Create model indexes that are missing from already existing tables."""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(sync_conn, checkfirst=True)
+
+
 async def init_db() -> None:
     """Initialize the database by creating all tables and applying optimizations.
 
@@ -189,6 +345,8 @@ async def init_db() -> None:
     async with engine.begin() as conn:
         # Create all tables
         await conn.run_sync(Base.metadata.create_all)
+        # create_all skips existing tables, so add indexes declared since
+        await conn.run_sync(_create_missing_indexes)
 
         # Ensure preferences column exists for user table
         if "sqlite" in DATABASE_URL:
@@ -200,12 +358,17 @@ async def init_db() -> None:
                     text("ALTER TABLE users ADD COLUMN preferences JSON")
                 )
 
-        # Create default admin user if none exists
+            # Row version used by the decrypted report payload cache
+            result = await conn.execute(text("PRAGMA table_info(reports)"))
+            columns = [row[1] for row in result.fetchall()]
+            if "version" not in columns:
+                logger.info("Adding version column to reports table")
+                await conn.execute(
+                    text("ALTER TABLE reports ADD COLUMN version INTEGER NOT NULL DEFAULT 1")
+                )
+
         result = await conn.execute(text("SELECT COUNT(*) FROM users"))
-        if result.scalar() == 0:
-            logger.info("Creating default admin user")
-            # Use a proper session for ORM operations
-            await create_default_admin_user()
+        needs_admin_user = result.scalar() == 0
 
         # Apply SQLite-specific optimizations if enabled
         if "sqlite" in DATABASE_URL and settings.database.sqlite_optimizations:
@@ -230,6 +393,12 @@ async def init_db() -> None:
                 text("PRAGMA foreign_keys=ON")
             )  # Enable foreign key constraints
 
+    # Create default admin user if none exists. The session needs the writer
+    # connection, so this runs after the schema transaction has released it.
+    if needs_admin_user:
+        logger.info("Creating default admin user")
+        await create_default_admin_user()
+
     logger.info("Database initialization complete")
 
 
@@ -262,7 +431,7 @@ async def close_db_connections() -> None:
     """
     logger.info("Shutting down database connections")
     try:
-        await engine.dispose()
+        await engine_profile.dispose()
         logger.info("Database connections closed successfully")
     except (sqlalchemy.exc.SQLAlchemyError, sqlite3.Error) as e:
         logger.exception("Error during database shutdown: %s", e)
@@ -5,9 +5,12 @@ ensuring data protection at rest in the database.
 """
 
 import base64
+import json
 import logging
 import os
-from typing import Any, Optional, Type, TypeVar
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Iterable, Optional, Type, TypeVar
 
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
@@ -213,3 +216,93 @@ def decrypt_sensitive_data(encrypted_data: str) -> str:
     """Decrypt sensitive data using the global encryption service."""
     service = get_database_encryption_service()
     return service.decrypt_field(encrypted_data)
+
+
+DEFAULT_PAYLOAD_CACHE_ENTRIES = 512
+
+
+def _performance_settings() -> dict[str, Any]:
+    try:
+        from src.config import get_settings
+
+        return dict(get_settings().performance or {})
+    except Exception:
+        return {}
+
+
+class DecryptedPayloadCache:
+    """LRU cache of decrypted JSON payloads keyed on (row id, row version).
+
+    Decryption dominates the cost of loading encrypted JSON, so the cache
+    keeps the decrypted JSON text and parses it on every hit; callers get a
+    fresh dict they may mutate. Each entry also records the ciphertext it was
+    decrypted from and is only used when that still matches, so a row
+    rewritten without a version bump, or the same key in another database,
+    cannot return a stale payload.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None) -> None:
+        self.max_entries = int(
+            max_entries
+            if max_entries is not None
+            else _performance_settings().get(
+                "report_payload_cache_entries", DEFAULT_PAYLOAD_CACHE_ENTRIES
+            )
+        )
+        self._entries: OrderedDict[Hashable, tuple[str, str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def decrypt(self, key: Optional[Hashable], ciphertext: str) -> Any:
+        """Return the payload encrypted in ``ciphertext``, decrypting on a miss.
+
+        Args:
+            key: Identity of the row version, or None to bypass the cache.
+            ciphertext: Value stored by ``EncryptedJSON``.
+        """
+        if key is not None and self.max_entries > 0:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] == ciphertext:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return json.loads(entry[1])
+                self.misses += 1
+
+        plaintext = get_database_encryption_service().decrypt_field(ciphertext)
+        if key is not None and self.max_entries > 0:
+            with self._lock:
+                self._entries[key] = (ciphertext, plaintext)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return json.loads(plaintext)
+
+    def discard_rows(self, row_ids: Iterable[int]) -> int:
+        """Drop every cached version of the given row ids, e.g. after deletion."""
+        row_ids = set(row_ids)
+        with self._lock:
+            stale = [
+                key
+                for key in self._entries
+                if isinstance(key, tuple) and key and key[0] in row_ids
+            ]
+            for key in stale:
+                del self._entries[key]
+        return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+report_payload_cache = DecryptedPayloadCache()
+
+
+def encrypt_json(value: Any) -> str:
+    """Encrypt a JSON-serialisable value the way ``EncryptedJSON`` stores it."""
+    return get_database_encryption_service().encrypt_field(json.dumps(value))
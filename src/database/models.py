@@ -15,15 +15,24 @@ from sqlalchemy import (
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
     LargeBinary,
     String,
     Text,
+    UniqueConstraint,
+    text,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .database import Base
-from .encryption import EncryptedJSON, EncryptedString, EncryptedText
+from .encryption import (
+    EncryptedJSON,
+    EncryptedString,
+    EncryptedText,
+    encrypt_json,
+    report_payload_cache,
+)
 
 
 class User(Base):
@@ -96,15 +105,60 @@ class AnalysisReport(Base):
     compliance_score: Mapped[float] = mapped_column(Float, index=True)
     document_type: Mapped[str | None] = mapped_column(String, index=True, nullable=True)
     discipline: Mapped[str | None] = mapped_column(String, index=True, nullable=True)
-    analysis_result: Mapped[dict] = mapped_column(
-        EncryptedJSON
-    )  # Encrypt sensitive analysis data
+    # Encrypted analysis payload, stored as EncryptedJSON does. Deferred so
+    # queries that do not need it skip loading and decrypting it; read it
+    # through ``analysis_result``.
+    analysis_result_encrypted: Mapped[str | None] = mapped_column(
+        "analysis_result", Text, deferred=True
+    )
     document_embedding: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    # Bumped on every ORM update; keys the decrypted payload cache
+    version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=1, server_default=text("1")
+    )
 
     findings: Mapped[list["Finding"]] = relationship(
         "Finding", back_populates="report", cascade="all, delete-orphan"
     )
 
+    __mapper_args__ = {"version_id_col": version}
+    # Analytics filter on a date window and aggregate scores per discipline or
+    # document type; these let those queries read only index entries.
+    __table_args__ = (
+        Index(
+            "ix_reports_discipline_date_score",
+            "discipline",
+            "analysis_date",
+            "compliance_score",
+        ),
+        Index("ix_reports_type_score", "document_type", "compliance_score"),
+        Index("ix_reports_type_date", "document_type", "analysis_date"),
+    )
+
+    @property
+    def analysis_result(self) -> dict | None:
+        """Decrypted analysis payload.
+
+        Decrypted on first access (loading the deferred column if needed) via
+        ``report_payload_cache``. In async sessions, load the column first with
+        ``crud.load_report_payload`` or the ``crud.with_report_payload`` option.
+        """
+        ciphertext = self.analysis_result_encrypted
+        if ciphertext is None:
+            return None
+        cached = self.__dict__.get("_analysis_result")
+        if cached is not None and cached[0] is ciphertext:
+            return cached[1]
+        key = (self.id, self.version) if self.id is not None else None
+        value = report_payload_cache.decrypt(key, ciphertext)
+        self.__dict__["_analysis_result"] = (ciphertext, value)
+        return value
+
+    @analysis_result.setter
+    def analysis_result(self, value: dict | None) -> None:
+        self.analysis_result_encrypted = encrypt_json(value) if value is not None else None
+        self.__dict__["_analysis_result"] = (self.analysis_result_encrypted, value)
+
 
 class Finding(Base):
     """Finding model for storing individual compliance issues found in documents with encrypted sensitive text."""
@@ -129,6 +183,13 @@ class Finding(Base):
         "AnalysisReport", back_populates="findings"
     )
 
+    __table_args__ = (
+        # Per-report finding and high-risk counts
+        Index("ix_findings_report_risk", "report_id", "risk"),
+        # Findings summary by rule
+        Index("ix_findings_rule_confidence", "rule_id", "confidence_score"),
+    )
+
 
 class FeedbackAnnotation(Base):
     """Model for storing human-in-the-loop feedback on AI-generated findings with encrypted comments."""
@@ -250,3 +311,73 @@ class HabitProgressSnapshot(Base):
     user: Mapped["User"] = relationship(
         "User", back_populates="habit_progress_snapshots"
     )
+
+    __table_args__ = (
+        Index("ix_habit_snapshots_user_date", "user_id", "snapshot_date"),
+    )
+
+
+class AnalyticsDailyRollup(Base):
+    """Per-day analysis aggregates by discipline and document type.
+
+    Maintained incrementally by ``crud.create_analysis_report`` and refreshed by
+    the database maintenance job, so analytics read a row per day and dimension
+    instead of scanning reports. Sums are stored rather than averages so rows
+    can be combined into weekly or whole-range figures.
+    """
+
+    __tablename__ = "analytics_daily_rollups"
+    __table_args__ = (
+        UniqueConstraint(
+            "day", "discipline", "document_type", name="uq_analytics_daily_rollup"
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    day: Mapped[datetime.date] = mapped_column(Date, index=True)
+    # Empty string rather than NULL so the unique constraint applies
+    discipline: Mapped[str] = mapped_column(String, default="")
+    document_type: Mapped[str] = mapped_column(String, default="")
+
+    report_count: Mapped[int] = mapped_column(Integer, default=0)
+    score_sum: Mapped[float] = mapped_column(Float, default=0.0)
+    score_min: Mapped[float | None] = mapped_column(Float, nullable=True)
+    score_max: Mapped[float | None] = mapped_column(Float, nullable=True)
+    finding_count: Mapped[int] = mapped_column(Integer, default=0)
+    high_risk_finding_count: Mapped[int] = mapped_column(Integer, default=0)
+    # Only reports whose analysis_result carries processing_time_ms contribute
+    processing_ms_sum: Mapped[float] = mapped_column(Float, default=0.0)
+    processing_ms_count: Mapped[int] = mapped_column(Integer, default=0)
+
+    updated_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.datetime.now(datetime.UTC),
+        onupdate=lambda: datetime.datetime.now(datetime.UTC),
+    )
+
+
+class AnalyticsScoreHistogram(Base):
+    """Per-day compliance score histogram by discipline.
+
+    One row per populated score bin (see ``src.core.score_sketch``). Rows for
+    any range of days merge into a single histogram, so benchmark percentiles
+    cost a scan of the window's bins rather than of its reports.
+    """
+
+    __tablename__ = "analytics_score_histogram"
+    __table_args__ = (
+        UniqueConstraint(
+            "day", "discipline", "bin", name="uq_analytics_score_histogram"
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    day: Mapped[datetime.date] = mapped_column(Date, index=True)
+    discipline: Mapped[str] = mapped_column(String, default="")
+    bin: Mapped[int] = mapped_column(Integer)
+
+    count: Mapped[int] = mapped_column(Integer, default=0)
+    score_sum: Mapped[float] = mapped_column(Float, default=0.0)
+    score_sq_sum: Mapped[float] = mapped_column(Float, default=0.0)
+    score_min: Mapped[float | None] = mapped_column(Float, nullable=True)
+    score_max: Mapped[float | None] = mapped_column(Float, nullable=True)
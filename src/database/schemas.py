@@ -68,6 +68,18 @@ class Report(ReportBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class ReportSummary(BaseModel):
+    """Report metadata for list views, without the analysis payload."""
+
+    id: int
+    document_name: str
+    analysis_date: datetime.datetime
+    compliance_score: float
+    document_type: str | None = None
+    discipline: str | None = None
+    finding_count: int = 0
+
+
 class FindingSummary(BaseModel):
     rule_id: str
     count: int
@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database import crud, schemas
+
+
+async def _create_reports(db_session: AsyncSession, count: int) -> None:
+    for index in range(count):
+        await crud.create_analysis_report(
+            db_session,
+            schemas.ReportCreate(
+                document_name=f"note_{index}.pdf",
+                compliance_score=70.0 + index,
+                document_type="Progress Note",
+                analysis_result={"discipline": "PT"},
+            ),
+            [
+                schemas.FindingCreate(
+                    rule_id="rule_goals",
+                    risk="High",
+                    personalized_tip="Add measurable goals",
+                    problematic_text="Patient doing well",
+                )
+            ],
+        )
+
+
+@pytest.mark.asyncio
+async def test_report_summaries_page_by_cursor_header(
+    client_with_auth_override: AsyncClient, db_session: AsyncSession
+):
+    await _create_reports(db_session, 3)
+
+    first = await client_with_auth_override.get("/dashboard/reports/summary", params={"limit": 2})
+    second = await client_with_auth_override.get(
+        "/dashboard/reports/summary",
+        params={"limit": 2, "cursor": first.headers["X-Next-Cursor"]},
+    )
+    invalid = await client_with_auth_override.get(
+        "/dashboard/reports/summary", params={"cursor": "garbage"}
+    )
+
+    assert len(first.json()) == 2
+    assert len(second.json()) == 1
+    assert "X-Next-Cursor" not in second.headers
+    assert {row["id"] for row in first.json()}.isdisjoint(row["id"] for row in second.json())
+    assert invalid.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_streaming_exports(client_with_auth_override: AsyncClient, db_session: AsyncSession):
+    await _create_reports(db_session, 3)
+
+    reports_csv = await client_with_auth_override.get("/analytics/export/reports")
+    findings_ndjson = await client_with_auth_override.get(
+        "/analytics/export/findings", params={"format": "ndjson"}
+    )
+    unsupported = await client_with_auth_override.get(
+        "/analytics/export/reports", params={"format": "xml"}
+    )
+
+    assert reports_csv.headers["content-type"].startswith("text/csv")
+    lines = reports_csv.text.strip().splitlines()
+    assert lines[0].startswith("id,analysis_date,document_name")
+    assert len(lines) == 4
+    rows = [json.loads(line) for line in findings_ndjson.text.splitlines()]
+    assert [row["rule_id"] for row in rows] == ["rule_goals"] * 3
+    assert unsupported.status_code == 400
@@ -95,3 +95,24 @@ async def test_rrf_ranking_logic(retriever):
 
     assert len(results_top_2) == 2
     assert [res["name"] for res in results_top_2] == ["Doc A", "Doc C"]
+
+
+@pytest.mark.asyncio
+async def test_retrieve_batch_encodes_queries_once(retriever):
+    """Batched retrieval encodes all queries in one call and ranks each like retrieve()."""
+    retriever.bm25.get_scores.return_value = np.array([0.9, 0.5, 0.1])
+    retriever.use_reranker = False
+    retriever.use_query_expansion = False
+    mock_tensor = MagicMock()
+    mock_tensor.cpu.return_value.numpy.return_value = np.array([0.5, 0.1, 0.9])
+    retriever.dense_retriever.encode = MagicMock(return_value=np.random.rand(2, 384))
+
+    with patch("src.core.hybrid_retriever.cos_sim", return_value=[mock_tensor]):
+        results = await retriever.retrieve_batch(
+            [{"query": "first query", "top_k": 3}, {"query": "second query", "top_k": 1}]
+        )
+
+    retriever.dense_retriever.encode.assert_called_once()
+    assert retriever.dense_retriever.encode.call_args.args[0] == ["first query", "second query"]
+    assert [r["name"] for r in results[0]] == ["Doc A", "Doc C", "Doc B"]
+    assert [r["name"] for r in results[1]] == ["Doc A"]
@@ -0,0 +1,89 @@
+"""Dashboard read latency while a writer streams inserts: shared connection vs WAL read pool."""
+
+import asyncio
+import datetime
+import statistics
+import time
+
+import pytest
+from sqlalchemy import insert, select
+
+from src.config import DatabaseSettings
+from src.database import models
+from src.database.database import Base, build_engine_profile, make_session_factory
+
+SEED_REPORTS = 20_000
+WRITE_BATCH = 2_000
+READERS = 8
+READS_PER_READER = 20
+
+
+def _rows(count: int) -> list[dict]:
+    now = datetime.datetime.now(datetime.UTC)
+    return [
+        {
+            "document_name": f"note_{index}.pdf",
+            "compliance_score": 60 + index % 40,
+            "document_type": "Progress Note",
+            "discipline": "PT",
+            "analysis_date": now,
+            "analysis_result": "x" * 200,
+        }
+        for index in range(count)
+    ]
+
+
+async def _read_latencies_ms(url: str, read_pool_size: int) -> list[float]:
+    profile = build_engine_profile(url, DatabaseSettings(url=url, read_pool_size=read_pool_size))
+    session_factory = make_session_factory(profile)
+    async with profile.writer.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with session_factory() as session:
+        await session.execute(insert(models.AnalysisReport), _rows(SEED_REPORTS))
+        await session.commit()
+
+    done = asyncio.Event()
+
+    async def writer():
+        while not done.is_set():
+            async with session_factory() as session:
+                await session.execute(insert(models.AnalysisReport), _rows(WRITE_BATCH))
+                await session.commit()
+
+    samples = []
+
+    async def reader():
+        for _ in range(READS_PER_READER):
+            start = time.perf_counter()
+            async with session_factory() as session:
+                await session.execute(
+                    select(models.AnalysisReport.id, models.AnalysisReport.compliance_score)
+                    .order_by(models.AnalysisReport.id.desc())
+                    .limit(50)
+                )
+            samples.append((time.perf_counter() - start) * 1000)
+            await asyncio.sleep(0.005)
+
+    write_task = asyncio.create_task(writer())
+    await asyncio.gather(*(reader() for _ in range(READERS)))
+    done.set()
+    await write_task
+    await profile.dispose()
+    return samples
+
+
+@pytest.mark.asyncio
+@pytest.mark.performance
+@pytest.mark.benchmark
+async def test_dashboard_reads_do_not_queue_behind_writes(tmp_path):
+    shared = await _read_latencies_ms(f"sqlite+aiosqlite:///{tmp_path / 'shared.db'}", 0)
+    pooled = await _read_latencies_ms(f"sqlite+aiosqlite:///{tmp_path / 'pooled.db'}", 4)
+
+    for name, samples in (("shared", shared), ("read pool", pooled)):
+        samples.sort()
+        print(
+            f"{name:>9}: p50={statistics.median(samples):.1f}ms "
+            f"p95={samples[int(len(samples) * 0.95)]:.1f}ms"
+        )
+
+    assert statistics.median(pooled) < statistics.median(shared)
@@ -0,0 +1,45 @@
+"""Metrics ingestion throughput of TimeSeriesStorage, raw partitions plus rollups."""
+
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.core.data_aggregator import AggregationLevel, TimeSeriesStorage
+
+POINTS = 200_000
+FLUSH = 5_000
+
+
+@pytest.mark.performance
+@pytest.mark.benchmark
+def test_ingestion_sustains_tens_of_thousands_of_points_per_second(tmp_path):
+    storage = TimeSeriesStorage(str(tmp_path / "metrics.db"))
+    start = datetime(2026, 1, 5, 10, 0)
+    metrics = [
+        {
+            "timestamp": (start + timedelta(milliseconds=50 * index)).isoformat(),
+            "name": f"metric_{index % 20}",
+            "value": float(index % 97),
+            "unit": "percent",
+            "type": "gauge",
+            "source": "system",
+            "tags": {"host": "web-1"},
+            "metadata": {},
+        }
+        for index in range(POINTS)
+    ]
+
+    began = time.perf_counter()
+    for offset in range(0, POINTS, FLUSH):
+        storage.store_raw_metrics(metrics[offset : offset + FLUSH])
+    elapsed = time.perf_counter() - began
+
+    rate = POINTS / elapsed
+    print(f"{POINTS} points in {elapsed:.2f}s ({rate:,.0f} points/s)")
+    hourly = storage.query_aggregated_metrics(
+        start, start + timedelta(hours=4), AggregationLevel.LONG_TERM
+    )
+    assert sum(bucket.count for bucket in hourly) == POINTS
+    assert rate > 20_000
+    storage.close()
@@ -0,0 +1,94 @@
+"""Per-request overhead of the legacy BaseHTTPMiddleware stack vs the ASGI pipeline."""
+
+import statistics
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.middleware.csrf_protection import CSRFProtectionMiddleware
+from src.api.middleware.enhanced_rate_limiting import EnhancedRateLimitMiddleware
+from src.api.middleware.performance_monitoring import PerformanceMonitoringMiddleware
+from src.api.middleware.request_logging import RequestLoggingMiddleware
+from src.api.middleware.request_pipeline import SECURITY_HEADERS, RequestPipelineMiddleware
+from src.api.middleware.request_tracking import RequestIdMiddleware
+from src.api.middleware.security_middleware import (
+    AuthenticationMiddleware,
+    DataProtectionMiddleware,
+    SecurityMiddleware,
+)
+from src.logging_config import CorrelationIdMiddleware
+
+SECRET = "benchmark-secret-key"
+REQUESTS = 300
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    return app
+
+
+def _legacy_app() -> FastAPI:
+    app = _app()
+    app.add_middleware(RequestLoggingMiddleware)
+    app.add_middleware(SecurityMiddleware)
+    app.add_middleware(AuthenticationMiddleware)
+    app.add_middleware(DataProtectionMiddleware)
+    app.add_middleware(PerformanceMonitoringMiddleware)
+    app.add_middleware(EnhancedRateLimitMiddleware)
+    app.add_middleware(CSRFProtectionMiddleware, secret_key=SECRET)
+    app.add_middleware(CorrelationIdMiddleware)
+    app.add_middleware(RequestIdMiddleware)
+
+    @app.middleware("http")
+    async def add_security_headers(request, call_next):
+        response = await call_next(request)
+        for name, value in SECURITY_HEADERS.items():
+            response.headers[name] = value
+        return response
+
+    return app
+
+
+def _pipeline_app() -> FastAPI:
+    app = _app()
+    app.add_middleware(RequestPipelineMiddleware, secret_key=SECRET)
+    return app
+
+
+def _latencies_ms(app: FastAPI) -> list[float]:
+    samples = []
+    with TestClient(app) as client:
+        for _ in range(20):  # warm up
+            client.get("/health")
+        for _ in range(REQUESTS):
+            start = time.perf_counter()
+            response = client.get("/health")
+            samples.append((time.perf_counter() - start) * 1000)
+            assert response.status_code == 200
+    return samples
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    return statistics.quantiles(samples, n=100)[int(pct) - 1]
+
+
+@pytest.mark.performance
+@pytest.mark.benchmark
+def test_pipeline_overhead_vs_legacy_stack():
+    legacy = _latencies_ms(_legacy_app())
+    pipeline = _latencies_ms(_pipeline_app())
+
+    for name, samples in (("legacy", legacy), ("pipeline", pipeline)):
+        print(
+            f"{name:>8}: p50={statistics.median(samples):.3f}ms "
+            f"p99={_percentile(samples, 99):.3f}ms"
+        )
+
+    assert statistics.median(pipeline) <= statistics.median(legacy)
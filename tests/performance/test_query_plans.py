@@ -0,0 +1,221 @@
+"""Query-plan regression suite for the hot crud queries.
+
+Seeds a large synthetic SQLite database, runs each crud function while
+capturing its SELECTs, and checks ``EXPLAIN QUERY PLAN`` for every one:
+
+- no query may scan a hot table row by row (``SCAN reports`` without an
+  index), and
+- queries over a date window must reach hot tables through an index search,
+  so their cost follows the window rather than the table size. Paged list
+  queries may walk an index in order, since ``LIMIT`` bounds the walk.
+
+Timings are printed and attached to the test report as properties.
+"""
+
+import datetime
+import random
+import statistics
+import time
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from src.database import crud
+from src.database.database import Base
+from src.database.encryption import encrypt_json, encrypt_sensitive_data
+
+REPORTS = 50_000
+FINDINGS_PER_REPORT = 4
+USERS = 40
+SNAPSHOT_DAYS = 365
+ROUNDS = 3
+
+HOT_TABLES = {"reports", "findings", "habit_progress_snapshots"}
+DISCIPLINES = ("PT", "OT", "SLP")
+DOCUMENT_TYPES = ("Progress Note", "Evaluation", "Discharge Summary", "Daily Note")
+
+
+def _seed(sync_conn) -> None:
+    rng = random.Random(7)
+    now = datetime.datetime.now(datetime.UTC).replace(tzinfo=None)
+
+    created = now.strftime("%Y-%m-%d %H:%M:%S.%f")
+    # Encrypting once keeps seeding fast while payloads still decrypt
+    document_name = encrypt_sensitive_data("note.pdf")
+    payload = encrypt_json({"discipline": "PT"})
+    tip = encrypt_sensitive_data("Document measurable functional goals.")
+    text = encrypt_sensitive_data("Patient tolerated treatment well.")
+
+    def stamp(value: datetime.datetime) -> str:
+        return value.strftime("%Y-%m-%d %H:%M:%S.%f")
+
+    sync_conn.exec_driver_sql(
+        "INSERT INTO users (username, hashed_password, is_active, is_admin, created_at,"
+        " updated_at) VALUES (?, 'x', 1, 0, ?, ?)",
+        [(f"clinician_{index}", created, created) for index in range(USERS)],
+    )
+    sync_conn.exec_driver_sql(
+        "INSERT INTO reports (id, document_name, analysis_date, compliance_score, document_type,"
+        " discipline, analysis_result, version) VALUES (?, ?, ?, ?, ?, ?, ?, 1)",
+        [
+            (
+                report_id,
+                document_name,
+                stamp(now - datetime.timedelta(minutes=rng.randrange(3 * 365 * 24 * 60))),
+                round(rng.uniform(40, 100), 1),
+                rng.choice(DOCUMENT_TYPES),
+                rng.choice(DISCIPLINES),
+                payload,
+            )
+            for report_id in range(1, REPORTS + 1)
+        ],
+    )
+    sync_conn.exec_driver_sql(
+        "INSERT INTO findings (report_id, rule_id, risk, personalized_tip, problematic_text,"
+        " confidence_score) VALUES (?, ?, ?, ?, ?, ?)",
+        [
+            (
+                report_id,
+                f"rule_{rng.randrange(60)}",
+                rng.choice(("High", "Medium", "Low")),
+                tip,
+                text,
+                rng.random(),
+            )
+            for report_id in range(1, REPORTS + 1)
+            for _ in range(FINDINGS_PER_REPORT)
+        ],
+    )
+    sync_conn.exec_driver_sql(
+        "INSERT INTO habit_progress_snapshots (user_id, snapshot_date, habit_1_percentage,"
+        " habit_2_percentage, habit_3_percentage, habit_4_percentage, habit_5_percentage,"
+        " habit_6_percentage, habit_7_percentage, total_findings, overall_progress_score,"
+        " consistency_score, improvement_rate, created_at)"
+        " VALUES (?, ?, 10, 10, 10, 10, 10, 10, 10, ?, 50, 50, 0, ?)",
+        [
+            (
+                user_id,
+                (now.date() - datetime.timedelta(days=day)).isoformat(),
+                rng.randrange(20),
+                created,
+            )
+            for user_id in range(1, USERS + 1)
+            for day in range(SNAPSHOT_DAYS)
+        ],
+    )
+
+
+def _cases():
+    today = datetime.date.today()
+    week_ago = today - datetime.timedelta(days=7)
+    # (name, call, windowed); offset-paged list queries are not windowed, while
+    # cursor pages must seek into the index
+    return [
+        ("get_dashboard_statistics", lambda db: crud.get_dashboard_statistics(db), False),
+        ("get_organizational_metrics", lambda db: crud.get_organizational_metrics(db, 30), True),
+        ("get_discipline_breakdown", lambda db: crud.get_discipline_breakdown(db, 30), True),
+        ("get_team_performance_trends", lambda db: crud.get_team_performance_trends(db, 28), True),
+        ("get_reports", lambda db: crud.get_reports(db, limit=50), False),
+        ("get_report_summaries", lambda db: crud.get_report_summaries(db, limit=100), False),
+        (
+            "get_report_summaries[cursor]",
+            lambda db: crud.get_report_summaries(
+                db, limit=100, cursor=crud.encode_report_cursor(datetime.datetime(2025, 6, 1), 0)
+            ),
+            True,
+        ),
+        (
+            "get_report_summaries[document_type]",
+            lambda db: crud.get_report_summaries(db, limit=100, document_type="Evaluation"),
+            False,
+        ),
+        (
+            "get_total_findings_count",
+            lambda db: crud.get_total_findings_count(
+                db, start_date=week_ago, end_date=today, discipline="PT"
+            ),
+            True,
+        ),
+        ("get_findings_summary", lambda db: crud.get_findings_summary(db), False),
+        (
+            "get_habit_trend_data",
+            lambda db: crud.get_habit_trend_data(db, start_date=week_ago, end_date=today),
+            True,
+        ),
+        (
+            "get_team_habit_summary",
+            lambda db: crud.get_team_habit_summary(db, start_date=week_ago, end_date=today),
+            True,
+        ),
+        ("get_user_habit_statistics", lambda db: crud.get_user_habit_statistics(db, 3, 30), True),
+        (
+            "rebuild_analytics_rollups[7 days]",
+            lambda db: crud.rebuild_analytics_rollups(db, days_back=7),
+            True,
+        ),
+    ]
+
+
+def _plan_violations(plan: list[str], windowed: bool) -> list[str]:
+    violations = []
+    for detail in plan:
+        words = detail.split()
+        if len(words) < 2 or words[0] != "SCAN" or words[1] not in HOT_TABLES:
+            continue
+        if windowed or "INDEX" not in detail:
+            violations.append(detail)
+    return violations
+
+
+@pytest.mark.asyncio
+@pytest.mark.performance
+@pytest.mark.benchmark
+async def test_hot_crud_queries_use_indexes(tmp_path, record_property):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'plans.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_seed)
+        # Planner statistics, as kept current by optimize_database()
+        await conn.exec_driver_sql("ANALYZE")
+
+    statements: list[tuple[str, object]] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    failures = []
+    timings = {}
+    async with AsyncSession(engine, expire_on_commit=False) as db:
+        for name, call, windowed in _cases():
+            event.listen(engine.sync_engine, "before_cursor_execute", capture)
+            await call(db)
+            event.remove(engine.sync_engine, "before_cursor_execute", capture)
+            captured, statements[:] = list(statements), []
+
+            samples = []
+            for _ in range(ROUNDS):
+                start = time.perf_counter()
+                await call(db)
+                samples.append((time.perf_counter() - start) * 1000)
+                db.expunge_all()
+            timings[name] = round(statistics.median(samples), 2)
+
+            async with engine.connect() as conn:
+                for statement, parameters in captured:
+                    plan = [
+                        row[3]
+                        for row in await conn.exec_driver_sql(
+                            "EXPLAIN QUERY PLAN " + statement, parameters
+                        )
+                    ]
+                    violations = _plan_violations(plan, windowed)
+                    if violations:
+                        failures.append(f"{name}: {violations}\n    {statement.strip()}")
+    await engine.dispose()
+
+    for name, elapsed in timings.items():
+        print(f"{name:>40}: {elapsed:8.2f}ms")
+    record_property("query_timings_ms", timings)
+    assert not failures, "Queries scanning hot tables:\n" + "\n".join(failures)
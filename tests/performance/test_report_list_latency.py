@@ -0,0 +1,80 @@
+"""List-view latency over 10k encrypted reports: full entities vs projections."""
+
+import datetime
+import statistics
+import time
+
+import pytest
+
+from src.database import crud, models, schemas
+from src.database.encryption import report_payload_cache
+
+REPORTS = 10_000
+PAGE = 100
+ROUNDS = 15
+
+
+def _payload(index: int) -> dict:
+    return {
+        "discipline": "PT",
+        "summary": "Patient ambulated 150 feet with rolling walker. " * 20,
+        "findings": [
+            {"rule_id": f"rule_{rule}", "risk": "Medium", "text": "Goals lack measurable criteria. " * 4}
+            for rule in range(8)
+        ],
+        "index": index,
+    }
+
+
+async def _timed_ms(call) -> list[float]:
+    samples = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        await call()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+@pytest.mark.asyncio
+@pytest.mark.performance
+@pytest.mark.benchmark
+async def test_report_list_latency_with_10k_reports(db_session):
+    now = datetime.datetime.now(datetime.UTC)
+    db_session.add_all(
+        models.AnalysisReport(
+            document_name=f"note_{index}.pdf",
+            compliance_score=60 + index % 40,
+            document_type="Progress Note",
+            discipline="PT",
+            analysis_date=now - datetime.timedelta(minutes=index),
+            analysis_result=_payload(index),
+        )
+        for index in range(REPORTS)
+    )
+    await db_session.commit()
+    db_session.expunge_all()
+
+    async def full_entities_uncached():
+        report_payload_cache.clear()
+        db_session.expunge_all()
+        reports = await crud.get_reports(db_session, limit=PAGE)
+        return [schemas.Report.model_validate(report) for report in reports]
+
+    async def full_entities_cached():
+        db_session.expunge_all()
+        reports = await crud.get_reports(db_session, limit=PAGE)
+        return [schemas.Report.model_validate(report) for report in reports]
+
+    async def summaries():
+        rows = await crud.get_report_summaries(db_session, limit=PAGE)
+        return [schemas.ReportSummary.model_validate(row) for row in rows]
+
+    before = await _timed_ms(full_entities_uncached)
+    cached = await _timed_ms(full_entities_cached)
+    after = await _timed_ms(summaries)
+
+    for name, samples in (("entities", before), ("cached", cached), ("summaries", after)):
+        print(f"{name:>9}: p50={statistics.median(samples):.2f}ms max={max(samples):.2f}ms")
+
+    assert statistics.median(cached) < statistics.median(before)
+    assert statistics.median(after) < statistics.median(before)
@@ -0,0 +1,58 @@
+"""Persistence throughput of create_analysis_report for 1k reports with 20 findings each."""
+
+import time
+
+import pytest
+from sqlalchemy import event
+
+from src.database import crud, schemas
+
+REPORTS = 1_000
+FINDINGS_PER_REPORT = 20
+
+
+def _findings() -> list[schemas.FindingCreate]:
+    return [
+        schemas.FindingCreate(
+            rule_id=f"rule_{index}",
+            risk=("High", "Medium", "Low")[index % 3],
+            personalized_tip="Document measurable functional goals.",
+            problematic_text="Patient tolerated treatment well.",
+            confidence_score=0.8,
+        )
+        for index in range(FINDINGS_PER_REPORT)
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.performance
+@pytest.mark.benchmark
+async def test_create_analysis_report_persistence_for_1k_reports(db_session, async_engine):
+    statements = []
+    event.listen(
+        async_engine.sync_engine,
+        "before_cursor_execute",
+        lambda *args: statements.append(args[2]),
+    )
+    findings = _findings()
+
+    start = time.perf_counter()
+    for index in range(REPORTS):
+        await crud.create_analysis_report(
+            db_session,
+            schemas.ReportCreate(
+                document_name=f"note_{index}.pdf",
+                compliance_score=60 + index % 40,
+                document_type="Progress Note",
+                analysis_result={"discipline": "PT", "processing_time_ms": 1500},
+            ),
+            findings,
+        )
+    elapsed = time.perf_counter() - start
+
+    per_report = len(statements) / REPORTS
+    print(
+        f"{REPORTS} reports x {FINDINGS_PER_REPORT} findings: {elapsed:.2f}s "
+        f"({elapsed / REPORTS * 1000:.2f}ms/report, {per_report:.1f} statements/report)"
+    )
+    assert per_report < FINDINGS_PER_REPORT
@@ -0,0 +1,61 @@
+"""Memory use of the streaming report export: a year of reports vs a month."""
+
+import datetime
+import time
+import tracemalloc
+
+import pytest
+
+from src.api.routers.advanced_analytics import REPORT_EXPORT_FIELDS, _encode_export
+from src.database import crud
+from src.database.encryption import encrypt_sensitive_data
+
+REPORTS_PER_DAY = 60
+DAYS = 365
+BATCH = 500
+
+
+async def _export_peak(db_session, days: int) -> tuple[int, int, float]:
+    """Bytes written, peak traced memory and seconds for exporting ``days`` days."""
+    start_date = (datetime.datetime.utcnow() - datetime.timedelta(days=days)).date()
+    batches = crud.iter_report_export_batches(
+        db_session, start_date=start_date, batch_size=BATCH
+    )
+    written = 0
+    tracemalloc.start()
+    start = time.perf_counter()
+    async for chunk in _encode_export(batches, REPORT_EXPORT_FIELDS, "csv"):
+        written += len(chunk)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return written, peak, elapsed
+
+
+@pytest.mark.asyncio
+@pytest.mark.performance
+@pytest.mark.benchmark
+async def test_report_export_memory_does_not_grow_with_window(db_session, async_engine):
+    now = datetime.datetime.utcnow()
+    document_name = encrypt_sensitive_data("note.pdf")
+    async with async_engine.begin() as conn:
+        await conn.exec_driver_sql(
+            "INSERT INTO reports (document_name, analysis_date, compliance_score, document_type,"
+            " discipline, version) VALUES (?, ?, 80.0, 'Progress Note', 'PT', 1)",
+            [
+                (
+                    document_name,
+                    (now - datetime.timedelta(minutes=index * 24 * 60 // REPORTS_PER_DAY))
+                    .strftime("%Y-%m-%d %H:%M:%S.%f"),
+                )
+                for index in range(REPORTS_PER_DAY * DAYS)
+            ],
+        )
+
+    month = await _export_peak(db_session, 30)
+    year = await _export_peak(db_session, DAYS)
+
+    for name, (written, peak, elapsed) in (("30 days", month), ("365 days", year)):
+        print(f"{name:>8}: {written / 1e6:.1f}MB written, peak {peak / 1e6:.2f}MB, {elapsed:.2f}s")
+    assert year[0] > 10 * month[0]
+    assert year[1] < 2 * month[1]
@@ -64,6 +64,7 @@ def mock_preemptive_services():
 # Now it is safe to import the rest of our test modules and the application itself.
 from fastapi.testclient import TestClient
 
+from src.api.admission_control import AnalysisAdmissionController
 from src.api.main import app, limiter
 from src.api.routers import analysis as analysis_router
 from src.auth import get_current_active_user
@@ -74,8 +75,13 @@ limiter.enabled = False
 
 
 @pytest.fixture(autouse=True)
-def reset_analysis_state():
-    """Ensure shared task registries start clean across tests."""
+def reset_analysis_state(monkeypatch):
+    """Ensure shared task registries and admission slots start clean across tests."""
+    monkeypatch.setattr(analysis_router, "analysis_admission", AnalysisAdmissionController())
+    # The root conftest clears overrides after every test, so reinstall auth here
+    app.dependency_overrides[get_current_active_user] = lambda: schemas.User(
+        id=1, username="testuser", is_active=True, is_admin=False, created_at=datetime.now(UTC)
+    )
     analysis_router.tasks.clear()
     analysis_router.analysis_task_registry.metadata.clear()
     yield
@@ -136,6 +142,40 @@ def test_analyze_document_api_route(client: TestClient, mocker, tmp_path):
     )
 
 
+def test_analyze_batch_api_route(client: TestClient, mocker, tmp_path):
+    """POST /analysis/analyze-batch schedules one batch task for all uploads."""
+    mock_run_batch = mocker.patch(
+        "src.api.routers.analysis.run_batch_analysis_and_save", return_value=None
+    )
+    mocker.patch.object(
+        analysis_router, "get_analysis_service", return_value=MagicMock()
+    )
+    # The root conftest clears overrides after every test, so reinstall auth here
+    app.dependency_overrides[get_current_active_user] = lambda: schemas.User(
+        id=1, username="testuser", is_active=True, is_admin=False, created_at=datetime.now(UTC)
+    )
+    app.dependency_overrides[analysis_router.get_analysis_service] = lambda: MagicMock()
+
+    try:
+        response = client.post(
+            "/analysis/analyze-batch",
+            files=[
+                ("files", ("note_a.txt", b"Patient seen for gait training.", "text/plain")),
+                ("files", ("note_b.txt", b"Patient seen for balance training.", "text/plain")),
+            ],
+            data={"discipline": "pt", "analysis_mode": "rubric"},
+        )
+    finally:
+        app.dependency_overrides.pop(analysis_router.get_analysis_service, None)
+
+    assert response.status_code == 202
+    payload = response.json()
+    assert payload["document_count"] == 2
+    documents = mock_run_batch.call_args.args[0]
+    assert [doc["original_filename"] for doc in documents] == ["note_a.txt", "note_b.txt"]
+    assert mock_run_batch.call_args.args[1] == payload["task_id"]
+
+
 def test_analyze_document_rejects_invalid_strictness(client: TestClient, tmp_path):
     file_path = tmp_path / "invalid.txt"
     file_path.write_text("bad strictness")
@@ -0,0 +1,166 @@
+import asyncio
+
+import pytest
+from fastapi import BackgroundTasks, HTTPException
+
+from src.api import admission_control
+from src.api.admission_control import AdmissionRejected, AnalysisAdmissionController
+from src.api.routers import analysis as analysis_router
+
+
+def test_admits_up_to_concurrency_then_queues_then_rejects():
+    controller = AnalysisAdmissionController(max_concurrent=2, max_queue=2)
+
+    assert controller.admit("a").queue_position == 0
+    assert controller.admit("b").queue_position == 0
+    assert controller.admit("c").queue_position == 1
+    assert controller.admit("d").queue_position == 2
+
+    with pytest.raises(AdmissionRejected) as exc_info:
+        controller.admit("e")
+    assert exc_info.value.status_code == 429
+    assert exc_info.value.retry_after >= 1
+
+
+def test_rejects_with_503_when_estimated_wait_too_long():
+    controller = AnalysisAdmissionController(max_concurrent=1, max_queue=10, max_wait_seconds=100)
+    for _ in range(5):
+        controller._durations.append(300.0)
+    controller.admit("a")
+
+    with pytest.raises(AdmissionRejected) as exc_info:
+        controller.admit("b")
+    assert exc_info.value.status_code == 503
+
+
+def test_estimate_uses_recent_durations():
+    controller = AnalysisAdmissionController(max_concurrent=2, max_queue=10)
+    controller._durations.extend([10.0, 30.0])
+
+    assert controller.estimate_start_seconds(1) == 10.0
+    assert controller.estimate_start_seconds(3) == 30.0
+
+
+@pytest.mark.asyncio
+async def test_queued_analyses_start_in_fifo_order_as_slots_free():
+    controller = AnalysisAdmissionController(max_concurrent=1, max_queue=5)
+    started = []
+
+    async def run(task_id):
+        await controller.acquire(task_id)
+        started.append(task_id)
+
+    for task_id in ("a", "b", "c"):
+        controller.admit(task_id)
+    runners = [asyncio.create_task(run(t)) for t in ("c", "b", "a")]
+    await asyncio.sleep(0)
+
+    assert started == ["a"]
+    assert controller.status_for("c") == {"queue_position": 2, "estimated_start_seconds": 90.0}
+
+    controller.release("a", 5.0)
+    await asyncio.sleep(0)
+    assert started == ["a", "b"]
+    assert controller.queue_position("c") == 1
+
+    controller.release("b", 5.0)
+    await asyncio.gather(*runners)
+    assert started == ["a", "b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_queue():
+    controller = AnalysisAdmissionController(max_concurrent=1, max_queue=5)
+    controller.admit("a")
+    await controller.acquire("a")
+    controller.admit("b")
+    waiter = asyncio.create_task(controller.acquire("b"))
+    await asyncio.sleep(0)
+
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    assert controller.queue_position("b") is None
+    controller.release("a")
+    assert controller.active_count == 0
+
+
+@pytest.mark.asyncio
+async def test_dispatch_returns_retry_after_when_saturated(monkeypatch):
+    controller = AnalysisAdmissionController(max_concurrent=1, max_queue=0)
+    monkeypatch.setattr(analysis_router, "analysis_admission", controller)
+    monkeypatch.setattr(analysis_router, "job_queue_enabled", lambda: False)
+    controller.admit("busy")
+
+    with pytest.raises(HTTPException) as exc_info:
+        await analysis_router.dispatch_analysis(
+            BackgroundTasks(), b"text", "t1", "note.txt", "pt", "rubric", "standard", object(), 1
+        )
+
+    assert exc_info.value.status_code == 429
+    assert int(exc_info.value.headers["Retry-After"]) == admission_control.DEFAULT_ANALYSIS_SECONDS
+
+
+@pytest.mark.asyncio
+async def test_dispatch_keeps_reservation_until_runner_releases_it(monkeypatch):
+    controller = AnalysisAdmissionController(max_concurrent=1, max_queue=0)
+    monkeypatch.setattr(analysis_router, "analysis_admission", controller)
+    monkeypatch.setattr(analysis_router, "job_queue_enabled", lambda: False)
+    gate = asyncio.Event()
+
+    async def starts_runner(file_content, task_id, *args):
+        # Like run_analysis_and_save: returns once the runner task is scheduled
+        await analysis_router.analysis_task_registry.start(task_id, gate.wait())
+
+    async def returns_early(*args):
+        return None
+
+    async def fails(*args):
+        raise RuntimeError("registry unavailable")
+
+    monkeypatch.setattr(analysis_router, "run_analysis_and_save", starts_runner)
+    background = BackgroundTasks()
+    await analysis_router.dispatch_analysis(
+        background, b"text", "t1", "note.txt", "pt", "rubric", "standard", object(), 1
+    )
+    await background()
+
+    with pytest.raises(HTTPException) as exc_info:
+        await analysis_router.dispatch_analysis(
+            BackgroundTasks(), b"text", "t2", "note.txt", "pt", "rubric", "standard", object(), 1
+        )
+    assert exc_info.value.status_code == 429
+
+    gate.set()
+    await asyncio.sleep(0)
+    controller.release("t1")
+    for runner, task_id in ((returns_early, "t3"), (fails, "t4")):
+        monkeypatch.setattr(analysis_router, "run_analysis_and_save", runner)
+        background = BackgroundTasks()
+        await analysis_router.dispatch_analysis(
+            background, b"text", task_id, "note.txt", "pt", "rubric", "standard", object(), 1
+        )
+        if runner is fails:
+            with pytest.raises(RuntimeError):
+                await background()
+        else:
+            await background()
+        assert controller.active_count == 0
+
+
+@pytest.mark.asyncio
+async def test_discard_unstarted_keeps_running_slots():
+    controller = AnalysisAdmissionController(max_concurrent=1, max_queue=2)
+    controller.admit("a")
+    controller.admit("b")
+
+    assert controller.discard_unstarted("b") is True
+    assert controller.queue_position("b") is None
+    assert controller.discard_unstarted("a") is True
+    assert controller.active_count == 0
+
+    controller.admit("c")
+    await controller.acquire("c")
+    assert controller.discard_unstarted("c") is False
+    assert controller.active_count == 1
@@ -0,0 +1,116 @@
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.core import analysis_job_worker
+from src.core.analysis_job_worker import AnalysisJobWorker, load_spooled_document, spool_document
+from src.core.persistent_task_registry import PersistentTaskRegistry, TaskStatus
+
+
+@pytest.fixture
+async def registry(tmp_path):
+    registry = PersistentTaskRegistry(db_path=str(tmp_path / "tasks.db"))
+    yield registry
+    await registry.close()
+
+
+@pytest.fixture(autouse=True)
+def spool_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        analysis_job_worker,
+        "_performance_settings",
+        lambda: {"analysis_job_spool_dir": str(tmp_path / "spool")},
+    )
+
+
+async def _enqueue(registry, task_id, content=b"Patient seen for gait training.", **kwargs):
+    path = spool_document(task_id, content)
+    await registry.enqueue_job(
+        task_id,
+        payload={"spool_path": path, "filename": "note.txt", "discipline": "pt",
+                 "analysis_mode": "rubric", "strictness": "standard"},
+        **kwargs,
+    )
+    return path
+
+
+def test_spooled_document_is_encrypted():
+    content = b"Patient John Smith, DOB 01/02/1950"
+    path = spool_document("t1", content)
+
+    assert b"John Smith" not in Path(path).read_bytes()
+    assert load_spooled_document(path) == content
+
+
+@pytest.mark.asyncio
+async def test_worker_completes_job_and_removes_spool(registry):
+    path = await _enqueue(registry, "job-1")
+
+    async def analyze_document(**kwargs):
+        kwargs["progress_callback"](50, "Halfway")
+        return {"analysis": {"findings": [{"id": 1}], "compliance_score": 88}}
+
+    service = AsyncMock()
+    service.analyze_document.side_effect = analyze_document
+    worker = AnalysisJobWorker(registry=registry, worker_id="w1", analysis_service=service)
+
+    assert await worker.run_once() is True
+
+    task = await registry.get_task("job-1")
+    assert task.status == TaskStatus.COMPLETED
+    assert task.lease_owner is None
+    assert task.result_data["overall_score"] == 88
+    assert task.result_data["findings"] == [{"id": 1}]
+    assert service.analyze_document.call_args.kwargs["file_content"] == b"Patient seen for gait training."
+    assert not Path(path).exists()
+
+
+@pytest.mark.asyncio
+async def test_worker_requeues_failed_job_until_retries_exhausted(registry):
+    path = await _enqueue(registry, "job-1", max_retries=1)
+    service = AsyncMock()
+    service.analyze_document.side_effect = RuntimeError("model crashed")
+    worker = AnalysisJobWorker(registry=registry, worker_id="w1", analysis_service=service)
+
+    await worker.run_once()
+    task = await registry.get_task("job-1")
+    assert task.status == TaskStatus.RETRYING
+    assert Path(path).exists()
+
+    await worker.run_once()
+    task = await registry.get_task("job-1")
+    assert task.status == TaskStatus.FAILED
+    assert task.error_message == "model crashed"
+    assert not Path(path).exists()
+
+
+@pytest.mark.asyncio
+async def test_worker_idles_when_queue_empty(registry):
+    worker = AnalysisJobWorker(registry=registry, worker_id="w1", analysis_service=AsyncMock())
+
+    assert await worker.run_once() is False
+
+
+@pytest.mark.asyncio
+async def test_worker_that_lost_its_lease_leaves_reclaimed_job_alone(registry):
+    path = await _enqueue(registry, "job-1", max_retries=2)
+
+    async def analyze_document(**kwargs):
+        # The lease expires mid-analysis and a second worker reclaims the job
+        await registry.update_task("job-1", lease_expires_at=0)
+        assert await registry.requeue_expired_leases() == 1
+        assert (await registry.claim_next_job("w2")).task_id == "job-1"
+        return {"analysis": {"findings": [], "compliance_score": 90}}
+
+    service = AsyncMock()
+    service.analyze_document.side_effect = analyze_document
+    worker = AnalysisJobWorker(registry=registry, worker_id="w1", analysis_service=service)
+
+    await worker.run_once()
+
+    task = await registry.get_task("job-1")
+    assert task.status == TaskStatus.RUNNING
+    assert task.lease_owner == "w2"
+    assert task.result_data is None
+    assert Path(path).exists()
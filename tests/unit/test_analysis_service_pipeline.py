@@ -74,3 +74,73 @@ async def test_analysis_service_uses_analysis_utils(monkeypatch):
     assert result["analysis"]["enriched"] is True
     assert result["report_html"] == "<p>report</p>"
     assert cache_calls["set_value"]["analysis"]["enriched"] is True
+    stage_trace = result["analysis"]["metadata"]["stage_trace"]
+    assert stage_trace["executions"]["document_classification"] == 1
+    assert stage_trace["total_redundant_executions"] == 0
+
+
+@pytest.mark.asyncio
+async def test_analyze_batch_shares_model_stages(monkeypatch):
+    service = AnalysisService.__new__(AnalysisService)
+    calls = {"scrub_many": 0, "ner_batch": 0, "retrieve_batch": 0, "analyzer": []}
+
+    def fake_scrub_many(texts):
+        calls["scrub_many"] += 1
+        return [text.upper() for text in texts]
+
+    def fake_extract_entities_batch(texts):
+        calls["ner_batch"] += 1
+        return [[{"entity_group": "TEST", "word": text[:4]}] for text in texts]
+
+    async def fake_retrieve_batch(requests):
+        calls["retrieve_batch"] += 1
+        return [[{"content": f"rule for {r['context_entities'][0]}"}] for r in requests]
+
+    async def fake_analyze_document(document_text, discipline, doc_type, analysis_context):
+        calls["analyzer"].append(analysis_context.retrieved_rules)
+        return {"findings": [], "summary": document_text}
+
+    async def fake_generate_report(enriched):
+        return {"report_html": "<p>report</p>"}
+
+    monkeypatch.setattr("src.core.analysis_service.trim_document_text", lambda text: text)
+    monkeypatch.setattr(
+        "src.core.analysis_service.enrich_analysis_result", lambda result, **kwargs: dict(result)
+    )
+    monkeypatch.setattr("src.core.analysis_service.cache_service.get_from_disk", lambda key: None)
+    monkeypatch.setattr("src.core.analysis_service.cache_service.set_to_disk", lambda key, value: None)
+
+    service.phi_scrubber = SimpleNamespace(scrub_many=fake_scrub_many)
+    service.clinical_ner_service = SimpleNamespace(extract_entities_batch=fake_extract_entities_batch)
+    service.retriever = SimpleNamespace(retrieve_batch=fake_retrieve_batch)
+    service.preprocessing = SimpleNamespace()
+    service.compliance_analyzer = SimpleNamespace(analyze_document=fake_analyze_document)
+    service.report_generator = SimpleNamespace(generate_report=fake_generate_report)
+    service.checklist_service = SimpleNamespace()
+    service.rubric_detector = SimpleNamespace(
+        detect_rubric=lambda text, filename: ("default", 0.8, {}),
+        detect_discipline=lambda text: ("pt", 0.1),
+    )
+
+    aggregate = []
+    per_document = []
+    results = await service.analyze_batch(
+        [
+            {"document_text": "gait note", "original_filename": "a.txt"},
+            {"document_text": "", "original_filename": "empty.txt"},
+            {"document_text": "balance note", "original_filename": "b.txt"},
+        ],
+        discipline="PT",
+        progress_callback=lambda pct, msg: aggregate.append(pct),
+        document_progress_callback=lambda index, pct, msg: per_document.append((index, pct)),
+    )
+
+    assert calls["scrub_many"] == 1
+    assert calls["ner_batch"] == 1
+    assert calls["retrieve_batch"] == 1
+    assert calls["analyzer"] == [[{"content": "rule for GAIT"}], [{"content": "rule for BALA"}]]
+    assert results[0]["analysis"]["summary"] == "GAIT NOTE"
+    assert results[1]["original_filename"] == "empty.txt" and "error" in results[1]
+    assert results[2]["analysis"]["metadata"]["stage_trace"]["total_redundant_executions"] == 0
+    assert (0, 100) in per_document and (2, 100) in per_document
+    assert aggregate == sorted(aggregate)
@@ -0,0 +1,144 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.database_maintenance_service import DatabaseMaintenanceService
+from src.core.meta_analytics_service import MetaAnalyticsService
+from src.database import crud, models, schemas
+
+
+async def _rollup_rows(db: AsyncSession) -> list[models.AnalyticsDailyRollup]:
+    result = await db.execute(select(models.AnalyticsDailyRollup).order_by(models.AnalyticsDailyRollup.day))
+    return list(result.scalars().all())
+
+
+@pytest.mark.asyncio
+async def test_create_analysis_report_increments_daily_rollup(db_session: AsyncSession):
+    findings = [
+        schemas.FindingCreate(
+            rule_id="rule_goals",
+            risk="High",
+            personalized_tip="Add measurable goals",
+            problematic_text="Patient doing well",
+        ),
+        schemas.FindingCreate(
+            rule_id="rule_frequency",
+            risk="Low",
+            personalized_tip="Document frequency",
+            problematic_text="Seen this week",
+        ),
+    ]
+    for score, processing_ms in ((80.0, 1200), (90.0, None)):
+        result = {"discipline": "PT"}
+        if processing_ms is not None:
+            result["processing_time_ms"] = processing_ms
+        await crud.create_analysis_report(
+            db_session,
+            schemas.ReportCreate(
+                document_name="Progress note",
+                compliance_score=score,
+                document_type="Progress Note",
+                analysis_result=result,
+            ),
+            findings,
+        )
+
+    [rollup] = await _rollup_rows(db_session)
+    assert (rollup.discipline, rollup.document_type) == ("PT", "Progress Note")
+    assert rollup.report_count == 2
+    assert rollup.score_sum == pytest.approx(170.0)
+    assert (rollup.score_min, rollup.score_max) == (80.0, 90.0)
+    assert (rollup.finding_count, rollup.high_risk_finding_count) == (4, 2)
+    assert (rollup.processing_ms_sum, rollup.processing_ms_count) == (1200.0, 1)
+
+
+@pytest.mark.asyncio
+async def test_rebuilt_rollups_match_report_aggregates(populated_db: AsyncSession):
+    written = await crud.rebuild_analytics_rollups(populated_db)
+
+    assert written == 4
+    assert await crud.get_rollup_organizational_metrics(
+        populated_db, days_back=30
+    ) == await crud.get_organizational_metrics(populated_db, days_back=30)
+    breakdown = await crud.get_rollup_discipline_breakdown(populated_db, days_back=30)
+    assert breakdown["PT"] == {"avg_compliance_score": 90.0, "user_count": 2}
+    trends = await crud.get_rollup_performance_trends(populated_db, days_back=21)
+    assert [week["avg_compliance_score"] for week in trends] == pytest.approx([95.0, 85.0, 82.5])
+
+    # Rebuilding drops rows whose reports are gone
+    report = (await populated_db.execute(select(models.AnalysisReport).limit(1))).scalar_one()
+    await populated_db.delete(report)
+    await populated_db.commit()
+    await crud.rebuild_analytics_rollups(populated_db)
+    assert len(await _rollup_rows(populated_db)) == 3
+
+
+@pytest.mark.asyncio
+async def test_organizational_overview_reads_rollups(populated_db: AsyncSession):
+    await crud.rebuild_analytics_rollups(populated_db)
+    # Reports are no longer scanned once rollups exist
+    populated_db.add(
+        models.AnalyticsDailyRollup(
+            day=(await _rollup_rows(populated_db))[-1].day,
+            discipline="SLP",
+            document_type="Evaluation",
+            report_count=1,
+            score_sum=50.0,
+        )
+    )
+    await populated_db.commit()
+
+    overview = await MetaAnalyticsService().get_organizational_overview(populated_db, days_back=30)
+
+    assert overview["organizational_metrics"]["total_analyses"] == 5
+    assert overview["discipline_breakdown"]["SLP"]["avg_compliance_score"] == 50.0
+    assert len(overview["team_trends"]) == 5
+
+
+@pytest.mark.asyncio
+async def test_benchmarks_from_score_histograms_match_report_scores(populated_db: AsyncSession):
+    before = await crud.get_benchmark_data(populated_db, min_analyses=3)
+    await crud.rebuild_analytics_rollups(populated_db)
+    for score in (62.5, 88.0):
+        await crud.create_analysis_report(
+            populated_db,
+            schemas.ReportCreate(
+                document_name="Daily note",
+                compliance_score=score,
+                analysis_result={"discipline": "PT"},
+            ),
+        )
+
+    after = await crud.get_benchmark_data(populated_db, min_analyses=3)
+    pt_only = await crud.get_benchmark_data(populated_db, min_analyses=3, discipline="PT")
+
+    assert before["compliance_score_percentiles"]["p50"] == pytest.approx(87.5)
+    scores = [95.0, 85.0, 75.0, 90.0, 62.5, 88.0]
+    assert after["total_analyses"] == 6
+    assert after["compliance_score_percentiles"]["p25"] == pytest.approx(np.percentile(scores, 25))
+    assert after["std_deviation"] == pytest.approx(round(np.std(scores), 2))
+    assert after["score_range"] == {"min": 62.5, "max": 95.0}
+    assert pt_only["total_analyses"] == 4
+
+
+@pytest.mark.asyncio
+async def test_scheduled_refresh_runs_on_the_application_loop(monkeypatch):
+    service = DatabaseMaintenanceService()
+    loops = []
+
+    async def refresh(full: bool = False) -> int:
+        loops.append(asyncio.get_running_loop())
+        return 3
+
+    monkeypatch.setattr(service, "refresh_analytics_rollups_async", refresh)
+    loop = asyncio.get_running_loop()
+
+    # APScheduler calls the job from its own thread
+    assert await asyncio.to_thread(service.refresh_analytics_rollups, loop) == 3
+    assert loops == [loop]
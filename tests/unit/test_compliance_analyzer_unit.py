@@ -1,7 +1,14 @@
-from unittest.mock import AsyncMock, MagicMock
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from src.core.analysis_context import (
+    ENTITY_EXTRACTION,
+    RULE_RETRIEVAL,
+    AnalysisContext,
+)
+from src.core.cache_service import TipCache
 from src.core.compliance_analyzer import ComplianceAnalyzer
 
 
@@ -57,6 +64,124 @@ async def test_analyze_document_orchestration(compliance_analyzer: ComplianceAna
     assert result == {"findings": []}
 
 
+@pytest.mark.asyncio
+async def test_analyze_document_reuses_analysis_context(compliance_analyzer: ComplianceAnalyzer):
+    document_text = "Patient requires assistance with transfers."
+    context = AnalysisContext(document_text=document_text, discipline="PT", doc_type="Progress Note")
+
+    async def entities():
+        return [{"entity_group": "ISSUE", "word": "transfers"}]
+
+    async def rules():
+        return [{"id": "r1", "name": "Transfers", "content": "Document assist level."}]
+
+    await context.run_stage(ENTITY_EXTRACTION, entities)
+    await context.run_stage(RULE_RETRIEVAL, rules)
+
+    await compliance_analyzer.analyze_document(
+        document_text=document_text,
+        discipline="PT",
+        doc_type="Progress Note",
+        analysis_context=context,
+    )
+
+    compliance_analyzer.ner_analyzer.extract_entities.assert_not_called()
+    compliance_analyzer.retriever.retrieve.assert_not_awaited()
+    trace = context.trace.as_dict()
+    assert trace["executions"] == {ENTITY_EXTRACTION: 1, RULE_RETRIEVAL: 1}
+    assert trace["reuses"] == {ENTITY_EXTRACTION: 1, RULE_RETRIEVAL: 1}
+    assert trace["total_redundant_executions"] == 0
+
+
+@pytest.mark.asyncio
+async def test_analyze_document_ignores_context_for_other_text(compliance_analyzer: ComplianceAnalyzer):
+    context = AnalysisContext(document_text="different text", discipline="PT")
+
+    async def entities():
+        return []
+
+    await context.run_stage(ENTITY_EXTRACTION, entities)
+
+    await compliance_analyzer.analyze_document(
+        document_text="Patient requires assistance with transfers.",
+        discipline="PT",
+        doc_type="Progress Note",
+        analysis_context=context,
+    )
+
+    compliance_analyzer.ner_analyzer.extract_entities.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_stage_trace_counts_redundant_executions():
+    context = AnalysisContext(document_text="text", discipline="PT")
+    context.trace.record_execution(ENTITY_EXTRACTION)
+    context.trace.record_execution(ENTITY_EXTRACTION)
+
+    assert context.trace.redundant_executions == {ENTITY_EXTRACTION: 1}
+    assert context.trace.as_dict()["total_redundant_executions"] == 1
+
+
+@pytest.fixture
+def clear_tip_cache():
+    TipCache.clear()
+    yield
+    TipCache.clear()
+
+
+def _findings(count: int) -> list[dict]:
+    return [
+        {"rule_id": f"r{i}", "issue_title": f"Issue {i}", "suggestion": f"Suggestion {i}"}
+        for i in range(count)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_post_process_generates_tips_concurrently(compliance_analyzer, clear_tip_cache):
+    def slow_tip(finding):
+        time.sleep(0.2)
+        return f"Tip for {finding['issue_title']}"
+
+    compliance_analyzer.nlg_service.generate_personalized_tip.side_effect = slow_tip
+    analysis = {"findings": _findings(4)}
+
+    started = time.perf_counter()
+    result = await compliance_analyzer._post_process_findings(analysis, [])
+
+    assert time.perf_counter() - started < 0.6
+    assert [f["personalized_tip"] for f in result["findings"]] == [
+        f"Tip for Issue {i}" for i in range(4)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_post_process_reuses_cached_tips(compliance_analyzer, clear_tip_cache):
+    await compliance_analyzer._post_process_findings({"findings": _findings(2)}, [])
+    repeat = [{"rule_id": "r0", "issue_title": "  issue 0! ", "suggestion": "s"}]
+    result = await compliance_analyzer._post_process_findings({"findings": repeat}, [])
+
+    assert compliance_analyzer.nlg_service.generate_personalized_tip.call_count == 2
+    assert result["findings"][0]["personalized_tip"] == "Tip"
+
+
+@pytest.mark.asyncio
+async def test_post_process_falls_back_to_suggestion_after_budget(compliance_analyzer, clear_tip_cache):
+    compliance_analyzer.nlg_service.generate_personalized_tip.side_effect = (
+        lambda finding: time.sleep(0.5) or "late tip"
+    )
+    performance = {"tip_time_budget_seconds": 0.1, "tip_concurrency": 1}
+    with patch("src.config.get_settings") as get_settings:
+        get_settings.return_value.performance = performance
+        result = await compliance_analyzer._post_process_findings(
+            {"findings": _findings(2)}, []
+        )
+
+    assert [f["personalized_tip"] for f in result["findings"]] == [
+        "Suggestion 0",
+        "Suggestion 1",
+    ]
+
+
 def test_format_rules_for_prompt():
     """
     Tests the formatting of compliance rules for the LLM prompt.
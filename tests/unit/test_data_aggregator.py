@@ -5,7 +5,13 @@ This module tests the comprehensive metric processing, aggregation, and storage
 functionality including time-series data management and automatic cleanup.
 """
 
-from src.core.data_aggregator import AggregationLevel
+import sqlite3
+import statistics
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.core.data_aggregator import AggregationLevel, DataAggregator, TimeSeriesStorage
 
 
 class TestAggregationLevel:
@@ -21,3 +27,139 @@ class TestAggregationLevel:
 
 class TestAggregatedMetric:
     """Test aggregated metric data."""
+
+
+def _metrics(start: datetime, count: int, step: timedelta, name: str = "cpu_usage") -> list[dict]:
+    return [
+        {
+            "timestamp": (start + step * index).isoformat(),
+            "name": name,
+            "value": float(index % 7),
+            "unit": "percent",
+            "type": "gauge",
+            "source": "system",
+            "tags": {"host": "web-1"},
+            "metadata": {"sample": index} if index == 0 else {},
+        }
+        for index in range(count)
+    ]
+
+
+class TestTimeSeriesStorage:
+    """Test partitioned raw storage and incremental rollups."""
+
+    def test_rollups_match_raw_statistics(self, tmp_path):
+        storage = TimeSeriesStorage(str(tmp_path / "metrics.db"))
+        start = datetime(2026, 1, 5, 10, 0)
+        metrics = _metrics(start, 240, timedelta(seconds=5))
+        # Rollups accumulate across flushes
+        assert storage.store_raw_metrics(metrics[:100]) == 100
+        assert storage.store_raw_metrics(metrics[100:]) == 140
+
+        raw = storage.query_raw_metrics(start, start + timedelta(hours=1), metric_name="cpu_usage")
+        assert len(raw) == 240
+        assert raw[0]["tags"] == {"host": "web-1"}
+        assert raw[0]["metadata"] == {"sample": 0}
+
+        values = [metric["value"] for metric in metrics]
+        [hourly] = storage.query_aggregated_metrics(
+            start, start + timedelta(hours=1), AggregationLevel.LONG_TERM
+        )
+        assert hourly.timestamp == start
+        assert (hourly.count, hourly.min_value, hourly.max_value) == (240, 0.0, 6.0)
+        assert hourly.avg_value == pytest.approx(statistics.mean(values))
+        assert hourly.std_dev == pytest.approx(statistics.stdev(values))
+
+        minutes = storage.query_aggregated_metrics(
+            start, start + timedelta(hours=1), AggregationLevel.SHORT_TERM
+        )
+        five_minutes = storage.query_aggregated_metrics(
+            start, start + timedelta(hours=1), AggregationLevel.MEDIUM_TERM
+        )
+        assert [bucket.count for bucket in minutes] == [12] * 20
+        assert [bucket.count for bucket in five_minutes] == [60] * 4
+        storage.close()
+
+    def test_cleanup_drops_raw_partitions_before_rollups(self, tmp_path):
+        storage = TimeSeriesStorage(str(tmp_path / "metrics.db"))
+        old = (datetime.now() - timedelta(days=10)).replace(second=0, microsecond=0)
+        storage.store_raw_metrics(_metrics(old, 10, timedelta(seconds=5)))
+        storage.store_raw_metrics(_metrics(datetime.now(), 5, timedelta(seconds=1)))
+
+        raw_deleted, aggregated_deleted = storage.cleanup_old_data(retention_days=365)
+
+        assert raw_deleted == 10
+        # Minute buckets expire after 7 days; 5-minute and hourly ones are kept
+        assert aggregated_deleted == 1
+        window = (old - timedelta(hours=1), old + timedelta(hours=1))
+        assert storage.query_raw_metrics(*window) == []
+        assert sum(m.count for m in storage.query_aggregated_metrics(*window, AggregationLevel.LONG_TERM)) == 10
+        assert storage.get_storage_stats()["raw_metrics_count"] == 5
+        storage.close()
+
+    def test_legacy_tables_are_migrated_and_vacuum_mode_switched(self, tmp_path):
+        db_path = str(tmp_path / "metrics.db")
+        start = datetime(2026, 1, 5, 10, 0)
+        conn = sqlite3.connect(db_path)
+        conn.execute(
+            "CREATE TABLE raw_metrics (id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT NOT NULL, "
+            "name TEXT NOT NULL, value REAL NOT NULL, unit TEXT, type TEXT, source TEXT NOT NULL, "
+            "tags TEXT, metadata TEXT, created_at TEXT DEFAULT CURRENT_TIMESTAMP)"
+        )
+        conn.execute(
+            "CREATE TABLE aggregated_metrics (id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT NOT NULL, "
+            "name TEXT NOT NULL, source TEXT NOT NULL, aggregation_level TEXT NOT NULL, "
+            "count INTEGER NOT NULL, min_value REAL NOT NULL, max_value REAL NOT NULL, "
+            "avg_value REAL NOT NULL, sum_value REAL NOT NULL, std_dev REAL, tags TEXT, "
+            "metadata TEXT, created_at TEXT DEFAULT CURRENT_TIMESTAMP)"
+        )
+        conn.executemany(
+            "INSERT INTO raw_metrics (timestamp, name, value, unit, type, source, tags) "
+            "VALUES (?, 'cpu_usage', ?, 'percent', 'gauge', 'system', '{\"host\": \"web-1\"}')",
+            [((start + timedelta(seconds=5 * i)).isoformat(), float(i)) for i in range(4)],
+        )
+        conn.execute(
+            "INSERT INTO aggregated_metrics (timestamp, name, source, aggregation_level, count, "
+            "min_value, max_value, avg_value, sum_value, std_dev) "
+            "VALUES (?, 'memory_usage', 'system', 'long', 2, 1.0, 3.0, 2.0, 4.0, ?)",
+            ((start - timedelta(days=1)).isoformat(), statistics.stdev([1.0, 3.0])),
+        )
+        conn.commit()
+        conn.close()
+
+        storage = TimeSeriesStorage(db_path)
+
+        raw = storage.query_raw_metrics(start, start + timedelta(minutes=1), metric_name="cpu_usage")
+        assert [metric["value"] for metric in raw] == [0.0, 1.0, 2.0, 3.0]
+        assert raw[0]["tags"] == {"host": "web-1"}
+        [hourly] = storage.query_aggregated_metrics(
+            start, start + timedelta(hours=1), AggregationLevel.LONG_TERM, metric_name="cpu_usage"
+        )
+        assert hourly.count == 4
+        [legacy] = storage.query_aggregated_metrics(
+            start - timedelta(days=1), start - timedelta(hours=23), AggregationLevel.LONG_TERM
+        )
+        assert (legacy.name, legacy.count, legacy.avg_value) == ("memory_usage", 2, 2.0)
+        assert legacy.std_dev == pytest.approx(statistics.stdev([1.0, 3.0]))
+        storage.close()
+
+        conn = sqlite3.connect(db_path)
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        assert not tables & {"raw_metrics", "aggregated_metrics"}
+        assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+        conn.close()
+
+
+class TestDataAggregator:
+    """Test buffered ingestion."""
+
+    def test_force_aggregation_flushes_buffer(self, tmp_path):
+        aggregator = DataAggregator(db_path=str(tmp_path / "metrics.db"))
+        start = datetime(2026, 1, 5, 10, 0)
+        aggregator.process_metrics(_metrics(start, 30, timedelta(seconds=5)))
+
+        assert aggregator.force_aggregation() == {"short": 3, "medium": 1, "long": 1}
+
+        stats = aggregator.get_aggregator_stats()
+        assert (stats["metrics_stored"], stats["buffer_size"]) == (30, 0)
+        aggregator.cleanup()
@@ -157,6 +157,65 @@ async def test_get_team_performance_trends(populated_db: AsyncSession):
     assert len(trends) == 3
 
 
+@pytest.mark.asyncio
+async def test_metrics_and_trends_count_findings_without_skewing_scores(populated_db: AsyncSession):
+    from sqlalchemy import select
+
+    from src.database import models
+
+    reports = (await populated_db.execute(select(models.AnalysisReport))).scalars().all()
+    most_recent = max(reports, key=lambda report: report.analysis_date)
+    for index in range(3):
+        populated_db.add(
+            models.Finding(
+                report_id=most_recent.id,
+                rule_id=f"rule_{index}",
+                risk="High",
+                personalized_tip="Add measurable goals",
+                problematic_text="Patient doing well",
+            )
+        )
+    await populated_db.commit()
+
+    metrics = await crud.get_organizational_metrics(populated_db, days_back=30)
+    trends = await crud.get_team_performance_trends(populated_db, days_back=21)
+
+    assert metrics["total_findings"] == 3
+    assert metrics["avg_compliance_score"] == pytest.approx(86.25)
+    assert [week["total_findings"] for week in trends] == [3, 0, 0]
+    assert [week["avg_compliance_score"] for week in trends] == pytest.approx([95.0, 85.0, 82.5])
+
+
+@pytest.mark.asyncio
+async def test_team_trends_bucket_whole_weeks(db_session: AsyncSession):
+    import datetime
+    from types import SimpleNamespace
+
+    from sqlalchemy.dialects import postgresql
+
+    from src.database import models
+
+    now = datetime.datetime.now(datetime.UTC).replace(tzinfo=None)
+    # 4 days old would round into week 2; 7.5 days old truncates into week 2
+    for days, score in ((4, 90.0), (6.9, 80.0), (7.5, 60.0)):
+        db_session.add(
+            models.AnalysisReport(
+                document_name="note.pdf",
+                compliance_score=score,
+                analysis_date=now - datetime.timedelta(days=days),
+                analysis_result={"discipline": "PT"},
+            )
+        )
+    await db_session.commit()
+
+    trends = await crud.get_team_performance_trends(db_session, days_back=14)
+    assert [week["avg_compliance_score"] for week in trends] == pytest.approx([85.0, 60.0])
+
+    postgres_session = SimpleNamespace(bind=SimpleNamespace(dialect=postgresql.dialect()))
+    expr = crud._report_week_index(postgres_session, datetime.datetime.now(datetime.UTC))
+    assert "floor(" in str(expr.compile(dialect=postgresql.dialect()))
+
+
 @pytest.mark.asyncio
 async def test_get_benchmark_data(populated_db: AsyncSession):
     benchmarks = await crud.get_benchmark_data(populated_db, min_analyses=3)
@@ -195,15 +254,129 @@ async def test_create_analysis_report(db_session: AsyncSession):
     ]
     report = await crud.create_analysis_report(db_session, report_data, findings_data)
     assert report.document_name == "Test Report"
+    assert report.analysis_result == {}
     assert len(report.findings) == 1
 
 
+@pytest.mark.asyncio
+async def test_findings_are_inserted_in_a_constant_number_of_statements(db_session: AsyncSession):
+    from sqlalchemy import event
+
+    statements = []
+    event.listen(
+        db_session.bind.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2])
+    )
+
+    def findings(count):
+        return [
+            schemas.FindingCreate(
+                rule_id=f"rule_{index}", risk="Medium", personalized_tip="Tip", problematic_text="Text"
+            )
+            for index in range(count)
+        ]
+
+    counts = []
+    for finding_count in (1, 20):
+        statements.clear()
+        report = await crud.create_analysis_report(
+            db_session,
+            schemas.ReportCreate(document_name="Note", compliance_score=80.0, analysis_result={}),
+            findings(finding_count),
+        )
+        counts.append(len(statements))
+        assert [finding.rule_id for finding in report.findings] == [f"rule_{i}" for i in range(finding_count)]
+
+    statements.clear()
+    created = await crud.bulk_create_findings(db_session, report.id, findings(5))
+
+    assert counts[0] == counts[1]
+    assert len(statements) <= 2
+    assert all(finding.id for finding in created)
+    assert created[0].problematic_text == "Text"
+
+
 @pytest.mark.asyncio
 async def test_get_reports(populated_db: AsyncSession):
     reports = await crud.get_reports(populated_db)
     assert len(reports) == 4
 
 
+@pytest.mark.asyncio
+async def test_report_cursor_pages_match_offset_pages(db_session: AsyncSession):
+    import datetime
+
+    from src.database import models
+
+    # Pairs of reports share an analysis_date, so the id breaks ties
+    day = datetime.datetime(2026, 1, 1)
+    db_session.add_all(
+        models.AnalysisReport(
+            document_name=f"note_{index}.pdf",
+            compliance_score=80.0,
+            analysis_date=day + datetime.timedelta(hours=index // 2),
+            analysis_result={"discipline": "PT"},
+        )
+        for index in range(7)
+    )
+    await db_session.commit()
+
+    expected = [row["id"] for row in await crud.get_report_summaries(db_session, limit=10)]
+    paged, cursor = [], None
+    while True:
+        page = await crud.get_report_summaries(db_session, limit=3, cursor=cursor)
+        paged.extend(row["id"] for row in page)
+        cursor = crud.next_report_cursor(page, 3)
+        if cursor is None:
+            break
+
+    assert paged == expected
+    first_page = await crud.get_reports(db_session, limit=3)
+    reports = await crud.get_reports(
+        db_session, limit=3, cursor=crud.next_report_cursor(first_page, 3)
+    )
+    assert [report.id for report in reports] == expected[3:6]
+    with pytest.raises(ValueError):
+        await crud.get_reports(db_session, cursor="not-a-cursor")
+
+    batches = [
+        batch async for batch in crud.iter_report_export_batches(db_session, batch_size=3)
+    ]
+    assert [len(batch) for batch in batches] == [3, 3, 1]
+    assert [row["id"] for batch in batches for row in batch] == expected[::-1]
+
+
+@pytest.mark.asyncio
+async def test_report_payloads_are_deferred_and_cached_per_version(populated_db: AsyncSession):
+    from sqlalchemy import select
+
+    from src.database import models
+    from src.database.encryption import report_payload_cache
+
+    summaries = await crud.get_report_summaries(populated_db, limit=2)
+    assert len(summaries) == 2
+    assert "analysis_result" not in summaries[0]
+    report_id = summaries[0]["id"]
+
+    populated_db.expunge_all()
+    report = (
+        await populated_db.execute(select(models.AnalysisReport).where(models.AnalysisReport.id == report_id))
+    ).scalar_one()
+    assert "analysis_result_encrypted" not in report.__dict__
+    assert (await crud.load_report_payload(populated_db, report))["discipline"] == "PT"
+
+    populated_db.expunge_all()
+    hits = report_payload_cache.hits
+    report = await crud.get_report(populated_db, report_id)
+    assert report.analysis_result["discipline"] == "PT"
+    assert report_payload_cache.hits == hits + 1
+
+    report.analysis_result = {"discipline": "OT"}
+    await populated_db.commit()
+    assert report.version == 2
+    populated_db.expunge_all()
+    assert (await crud.get_report(populated_db, report_id)).analysis_result == {"discipline": "OT"}
+
+
 @pytest.mark.asyncio
 async def test_get_findings_summary(populated_db: AsyncSession):
     summary = await crud.get_findings_summary(populated_db)
@@ -214,3 +387,47 @@ async def test_get_findings_summary(populated_db: AsyncSession):
 async def test_get_total_findings_count(populated_db: AsyncSession):
     count = await crud.get_total_findings_count(populated_db)
     assert count >= 0
+
+
+@pytest.mark.asyncio
+async def test_cleanup_old_data_purges_in_batches_and_evicts_caches(db_session: AsyncSession):
+    import datetime
+
+    import numpy as np
+    from sqlalchemy import func, select
+
+    from src.core.vector_store import get_vector_store
+    from src.database import models
+    from src.database.encryption import report_payload_cache
+
+    now = datetime.datetime.now(datetime.UTC)
+    reports = [
+        models.AnalysisReport(
+            document_name=f"note_{age}.pdf",
+            compliance_score=80.0,
+            analysis_date=now - datetime.timedelta(days=age),
+            analysis_result={"discipline": "PT"},
+            findings=[models.Finding(rule_id="rule", risk="Low", personalized_tip="tip", problematic_text="text")],
+        )
+        for age in (400, 390, 380, 370, 366, 10)
+    ]
+    db_session.add_all(reports)
+    await db_session.commit()
+    ids = [report.id for report in reports]
+
+    vector_store = get_vector_store()
+    vector_store.initialize_index()
+    vector_store.add_vectors(np.ones((len(ids), vector_store.embedding_dim), dtype=np.float32), ids)
+    for report in reports:
+        report_payload_cache.decrypt((report.id, report.version), report.analysis_result_encrypted)
+
+    counts = await crud.cleanup_old_data(db_session, days_to_keep=365, dry_run=False, batch_size=2, pause_seconds=0)
+
+    assert (counts["reports"], counts["findings"], counts["snapshots"]) == (5, 5, 0)
+    assert counts["rows_per_second"] > 0
+    assert (await db_session.scalars(select(models.AnalysisReport.id))).all() == [ids[-1]]
+    assert await db_session.scalar(select(func.count(models.Finding.id))) == 1
+    assert not set(ids[:-1]) & set(vector_store.report_ids)
+    assert ids[-1] in vector_store.report_ids
+    assert report_payload_cache.discard_rows(ids) == 1
+    vector_store.remove_ids(ids)
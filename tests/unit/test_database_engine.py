@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from sqlalchemy import select, text
+
+from src.config import DatabaseSettings
+from src.database import crud, models
+from src.database.database import (
+    Base,
+    _create_missing_indexes,
+    _postgres_engine_args,
+    build_engine_profile,
+    make_session_factory,
+)
+
+
+@pytest.fixture
+async def file_profile(tmp_path):
+    url = f"sqlite+aiosqlite:///{tmp_path / 'profile.db'}"
+    profile = build_engine_profile(url, DatabaseSettings(url=url, read_pool_size=2))
+    async with profile.writer.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield profile
+    await profile.dispose()
+
+
+def test_memory_sqlite_shares_one_engine():
+    url = "sqlite+aiosqlite:///:memory:"
+    profile = build_engine_profile(url, DatabaseSettings(url=url))
+
+    assert not profile.split
+
+
+def test_postgres_profile_sizes_pool_and_caches_statements():
+    args = _postgres_engine_args(
+        DatabaseSettings(url="postgresql+asyncpg://db/app", pool_size=15, statement_cache_size=250)
+    )
+
+    assert args["pool_size"] == 15
+    assert args["connect_args"]["prepared_statement_cache_size"] == 250
+
+
+@pytest.mark.asyncio
+async def test_reads_do_not_wait_for_open_write_transaction(file_profile):
+    session_factory = make_session_factory(file_profile)
+    async with session_factory() as session:
+        session.add(models.User(username="reader", hashed_password="x"))
+        await session.commit()
+
+    async with session_factory() as writer:
+        await writer.execute(text("UPDATE users SET username = 'renamed'"))
+
+        async with session_factory() as reader:
+            names = await asyncio.wait_for(reader.scalars(select(models.User.username)), timeout=2)
+            assert names.all() == ["reader"]
+
+        # Reads after a write stay on the writer and see its changes
+        assert (await writer.scalars(select(models.User.username))).all() == ["renamed"]
+        await writer.commit()
+
+    async with session_factory() as session:
+        assert (await session.scalars(select(models.User.username))).all() == ["renamed"]
+
+
+@pytest.mark.asyncio
+async def test_bind_lookups_do_not_pin_reads_to_the_writer(file_profile):
+    async with make_session_factory(file_profile)() as session:
+        assert crud._dialect_name(session) == "sqlite"
+        session.sync_session.get_bind()
+        bind = session.sync_session.get_bind(clause=select(models.User))
+        assert bind is file_profile.reader.sync_engine
+
+        await session.connection()
+        bind = session.sync_session.get_bind(clause=select(models.User))
+        assert bind is file_profile.writer.sync_engine
+
+
+@pytest.mark.asyncio
+async def test_read_connections_reject_writes(file_profile):
+    async with file_profile.reader.connect() as conn:
+        with pytest.raises(Exception, match="readonly"):
+            await conn.execute(text("DELETE FROM users"))
+
+
+async def test_missing_indexes_are_added_to_existing_tables(file_profile):
+    async with file_profile.writer.begin() as conn:
+        await conn.execute(text("DROP INDEX ix_reports_discipline_date_score"))
+        await conn.run_sync(_create_missing_indexes)
+        indexes = (await conn.execute(text("PRAGMA index_list(reports)"))).all()
+
+    assert "ix_reports_discipline_date_score" in {row[1] for row in indexes}
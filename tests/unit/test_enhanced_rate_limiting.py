@@ -0,0 +1,97 @@
+from types import SimpleNamespace
+
+import pytest
+
+from src.api.middleware.enhanced_rate_limiting import (
+    EnhancedRateLimiter,
+    MemoryRateLimitStore,
+    RateLimit,
+    SQLiteRateLimitStore,
+    slide_window,
+)
+
+
+def _request(path="/analysis/analyze", ip="10.0.0.1"):
+    return SimpleNamespace(
+        client=SimpleNamespace(host=ip),
+        state=SimpleNamespace(),
+        url=SimpleNamespace(path=path),
+        route=None,
+    )
+
+
+def test_previous_window_is_weighted_by_overlap():
+    counter, estimate = slide_window((0.0, 10, 0), 60, 60.0 + 15)
+
+    assert counter == (60.0, 0, 10)
+    assert estimate == pytest.approx(7.5)
+
+    counter, estimate = slide_window((0.0, 10, 4), 60, 200.0)
+    assert counter == (180.0, 0, 0)
+    assert estimate == 0
+
+
+def test_burst_limit_rejects_and_reports_headers():
+    limiter = EnhancedRateLimiter(store=MemoryRateLimitStore())
+    limit = limiter.endpoint_limits["/analysis/analyze"]
+
+    results = [limiter.is_rate_limited(_request()) for _ in range(limit.burst_limit + 1)]
+
+    assert not any(limited for limited, _, _ in results[:-1])
+    limited, reason, headers = results[-1]
+    assert limited and reason.startswith("Burst limit exceeded")
+    assert results[0][2]["X-RateLimit-Remaining-Minute"] == limit.requests_per_minute - 1
+    assert not limiter.is_rate_limited(_request(ip="10.0.0.2"))[0]
+
+
+def test_idle_clients_are_evicted():
+    store = MemoryRateLimitStore(shards=4)
+    windows = RateLimit(requests_per_minute=5, requests_per_hour=50).windows()
+    for client in range(100):
+        store.hit(f"ip:{client}", windows, now=1000.0)
+    assert len(store) == 100
+
+    store.evict_idle(now=1000.0 + 2 * 3600)
+
+    assert len(store) == 0
+
+
+def test_sqlite_store_shares_limits_between_workers(tmp_path):
+    db_path = tmp_path / "rate_limits.db"
+    workers = [EnhancedRateLimiter(store=SQLiteRateLimitStore(db_path)) for _ in range(2)]
+    limit = workers[0].endpoint_limits["/auth/register"]
+
+    decisions = [
+        workers[i % 2].is_rate_limited(_request("/auth/register"))[0]
+        for i in range(limit.burst_limit + 1)
+    ]
+
+    assert decisions == [False] * limit.burst_limit + [True]
+
+
+def test_store_requires_hit():
+    from src.api.middleware.enhanced_rate_limiting import RateLimitStore
+
+    with pytest.raises(TypeError):
+        RateLimitStore()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_store_checks_off_the_event_loop(tmp_path, monkeypatch):
+    import threading
+
+    store = SQLiteRateLimitStore(tmp_path / "rate_limits.db")
+    limiter = EnhancedRateLimiter(store=store)
+    loop_thread = threading.get_ident()
+    threads = []
+    hit = store.hit
+
+    def tracking_hit(*args):
+        threads.append(threading.get_ident())
+        return hit(*args)
+
+    monkeypatch.setattr(store, "hit", tracking_hit)
+    limited, _, headers = await limiter.is_rate_limited_async(_request())
+
+    assert not limited and headers
+    assert threads and loop_thread not in threads
@@ -0,0 +1,94 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from src.api.event_bus import ProgressEventBus, progress_event
+from src.api.routers import websocket as websocket_routes
+
+
+@pytest.mark.asyncio
+async def test_late_subscriber_receives_last_event():
+    bus = ProgressEventBus()
+    bus.publish("analysis_1", progress_event("1", 10, "Parsing"))
+    bus.publish("analysis_1", progress_event("1", 40, "Retrieving rules"))
+
+    with bus.subscribe("analysis_1") as subscription:
+        event = await subscription.get(timeout=1)
+
+    assert event["current"] == 40
+    assert bus.subscriber_count() == 0
+
+
+@pytest.mark.asyncio
+async def test_events_are_scoped_to_their_channel():
+    bus = ProgressEventBus()
+    first = bus.subscribe("analysis_1", replay=False)
+    second = bus.subscribe("analysis_2", replay=False)
+
+    assert bus.publish("analysis_1", progress_event("1", 50, "Half")) == 1
+
+    assert (await first.get(timeout=1))["task_id"] == "1"
+    assert await second.get(timeout=0.05) is None
+
+
+@pytest.mark.asyncio
+async def test_iteration_stops_after_terminal_event():
+    bus = ProgressEventBus()
+    subscription = bus.subscribe("analysis_1")
+
+    def worker():
+        bus.publish("analysis_1", progress_event("1", 60, "Scoring"))
+        bus.publish("analysis_1", progress_event("1", 100, "Done", event_type="complete"))
+
+    threading.Thread(target=worker).start()
+    received = [event["type"] async for event in subscription]
+
+    assert received == ["progress", "complete"]
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_keeps_latest_events():
+    bus = ProgressEventBus(subscriber_buffer=2)
+    subscription = bus.subscribe("analysis_1")
+    for pct in (10, 20, 30):
+        bus.publish("analysis_1", progress_event("1", pct, None))
+
+    assert [(await subscription.get())["current"] for _ in range(2)] == [20, 30]
+    assert subscription.dropped == 1
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def accept(self):
+        pass
+
+    async def send_json(self, message):
+        self.sent.append(message)
+
+
+@pytest.mark.asyncio
+async def test_connection_manager_forwards_bus_events(monkeypatch):
+    bus = ProgressEventBus()
+    monkeypatch.setattr(websocket_routes, "progress_events", bus)
+    manager = websocket_routes.ConnectionManager()
+    user = SimpleNamespace(id=1, username="clinician")
+    bus.publish("analysis_7", progress_event("7", 30, "Extracting entities"))
+
+    early, late = FakeWebSocket(), FakeWebSocket()
+    await manager.connect(early, "analysis_7", user)
+    await asyncio.sleep(0.01)
+    bus.publish("analysis_7", progress_event("7", 70, "Generating report"))
+    await asyncio.sleep(0.01)
+    await manager.connect(late, "analysis_7", user)
+
+    assert [m["current"] for m in early.sent] == [30, 70]
+    assert [m["current"] for m in late.sent] == [70]
+
+    manager.disconnect(early, "analysis_7")
+    manager.disconnect(late, "analysis_7")
+    await asyncio.sleep(0.01)
+    assert bus.subscriber_count() == 0
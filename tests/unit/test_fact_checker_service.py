@@ -0,0 +1,88 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.core.cache_service import FactCheckCache
+from src.core.fact_checker_service import FactCheckerService
+
+
+@pytest.fixture(autouse=True)
+def clear_fact_check_cache():
+    FactCheckCache.clear()
+    yield
+    FactCheckCache.clear()
+
+
+@pytest.fixture
+def pipeline_checker() -> FactCheckerService:
+    service = FactCheckerService(backend="pipeline")
+    service.classifier = MagicMock(
+        side_effect=lambda prompts, **kwargs: [
+            {"generated_text": "yes" if "gait" in prompt else "no"} for prompt in prompts
+        ]
+    )
+    return service
+
+
+def test_select_premise_window_keeps_relevant_sentences():
+    premise = " ".join(
+        ["Patient ambulated 150 feet with a rolling walker."]
+        + ["Vitals were stable during the session."] * 60
+        + ["Goals for gait speed were reviewed with the patient."]
+    )
+
+    window = FactCheckerService.select_premise_window(premise, "Gait goals not reviewed")
+
+    assert "Goals for gait speed were reviewed" in window
+    assert len(window) < len(premise)
+
+
+def test_batch_sends_all_pairs_in_one_pipeline_call(pipeline_checker):
+    verdicts = pipeline_checker.check_consistency_batch(
+        [("Gait training done.", "gait"), ("Balance training done.", "balance"), ("Notes.", "x")]
+    )
+
+    assert verdicts == [True, False, False]
+    assert pipeline_checker.classifier.call_count == 1
+    assert pipeline_checker.classifier.call_args.kwargs["batch_size"] == 3
+
+
+def test_batch_reuses_cached_verdicts(pipeline_checker):
+    pairs = [("Gait training done.", "gait"), ("Balance training done.", "balance")]
+    pipeline_checker.check_consistency_batch(pairs)
+    pipeline_checker.check_consistency_batch(pairs + [pairs[0]])
+
+    assert pipeline_checker.classifier.call_count == 1
+
+
+def test_llm_backend_parses_numbered_answers():
+    llm = MagicMock()
+    llm.is_ready.return_value = True
+    llm.generate.return_value = "1: YES\n2: NO"
+    service = FactCheckerService(llm_service=llm, backend="llm")
+
+    verdicts = service.check_consistency_batch([("a b c", "first"), ("d e f", "second")])
+
+    assert verdicts == [True, False]
+    assert llm.generate.call_count == 1
+
+
+def test_llm_backend_rechecks_unparsed_pairs_individually():
+    llm = MagicMock()
+    llm.is_ready.return_value = True
+    llm.generate.side_effect = ["1: YES", "NO"]
+    service = FactCheckerService(llm_service=llm, backend="llm")
+
+    verdicts = service.check_consistency_batch([("a b c", "first"), ("d e f", "second")])
+
+    assert verdicts == [True, False]
+    assert llm.generate.call_count == 2
+
+
+def test_batch_fails_open_when_backend_unavailable():
+    llm = MagicMock()
+    llm.is_ready.return_value = False
+    service = FactCheckerService(llm_service=llm, backend="llm")
+
+    assert service.check_consistency_batch([("premise", "hypothesis")]) == [True]
+    llm.generate.assert_not_called()
@@ -0,0 +1,105 @@
+import gc
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.core.hybrid_retriever import HybridRetriever, warm_retriever_models
+from src.core.model_registry import FAILED, READY, ModelRegistry, model_registry
+
+
+class FakeModel:
+    loads = 0
+
+    def __init__(self, name, device=None):
+        type(self).loads += 1
+        self.name = name
+        self.device = device
+        time.sleep(0.05)
+
+
+@pytest.fixture(autouse=True)
+def reset_loads():
+    FakeModel.loads = 0
+
+
+def test_concurrent_acquires_load_once_and_unload_after_last_release():
+    registry = ModelRegistry()
+    models = []
+    threads = [
+        threading.Thread(target=lambda: models.append(registry.acquire(FakeModel, "mini", device="cpu")))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert FakeModel.loads == 1
+    assert len({id(model) for model in models}) == 1
+    assert registry.status()[0]["references"] == 4
+
+    for _ in range(4):
+        registry.release(FakeModel, "mini", device="cpu")
+    assert registry.status() == []
+
+
+def test_warm_reports_readiness_and_stays_resident():
+    registry = ModelRegistry()
+
+    thread = registry.warm(FakeModel, "mini")
+    assert registry.warm(FakeModel, "mini") is None
+    thread.join()
+
+    assert registry.is_ready()
+    assert registry.status()[0]["state"] == READY
+    registry.acquire(FakeModel, "mini")
+    registry.release(FakeModel, "mini")
+    assert FakeModel.loads == 1
+    assert len(registry.status()) == 1
+
+
+def test_failed_loads_are_reported_and_retried():
+    registry = ModelRegistry()
+    loader = MagicMock(side_effect=[OSError("offline"), "model"])
+    loader.__name__ = "Loader"
+
+    registry.warm(loader, "mini").join()
+    assert registry.status()[0]["state"] == FAILED
+
+    assert registry.acquire(loader, "mini") == "model"
+
+
+def test_retrievers_share_one_dense_model():
+    rules = [{"name": "Goals", "content": "Document measurable goals."}]
+    registered = len(model_registry.status())
+    with patch("src.core.hybrid_retriever.SentenceTransformer") as sentence_transformer:
+        first = HybridRetriever(rules=rules)
+        second = HybridRetriever(rules=rules)
+
+        assert first.dense_retriever is second.dense_retriever
+        assert sentence_transformer.call_count == 1
+        assert len(model_registry.status()) == registered + 1
+
+        del first, second
+        gc.collect()
+        assert len(model_registry.status()) == registered
+
+
+def test_startup_warm_is_shared_by_the_retriever():
+    registry = ModelRegistry()
+    rules = [{"name": "Goals", "content": "Document measurable goals."}]
+    with patch("src.core.hybrid_retriever.model_registry", registry), patch(
+        "src.core.hybrid_retriever.SentenceTransformer"
+    ) as sentence_transformer:
+        threads = warm_retriever_models()
+        assert warm_retriever_models() == []
+        for thread in threads:
+            thread.join()
+
+        retriever = HybridRetriever(rules=rules)
+
+        assert retriever.dense_retriever is sentence_transformer.return_value
+        assert sentence_transformer.call_count == 1
+        assert [entry["pinned"] for entry in registry.status()] == [True]
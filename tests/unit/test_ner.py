@@ -204,6 +204,115 @@ class TestNERIntegration:
         assert isinstance(entities, list)
 
 
+class _FakeBatchPipeline:
+    """Token-classification pipeline double that records batched calls."""
+
+    def __init__(self, keyword, label, score=0.9):
+        self.keyword = keyword
+        self.label = label
+        self.score = score
+        self.calls = []
+
+    def __call__(self, inputs, batch_size=None):
+        self.calls.append((list(inputs), batch_size))
+        outputs = []
+        for text in inputs:
+            entities = []
+            start = text.find(self.keyword)
+            while start != -1:
+                entities.append(
+                    {
+                        "entity_group": self.label,
+                        "word": self.keyword,
+                        "start": start,
+                        "end": start + len(self.keyword),
+                        "score": self.score,
+                    }
+                )
+                start = text.find(self.keyword, start + 1)
+            outputs.append(entities)
+        return outputs
+
+
+class TestBatchedNER:
+    """Tests for batched, windowed inference across the ensemble."""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        from src.core.cache_service import NERCache
+
+        NERCache.clear()
+        yield
+        NERCache.clear()
+
+    @pytest.fixture
+    def analyzer(self):
+        analyzer = NERAnalyzer([])
+        analyzer.model_names = ["fake-a", "fake-b"]
+        analyzer.pipelines = [
+            _FakeBatchPipeline("knee", "ANATOMY"),
+            _FakeBatchPipeline("ibuprofen", "DRUG"),
+        ]
+        yield analyzer
+        analyzer.shutdown()
+
+    def test_batch_runs_each_model_once(self, analyzer):
+        texts = ["Patient has knee pain.", "Takes ibuprofen daily for knee."]
+        results = analyzer.extract_entities_batch(texts)
+
+        assert [e["word"] for e in results[0]] == ["knee"]
+        assert [e["word"] for e in results[1]] == ["ibuprofen", "knee"]
+        for pipe in analyzer.pipelines:
+            assert len(pipe.calls) == 1
+            assert pipe.calls[0][0] == texts
+
+    def test_batch_uses_cache_and_dedupes_inputs(self, analyzer):
+        analyzer.extract_entities("Patient has knee pain.")
+        results = analyzer.extract_entities_batch(
+            ["Patient has knee pain.", "knee again", "knee again", ""]
+        )
+
+        assert results[1] == results[2]
+        assert results[3] == []
+        for pipe in analyzer.pipelines:
+            assert pipe.calls[-1][0] == ["knee again"]
+
+    def test_sliding_windows_map_offsets_back(self, analyzer):
+        text = ("filler " * 600) + "knee " + ("filler " * 600) + "knee"
+        with patch.object(
+            analyzer,
+            "_performance_settings",
+            return_value={"ner_window_chars": 500, "ner_window_overlap": 50},
+        ):
+            entities = analyzer.extract_entities(text)
+
+        assert len(analyzer.pipelines[0].calls[0][0]) > 1
+        assert [e["word"] for e in entities] == ["knee", "knee"]
+        for entity in entities:
+            assert text[entity["start"] : entity["end"]] == "knee"
+
+    def test_split_into_windows_covers_text(self):
+        text = " ".join(f"word{i}" for i in range(500))
+        windows = NERAnalyzer._split_into_windows(text, 200, 40)
+
+        assert windows[0][0] == 0
+        assert windows[-1][0] + len(windows[-1][1]) == len(text)
+        for (offset, window), (next_offset, _) in zip(windows, windows[1:]):
+            assert text[offset : offset + len(window)] == window
+            assert next_offset < offset + len(window)
+
+    def test_entities_without_offsets_are_skipped(self, analyzer):
+        analyzer.pipelines = [
+            Mock(return_value=[[{"entity_group": "DRUG", "word": "aspirin", "score": 0.9, "start": None, "end": None}]])
+        ]
+        assert analyzer.extract_entities("Takes aspirin.") == []
+
+    def test_failed_model_does_not_drop_others(self, analyzer):
+        analyzer.pipelines[0] = Mock(side_effect=RuntimeError("boom"))
+        entities = analyzer.extract_entities("Takes ibuprofen.")
+        assert [e["word"] for e in entities] == ["ibuprofen"]
+
+
 @pytest.mark.slow
 class TestNERWithRealModels:
     """Tests that require actual model loading (marked as slow)."""
@@ -0,0 +1,165 @@
+import sqlite3
+
+import pytest
+
+from src.core.persistent_task_registry import PersistentTaskRegistry, TaskStatus
+
+
+@pytest.fixture
+async def registry(tmp_path):
+    registry = PersistentTaskRegistry(db_path=str(tmp_path / "tasks.db"), flush_interval=60)
+    yield registry
+    await registry.close()
+
+
+def _stored_row(registry, task_id):
+    with sqlite3.connect(registry.db_path) as conn:
+        return conn.execute(
+            "SELECT status, progress, status_message FROM tasks WHERE task_id = ?",
+            (task_id,),
+        ).fetchone()
+
+
+@pytest.mark.asyncio
+async def test_progress_updates_are_coalesced_into_one_flush(registry):
+    await registry.create_task("t1", status=TaskStatus.PENDING)
+    await registry.create_task("t2", status=TaskStatus.PENDING)
+
+    for pct in range(0, 100, 5):
+        registry.record_progress("t1", status=TaskStatus.RUNNING, progress=pct, status_message=f"{pct}%")
+        registry.record_progress("t2", status=TaskStatus.RUNNING, progress=pct, status_message=f"{pct}%")
+    await registry.flush()
+
+    assert _stored_row(registry, "t1") == ("running", 95, "95%")
+    assert _stored_row(registry, "t2") == ("running", 95, "95%")
+    assert registry._progress.rows_written == 2
+    assert registry._progress.flush_count == 1
+
+
+@pytest.mark.asyncio
+async def test_get_task_reflects_unflushed_progress(registry):
+    await registry.create_task("t1", status=TaskStatus.PENDING)
+    registry.record_progress("t1", status=TaskStatus.RUNNING, progress=40, status_message="Retrieving rules")
+
+    task = await registry.get_task("t1")
+
+    assert task.status == TaskStatus.RUNNING
+    assert task.progress == 40
+    assert _stored_row(registry, "t1")[1] == 0
+
+
+@pytest.mark.asyncio
+async def test_terminal_update_is_durable_and_not_overwritten(registry):
+    await registry.create_task("t1", status=TaskStatus.PENDING)
+    registry.record_progress("t1", status=TaskStatus.RUNNING, progress=90, status_message="Almost")
+
+    assert await registry.update_task("t1", status=TaskStatus.COMPLETED, progress=100, result_data={"ok": True})
+    assert _stored_row(registry, "t1") == ("completed", 100, "Almost")
+
+    await registry.flush()
+    assert _stored_row(registry, "t1")[0] == "completed"
+
+
+@pytest.mark.asyncio
+async def test_record_progress_rejects_terminal_status(registry):
+    with pytest.raises(ValueError):
+        registry.record_progress("t1", status=TaskStatus.FAILED)
+
+
+@pytest.mark.asyncio
+async def test_update_task_reports_missing_task(registry):
+    assert await registry.update_task("missing", progress=10) is False
+
+
+@pytest.mark.asyncio
+async def test_dead_writer_fails_waiting_updates_and_restarts(registry):
+    await registry.create_task("t1", status=TaskStatus.PENDING)
+    sink = registry._progress
+    flush_once = sink._flush_once
+
+    def crash(conn):
+        sink._flush_once = flush_once
+        with sink._lock:
+            sink._inflight = [future for _, _, future in sink._direct]
+            sink._direct = []
+        raise RuntimeError("writer crashed")
+
+    sink._flush_once = crash
+
+    assert await registry.update_task("t1", progress=10) is False
+    assert await registry.update_task("t1", progress=20) is True
+    assert _stored_row(registry, "t1")[1] == 20
+
+
+@pytest.mark.asyncio
+async def test_claim_next_job_leases_each_job_once(registry):
+    await registry.enqueue_job("job-1", payload={"spool_path": "a"})
+    await registry.enqueue_job("job-2", payload={"spool_path": "b"})
+    await registry.create_task("inline", status=TaskStatus.PENDING)
+
+    first = await registry.claim_next_job("w1", lease_seconds=30)
+    second = await registry.claim_next_job("w2", lease_seconds=30)
+
+    assert {first.task_id, second.task_id} == {"job-1", "job-2"}
+    assert first.lease_owner == "w1"
+    assert first.payload["spool_path"] in {"a", "b"}
+    assert await registry.claim_next_job("w3") is None
+
+
+@pytest.mark.asyncio
+async def test_renew_lease_only_for_owner(registry):
+    await registry.enqueue_job("job-1", payload={})
+    await registry.claim_next_job("w1")
+
+    assert await registry.renew_lease("job-1", "w1") is True
+    assert await registry.renew_lease("job-1", "w2") is False
+
+
+@pytest.mark.asyncio
+async def test_expired_leases_are_requeued_then_failed(registry):
+    await registry.enqueue_job("job-1", payload={}, max_retries=1)
+
+    await registry.claim_next_job("w1", lease_seconds=-1)
+    assert await registry.requeue_expired_leases() == 1
+    task = await registry.get_task("job-1")
+    assert task.status == TaskStatus.RETRYING
+    assert task.retry_count == 1
+    assert task.lease_owner is None
+
+    await registry.claim_next_job("w2", lease_seconds=-1)
+    assert await registry.requeue_expired_leases() == 1
+    task = await registry.get_task("job-1")
+    assert task.status == TaskStatus.FAILED
+    assert await registry.claim_next_job("w3") is None
+
+
+@pytest.mark.asyncio
+async def test_progress_from_a_worker_that_lost_its_lease_is_dropped(registry):
+    await registry.enqueue_job("job-1", payload={})
+    await registry.claim_next_job("w1", lease_seconds=-1)
+    assert await registry.requeue_expired_leases() == 1
+
+    registry.record_progress("job-1", worker_id="w1", status=TaskStatus.RUNNING, progress=50)
+    await registry.flush()
+    assert _stored_row(registry, "job-1")[:2] == ("retrying", 0)
+
+    await registry.claim_next_job("w2", lease_seconds=30)
+    registry.record_progress("job-1", worker_id="w2", status=TaskStatus.RUNNING, progress=60)
+    await registry.flush()
+    assert _stored_row(registry, "job-1")[:2] == ("running", 60)
+
+
+@pytest.mark.asyncio
+async def test_update_guarded_by_lease_only_applies_for_owner(registry):
+    await registry.enqueue_job("job-1", payload={})
+    await registry.claim_next_job("w2", lease_seconds=30)
+
+    assert await registry.update_task(
+        "job-1", expected_lease_owner="w1", status=TaskStatus.COMPLETED, lease_owner=None
+    ) is False
+    assert _stored_row(registry, "job-1")[0] == "running"
+
+    assert await registry.update_task(
+        "job-1", expected_lease_owner="w2", status=TaskStatus.COMPLETED, lease_owner=None
+    ) is True
+    assert _stored_row(registry, "job-1")[0] == "completed"
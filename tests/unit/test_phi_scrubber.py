@@ -57,3 +57,63 @@ def test_scrub_logs_and_returns_original_when_wrapper_errors(mocker):
     )
     service = PhiScrubberService(wrapper=faulty_wrapper)
     assert service.scrub("Patient John Doe") == "Patient John Doe"
+
+
+def test_scrub_many_batches_documents():
+    wrapper = DummyWrapper(["John Doe"])
+    service = PhiScrubberService(replacement="[REDACTED]", wrapper=wrapper)
+
+    scrubbed = service.scrub_many(["Seen by John Doe.", None, "No identifiers here."])
+
+    assert scrubbed == ["Seen by [REDACTED].", None, "No identifiers here."]
+    assert len(wrapper.anonymize_calls) == 2
+
+
+def test_long_text_is_segmented_and_boundary_entities_are_masked():
+    wrapper = DummyWrapper(["John Doe"])
+    service = PhiScrubberService(
+        replacement="[REDACTED]", wrapper=wrapper, segment_chars=60, segment_overlap=20
+    )
+    text = "Patient tolerated exercise well. " * 3 + "Called John Doe today. " + "Gait improved. " * 3
+
+    scrubbed = service.scrub(text)
+
+    assert len(wrapper.analyze_calls) > 1
+    assert "John Doe" not in scrubbed
+    assert scrubbed.count("[REDACTED]") == 1
+    assert scrubbed.replace("[REDACTED]", "John Doe") == text
+
+
+@pytest.mark.parametrize("segment_chars", range(30, 50))
+def test_entities_crossing_hard_cuts_are_masked(segment_chars):
+    wrapper = DummyWrapper(["John Doe"])
+    service = PhiScrubberService(
+        wrapper=wrapper, segment_chars=segment_chars, segment_overlap=15
+    )
+    text = "gait " * 8 + "John Doe " + "gait " * 8
+
+    assert service.scrub(text) == text.replace("John Doe", "<PHI>")
+
+
+def test_split_segments_cover_text_with_overlap():
+    service = PhiScrubberService(wrapper=DummyWrapper([]), segment_chars=50, segment_overlap=10)
+    text = " ".join(f"Sentence number {i} is here." for i in range(20))
+
+    segments = service._split_segments(text)
+
+    assert segments[0][0] == 0
+    assert segments[-1][0] + len(segments[-1][1]) == len(text)
+    for (offset, segment), (next_offset, _) in zip(segments, segments[1:]):
+        assert text[offset : offset + len(segment)] == segment
+        assert next_offset <= offset + len(segment)
+
+
+def test_regex_prefilter_skips_segments_without_candidates():
+    wrapper = DummyWrapper(["John Doe"])
+    service = PhiScrubberService(wrapper=wrapper, regex_prefilter=True)
+
+    assert service.scrub_many(["Gait improved with cues.", "Seen by John Doe."]) == [
+        "Gait improved with cues.",
+        "Seen by <PHI>.",
+    ]
+    assert wrapper.analyze_calls == ["Seen by John Doe."]
@@ -0,0 +1,131 @@
+import pytest
+
+from src import auth
+from src.core.principal_cache import PrincipalCache, principal_cache
+from src.database import crud, models
+
+
+@pytest.fixture(autouse=True)
+def clean_principal_cache():
+    principal_cache.clear()
+    yield
+    principal_cache.clear()
+
+
+@pytest.fixture
+async def clinician(db_session):
+    user = models.User(
+        username="cached_clinician",
+        hashed_password="hash",
+        is_active=True,
+        preferences={"theme": "dark"},
+    )
+    db_session.add(user)
+    await db_session.commit()
+    return user
+
+
+@pytest.fixture
+def counted_lookups(monkeypatch):
+    calls = []
+    original = crud.get_user_by_username
+
+    async def counting(db, username):
+        calls.append(username)
+        return await original(db, username=username)
+
+    monkeypatch.setattr(crud, "get_user_by_username", counting)
+    return calls
+
+
+def _token(username):
+    return auth.get_auth_service().create_access_token({"sub": username})
+
+
+@pytest.mark.asyncio
+async def test_repeated_requests_skip_the_user_query(async_session_factory, clinician, counted_lookups):
+    token = _token(clinician.username)
+    service = auth.get_auth_service()
+
+    for _ in range(3):
+        async with async_session_factory() as session:
+            user = await auth.get_current_user(token, session, service)
+            assert user.id == clinician.id
+            assert user.preferences == {"theme": "dark"}
+
+    assert counted_lookups == [clinician.username]
+
+
+@pytest.mark.asyncio
+async def test_password_change_and_deactivation_invalidate(async_session_factory, clinician, counted_lookups):
+    token = _token(clinician.username)
+    service = auth.get_auth_service()
+
+    async with async_session_factory() as session:
+        user = await auth.get_current_user(token, session, service)
+        await crud.change_user_password(session, user, "new-hash")
+
+    async with async_session_factory() as session:
+        user = await auth.get_current_user(token, session, service)
+        assert user.hashed_password == "new-hash"
+        user.is_active = False
+        await session.commit()
+
+    async with async_session_factory() as session:
+        user = await auth.get_current_user(token, session, service)
+        assert not user.is_active
+
+    assert len(counted_lookups) == 3
+
+
+def test_entries_expire_and_are_bounded(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("src.core.principal_cache.time.monotonic", lambda: now[0])
+    cache = PrincipalCache(ttl_seconds=10, max_entries=2)
+    user = models.User(
+        id=1,
+        username="a",
+        hashed_password="x",
+        is_active=True,
+        is_admin=False,
+        license_key=None,
+        created_at=None,
+        updated_at=None,
+        preferences={},
+    )
+    for issued_at in (1, 2, 3):
+        cache.put("a", issued_at, user)
+
+    assert len(cache) == 2
+    assert cache.get("a", 1) is None
+    assert cache.get("a", 3)["id"] == 1
+
+    now[0] += 11
+    assert cache.get("a", 3) is None
+    assert cache.invalidate_user(user_id=1) == 1
+
+
+@pytest.mark.asyncio
+async def test_principal_cached_between_flush_and_commit_is_invalidated(
+    async_session_factory, clinician, counted_lookups
+):
+    token = _token(clinician.username)
+    service = auth.get_auth_service()
+
+    async with async_session_factory() as writer:
+        user = await crud.get_user_by_username(writer, username=clinician.username)
+        user.is_active = False
+        await writer.flush()
+
+        # A concurrent request still reads the committed row and caches it
+        async with async_session_factory() as reader:
+            cached = await auth.get_current_user(token, reader, service)
+            assert cached.is_active
+
+        await writer.commit()
+
+    async with async_session_factory() as session:
+        user = await auth.get_current_user(token, session, service)
+        assert not user.is_active
+
+    assert len(counted_lookups) == 3
@@ -0,0 +1,100 @@
+import logging
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.responses import JSONResponse
+
+from src.api.middleware.request_pipeline import (
+    CorrelationIdStage,
+    PipelineStage,
+    RequestIdStage,
+    RequestLoggingStage,
+    RequestPipelineMiddleware,
+    SecurityHeadersStage,
+    ThreatScreeningStage,
+)
+
+
+class RecordingStage(PipelineStage):
+    def __init__(self, name, events):
+        self.name = name
+        self.events = events
+
+    async def on_request(self, ctx):
+        self.events.append(f"{self.name}:request")
+
+    def on_response(self, ctx, headers):
+        self.events.append(f"{self.name}:response")
+
+
+class BlockingStage(PipelineStage):
+    async def on_request(self, ctx):
+        return JSONResponse({"detail": "blocked"}, status_code=429)
+
+
+def _client(stages):
+    app = FastAPI()
+
+    @app.get("/ok")
+    async def ok():
+        return {"status": "ok"}
+
+    @app.get("/boom")
+    async def boom():
+        raise RuntimeError("boom")
+
+    app.add_middleware(RequestPipelineMiddleware, stages=stages)
+    return TestClient(app, raise_server_exceptions=False)
+
+
+def test_stages_wrap_the_endpoint_in_order():
+    events = []
+    client = _client([RecordingStage("outer", events), RecordingStage("inner", events)])
+
+    assert client.get("/ok").status_code == 200
+    assert events == ["outer:request", "inner:request", "inner:response", "outer:response"]
+
+
+def test_headers_request_id_and_correlation_id():
+    client = _client([SecurityHeadersStage(), RequestIdStage(), CorrelationIdStage()])
+
+    response = client.get("/ok", headers={"X-Request-ID": "req-123"})
+
+    assert response.headers["X-Request-ID"] == "req-123"
+    assert response.headers["X-Correlation-ID"]
+    assert response.headers["X-Frame-Options"] == "DENY"
+    assert response.json() == {"status": "ok"}
+
+
+def test_short_circuit_only_runs_outer_stages():
+    events = []
+    client = _client(
+        [RecordingStage("outer", events), BlockingStage(), RecordingStage("inner", events)]
+    )
+
+    response = client.get("/ok")
+
+    assert response.status_code == 429
+    assert events == ["outer:request", "outer:response"]
+
+
+def test_endpoint_errors_become_security_500():
+    client = _client([SecurityHeadersStage(), ThreatScreeningStage(enable_threat_detection=False)])
+
+    response = client.get("/boom")
+
+    assert response.status_code == 500
+    assert response.json() == {"detail": "Internal security error"}
+    assert response.headers["X-Content-Type-Options"] == "nosniff"
+
+
+def test_request_logging_stage_logs_the_response_synchronously(caplog):
+    client = _client([RequestIdStage(), RequestLoggingStage()])
+
+    with caplog.at_level(logging.INFO, logger="src.api.middleware.request_logging"):
+        client.get("/ok", headers={"X-Request-ID": "req-9"})
+
+    completed = [r.getMessage() for r in caplog.records if "Request completed" in r.getMessage()]
+    assert len(completed) == 1
+    assert "id=req-9" in completed[0]
+    assert "status=200" in completed[0]
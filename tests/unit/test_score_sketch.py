@@ -0,0 +1,39 @@
+import random
+
+import numpy as np
+import pytest
+
+from src.core.score_sketch import ScoreHistogram
+
+
+def test_histogram_matches_numpy_for_scores_on_the_bin_grid():
+    rng = random.Random(7)
+    scores = [round(rng.uniform(40, 100), 1) for _ in range(500)]
+
+    histogram = ScoreHistogram.from_scores(scores)
+
+    for percent in (10, 25, 50, 75, 90):
+        assert histogram.quantile(percent) == pytest.approx(np.percentile(scores, percent))
+    assert histogram.mean() == pytest.approx(np.mean(scores))
+    assert histogram.std() == pytest.approx(np.std(scores))
+    assert (histogram.min(), histogram.max()) == (min(scores), max(scores))
+
+
+def test_merged_histograms_equal_histogram_of_all_scores():
+    rng = random.Random(11)
+    days = [[rng.uniform(0, 100) for _ in range(rng.randint(1, 40))] for _ in range(30)]
+
+    merged = ScoreHistogram()
+    for scores in days:
+        merged.merge(ScoreHistogram.from_scores(scores))
+    everything = [score for scores in days for score in scores]
+
+    assert merged.count == len(everything)
+    assert merged.std() == pytest.approx(np.std(everything))
+    for percent in (10, 50, 90):
+        assert merged.quantile(percent) == pytest.approx(np.percentile(everything, percent), abs=0.05)
+
+
+def test_empty_histogram_raises():
+    with pytest.raises(ValueError):
+        ScoreHistogram().quantile(50)
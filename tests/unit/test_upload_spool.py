@@ -0,0 +1,99 @@
+import hashlib
+import io
+from pathlib import Path
+
+import pytest
+from starlette.datastructures import Headers, UploadFile
+
+from src.core.file_upload_validator import StreamingFileValidator, validate_uploaded_file
+from src.core.security_validator import SecurityValidator
+from src.core.upload_spool import UploadRejectedError, receive_upload
+
+
+def _upload(content: bytes, filename: str = "note.txt", content_type: str = "text/plain") -> UploadFile:
+    return UploadFile(
+        io.BytesIO(content),
+        filename=filename,
+        headers=Headers({"content-type": content_type}),
+    )
+
+
+@pytest.mark.asyncio
+async def test_small_upload_stays_in_memory(tmp_path):
+    content = b"Patient seen for gait training."
+
+    upload = await receive_upload(_upload(content), chunk_size=8, spool_dir=tmp_path / "spool")
+
+    assert not upload.is_spooled
+    assert upload.size == len(content)
+    assert upload.sha256 == hashlib.sha256(content).hexdigest()
+    assert upload.read_bytes() == content
+    assert not any((tmp_path / "spool").glob("*"))
+
+
+@pytest.mark.asyncio
+async def test_large_upload_is_spooled_encrypted(tmp_path):
+    content = b"Patient John Smith ambulated 150 feet with rolling walker.\n" * 200
+
+    upload = await receive_upload(
+        _upload(content), chunk_size=1024, spool_threshold=4096, spool_dir=tmp_path / "spool"
+    )
+
+    assert upload.is_spooled
+    assert b"John Smith" not in Path(upload.spool_path).read_bytes()
+    assert upload.sha256 == hashlib.sha256(content).hexdigest()
+    assert upload.read_bytes() == content
+
+    copy = tmp_path / "plain.txt"
+    upload.copy_to(copy)
+    assert copy.read_bytes() == content
+
+    upload.discard()
+    assert not Path(upload.spool_path).exists()
+
+
+@pytest.mark.asyncio
+async def test_oversized_upload_is_rejected_before_reading_everything(tmp_path, monkeypatch):
+    monkeypatch.setattr(SecurityValidator, "MAX_FILE_SIZE_BYTES", 4096)
+    stream = io.BytesIO(b"clinical note text " * 10_000)
+
+    with pytest.raises(UploadRejectedError):
+        await receive_upload(
+            UploadFile(stream, filename="big.txt"),
+            chunk_size=1024,
+            spool_threshold=2048,
+            spool_dir=tmp_path / "spool",
+        )
+
+    assert stream.tell() < len(stream.getvalue())
+    assert not any((tmp_path / "spool").glob("*"))
+
+
+@pytest.mark.asyncio
+async def test_invalid_upload_is_rejected(tmp_path):
+    with pytest.raises(UploadRejectedError, match="does not match expected format"):
+        await receive_upload(
+            _upload(b"not really a pdf" * 4, "scan.pdf", "application/pdf"), spool_dir=tmp_path / "spool"
+        )
+
+    with pytest.raises(UploadRejectedError, match="empty"):
+        await receive_upload(_upload(b""), spool_dir=tmp_path / "spool")
+
+
+@pytest.mark.parametrize(
+    ("content", "filename"),
+    [
+        (b"Patient tolerated treatment well.\n" * 50, "note.txt"),
+        (b"%PDF-1.4 body", "scan.pdf"),
+        (b"Notes <scr" + b"ipt>alert(1)</script>", "note.txt"),
+        (b"\x00\x01\x02\x03" * 40 + b"text", "note.txt"),
+        (b"PK\x03\x04 word/vbaProject.bin", "note.docx"),
+        (b"GIF89a", "image.gif"),
+    ],
+)
+def test_streaming_validator_matches_buffered_validation(content, filename):
+    validator = StreamingFileValidator(filename)
+    for start in range(0, len(content), 7):
+        validator.feed(content[start : start + 7])
+
+    assert validator.result()[0] == validate_uploaded_file(content, filename)[0]